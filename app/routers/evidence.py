@@ -22,8 +22,9 @@ import os
 import sys
 import json
 import time
+import asyncio
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse
@@ -63,6 +64,7 @@ try:
         search_clinical_trials,
         format_api_results_for_claude,
     )
+    import search_tracing
     _SEARCH_READY = True
 except Exception as e:
     _INIT_ERROR = str(e)
@@ -134,18 +136,34 @@ except ImportError:
 try:
     from trial_forecaster import (
         get_trial_forecaster_status,
-        run_forecast,
         get_adjustable_parameters,
         quick_trial_lookup,
+        recompute_forecast,
+        params_from_dict,
     )
     _TRIAL_FORECASTER_READY = True
 except ImportError:
     get_trial_forecaster_status = None
-    run_forecast = None
     get_adjustable_parameters = None
     quick_trial_lookup = None
+    recompute_forecast = None
+    params_from_dict = None
     _TRIAL_FORECASTER_READY = False
 
+try:
+    from forecast_jobs import ForecastQueueFull, submit_forecast, get_job, get_executor_status
+except ImportError:
+    ForecastQueueFull = None
+    submit_forecast = None
+    get_job = None
+    get_executor_status = None
+
+try:
+    from portfolio_forecaster import submit_portfolio_job, load_run as load_portfolio_run
+except ImportError:
+    submit_portfolio_job = None
+    load_portfolio_run = None
+
 # Sub-routers (split out for maintainability)
 from app.routers.webcasts import router as webcasts_router, WEBCAST_READY as _WEBCAST_READY
 from app.routers.deck import router as deck_router, DECK_ANALYZER_READY as _DECK_ANALYZER_READY
@@ -183,7 +201,23 @@ class RegionalMineRequest(BaseModel):
 class TrialForecastRequest(BaseModel):
     query: str  # NCT ID like "NCT12345678" or drug name like "obicetrapib PREVAIL"
     params: Optional[Dict] = None  # Adjustable parameters (effect_scale, alpha, etc.)
-    n_iterations: int = 50000
+    n_iterations: int = 50000  # Cap when target_se is set
+    target_se: Optional[float] = None  # Stop once the PoS standard error is below this
+
+
+class TrialRecomputeRequest(BaseModel):
+    session_id: str  # From a previous /analyze result (the trial's NCT ID)
+    params: Optional[Dict] = None
+
+
+class PortfolioForecastRequest(BaseModel):
+    ticker: Optional[str] = None  # Company's pivotal catalog (lead sponsor)
+    window: Optional[str] = None  # Primary-completion window "2026-10-01:2027-03-31"
+    nct_ids: Optional[List[str]] = None
+    phases: List[str] = ["PHASE3"]
+    params: Optional[Dict] = None
+    n_iterations: int = 20000
+    target_se: Optional[float] = None
 
 
 class TrialSearchRequest(BaseModel):
@@ -233,10 +267,13 @@ async def evidence_search_stream(req: SearchRequest):
         return JSONResponse(status_code=400, content={"error": "Empty query"})
 
     def generate():
+        trace = search_tracing.start_trace("evidence_search", query=query)
+
         # Step 1: Classify
         yield f"data: {json.dumps({'type': 'step', 'step': 'classifying'})}\n\n"
         try:
-            plan = classify_query(query)
+            with trace.span("classify"):
+                plan = classify_query(query)
         except Exception as e:
             yield f"data: {json.dumps({'type': 'token', 'text': f'Classification error: {e}'})}\n\n"
             yield f"data: {json.dumps({'type': 'done', 'sources': [], 'timing': {}, 'metadata': {}, 'query_plan': {}})}\n\n"
@@ -244,13 +281,15 @@ async def evidence_search_stream(req: SearchRequest):
 
         # Step 1.5: Enrich with drug entities
         if DRUG_DB_AVAILABLE:
-            plan = enrich_with_drug_entities(query, plan)
+            with trace.span("entity_enrichment"):
+                plan = enrich_with_drug_entities(query, plan)
 
         yield f"data: {json.dumps({'type': 'step', 'step': 'searching', 'plan': {'sources': plan.get('sources', []), 'query_type': plan.get('query_type', 'general')}})}\n\n"
 
         # Step 2: Execute queries in parallel
         try:
-            query_data = execute_query_plan(plan)
+            with trace.span("execute"):
+                query_data = execute_query_plan(plan)
         except Exception as e:
             yield f"data: {json.dumps({'type': 'token', 'text': f'Search execution error: {e}'})}\n\n"
             yield f"data: {json.dumps({'type': 'done', 'sources': [], 'timing': {}, 'metadata': {}, 'query_plan': plan})}\n\n"
@@ -271,6 +310,7 @@ async def evidence_search_stream(req: SearchRequest):
         yield f"data: {json.dumps({'type': 'step', 'step': 'synthesizing', 'metadata': metadata})}\n\n"
 
         # Step 3: Build context for Claude synthesis
+        format_start = time.perf_counter()
         context_parts = []
         entity_ctx = plan.get("entity_context", {})
 
@@ -356,14 +396,18 @@ async def evidence_search_stream(req: SearchRequest):
                 print(f"  Company briefing failed: {e}")
 
         if not context_parts:
+            trace.record("format_context", time.perf_counter() - format_start)
+            trace.finish()
             yield f"data: {json.dumps({'type': 'token', 'text': 'No relevant data found for this query.'})}\n\n"
             yield f"data: {json.dumps({'type': 'done', 'sources': sources, 'timing': query_data.get('timing', {}), 'metadata': metadata, 'query_plan': plan})}\n\n"
             return
 
         full_context = "\n\n".join(context_parts)
         full_system = f"{SYNTHESIS_SYSTEM_PROMPT}\n\n{full_context}"
+        trace.record("format_context", time.perf_counter() - format_start)
 
         start_time = time.time()
+        first_token = True
         last_error = None
         for attempt in range(3):
             try:
@@ -374,6 +418,9 @@ async def evidence_search_stream(req: SearchRequest):
                     messages=[{"role": "user", "content": query}],
                 ) as stream:
                     for text in stream.text_stream:
+                        if first_token:
+                            trace.record("claude_ttft", time.time() - start_time)
+                            first_token = False
                         yield f"data: {json.dumps({'type': 'token', 'text': text})}\n\n"
                 last_error = None
                 break
@@ -388,8 +435,10 @@ async def evidence_search_stream(req: SearchRequest):
                     break
 
         total_time = round(time.time() - start_time, 2)
+        trace.record("claude_stream", time.time() - start_time, error=last_error is not None)
+        trace.finish()
         timing = {**query_data.get("timing", {}), "total": total_time}
-        yield f"data: {json.dumps({'type': 'done', 'sources': sources, 'timing': timing, 'metadata': metadata, 'query_plan': plan})}\n\n"
+        yield f"data: {json.dumps({'type': 'done', 'sources': sources, 'timing': timing, 'stages': trace.timing(), 'metadata': metadata, 'query_plan': plan})}\n\n"
 
     return StreamingResponse(
         generate(),
@@ -511,6 +560,8 @@ async def trial_forecaster_status():
 
     try:
         status = get_trial_forecaster_status()
+        if get_executor_status:
+            status["executor"] = get_executor_status()
         return status
     except Exception as e:
         return {
@@ -522,10 +573,9 @@ async def trial_forecaster_status():
         }
 
 
-@router.post("/api/trial-forecaster/analyze")
-async def trial_forecaster_analyze(req: TrialForecastRequest):
-    """SSE streaming endpoint for trial forecasting analysis."""
-    if not _TRIAL_FORECASTER_READY:
+def _submit_forecast_job(req: TrialForecastRequest):
+    """Queue a forecast job, or return the JSONResponse explaining why not."""
+    if not _TRIAL_FORECASTER_READY or submit_forecast is None:
         return JSONResponse(
             status_code=503,
             content={"error": "Trial forecaster module not loaded"},
@@ -535,14 +585,29 @@ async def trial_forecaster_analyze(req: TrialForecastRequest):
     if not query:
         return JSONResponse(status_code=400, content={"error": "Empty query"})
 
+    try:
+        return submit_forecast(query, req.params, req.n_iterations, req.target_se)
+    except ForecastQueueFull as e:
+        return JSONResponse(status_code=429, content={"error": str(e)})
+
+
+@router.post("/api/trial-forecaster/analyze")
+async def trial_forecaster_analyze(req: TrialForecastRequest):
+    """
+    SSE streaming endpoint for trial forecasting analysis.
+
+    The forecast runs as a background job (simulation in the forecast_jobs
+    process pool); this stream just relays the job's events. The job keeps
+    running if the client disconnects — poll /api/trial-forecaster/jobs/{id}.
+    """
+    job = _submit_forecast_job(req)
+    if isinstance(job, JSONResponse):
+        return job
+
     async def generate():
         try:
-            # Run forecast and stream results (run_forecast is an async generator)
-            async for event_type, event_data in run_forecast(
-                query=query,
-                params=req.params,
-                n_iterations=req.n_iterations,
-            ):
+            yield f"data: {json.dumps({'type': 'job', 'job_id': job.job_id})}\n\n"
+            async for event_type, event_data in job.stream():
                 if event_type == "step":
                     yield f"data: {json.dumps({'type': 'step', 'message': event_data})}\n\n"
                 elif event_type == "result":
@@ -559,6 +624,102 @@ async def trial_forecaster_analyze(req: TrialForecastRequest):
     )
 
 
+@router.post("/api/trial-forecaster/recompute")
+async def trial_forecaster_recompute(req: TrialRecomputeRequest):
+    """
+    Re-run a cached forecast with new slider values.
+
+    Reuses the trial design, anchors and random draws from the /analyze run,
+    so this returns in milliseconds. 404 means the session expired — call
+    /analyze again.
+    """
+    if not _TRIAL_FORECASTER_READY:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Trial forecaster module not loaded"},
+        )
+
+    try:
+        result = await recompute_forecast(req.session_id, params_from_dict(req.params))
+    except KeyError:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Forecast session '{req.session_id}' expired or not found"},
+        )
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Recompute failed: {str(e)}"},
+        )
+    return result.to_dict()
+
+
+@router.post("/api/trial-forecaster/jobs")
+async def trial_forecaster_submit_job(req: TrialForecastRequest):
+    """Queue a forecast and return its job id immediately (202)."""
+    job = _submit_forecast_job(req)
+    if isinstance(job, JSONResponse):
+        return job
+    return JSONResponse(status_code=202, content=job.to_dict(include_result=False))
+
+
+@router.get("/api/trial-forecaster/jobs/{job_id}")
+async def trial_forecaster_job_status(job_id: str):
+    """Status, progress steps and (once done) the result of a forecast job."""
+    job = get_job(job_id) if get_job else None
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Forecast job '{job_id}' not found or expired"},
+        )
+    return job.to_dict()
+
+
+@router.post("/api/trial-forecaster/portfolio")
+async def trial_forecaster_portfolio(req: PortfolioForecastRequest):
+    """
+    Queue a batch forecast over a ticker's catalog, a catalyst window or an
+    NCT list. Poll /api/trial-forecaster/jobs/{job_id}; the finished result
+    carries a run_id readable from /api/trial-forecaster/portfolio/{run_id}.
+    """
+    if submit_portfolio_job is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Portfolio forecaster module not loaded"},
+        )
+    if not (req.ticker or req.window or req.nct_ids):
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Give a ticker, a catalyst window or a list of NCT IDs"},
+        )
+
+    try:
+        job = submit_portfolio_job(
+            ticker=req.ticker,
+            window=req.window,
+            nct_ids=req.nct_ids,
+            phases=tuple(req.phases),
+            params=req.params,
+            n_iterations=req.n_iterations,
+            target_se=req.target_se,
+        )
+    except ForecastQueueFull as e:
+        return JSONResponse(status_code=429, content={"error": str(e)})
+    return JSONResponse(status_code=202, content=job.to_dict(include_result=False))
+
+
+@router.get("/api/trial-forecaster/portfolio/{run_id}")
+async def trial_forecaster_portfolio_run(run_id: str):
+    """A saved portfolio run: ranked rows of PoS, effect and event distributions."""
+    run = await asyncio.to_thread(load_portfolio_run, run_id) if load_portfolio_run else None
+    if run is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Portfolio run '{run_id}' not found"},
+        )
+    return run
+
+
 @router.get("/api/trial-forecaster/parameters")
 async def trial_forecaster_parameters():
     """Returns the list of adjustable parameters with their definitions."""
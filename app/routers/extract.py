@@ -13,7 +13,6 @@ import uuid
 import json
 import base64
 import tempfile
-import requests
 from pathlib import Path
 
 from fastapi import APIRouter, UploadFile, File, Request
@@ -514,6 +513,14 @@ Always cite the source document (ticker, filename, page number) for every claim.
 
 _CT_BASE = "https://clinicaltrials.gov/api/v2"
 
+# Shared CT.gov client (pooled session, rate limiter, disk cache) lives with the
+# search backend. Appended rather than prepended so extraction/rag_search wins.
+import sys as _sys
+_SEARCH_DIR = str(Path(__file__).resolve().parent.parent.parent / "backend" / "services" / "search")
+if _SEARCH_DIR not in _sys.path:
+    _sys.path.append(_SEARCH_DIR)
+import ctgov_client
+
 # Map tickers to ClinicalTrials.gov sponsor search terms.
 # Some companies go by different legal names in trial registrations.
 _SPONSOR_MAP: dict[str, str] = {
@@ -565,19 +572,12 @@ _SPONSOR_MAP: dict[str, str] = {
 def _search_trials_for_sponsor(sponsor_term: str, max_results: int = 25) -> list[dict]:
     """Query ClinicalTrials.gov v2 API for trials by sponsor name."""
     try:
-        resp = requests.get(
-            f"{_CT_BASE}/studies",
-            params={
-                "query.sponsor": sponsor_term,
-                "filter.overallStatus": "RECRUITING,ACTIVE_NOT_RECRUITING,ENROLLING_BY_INVITATION,NOT_YET_RECRUITING,COMPLETED",
-                "pageSize": max_results,
-                "sort": "LastUpdatePostDate:desc",
-            },
-            headers={"User-Agent": "SatyaBio-Platform/1.0"},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        data = ctgov_client.get_json({
+            "query.sponsor": sponsor_term,
+            "filter.overallStatus": "RECRUITING,ACTIVE_NOT_RECRUITING,ENROLLING_BY_INVITATION,NOT_YET_RECRUITING,COMPLETED",
+            "pageSize": max_results,
+            "sort": "LastUpdatePostDate:desc",
+        }, timeout=15)
     except Exception as e:
         print(f"  ClinicalTrials.gov API error for '{sponsor_term}': {e}")
         return []
@@ -623,14 +623,7 @@ def _search_trials_for_sponsor(sponsor_term: str, max_results: int = 25) -> list
 def _get_trial_detail(nct_id: str) -> dict | None:
     """Fetch full trial detail for loading into chat."""
     try:
-        resp = requests.get(
-            f"{_CT_BASE}/studies/{nct_id}",
-            headers={"User-Agent": "SatyaBio-Platform/1.0"},
-            timeout=15,
-        )
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
+        data = ctgov_client.get_study(nct_id, timeout=15)
     except Exception as e:
         print(f"  ClinicalTrials.gov detail error for {nct_id}: {e}")
         return None
@@ -5,7 +5,7 @@ Endpoints for institutional ownership tracking:
 - Biotech specialist fund listings
 - XBI ETF holdings
 - SEC 13F filing lookups
-- KOL (Key Opinion Leader) search via PubMed
+- KOL (Key Opinion Leader) search from the PubMed-backed KOL store
 - Database statistics
 """
 
@@ -13,6 +13,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 from pathlib import Path
+import asyncio
 import json
 
 router = APIRouter()
@@ -157,23 +158,67 @@ async def get_consensus_positions():
 class KOLSearchRequest(BaseModel):
     query: str
     max_results: Optional[int] = 10
+    max_publications: Optional[int] = 200
+    refresh: bool = False
+
+
+# Background PubMed syncs in flight, keyed by query (keeps the tasks referenced)
+_kol_syncs: dict[str, asyncio.Task] = {}
+
+
+def _sync_kols(query: str, max_publications: int):
+    from src.scrapers.pubmed_kol_extractor import PubMedKOLExtractor
+
+    PubMedKOLExtractor().sync(query, max_publications)
+
+
+def _search_kol_store(query: str, limit: int) -> dict:
+    from src.scrapers.kol_store import KOLStore
+
+    return KOLStore().search_kols(query, limit=limit)
+
+
+def _schedule_kol_sync(query: str, max_publications: int):
+    key = query.strip().lower()
+    if key in _kol_syncs:
+        return
+    task = asyncio.create_task(asyncio.to_thread(_sync_kols, query, max_publications))
+    _kol_syncs[key] = task
+    task.add_done_callback(lambda _: _kol_syncs.pop(key, None))
 
 
 @router.post("/kols/search")
 async def search_kols(request: KOLSearchRequest):
     """
-    Search PubMed for Key Opinion Leaders (KOLs) on a drug or indication.
-    Returns top authors by publication count with affiliations.
+    Key Opinion Leaders (KOLs) on a drug or indication, ranked by publication
+    record with affiliations.
+
+    Answered from the local KOL store. A query the store has never synced is
+    answered from a full-text match over stored publications while PubMed is
+    synced in the background, as is a query whose last sync is older than
+    KOL_QUERY_TTL (the re-sync only fetches new PMIDs); only when the store
+    has nothing for it (or refresh is set) does the request wait for PubMed.
+    Store reads and syncs run in worker threads.
     """
     try:
-        from src.scrapers.pubmed_kol_extractor import PubMedKOLExtractor
+        max_publications = request.max_publications or 200
+        if request.refresh:
+            await asyncio.to_thread(_sync_kols, request.query, max_publications)
+
+        result = await asyncio.to_thread(_search_kol_store, request.query, request.max_results)
+        if not result["kols"] and result["source"] == "match":
+            await asyncio.to_thread(_sync_kols, request.query, max_publications)
+            result = await asyncio.to_thread(_search_kol_store, request.query, request.max_results)
+        elif result["source"] == "match" or result["stale"]:
+            _schedule_kol_sync(request.query, max_publications)
 
-        extractor = PubMedKOLExtractor()
-        kols = extractor.find_kols(request.query, max_results=request.max_results)
         return {
             "query": request.query,
-            "kols": kols,
-            "count": len(kols),
+            "kols": result["kols"],
+            "count": len(result["kols"]),
+            "publications": result["publications"],
+            "source": result["source"],
+            "stale": result["stale"],
         }
     except ImportError:
         raise HTTPException(
@@ -8,6 +8,7 @@ Architecture:
     POST /api/search/stream  → SSE streaming search
     POST /api/search         → synchronous search (fallback)
     GET  /api/search/health  → system health check
+    GET  /api/search/metrics → per-stage latency histograms (Prometheus text)
 """
 
 import os
@@ -18,7 +19,7 @@ from pathlib import Path
 from typing import AsyncGenerator
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -31,6 +32,10 @@ _SEARCH_DIR = str(Path(__file__).resolve().parent.parent.parent / "backend" / "s
 if _SEARCH_DIR not in sys.path:
     sys.path.insert(0, _SEARCH_DIR)
 
+# Tracing has no third-party dependencies, so /metrics works even when the
+# rest of the search backend failed to load.
+import search_tracing
+
 # Import flags — everything is optional so the app still starts if modules are missing
 _SEARCH_READY = False
 _INIT_ERROR = None
@@ -126,18 +131,23 @@ async def search_stream(req: SearchRequest):
 
     def generate():
         """Synchronous generator that yields SSE events."""
+        trace = search_tracing.start_trace("search_stream", query=query)
+
         # Step 1: Classify
         yield f"data: {json.dumps({'type': 'step', 'step': 'classifying'})}\n\n"
-        plan = classify_query(query)
+        with trace.span("classify"):
+            plan = classify_query(query)
 
         # Step 1.5: Enrich with drug entities
         if DRUG_DB_AVAILABLE:
-            plan = enrich_with_drug_entities(query, plan)
+            with trace.span("entity_enrichment"):
+                plan = enrich_with_drug_entities(query, plan)
 
         yield f"data: {json.dumps({'type': 'step', 'step': 'searching', 'plan': {'sources': plan.get('sources', []), 'query_type': plan.get('query_type', 'general')}})}\n\n"
 
         # Step 2: Execute queries in parallel
-        query_data = execute_query_plan(plan)
+        with trace.span("execute"):
+            query_data = execute_query_plan(plan)
         landscape = query_data.get("global_landscape")
         metadata = {
             "rag_chunks_retrieved": len(query_data.get("rag_results", [])),
@@ -151,6 +161,7 @@ async def search_stream(req: SearchRequest):
         yield f"data: {json.dumps({'type': 'step', 'step': 'synthesizing', 'metadata': metadata})}\n\n"
 
         # Step 3: Build context for Claude synthesis
+        format_start = time.perf_counter()
         context_parts = []
         entity_ctx = plan.get("entity_context", {})
 
@@ -226,12 +237,15 @@ async def search_stream(req: SearchRequest):
                 print(f"  IR events query failed: {e}")
 
         if not context_parts:
+            trace.record("format_context", time.perf_counter() - format_start)
+            trace.finish()
             yield f"data: {json.dumps({'type': 'token', 'text': 'No relevant data found for this query.'})}\n\n"
             yield f"data: {json.dumps({'type': 'done', 'sources': sources, 'timing': query_data.get('timing', {}), 'metadata': metadata, 'query_plan': plan})}\n\n"
             return
 
         full_context = "\n\n".join(context_parts)
         full_system = f"{SYNTHESIS_SYSTEM_PROMPT}\n\n{full_context}"
+        trace.record("format_context", time.perf_counter() - format_start)
 
         # Build messages with conversation history for context
         messages = []
@@ -242,6 +256,8 @@ async def search_stream(req: SearchRequest):
         messages.append({"role": "user", "content": query})
 
         start_time = time.time()
+        first_token = True
+        stream_error = False
         try:
             with get_client().messages.stream(
                 model="claude-sonnet-4-20250514",
@@ -250,13 +266,19 @@ async def search_stream(req: SearchRequest):
                 messages=messages,
             ) as stream:
                 for text in stream.text_stream:
+                    if first_token:
+                        trace.record("claude_ttft", time.time() - start_time)
+                        first_token = False
                     yield f"data: {json.dumps({'type': 'token', 'text': text})}\n\n"
         except Exception as e:
+            stream_error = True
             yield f"data: {json.dumps({'type': 'token', 'text': f'Error generating answer: {str(e)}'})}\n\n"
 
         total_time = round(time.time() - start_time, 2)
+        trace.record("claude_stream", time.time() - start_time, error=stream_error)
+        trace.finish()
         timing = {**query_data.get("timing", {}), "total": total_time}
-        yield f"data: {json.dumps({'type': 'done', 'sources': sources, 'timing': timing, 'metadata': metadata, 'query_plan': plan})}\n\n"
+        yield f"data: {json.dumps({'type': 'done', 'sources': sources, 'timing': timing, 'stages': trace.timing(), 'metadata': metadata, 'query_plan': plan})}\n\n"
 
     return StreamingResponse(
         generate(),
@@ -312,6 +334,25 @@ async def search_health():
     return health
 
 
+# ---------------------------------------------------------------------------
+# Latency metrics (Prometheus text format)
+# ---------------------------------------------------------------------------
+
+@router.get("/metrics")
+async def search_metrics():
+    """Per-stage latency histograms for the search pipeline (Prometheus scrape target)."""
+    return PlainTextResponse(
+        search_tracing.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/metrics/summary")
+async def search_metrics_summary():
+    """Human-readable per-stage latency summary (count, mean, p50, p95)."""
+    return {"stages": search_tracing.get_latency_summary()}
+
+
 # ---------------------------------------------------------------------------
 # Landscape chart data endpoint
 # ---------------------------------------------------------------------------
@@ -7,16 +7,20 @@ Supports:
   - Direct transcript paste → RAG embedding
   - URL-based audio download (yt-dlp) → Whisper → RAG
   - MediaRecorder JS bookmarklet for browser audio capture
+
+Audio processing (/process, /upload-audio) runs as a background job
+(webcast_jobs): the endpoint returns a job ID at once; poll /jobs/{id} or
+stream /jobs/{id}/events (SSE) for progress, and cancel / resume from there.
 """
 
 import os
 import sys
-import tempfile
+import json
 from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/webcasts", tags=["webcasts"])
@@ -32,7 +36,6 @@ if _SEARCH_DIR not in sys.path:
 try:
     from webcast_pipeline import (
         get_webcast_status,
-        process_webcast,
         search_webcasts,
         list_webcasts,
         get_webcast_transcript,
@@ -44,7 +47,6 @@ try:
 except ImportError as e:
     print(f"  [webcasts] Webcast pipeline not available: {e}")
     get_webcast_status = None
-    process_webcast = None
     search_webcasts = None
     list_webcasts = None
     get_webcast_transcript = None
@@ -53,6 +55,21 @@ except ImportError as e:
     get_registration_js = None
     WEBCAST_READY = False
 
+try:
+    from webcast_jobs import (
+        WebcastQueueFull,
+        cancel_job,
+        get_job,
+        get_queue_status,
+        list_jobs,
+        resume_job,
+        submit_webcast,
+    )
+except ImportError as e:
+    print(f"  [webcasts] Webcast job queue not available: {e}")
+    WebcastQueueFull = RuntimeError
+    cancel_job = get_job = get_queue_status = list_jobs = resume_job = submit_webcast = None
+
 
 # ---------------------------------------------------------------------------
 # Request models
@@ -68,6 +85,25 @@ class WebcastProcessRequest(BaseModel):
     event_type: str = "webcast"
 
 
+def _not_ready():
+    return JSONResponse({"status": "error", "error": "Webcast module not loaded"}, status_code=503)
+
+
+def _job_not_found(job_id: str):
+    return JSONResponse({"error": f"Webcast job '{job_id}' not found"}, status_code=404)
+
+
+def _submit(request: dict, upload_name: str = None, upload_bytes: bytes = None):
+    """Queue a webcast job and answer 202 with it, or explain why not."""
+    if not WEBCAST_READY or submit_webcast is None:
+        return _not_ready()
+    try:
+        job = submit_webcast(request, upload_name=upload_name, upload_bytes=upload_bytes)
+    except WebcastQueueFull as e:
+        return JSONResponse({"status": "error", "error": str(e)}, status_code=429)
+    return JSONResponse({"status": "queued", **job.to_dict()}, status_code=202)
+
+
 class WebcastSearchRequest(BaseModel):
     query: str
     ticker: Optional[str] = None
@@ -94,24 +130,81 @@ async def webcast_pipeline_status():
     """Check readiness of the webcast transcription pipeline."""
     if not WEBCAST_READY:
         return JSONResponse({"ready": False, "error": "Webcast module not loaded"})
-    return JSONResponse(get_webcast_status())
+    status = get_webcast_status()
+    if get_queue_status:
+        status["jobs"] = get_queue_status()
+    return JSONResponse(status)
 
 
 @router.post("/process")
 async def webcast_process(request: WebcastProcessRequest):
-    """Full pipeline: capture audio -> transcribe -> store in RAG."""
-    if not WEBCAST_READY:
-        return JSONResponse({"status": "error", "error": "Webcast module not loaded"}, status_code=503)
-    result = await process_webcast(
-        audio_path=request.audio_path,
-        url=request.url,
-        title=request.title,
-        ticker=request.ticker,
-        company_name=request.company_name,
-        event_date=request.event_date,
-        event_type=request.event_type,
+    """
+    Queue the full pipeline (capture audio -> transcribe -> store in RAG)
+    and return the job at once (202). Follow it at /jobs/{job_id}.
+    """
+    if not (request.audio_path or request.url):
+        return JSONResponse({"status": "error", "error": "Provide audio_path or url"}, status_code=400)
+    return _submit(request.model_dump())
+
+
+@router.get("/jobs")
+async def webcast_jobs(limit: int = 50):
+    """Recent webcast jobs, newest first."""
+    if list_jobs is None:
+        return _not_ready()
+    return JSONResponse({"jobs": list_jobs(limit=limit)})
+
+
+@router.get("/jobs/{job_id}")
+async def webcast_job_status(job_id: str):
+    """Status, stage, progress events and (once done) the result of a webcast job."""
+    job = get_job(job_id) if get_job else None
+    if job is None:
+        return _job_not_found(job_id)
+    return JSONResponse(job.to_dict())
+
+
+@router.get("/jobs/{job_id}/events")
+async def webcast_job_events(job_id: str):
+    """
+    SSE stream of a job's events — everything so far, then live until the
+    job finishes. Disconnecting does not affect the job.
+    """
+    job = get_job(job_id) if get_job else None
+    if job is None:
+        return _job_not_found(job_id)
+
+    async def generate():
+        async for event in job.stream():
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+        yield f"data: {json.dumps({'type': 'end', 'status': job.status})}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return JSONResponse(result)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def webcast_job_cancel(job_id: str):
+    """Cancel a job: at once if queued, after the current step if running."""
+    job = cancel_job(job_id) if cancel_job else None
+    if job is None:
+        return _job_not_found(job_id)
+    return JSONResponse(job.to_dict())
+
+
+@router.post("/jobs/{job_id}/resume")
+async def webcast_job_resume(job_id: str):
+    """Restart a failed or cancelled job from its last completed stage."""
+    try:
+        job = resume_job(job_id) if resume_job else None
+    except WebcastQueueFull as e:
+        return JSONResponse({"status": "error", "error": str(e)}, status_code=429)
+    if job is None:
+        return _job_not_found(job_id)
+    return JSONResponse(job.to_dict(), status_code=202 if job.status == "queued" else 200)
 
 
 @router.post("/ingest")
@@ -134,7 +227,7 @@ async def webcast_ingest(request: WebcastIngestRequest):
 
 @router.post("/search")
 async def webcast_search(request: WebcastSearchRequest):
-    """Search across all webcast transcripts (hybrid vector + keyword)."""
+    """Search across all webcast transcripts (hybrid vector + keyword), anchored to the matching moments."""
     if not WEBCAST_READY:
         return JSONResponse({"query": request.query, "results": [], "error": "Webcast module not loaded"})
     results = search_webcasts(query=request.query, ticker=request.ticker, top_k=request.top_k)
@@ -149,6 +242,12 @@ async def webcast_search(request: WebcastSearchRequest):
             "title": r.get("title", ""),
             "date": r.get("date", ""),
             "score": round(r.get("hybrid_score", r.get("rerank_score", 0)), 4),
+            "document_id": r.get("document_id"),
+            "start_time": r.get("start_time"),
+            "end_time": r.get("end_time"),
+            "timestamp": r.get("timestamp"),
+            "jump_url": r.get("jump_url"),
+            "moments": r.get("moments", []),
         })
     return JSONResponse({"query": request.query, "results": clean_results, "count": len(clean_results)})
 
@@ -194,9 +293,11 @@ async def webcast_upload_audio(
     Upload an audio file → transcribe with Whisper → embed in RAG.
     This is the primary sustainable workflow for webcast ingestion.
     Accepts: .mp3, .webm, .wav, .m4a, .ogg, .mp4, .flac
+
+    The recording is stored with a background job; returns the job (202).
     """
     if not WEBCAST_READY:
-        return JSONResponse({"status": "error", "error": "Webcast module not loaded"}, status_code=503)
+        return _not_ready()
 
     # Validate file type
     allowed_extensions = {".mp3", ".webm", ".wav", ".m4a", ".ogg", ".mp4", ".flac", ".opus"}
@@ -207,45 +308,22 @@ async def webcast_upload_audio(
             "error": f"Unsupported file type '{ext}'. Accepted: {', '.join(sorted(allowed_extensions))}"
         }, status_code=400)
 
-    # Save uploaded file to temp directory
-    os.makedirs("/tmp/helix-webcasts", exist_ok=True)
-    temp_path = os.path.join("/tmp/helix-webcasts", f"upload_{audio_file.filename}")
-    try:
-        contents = await audio_file.read()
-        if len(contents) > 100 * 1024 * 1024:  # 100 MB limit
-            return JSONResponse({
-                "status": "error",
-                "error": "File too large. Maximum 100 MB."
-            }, status_code=400)
-
-        with open(temp_path, "wb") as f:
-            f.write(contents)
-
-        # Run the full pipeline: transcribe → chunk → embed → store
-        result = await process_webcast(
-            audio_path=temp_path,
-            title=title or audio_file.filename or "Uploaded Webcast",
-            ticker=ticker,
-            company_name=company_name,
-            event_date=event_date,
-            event_type=event_type,
-        )
-
-        # Add source_url to result if provided
-        if source_url and result.get("status") == "ok":
-            result["source_url"] = source_url
-
-        return JSONResponse(result)
-
-    except Exception as e:
-        return JSONResponse({"status": "error", "error": str(e)}, status_code=500)
-    finally:
-        # Clean up temp file
-        try:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-        except Exception:
-            pass
+    contents = await audio_file.read()
+    if len(contents) > 100 * 1024 * 1024:  # 100 MB limit
+        return JSONResponse({
+            "status": "error",
+            "error": "File too large. Maximum 100 MB."
+        }, status_code=400)
+
+    return _submit({
+        "title": title or audio_file.filename or "Uploaded Webcast",
+        "ticker": ticker,
+        "company_name": company_name,
+        "event_date": event_date,
+        "event_type": event_type,
+        "source_url": source_url,
+        "duration_seconds": duration_seconds,
+    }, upload_name=audio_file.filename, upload_bytes=contents)
 
 
 @router.get("/capture-js")
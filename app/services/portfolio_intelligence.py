@@ -11,6 +11,7 @@ so the LLM can reason about changes, scores, and risks with real computed data.
 """
 
 import os
+import sys
 import json
 import hashlib
 import requests
@@ -21,6 +22,16 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Shared mention tagger (backend/services/search) for indication → TA inference
+_SEARCH_DIR = str(Path(__file__).resolve().parent.parent.parent / "backend" / "services" / "search")
+if _SEARCH_DIR not in sys.path:
+    sys.path.append(_SEARCH_DIR)
+try:
+    from mention_tagger import MentionTagger
+    MENTION_TAGGER_AVAILABLE = True
+except ImportError:
+    MENTION_TAGGER_AVAILABLE = False
+
 # --------------------------------------------------------------------------
 # Config
 # --------------------------------------------------------------------------
@@ -609,50 +620,72 @@ def format_ta_scores_for_claude(scores: dict) -> str:
     return "\n".join(lines)
 
 
+# Therapeutic area → indication keywords, in priority order. Keywords match
+# on word starts ("tumor" also hits "tumors"; "als" no longer hits "trials").
+_TA_KEYWORDS = {
+    "oncology": [
+        "cancer", "tumor", "carcinoma", "lymphoma", "leukemia", "melanoma",
+        "sarcoma", "myeloma", "glioblastoma", "mesothelioma", "neuroblastoma",
+        "nsclc", "sclc", "hcc", "rcc", "aml", "cll", "dlbcl", "mds",
+    ],
+    "immunology": [
+        "arthritis", "lupus", "psoriasis", "dermatitis", "colitis",
+        "crohn", "ibd", "uc", "sle", "pemphigus", "vitiligo", "alopecia",
+        "myasthenia", "cidp", "itp", "autoimmune",
+    ],
+    "metabolic": [
+        "diabetes", "obesity", "overweight", "nash", "mash", "nafld",
+        "weight", "glycemic", "hba1c", "glp-1", "metabolic", "lipid",
+        "cardiovascular", "hypertension", "heart failure",
+    ],
+    "neurology": [
+        "alzheimer", "parkinson", "epilepsy", "migraine", "MS", "multiple sclerosis",
+        "als", "huntington", "neuropathy", "seizure", "pain", "sleep apnea",
+    ],
+    "rare disease": [
+        "orphan", "rare", "gaucher", "fabry", "sma", "duchenne", "cystic fibrosis",
+        "hemophilia", "sickle cell", "thalassemia", "angelman", "rett",
+    ],
+    "infectious disease": [
+        "hiv", "hepatitis", "covid", "rsv", "influenza", "antimicrobial",
+        "antifungal", "antibiotic", "infection", "viral",
+    ],
+    "respiratory": [
+        "asthma", "copd", "pulmonary", "lung fibrosis", "ipf",
+    ],
+    "musculoskeletal": [
+        "osteoarthritis", "osteoporosis", "bone", "joint", "gout",
+        "incontinence", "urinary",
+    ],
+}
+
+_ta_tagger = None
+
+
+def _get_ta_tagger():
+    global _ta_tagger
+    if _ta_tagger is None and MENTION_TAGGER_AVAILABLE:
+        tagger = MentionTagger()
+        tagger.set_source(
+            "ta_keywords", "indication",
+            ((kw, ta, kw) for ta, keywords in _TA_KEYWORDS.items() for kw in keywords),
+            prefix=True,
+        )
+        _ta_tagger = tagger
+    return _ta_tagger
+
+
 def _infer_ta(indication: str) -> str:
     """Infer therapeutic area from an indication name."""
-    indication_lower = str(indication).lower()
+    tagger = _get_ta_tagger()
+    if tagger is not None:
+        mention = tagger.first(str(indication), "indication")
+        return mention.entity_id if mention else "other"
 
-    ta_map = {
-        "oncology": [
-            "cancer", "tumor", "carcinoma", "lymphoma", "leukemia", "melanoma",
-            "sarcoma", "myeloma", "glioblastoma", "mesothelioma", "neuroblastoma",
-            "nsclc", "sclc", "hcc", "rcc", "aml", "cll", "dlbcl", "mds",
-        ],
-        "immunology": [
-            "arthritis", "lupus", "psoriasis", "dermatitis", "colitis",
-            "crohn", "ibd", "uc", "sle", "pemphigus", "vitiligo", "alopecia",
-            "myasthenia", "cidp", "itp", "autoimmune",
-        ],
-        "metabolic": [
-            "diabetes", "obesity", "overweight", "nash", "mash", "nafld",
-            "weight", "glycemic", "hba1c", "glp-1", "metabolic", "lipid",
-            "cardiovascular", "hypertension", "heart failure",
-        ],
-        "neurology": [
-            "alzheimer", "parkinson", "epilepsy", "migraine", "ms ", "multiple sclerosis",
-            "als", "huntington", "neuropathy", "seizure", "pain", "sleep apnea",
-        ],
-        "rare disease": [
-            "orphan", "rare", "gaucher", "fabry", "sma", "duchenne", "cystic fibrosis",
-            "hemophilia", "sickle cell", "thalassemia", "angelman", "rett",
-        ],
-        "infectious disease": [
-            "hiv", "hepatitis", "covid", "rsv", "influenza", "antimicrobial",
-            "antifungal", "antibiotic", "infection", "viral",
-        ],
-        "respiratory": [
-            "asthma", "copd", "pulmonary", "lung fibrosis", "ipf",
-        ],
-        "musculoskeletal": [
-            "osteoarthritis", "osteoporosis", "bone", "joint", "gout",
-            "incontinence", "urinary",
-        ],
-    }
-
-    for ta, keywords in ta_map.items():
+    indication_lower = str(indication).lower()
+    for ta, keywords in _TA_KEYWORDS.items():
         for kw in keywords:
-            if kw in indication_lower:
+            if kw.lower() in indication_lower:
                 return ta
 
     return "other"
@@ -41,6 +41,7 @@ interface ForecastResult {
   anchors: Anchor[]
   risk_factors: RiskFactor[]
   power_curve?: string[]
+  session_id?: string
 }
 
 interface Parameter {
@@ -260,9 +261,44 @@ export default function TrialForecasterPanel({ onTrialSearch: _onTrialSearch }:
     setParamValues(defaults)
   }
 
-  // Re-run analysis with current parameters
+  // Re-run analysis with current parameters. Uses the cached session from
+  // the last analysis when the backend still has it (no re-fetch, ~ms);
+  // falls back to a full analysis if the session has expired.
   async function handleRerun() {
-    await handleAnalyze()
+    const sessionId = forecastResult?.session_id
+    if (!sessionId) {
+      await handleAnalyze()
+      return
+    }
+
+    setAnalyzing(true)
+    setAnalyzeError('')
+    try {
+      const res = await fetch('/extract/api/trial-forecaster/recompute', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ session_id: sessionId, params: paramValues }),
+      })
+
+      if (res.status === 404) {
+        setAnalyzing(false)
+        await handleAnalyze()
+        return
+      }
+      if (!res.ok) {
+        setAnalyzeError('Re-run failed')
+        return
+      }
+
+      const data = await res.json()
+      // Keep the deep-research narrative from the original analysis
+      setForecastResult(prev => (prev ? { ...prev, ...data } : data))
+    } catch (e) {
+      setAnalyzeError('Error re-running analysis')
+      console.error(e)
+    } finally {
+      setAnalyzing(false)
+    }
   }
 
   return (
@@ -22,6 +22,32 @@ interface PipelineStatus {
 
 type IngestMode = 'upload' | 'url' | 'paste'
 
+interface WebcastJob {
+  job_id: string
+  status: 'queued' | 'running' | 'done' | 'error' | 'cancelled'
+  stage: string | null
+  events: { type: string; stage: string | null; message: string }[]
+  result: Record<string, any> | null
+  error: string | null
+}
+
+const JOB_POLL_MS = 3000
+
+// Audio jobs run in the background; poll until the job finishes and return
+// its result in the same shape the synchronous endpoints use.
+async function waitForJob(jobId: string, onProgress: (msg: string) => void): Promise<any> {
+  for (;;) {
+    await new Promise(r => setTimeout(r, JOB_POLL_MS))
+    const res = await fetch(`/extract/api/webcasts/jobs/${jobId}`)
+    const job: WebcastJob = await res.json()
+    const last = job.events?.[job.events.length - 1]
+    if (last?.message) onProgress(`${last.message}...`)
+    if (job.status === 'done') return job.result
+    if (job.status === 'error') return { status: 'error', error: job.error }
+    if (job.status === 'cancelled') return { status: 'error', error: 'Job was cancelled' }
+  }
+}
+
 export default function WebcastIngestForm({ company, onIngested }: Props) {
   const [mode, setMode] = useState<IngestMode>('upload')
   const [status, setStatus] = useState<PipelineStatus | null>(null)
@@ -149,7 +175,11 @@ export default function WebcastIngestForm({ company, onIngested }: Props) {
         return
       }
 
-      const data = await res.json()
+      let data = await res.json()
+      if (data.status === 'queued' && data.job_id) {
+        setProgress('Queued for transcription...')
+        data = await waitForJob(data.job_id, setProgress)
+      }
       if (data.status === 'ok') {
         const method = data.method ? ` (${data.method})` : ''
         setMessage(
@@ -31,14 +31,21 @@ NOTE: This version uses the `requests` library instead of urllib.
 import os
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import ctgov_client
+import pubmed_client
+from drug_matcher import get_alias_matcher
+
 
 # =============================================================================
 # 1. ClinicalTrials.gov v2 API
 # =============================================================================
+# All CT.gov traffic goes through ctgov_client (pooled session, shared rate
+# limiter, on-disk response cache).
 
-CTGOV_BASE = "https://clinicaltrials.gov/api/v2/studies"
+CTGOV_BASE = ctgov_client.CTGOV_BASE
 
 def search_clinical_trials(
     condition: str = "",
@@ -72,29 +79,7 @@ def search_clinical_trials(
         params["filter.phase"] = phase
 
     try:
-        resp = requests.get(
-            CTGOV_BASE,
-            params=params,
-            headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) SatyaBio/1.0"},
-            timeout=20,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.exceptions.SSLError:
-        # Retry without SSL verification as fallback (macOS cert issue)
-        try:
-            resp = requests.get(
-                CTGOV_BASE,
-                params=params,
-                headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) SatyaBio/1.0"},
-                timeout=20,
-                verify=False,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"  ClinicalTrials.gov API error (SSL fallback): {e}")
-            return []
+        data = ctgov_client.get_json(params, timeout=20)
     except Exception as e:
         print(f"  ClinicalTrials.gov API error: {e}")
         return []
@@ -148,6 +133,78 @@ def search_clinical_trials(
     return results
 
 
+# Disjoint overall-status slices used to split a large query into independent
+# page chains. Active statuses come first: when a sponsor has more trials
+# than the page budget, the budget goes to the programs that matter most.
+CTGOV_STATUS_PARTITIONS = [
+    "RECRUITING",
+    "ACTIVE_NOT_RECRUITING",
+    "NOT_YET_RECRUITING,ENROLLING_BY_INVITATION",
+    "COMPLETED",
+    "SUSPENDED,TERMINATED,WITHDRAWN",
+    "UNKNOWN",
+    "AVAILABLE,NO_LONGER_AVAILABLE,TEMPORARILY_NOT_AVAILABLE,APPROVED_FOR_MARKETING,WITHHELD",
+]
+
+CTGOV_PAGER_WORKERS = int(os.environ.get("CTGOV_PAGER_WORKERS", 6))
+
+
+def _trial_summary(study: dict) -> dict:
+    """Flatten one v2 study record into the search_clinical_trials_paginated shape."""
+    protocol = study.get("protocolSection", {})
+    id_module = protocol.get("identificationModule", {})
+    status_module = protocol.get("statusModule", {})
+    design_module = protocol.get("designModule", {})
+    sponsor_module = protocol.get("sponsorCollaboratorsModule", {})
+    conditions_module = protocol.get("conditionsModule", {})
+    interventions_module = protocol.get("armsInterventionsModule", {})
+    desc_module = protocol.get("descriptionModule", {})
+
+    interventions = []
+    for arm in interventions_module.get("interventions", []):
+        interventions.append({
+            "name": arm.get("name", ""),
+            "type": arm.get("type", ""),
+        })
+
+    return {
+        "nct_id": id_module.get("nctId", ""),
+        "title": id_module.get("briefTitle", ""),
+        "official_title": id_module.get("officialTitle", ""),
+        "status": status_module.get("overallStatus", ""),
+        "phase": ",".join(design_module.get("phases", [])),
+        "conditions": conditions_module.get("conditions", []),
+        "interventions": interventions,
+        "sponsor": sponsor_module.get("leadSponsor", {}).get("name", ""),
+        "start_date": status_module.get("startDateStruct", {}).get("date", ""),
+        "enrollment": design_module.get("enrollmentInfo", {}).get("count", 0),
+        "study_type": design_module.get("studyType", ""),
+        "summary": desc_module.get("briefSummary", ""),
+        "url": f"https://clinicaltrials.gov/study/{id_module.get('nctId', '')}",
+    }
+
+
+def _fetch_page_chain(params: dict, max_pages: int, first_page: Optional[dict] = None) -> list[dict]:
+    """Follow nextPageToken for one query slice. Page tokens are sequential."""
+    studies = []
+    data = first_page
+    pages = 0
+    while pages < max_pages:
+        if data is None:
+            try:
+                data = ctgov_client.get_json(params, timeout=20)
+            except Exception:
+                break
+        pages += 1
+        studies.extend(data.get("studies", []))
+        next_token = data.get("nextPageToken")
+        if not next_token or not data.get("studies"):
+            break
+        params = {**params, "pageToken": next_token}
+        data = None
+    return studies
+
+
 def search_clinical_trials_paginated(
     sponsor: str = "",
     condition: str = "",
@@ -157,110 +214,121 @@ def search_clinical_trials_paginated(
 ) -> list[dict]:
     """
     Paginated search of ClinicalTrials.gov — fetches ALL trials for a sponsor
-    (up to max_pages * page_size results). Uses the nextPageToken from the
-    v2 API for efficient pagination.
+    (up to max_pages * page_size results).
+
+    CT.gov page tokens can only be walked in order. A query that sequential
+    paging can cover within max_pages is walked in order; a bigger one is
+    split into disjoint overall-status slices (CTGOV_STATUS_PARTITIONS)
+    whose page chains are fetched in parallel. max_pages caps the page
+    requests made, first page included. All requests draw from the shared ctgov_client
+    token bucket. Results are de-duplicated by NCT ID.
 
     Returns the same structure as search_clinical_trials but with full coverage.
     """
-    all_results = []
-    next_token = None
-
-    for page in range(max_pages):
-        params = {
-            "format": "json",
-            "pageSize": page_size,
-        }
-        if sponsor:
-            params["query.spons"] = sponsor
-        if condition:
-            params["query.cond"] = condition
-        if intervention:
-            params["query.intr"] = intervention
-        if next_token:
-            params["pageToken"] = next_token
-
-        try:
-            resp = requests.get(
-                CTGOV_BASE,
-                params=params,
-                headers={"User-Agent": "Mozilla/5.0 SatyaBio/1.0"},
-                timeout=20,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except requests.exceptions.SSLError:
-            try:
-                resp = requests.get(
-                    CTGOV_BASE, params=params,
-                    headers={"User-Agent": "Mozilla/5.0 SatyaBio/1.0"},
-                    timeout=20, verify=False,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except Exception:
-                break
-        except Exception:
-            break
+    base = {"format": "json", "pageSize": page_size, "countTotal": "true"}
+    if sponsor:
+        base["query.spons"] = sponsor
+    if condition:
+        base["query.cond"] = condition
+    if intervention:
+        base["query.intr"] = intervention
 
-        studies = data.get("studies", [])
-        if not studies:
-            break
+    try:
+        first = ctgov_client.get_json(base, timeout=20)
+    except Exception:
+        return []
 
-        for study in studies:
-            protocol = study.get("protocolSection", {})
-            id_module = protocol.get("identificationModule", {})
-            status_module = protocol.get("statusModule", {})
-            design_module = protocol.get("designModule", {})
-            sponsor_module = protocol.get("sponsorCollaboratorsModule", {})
-            conditions_module = protocol.get("conditionsModule", {})
-            interventions_module = protocol.get("armsInterventionsModule", {})
-            desc_module = protocol.get("descriptionModule", {})
-
-            interventions = []
-            for arm in interventions_module.get("interventions", []):
-                interventions.append({
-                    "name": arm.get("name", ""),
-                    "type": arm.get("type", ""),
-                })
-
-            conditions = conditions_module.get("conditions", [])
-
-            all_results.append({
-                "nct_id": id_module.get("nctId", ""),
-                "title": id_module.get("briefTitle", ""),
-                "official_title": id_module.get("officialTitle", ""),
-                "status": status_module.get("overallStatus", ""),
-                "phase": ",".join(design_module.get("phases", [])),
-                "conditions": conditions,
-                "interventions": interventions,
-                "sponsor": sponsor_module.get("leadSponsor", {}).get("name", ""),
-                "start_date": status_module.get("startDateStruct", {}).get("date", ""),
-                "enrollment": design_module.get("enrollmentInfo", {}).get("count", 0),
-                "study_type": design_module.get("studyType", ""),
-                "summary": desc_module.get("briefSummary", ""),
-                "url": f"https://clinicaltrials.gov/study/{id_module.get('nctId', '')}",
-            })
+    total = first.get("totalCount")
+    if not first.get("nextPageToken") or max_pages <= 1:
+        studies = first.get("studies", [])
+    elif total is not None and total <= max_pages * page_size:
+        studies = _fetch_page_chain(base, max_pages, first_page=first)
+    else:
+        studies = _fetch_partitioned(base, first, max_pages, page_size)
 
-        next_token = data.get("nextPageToken")
-        if not next_token:
+    all_results, seen = [], set()
+    for study in studies:
+        trial = _trial_summary(study)
+        if trial["nct_id"] in seen:
+            continue
+        seen.add(trial["nct_id"])
+        all_results.append(trial)
+        if len(all_results) >= max_pages * page_size:
             break
 
-        time.sleep(0.3)  # Be respectful to the API
-
     return all_results
 
 
-# Module-level cache for drug alias → canonical mapping
+def _fetch_partitioned(base: dict, first: dict, max_pages: int, page_size: int) -> list[dict]:
+    """
+    Fetch a multi-page query as parallel status slices.
+
+    `first` (the unsliced first page) has already used one page of the
+    max_pages budget; its studies are kept. Round 1 fetches the first page
+    of every slice (which also returns each slice's totalCount); round 2
+    follows the remaining page chains, giving what is left of the budget
+    to slices in CTGOV_STATUS_PARTITIONS order. Walks the unsliced query sequentially
+    instead when the budget can't cover round 1, or when the slices don't
+    cover the whole result set.
+    """
+    total = first.get("totalCount")
+    slices = [{**base, "filter.overallStatus": statuses} for statuses in CTGOV_STATUS_PARTITIONS]
+    budget = max_pages - 1
+    if budget < len(slices):
+        return _fetch_page_chain(base, max_pages, first_page=first)
+
+    def _first_page(params):
+        try:
+            return ctgov_client.get_json(params, timeout=20)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=CTGOV_PAGER_WORKERS) as executor:
+        firsts = list(executor.map(_first_page, slices))
+
+        counts = [(page or {}).get("totalCount", 0) for page in firsts]
+        budget -= len(slices)
+        if any(page is None for page in firsts) or (total is not None and sum(counts) < total):
+            print(f"  [CT.gov] Status slices cover {sum(counts)}/{total} trials — paging sequentially")
+            return _fetch_page_chain(base, budget + 1, first_page=first)
+
+        # Slice first pages are already fetched; spend the rest of the budget
+        # on their follow-up pages in slice priority order
+        plans = []
+        for params, page, count in zip(slices, firsts, counts):
+            if not count:
+                continue
+            extra = min(budget, -(-count // page_size) - 1)
+            budget -= extra
+            plans.append((params, page, 1 + extra))
+
+        chains = [
+            executor.submit(_fetch_page_chain, params, pages, page)
+            for params, page, pages in plans
+        ]
+        studies = list(first.get("studies", []))
+        for future in chains:
+            studies.extend(future.result())
+    return studies
+
+
+# Module-level cache for drug alias → canonical mapping. Re-checked against a
+# cheap table fingerprint every few minutes so new aliases written by
+# entity_ingester / auto_drug_extractor show up without a restart.
 _DRUG_ALIAS_MAP_CACHE: dict | None = None
+_DRUG_ALIAS_FINGERPRINT: tuple | None = None
+_DRUG_ALIAS_CHECKED_AT: float = 0.0
+DRUG_ALIAS_RECHECK_SECONDS = int(os.environ.get("DRUG_ALIAS_RECHECK_SECONDS", 300))
 
 
 def _get_drug_alias_map() -> dict[str, str]:
     """Load {alias_lower: canonical_name} from drugs + drug_aliases. Cached."""
-    global _DRUG_ALIAS_MAP_CACHE
-    if _DRUG_ALIAS_MAP_CACHE is not None:
+    global _DRUG_ALIAS_MAP_CACHE, _DRUG_ALIAS_FINGERPRINT, _DRUG_ALIAS_CHECKED_AT
+    now = time.time()
+    if _DRUG_ALIAS_MAP_CACHE is not None and now - _DRUG_ALIAS_CHECKED_AT < DRUG_ALIAS_RECHECK_SECONDS:
         return _DRUG_ALIAS_MAP_CACHE
+    _DRUG_ALIAS_CHECKED_AT = now
     try:
-        import os
         import psycopg2
         try:
             from dotenv import load_dotenv
@@ -273,6 +341,20 @@ def _get_drug_alias_map() -> dict[str, str]:
             return _DRUG_ALIAS_MAP_CACHE
         conn = psycopg2.connect(dsn)
         cur = conn.cursor()
+        try:
+            cur.execute("""
+                SELECT (SELECT COUNT(*) FROM drugs), (SELECT MAX(updated_at) FROM drugs),
+                       (SELECT COUNT(*) FROM drug_aliases), (SELECT MAX(alias_id) FROM drug_aliases)
+            """)
+            fingerprint = tuple(cur.fetchone())
+        except Exception:
+            conn.rollback()
+            fingerprint = None
+        if (_DRUG_ALIAS_MAP_CACHE is not None and fingerprint is not None
+                and fingerprint == _DRUG_ALIAS_FINGERPRINT):
+            cur.close()
+            conn.close()
+            return _DRUG_ALIAS_MAP_CACHE
         cur.execute("""
             SELECT d.canonical_name, a.alias
             FROM drugs d LEFT JOIN drug_aliases a ON a.drug_id = d.drug_id
@@ -285,34 +367,23 @@ def _get_drug_alias_map() -> dict[str, str]:
                     m[alias.lower().strip()] = canonical
         cur.close()
         conn.close()
+        # A new dict object makes drug_matcher rebuild its automaton
         _DRUG_ALIAS_MAP_CACHE = m
+        _DRUG_ALIAS_FINGERPRINT = fingerprint
     except Exception:
-        _DRUG_ALIAS_MAP_CACHE = {}
+        if _DRUG_ALIAS_MAP_CACHE is None:
+            _DRUG_ALIAS_MAP_CACHE = {}
     return _DRUG_ALIAS_MAP_CACHE
 
 
 def _normalize_intervention_name(raw: str, alias_map: dict[str, str]) -> str:
     """Map an intervention name (e.g. 'Extended release injectable naltrexone (Vivitrol)')
     to its canonical drug name (e.g. 'VIVITROL') using the entity DB.
-    Falls back to the original name if no match."""
-    import re
-    if not raw:
-        return raw
-    s = raw.lower().strip()
-    if s in alias_map:
-        return alias_map[s]
-    # Strip parentheticals: "foo (Bar)" → "foo"
-    stripped = re.sub(r"\s*\([^)]*\)\s*", " ", s).strip()
-    if stripped and stripped in alias_map:
-        return alias_map[stripped]
-    # Substring: find the longest alias (≥4 chars) that appears in the raw name
-    candidates = sorted(
-        (k for k in alias_map if len(k) >= 4 and k in s),
-        key=len, reverse=True,
-    )
-    if candidates:
-        return alias_map[candidates[0]]
-    return raw
+    Falls back to the original name if no match.
+
+    Exact → parenthetical-stripped → longest alias (≥4 chars) contained in the
+    name, via a shared Aho-Corasick automaton over the whole alias map."""
+    return get_alias_matcher(alias_map).normalize(raw)
 
 
 def extract_drug_assets(trials: list[dict]) -> dict:
@@ -359,6 +430,7 @@ def extract_drug_assets(trials: list[dict]) -> dict:
     }
 
     assets: dict = {}
+    asset_keys_lower: dict[str, str] = {}
 
     for trial in trials:
         for intv in trial.get("interventions", []):
@@ -388,17 +460,14 @@ def extract_drug_assets(trials: list[dict]) -> dict:
             display_name = canonical if canonical != name else name
 
             # Fallback: case-insensitive grouping with existing keys
-            matched_key = None
-            for existing_key in assets:
-                if existing_key.lower() == display_name.lower():
-                    matched_key = existing_key
-                    break
+            matched_key = asset_keys_lower.get(display_name.lower())
             if matched_key:
                 display_name = matched_key
             elif display_name == display_name.lower():
                 display_name = display_name.title()
 
             if display_name not in assets:
+                asset_keys_lower.setdefault(display_name.lower(), display_name)
                 assets[display_name] = {
                     "type": itype,
                     "phases": {},
@@ -521,9 +590,6 @@ def search_fda_drugs(
 # 3. PubMed (NCBI E-utilities)
 # =============================================================================
 
-PUBMED_SEARCH = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-PUBMED_SUMMARY = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-
 def search_pubmed(
     query: str,
     max_results: int = 10,
@@ -533,106 +599,23 @@ def search_pubmed(
     Search PubMed for publications.
 
     Returns a list of dicts with: pmid, title, authors, journal, pub_date,
-    doi, url.
+    doi, url. Goes through pubmed_client, so parallel searches share NCBI's
+    rate budget and already-seen PMIDs come from the local cache.
     """
-    # NCBI rate limit: 3 requests/sec without API key, 10/sec with key
-    # Add a small delay to avoid 429 errors when multiple searches run in parallel
-    api_key = os.environ.get("NCBI_API_KEY", "")
-    base_params = {}
-    if api_key:
-        base_params["api_key"] = api_key
-
-    # Step 1: Search for PMIDs
-    search_params = {
-        **base_params,
-        "db": "pubmed",
-        "term": query,
-        "retmax": max_results,
-        "sort": sort,
-        "retmode": "json",
-    }
-
     try:
-        resp = requests.get(PUBMED_SEARCH, params=search_params, headers={"User-Agent": "SatyaBio/1.0"}, timeout=15)
-        if resp.status_code == 429:
-            # Rate limited — wait and retry once
-            time.sleep(1.5)
-            resp = requests.get(PUBMED_SEARCH, params=search_params, headers={"User-Agent": "SatyaBio/1.0"}, timeout=15)
-        resp.raise_for_status()
-        search_data = resp.json()
-    except requests.exceptions.SSLError:
-        try:
-            resp = requests.get(PUBMED_SEARCH, params=search_params, headers={"User-Agent": "SatyaBio/1.0"}, timeout=15, verify=False)
-            resp.raise_for_status()
-            search_data = resp.json()
-        except Exception as e:
-            print(f"  PubMed search error (SSL fallback): {e}")
-            return []
+        pmids = pubmed_client.search(query, max_results=max_results, sort=sort).pmids
+        articles = pubmed_client.fetch_articles(pmids) if pmids else {}
     except Exception as e:
         print(f"  PubMed search error: {e}")
         return []
 
-    pmids = search_data.get("esearchresult", {}).get("idlist", [])
-    if not pmids:
-        return []
-
-    # Step 2: Fetch summaries for those PMIDs
-    time.sleep(0.5)  # NCBI rate limit: 3 requests/second without API key
-    summary_params = {
-        **base_params,
-        "db": "pubmed",
-        "id": ",".join(pmids),
-        "retmode": "json",
-    }
-
-    try:
-        resp = requests.get(PUBMED_SUMMARY, params=summary_params, headers={"User-Agent": "SatyaBio/1.0"}, timeout=15)
-        if resp.status_code == 429:
-            time.sleep(1.5)
-            resp = requests.get(PUBMED_SUMMARY, params=summary_params, headers={"User-Agent": "SatyaBio/1.0"}, timeout=15)
-        resp.raise_for_status()
-        summary_data = resp.json()
-    except requests.exceptions.SSLError:
-        try:
-            resp = requests.get(PUBMED_SUMMARY, params=summary_params, headers={"User-Agent": "SatyaBio/1.0"}, timeout=15, verify=False)
-            resp.raise_for_status()
-            summary_data = resp.json()
-        except Exception as e:
-            print(f"  PubMed summary error (SSL fallback): {e}")
-            return []
-    except Exception as e:
-        print(f"  PubMed summary error: {e}")
-        return []
-
     results = []
-    summaries = summary_data.get("result", {})
-
-    for pmid in pmids:
-        article = summaries.get(pmid, {})
-        if not article or pmid == "uids":
-            continue
-
-        # Extract authors
-        authors = []
-        for author in article.get("authors", []):
-            authors.append(author.get("name", ""))
-
-        # Extract DOI from articleids
-        doi = ""
-        for aid in article.get("articleids", []):
-            if aid.get("idtype") == "doi":
-                doi = aid.get("value", "")
-                break
-
+    for article in articles.values():
+        summary = pubmed_client.article_summary(article)
         results.append({
             "source": "PubMed",
-            "pmid": pmid,
-            "title": article.get("title", ""),
-            "authors": authors[:5],  # First 5 authors
-            "journal": article.get("fulljournalname", article.get("source", "")),
-            "pub_date": article.get("pubdate", ""),
-            "doi": doi,
-            "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+            **summary,
+            "authors": summary["authors"][:5],  # First 5 authors
         })
 
     return results
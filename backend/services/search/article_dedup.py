@@ -0,0 +1,233 @@
+"""
+SatyaBio — Near-Duplicate Article Clustering
+
+The same licensing deal or trial readout is carried by many of the regional
+news miner's sources: syndicated copies across outlets, wire rewrites,
+regional editions. This module clusters those copies so only one
+representative per story goes through Claude entity extraction and RAG
+embedding; the other copies are kept as citations.
+
+What it does:
+  1. signature(): MinHash over 3-token shingles of title + summary + body
+     (CJK text is tokenized per character), NUM_PERM 32-bit hashes.
+  2. NearDuplicateIndex: LSH banding (BANDS x ROWS) to find candidate pairs,
+     confirmed by estimated Jaccard >= NEWS_DEDUP_THRESHOLD, and only
+     between articles published within NEWS_DEDUP_WINDOW_HOURS of each other.
+  3. cluster_articles(): greedy clustering of a batch against prior
+     signatures (stories already stored by earlier runs) and each other.
+     Representatives prefer English and the longest text.
+
+Similarity is lexical: copies and light rewrites cluster, but a story and
+its translation into another language do not.
+
+Usage:
+    from article_dedup import cluster_articles, signature
+
+    clusters = cluster_articles(articles, prior=[(cluster_key, minhash, published), ...])
+    for c in clusters:
+        if c.representative is not None:
+            extract(c.representative)
+
+Environment:
+    NEWS_DEDUP_THRESHOLD      estimated Jaccard to count as a duplicate (default 0.5)
+    NEWS_DEDUP_WINDOW_HOURS   max publication gap within a story (default 72)
+"""
+
+import os
+import re
+import zlib
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+
+THRESHOLD = float(os.environ.get("NEWS_DEDUP_THRESHOLD", 0.5))
+WINDOW_HOURS = float(os.environ.get("NEWS_DEDUP_WINDOW_HOURS", 72))
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS      # 16 x 4 puts the LSH S-curve midpoint near 0.5
+SHINGLE_SIZE = 3
+MAX_TEXT_CHARS = 6000         # leads and bodies beyond this add little signal
+
+_PRIME = 4294967311           # smallest prime above 2**32; a*x + b stays inside uint64
+_rng = np.random.RandomState(20240611)
+_A = _rng.randint(1, 2**31 - 1, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2**31 - 1, size=NUM_PERM).astype(np.uint64)
+
+_TOKEN = re.compile(r"[぀-ヿ㐀-鿿가-힯]|[^\W_]+", re.UNICODE)
+
+
+# =============================================================================
+# SIGNATURES
+# =============================================================================
+
+def article_text(article: dict) -> str:
+    """Title, summary and body of an article dict, as compared for duplicates."""
+    parts = [article.get("title", ""), article.get("summary", ""), article.get("full_text", "")]
+    return " ".join(p for p in parts if p)[:MAX_TEXT_CHARS]
+
+
+def shingles(text: str) -> set[int]:
+    """32-bit hashes of SHINGLE_SIZE-token windows (CJK / kana / hangul count one char per token)."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        tokens = tokens and [" ".join(tokens)]
+        return {zlib.crc32(t.encode()) for t in tokens}
+    return {
+        zlib.crc32(" ".join(tokens[i:i + SHINGLE_SIZE]).encode())
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(text: str) -> list[int]:
+    """MinHash signature (NUM_PERM ints below 2**32 + 15) — empty for empty text."""
+    hashed = shingles(text)
+    if not hashed:
+        return []
+    x = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+    values = (np.outer(_A, x) + _B[:, None]) % np.uint64(_PRIME)
+    return values.min(axis=1).astype(np.int64).tolist()
+
+
+def similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or not sig_b or len(sig_a) != len(sig_b):
+        return 0.0
+    return float(np.mean(np.asarray(sig_a) == np.asarray(sig_b)))
+
+
+def cluster_key_for(article: dict) -> str:
+    """Stable key for a cluster whose representative is this article."""
+    raw = article.get("url") or article_text(article)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+def _as_utc(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures. Each entry carries the cluster it
+    belongs to and a publication time; match() returns the most similar
+    entry's cluster within the time window, or None.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, window_hours: float = WINDOW_HOURS):
+        self.threshold = threshold
+        self.window = timedelta(hours=window_hours)
+        self._buckets: dict[tuple, list[int]] = {}
+        self._entries: list[tuple[list[int], str, Optional[datetime]]] = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _bands(sig):
+        for band in range(BANDS):
+            yield (band, *sig[band * ROWS:(band + 1) * ROWS])
+
+    def add(self, sig, cluster: str, published=None):
+        if not sig:
+            return
+        idx = len(self._entries)
+        self._entries.append((sig, cluster, _as_utc(published)))
+        for band in self._bands(sig):
+            self._buckets.setdefault(band, []).append(idx)
+
+    def match(self, sig, published=None) -> Optional[str]:
+        if not sig:
+            return None
+        published = _as_utc(published)
+        candidates = {idx for band in self._bands(sig) for idx in self._buckets.get(band, ())}
+        best, best_score = None, self.threshold
+        for idx in sorted(candidates):
+            other_sig, cluster, other_published = self._entries[idx]
+            if published and other_published and abs(published - other_published) > self.window:
+                continue
+            score = similarity(sig, other_sig)
+            if score >= best_score:
+                best, best_score = cluster, score
+        return best
+
+
+# =============================================================================
+# CLUSTERING
+# =============================================================================
+
+@dataclass
+class StoryCluster:
+    """
+    One story. representative is None when the story was already processed
+    in an earlier run (a prior cluster) — its new copies are citations only.
+    """
+    key: str
+    members: list = field(default_factory=list)
+    representative: Optional[dict] = None
+    prior: bool = False
+
+
+def _representative_rank(article: dict):
+    # English first (better extraction and search), then the most text
+    return (article.get("language", "en") == "en", len(article_text(article)))
+
+
+def cluster_articles(articles: list[dict], prior=(), threshold: float = THRESHOLD,
+                     window_hours: float = WINDOW_HOURS) -> list[StoryCluster]:
+    """
+    Cluster a batch of article dicts into stories.
+
+    Each article gets "minhash" and "cluster_key" set. Returned clusters are
+    in order of first appearance; new clusters carry a representative with
+    "citations" listing the other copies' source, title and URL.
+
+    Args:
+        articles: Article dicts (title / summary / full_text / published / url)
+        prior: (cluster_key, minhash, published) of recently stored articles
+        threshold, window_hours: See NearDuplicateIndex
+    """
+    index = NearDuplicateIndex(threshold, window_hours)
+    clusters: dict[str, StoryCluster] = {}
+    for key, sig, published in prior:
+        index.add(list(sig or []), key, published)
+        clusters.setdefault(key, StoryCluster(key, prior=True))
+
+    ordered = []
+    for article in articles:
+        sig = signature(article_text(article))
+        key = index.match(sig, article.get("published")) or cluster_key_for(article)
+        article["minhash"] = sig
+        article["cluster_key"] = key
+        index.add(sig, key, article.get("published"))
+        cluster = clusters.get(key)
+        if cluster is None:
+            cluster = clusters[key] = StoryCluster(key)
+        if not cluster.members:
+            ordered.append(cluster)
+        cluster.members.append(article)
+
+    for cluster in ordered:
+        if cluster.prior:
+            continue
+        rep = max(cluster.members, key=_representative_rank)
+        rep["citations"] = [
+            {"source_name": a.get("source_name", ""), "title": a.get("title", ""),
+             "url": a.get("url", ""), "region": a.get("region", "")}
+            for a in cluster.members if a is not rep
+        ]
+        cluster.representative = rep
+    return ordered
@@ -44,6 +44,8 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 import anthropic
 
+from mention_tagger import get_mention_tagger
+
 DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
 
 
@@ -214,6 +216,31 @@ DOCUMENT EXCERPTS:
         return []
 
 
+_warned_no_db_targets = False
+
+
+def _target_id(cur, tagger, target_name: str):
+    """
+    targets.target_id for a free-text target name. Uses the tagger's live
+    "targets" source; if that failed to load, tags against the built-in
+    TARGET_HIERARCHY and looks the canonical name up in the targets table.
+    """
+    if "targets" in tagger.sources():
+        mentions = tagger.tag(target_name, types=("target",), sources=("targets",))
+        return mentions[0].entity_id if mentions else None
+
+    global _warned_no_db_targets
+    if not _warned_no_db_targets:
+        print("  ⚠ Mention tagger has no DB targets source — linking targets via the built-in hierarchy")
+        _warned_no_db_targets = True
+    mentions = tagger.tag(target_name, types=("target",), sources=("target_hierarchy",))
+    if not mentions:
+        return None
+    cur.execute("SELECT target_id FROM targets WHERE name = %s", (mentions[0].canonical,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
 def upsert_extracted_drugs(conn, ticker: str, company_name: str, drugs: list[dict]):
     """
     Insert extracted drugs into the drugs, drug_aliases, and drug_targets tables.
@@ -222,6 +249,7 @@ def upsert_extracted_drugs(conn, ticker: str, company_name: str, drugs: list[dic
     cur = conn.cursor()
     count_new = 0
     count_updated = 0
+    tagger = get_mention_tagger()
 
     for drug in drugs:
         canonical = drug.get("canonical_name", "").strip()
@@ -294,24 +322,16 @@ def upsert_extracted_drugs(conn, ticker: str, company_name: str, drugs: list[dic
                     ON CONFLICT (alias) DO NOTHING
                 """, (drug_id, alias, alias_type, f"Auto-extracted from {ticker} documents"))
 
-            # Link to targets
+            # Link to targets: tag each name against the targets table (names
+            # + aliases, longest match — "KRAS G12C inhibitor" → KRAS G12C)
             for target_name in drug.get("target_names", []):
-                target_name = target_name.strip()
-                if not target_name:
-                    continue
-                # Try exact match first, then partial
-                cur.execute("SELECT target_id FROM targets WHERE LOWER(name) = LOWER(%s)", (target_name,))
-                trow = cur.fetchone()
-                if not trow:
-                    cur.execute("SELECT target_id FROM targets WHERE LOWER(name) LIKE LOWER(%s) LIMIT 1",
-                                (f"%{target_name}%",))
-                    trow = cur.fetchone()
-                if trow:
+                target_id = _target_id(cur, tagger, target_name.strip())
+                if target_id is not None:
                     cur.execute("""
                         INSERT INTO drug_targets (drug_id, target_id, role, selectivity)
                         VALUES (%s, %s, 'primary', 'selective')
                         ON CONFLICT (drug_id, target_id) DO NOTHING
-                    """, (drug_id, trow[0]))
+                    """, (drug_id, target_id))
 
             # Auto-generate PubMed search terms
             _auto_pubmed_terms(cur, drug_id, canonical, drug.get("aliases", []),
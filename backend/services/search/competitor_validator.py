@@ -50,6 +50,8 @@ load_dotenv()
 
 import requests
 
+import ctgov_client
+
 # ─── Optional imports ─────────────────────────────────────────────────────────
 
 try:
@@ -236,51 +238,37 @@ def _verify_via_global_regulators(drug_name: str, indication: str) -> dict:
         pmda_url = "https://www.pmda.go.jp/english/search/pageSearch.html"
         # PMDA doesn't have a clean API, but we can check via their search page
         # Use a simpler approach: search ClinicalTrials.gov for Japan-only trials
-        resp = requests.get(
-            "https://clinicaltrials.gov/api/v2/studies",
-            params={
-                "format": "json",
-                "query.intr": drug_name,
-                "filter.advanced": 'AREA[LocationCountry] "Japan"',
-                "pageSize": 5,
-            },
-            headers={"User-Agent": "SatyaBio/1.0"},
-            timeout=15,
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            jp_trials = data.get("totalCount", 0)
-            if jp_trials > 0:
-                results["matches"].append({
-                    "region": "Japan",
-                    "source": "ClinicalTrials.gov (Japan-located)",
-                    "trials": jp_trials,
-                })
+        data = ctgov_client.get_json({
+            "format": "json",
+            "query.intr": drug_name,
+            "filter.advanced": 'AREA[LocationCountry] "Japan"',
+            "pageSize": 5,
+        }, timeout=15)
+        jp_trials = data.get("totalCount", 0)
+        if jp_trials > 0:
+            results["matches"].append({
+                "region": "Japan",
+                "source": "ClinicalTrials.gov (Japan-located)",
+                "trials": jp_trials,
+            })
     except Exception:
         pass
 
     # ── 2. China (NMPA/CDE) — check via ClinicalTrials.gov China trials ──
     try:
-        resp = requests.get(
-            "https://clinicaltrials.gov/api/v2/studies",
-            params={
-                "format": "json",
-                "query.intr": drug_name,
-                "filter.advanced": 'AREA[LocationCountry] "China"',
-                "pageSize": 5,
-            },
-            headers={"User-Agent": "SatyaBio/1.0"},
-            timeout=15,
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            cn_trials = data.get("totalCount", 0)
-            if cn_trials > 0:
-                results["matches"].append({
-                    "region": "China",
-                    "source": "ClinicalTrials.gov (China-located)",
-                    "trials": cn_trials,
-                })
+        data = ctgov_client.get_json({
+            "format": "json",
+            "query.intr": drug_name,
+            "filter.advanced": 'AREA[LocationCountry] "China"',
+            "pageSize": 5,
+        }, timeout=15)
+        cn_trials = data.get("totalCount", 0)
+        if cn_trials > 0:
+            results["matches"].append({
+                "region": "China",
+                "source": "ClinicalTrials.gov (China-located)",
+                "trials": cn_trials,
+            })
     except Exception:
         pass
 
@@ -307,26 +295,19 @@ def _verify_via_global_regulators(drug_name: str, indication: str) -> dict:
 
     # ── 4. Korea (MFDS) — via ClinicalTrials.gov Korea trials ──
     try:
-        resp = requests.get(
-            "https://clinicaltrials.gov/api/v2/studies",
-            params={
-                "format": "json",
-                "query.intr": drug_name,
-                "filter.advanced": 'AREA[LocationCountry] "Korea, Republic of"',
-                "pageSize": 5,
-            },
-            headers={"User-Agent": "SatyaBio/1.0"},
-            timeout=15,
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            kr_trials = data.get("totalCount", 0)
-            if kr_trials > 0:
-                results["matches"].append({
-                    "region": "South Korea",
-                    "source": "ClinicalTrials.gov (Korea-located)",
-                    "trials": kr_trials,
-                })
+        data = ctgov_client.get_json({
+            "format": "json",
+            "query.intr": drug_name,
+            "filter.advanced": 'AREA[LocationCountry] "Korea, Republic of"',
+            "pageSize": 5,
+        }, timeout=15)
+        kr_trials = data.get("totalCount", 0)
+        if kr_trials > 0:
+            results["matches"].append({
+                "region": "South Korea",
+                "source": "ClinicalTrials.gov (Korea-located)",
+                "trials": kr_trials,
+            })
     except Exception:
         pass
 
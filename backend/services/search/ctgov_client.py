@@ -0,0 +1,329 @@
+"""
+SatyaBio — Shared ClinicalTrials.gov v2 Client
+
+One pooled, rate-limited, disk-cached client for every module that talks to
+ClinicalTrials.gov (api_connectors, trial_forecaster, global_asset_discovery,
+dynamic_discovery, competitor_validator, enrichment_agent, disease_space_map,
+app/routers/extract). Before this, each module opened its own requests/httpx
+session, none of them cached, and parallel landscape builds tripped the
+upstream rate limit.
+
+What it does:
+  1. Keep-alive connection pooling (one requests.Session, urllib3 retries on
+     429/5xx with Retry-After).
+  2. A process-wide token bucket shared by all callers.
+  3. An on-disk response cache keyed by the *normalized* request
+     (path + sorted params, case-folded query text, sorted filter lists), so
+     the same search issued by two modules is one upstream call.
+  4. TTL freshness with conditional revalidation: stale entries are re-checked
+     with If-None-Match / If-Modified-Since and a 304 just refreshes the entry.
+  5. A local mirror (ctgov_mirror.py) is consulted before the cache/network
+     when one has been seeded; live calls are the fallback.
+
+Usage:
+    from ctgov_client import get_json, get_study
+
+    data = get_json({"query.cond": "ulcerative colitis", "pageSize": 50})
+    study = get_study("NCT04650321")
+
+    # From async code (trial_forecaster)
+    data = await aget_json({"query.term": "obicetrapib"})
+
+Environment:
+    CTGOV_CACHE_DIR            default: <repo>/data/cache/ctgov
+    CTGOV_CACHE_TTL_SEARCH     seconds, default 6h
+    CTGOV_CACHE_TTL_STUDY      seconds, default 24h
+    CTGOV_RATE_PER_SEC         default 3
+    CTGOV_RATE_BURST           default 10
+    CTGOV_MIRROR, CTGOV_MIRROR_PATH   see ctgov_mirror.py
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import TokenBucket
+
+try:
+    import ctgov_mirror
+except ImportError:
+    ctgov_mirror = None
+
+
+CTGOV_BASE = "https://clinicaltrials.gov/api/v2/studies"
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) SatyaBio/1.0"
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+CACHE_DIR = Path(os.environ.get("CTGOV_CACHE_DIR", _REPO_ROOT / "data" / "cache" / "ctgov"))
+
+TTL_SEARCH = int(os.environ.get("CTGOV_CACHE_TTL_SEARCH", 6 * 3600))
+TTL_STUDY = int(os.environ.get("CTGOV_CACHE_TTL_STUDY", 24 * 3600))
+
+RATE_PER_SEC = float(os.environ.get("CTGOV_RATE_PER_SEC", 3))
+RATE_BURST = float(os.environ.get("CTGOV_RATE_BURST", 10))
+
+# Params whose values are comma-separated sets — order doesn't change the result
+_SET_PARAMS = {"filter.overallStatus", "filter.phase", "fields", "filter.ids"}
+# Params that don't change the response body
+_IGNORED_PARAMS = {"format"}
+
+
+# =============================================================================
+# Session + limiter (process-wide singletons)
+# =============================================================================
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_bucket = TokenBucket(rate=RATE_PER_SEC, capacity=RATE_BURST)
+
+_stats = {"mirror": 0, "hits": 0, "misses": 0, "revalidated": 0, "stale_served": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _bump(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session with connection pooling and 429/5xx retries."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 502, 503, 504),
+                    allowed_methods=("GET",),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+                s.mount("https://", adapter)
+                s.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+                _session = s
+    return _session
+
+
+def get_rate_limiter() -> TokenBucket:
+    """The shared CT.gov token bucket (for callers that fan out their own requests)."""
+    return _bucket
+
+
+# =============================================================================
+# Cache keys
+# =============================================================================
+
+def normalize_params(params: Optional[dict]) -> dict:
+    """Canonical form of a CT.gov query so equivalent requests share a cache entry."""
+    out = {}
+    for k, v in (params or {}).items():
+        if v is None or v == "" or k in _IGNORED_PARAMS:
+            continue
+        v = " ".join(str(v).split())
+        if k.startswith("query."):
+            v = v.lower()
+        elif k in _SET_PARAMS:
+            v = ",".join(sorted(p.strip() for p in v.split(",") if p.strip()))
+        out[k] = v
+    return dict(sorted(out.items()))
+
+
+def cache_key(path: str, params: Optional[dict]) -> str:
+    raw = json.dumps({"path": path, "params": normalize_params(params)}, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _read_cache(key: str) -> Optional[dict]:
+    path = _cache_path(key)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    except Exception as e:
+        print(f"  [CT.gov cache] read error: {e}")
+        return None
+
+
+def _write_cache(key: str, entry: dict):
+    path = _cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"  [CT.gov cache] write error: {e}")
+
+
+# =============================================================================
+# Fetch
+# =============================================================================
+
+def _http_get(url: str, params: dict, headers: dict, timeout: float) -> requests.Response:
+    _bucket.acquire()
+    session = get_session()
+    try:
+        return session.get(url, params=params, headers=headers, timeout=timeout)
+    except requests.exceptions.SSLError:
+        # Retry without SSL verification as fallback (macOS cert issue)
+        return session.get(url, params=params, headers=headers, timeout=timeout, verify=False)
+
+
+def get_json(
+    params: Optional[dict] = None,
+    nct_id: str = "",
+    ttl: Optional[int] = None,
+    timeout: float = 30,
+    live: bool = False,
+) -> dict:
+    """
+    GET a CT.gov v2 endpoint and return the parsed JSON body.
+
+    Args:
+        params: Query parameters (query.cond, filter.phase, pageSize, pageToken, ...)
+        nct_id: If set, fetch /studies/{nct_id} instead of the search endpoint
+        ttl: Freshness window in seconds (default: TTL_STUDY / TTL_SEARCH).
+             ttl=0 forces a revalidation round-trip.
+        timeout: Per-request timeout in seconds
+        live: Skip the local mirror and the disk cache (mirror sync uses this)
+
+    Raises:
+        requests.HTTPError on a non-2xx response (after retries) with no
+        usable cached copy; requests.RequestException on network failure.
+    """
+    path = f"/{nct_id.strip().upper()}" if nct_id else ""
+    url = CTGOV_BASE + path
+    params = dict(params or {})
+    if not nct_id:
+        params.setdefault("format", "json")
+    if ttl is None:
+        ttl = TTL_STUDY if nct_id else TTL_SEARCH
+
+    if live:
+        resp = _http_get(url, params, {}, timeout)
+        if resp.status_code >= 400:
+            _bump("errors")
+            resp.raise_for_status()
+        return resp.json()
+
+    if ctgov_mirror is not None:
+        body = ctgov_mirror.answer(params, nct_id=nct_id)
+        if body is not None:
+            _bump("mirror")
+            return body
+
+    key = cache_key(path, params)
+    entry = _read_cache(key)
+    now = time.time()
+
+    if entry and now - entry.get("fetched_at", 0) < ttl:
+        _bump("hits")
+        return entry["body"]
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        resp = _http_get(url, params, headers, timeout)
+    except requests.RequestException:
+        if entry:
+            # Network down — a stale answer beats no answer
+            _bump("stale_served")
+            return entry["body"]
+        _bump("errors")
+        raise
+
+    if resp.status_code == 304 and entry:
+        _bump("revalidated")
+        entry["fetched_at"] = now
+        _write_cache(key, entry)
+        return entry["body"]
+
+    if resp.status_code >= 400:
+        if entry and resp.status_code in (429, 500, 502, 503, 504):
+            _bump("stale_served")
+            return entry["body"]
+        _bump("errors")
+        resp.raise_for_status()
+
+    body = resp.json()
+    _bump("misses")
+    _write_cache(key, {
+        "url": url,
+        "params": normalize_params(params),
+        "fetched_at": now,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "body": body,
+    })
+    return body
+
+
+def get_study(nct_id: str, ttl: Optional[int] = None, timeout: float = 30) -> dict:
+    """Fetch one study record (/studies/{nct_id})."""
+    return get_json(nct_id=nct_id, ttl=ttl, timeout=timeout)
+
+
+async def aget_json(
+    params: Optional[dict] = None,
+    nct_id: str = "",
+    ttl: Optional[int] = None,
+    timeout: float = 30,
+) -> dict:
+    """Async wrapper — runs the blocking pooled fetch in a worker thread."""
+    return await asyncio.to_thread(get_json, params, nct_id, ttl, timeout)
+
+
+# =============================================================================
+# Cache maintenance
+# =============================================================================
+
+def get_cache_stats() -> dict:
+    """Mirror/hit/miss counters since process start plus on-disk entry count."""
+    with _stats_lock:
+        stats = dict(_stats)
+    try:
+        stats["entries"] = sum(1 for _ in CACHE_DIR.glob("*/*.json"))
+    except Exception:
+        stats["entries"] = 0
+    return stats
+
+
+def purge_cache(older_than_seconds: Optional[int] = None) -> int:
+    """Delete cache entries (all, or those last fetched more than N seconds ago)."""
+    removed = 0
+    cutoff = time.time() - older_than_seconds if older_than_seconds is not None else None
+    for path in CACHE_DIR.glob("*/*.json"):
+        try:
+            if cutoff is not None:
+                with open(path) as f:
+                    if json.load(f).get("fetched_at", 0) >= cutoff:
+                        continue
+            path.unlink()
+            removed += 1
+        except Exception:
+            continue
+    return removed
@@ -0,0 +1,744 @@
+"""
+SatyaBio — Local ClinicalTrials.gov Mirror
+
+A SQLite (FTS5) copy of ClinicalTrials.gov that answers the searches our
+landscape builders run (build_landscape, discover_landscape, precompute_assets)
+without a network round-trip. Seeded once from the CT.gov bulk JSON export,
+then kept current with an incremental sync on LastUpdatePostDate.
+
+ctgov_client.get_json() consults the mirror first, so every module that
+already goes through the shared client picks it up without code changes.
+Live API calls become the fallback: when the mirror is missing, stale, or
+can't express a query (unsupported filter.advanced syntax, exotic sort), the
+request goes upstream exactly as before.
+
+What the mirror understands (CT.gov v2 parameter names):
+    query.cond, query.intr, query.spons, query.term, query.locn, query.titles
+    filter.overallStatus, filter.phase, filter.ids
+    filter.advanced   AREA[LocationCountry] "X" (OR-joined),
+                      AREA[LastUpdatePostDate]RANGE[a,b], AREA[Phase]X,
+                      and AND-joined groups of these
+    sort              LastUpdatePostDate:asc|desc, @relevance
+    pageSize, pageToken, countTotal, fields, format
+
+Usage:
+    # One-time seed from the bulk export (https://clinicaltrials.gov/data-api/about-api/study-data-structure)
+    python ctgov_mirror.py seed ~/Downloads/ctg-studies.json.zip
+
+    # Nightly (cron) — pulls studies updated since the last sync
+    python ctgov_mirror.py sync
+
+    # From code
+    from ctgov_mirror import search_studies
+    studies = search_studies(condition="ulcerative colitis", phase="PHASE3", country="Japan")
+
+Environment:
+    CTGOV_MIRROR                auto (default) | only | off
+                                  auto — answer from the mirror when it is fresh,
+                                         fall back to the live API otherwise
+                                  only — answer every query the mirror can express
+                                         locally, even when stale or empty
+                                  off  — ignore the mirror
+    CTGOV_MIRROR_PATH           default: <repo>/data/ctgov_mirror.db
+    CTGOV_MIRROR_MAX_AGE_HOURS  auto mode skips a mirror older than this (default 48)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+import sqlite3
+import argparse
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+MIRROR_PATH = Path(os.environ.get("CTGOV_MIRROR_PATH", _REPO_ROOT / "data" / "ctgov_mirror.db"))
+MIRROR_MODE = os.environ.get("CTGOV_MIRROR", "auto").strip().lower()
+MAX_AGE_HOURS = float(os.environ.get("CTGOV_MIRROR_MAX_AGE_HOURS", 48))
+
+SYNC_PAGE_SIZE = 1000          # CT.gov v2 maximum
+_BATCH = 500                   # rows per write transaction
+_STATUS_RECHECK_SECONDS = 60   # how often auto mode re-reads mirror metadata
+
+_TOKEN_PREFIX = "mirror:"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS studies (
+    nct_id          TEXT PRIMARY KEY,
+    overall_status  TEXT,
+    phases          TEXT,           -- ",PHASE2,PHASE3," so one LIKE matches any phase
+    study_type      TEXT,
+    lead_sponsor    TEXT,
+    start_date      TEXT,
+    last_update     TEXT,           -- YYYY-MM-DD (LastUpdatePostDate)
+    raw             TEXT NOT NULL   -- full v2 study JSON, returned verbatim
+);
+CREATE INDEX IF NOT EXISTS idx_studies_status ON studies(overall_status);
+CREATE INDEX IF NOT EXISTS idx_studies_last_update ON studies(last_update);
+
+CREATE TABLE IF NOT EXISTS study_countries (
+    nct_id   TEXT NOT NULL,
+    country  TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (nct_id, country)
+);
+CREATE INDEX IF NOT EXISTS idx_study_countries_country ON study_countries(country);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS studies_fts USING fts5(
+    title, conditions, interventions, sponsors, locations, body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE IF NOT EXISTS mirror_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+# CT.gov query param → FTS column set
+_QUERY_COLUMNS = {
+    "query.cond": "{conditions}",
+    "query.intr": "{interventions}",
+    "query.spons": "{sponsors}",
+    "query.locn": "{locations}",
+    "query.titles": "{title}",
+    "query.term": "",               # all columns
+}
+_PASSTHROUGH_PARAMS = {"format", "pageSize", "pageToken", "countTotal", "fields"}
+
+_AREA_COUNTRY = re.compile(r'^AREA\[LocationCountry\]\s*"([^"]+)"$', re.I)
+_AREA_RANGE = re.compile(r'^AREA\[LastUpdatePostDate\]\s*RANGE\[\s*([^,\]]+)\s*,\s*([^\]]+)\]$', re.I)
+_AREA_PHASE = re.compile(r'^AREA\[Phase\]\s*"?(\w+)"?$', re.I)
+
+
+# =============================================================================
+# Connection
+# =============================================================================
+
+_local = threading.local()
+
+
+def _connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """Per-thread connection (sqlite3 connections aren't shareable across threads)."""
+    path = Path(path or MIRROR_PATH)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(str(path))
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conns[str(path)] = conn
+    return conn
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+    conn.execute(
+        "INSERT INTO mirror_meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+# =============================================================================
+# Indexing
+# =============================================================================
+
+def _index_fields(study: dict) -> Optional[dict]:
+    """Pull the searchable/filterable fields out of one v2 study record."""
+    protocol = study.get("protocolSection", {})
+    id_mod = protocol.get("identificationModule", {})
+    nct_id = id_mod.get("nctId", "")
+    if not nct_id:
+        return None
+
+    status_mod = protocol.get("statusModule", {})
+    design_mod = protocol.get("designModule", {})
+    sponsor_mod = protocol.get("sponsorCollaboratorsModule", {})
+    cond_mod = protocol.get("conditionsModule", {})
+    interv_mod = protocol.get("armsInterventionsModule", {})
+    loc_mod = protocol.get("contactsLocationsModule", {})
+    desc_mod = protocol.get("descriptionModule", {})
+
+    lead = sponsor_mod.get("leadSponsor", {}).get("name", "")
+    sponsors = [lead] + [c.get("name", "") for c in sponsor_mod.get("collaborators", [])]
+
+    interventions = []
+    for iv in interv_mod.get("interventions", []):
+        interventions.append(iv.get("name", ""))
+        interventions.extend(iv.get("otherNames", []))
+
+    locations, countries = [], set()
+    for loc in loc_mod.get("locations", []):
+        locations.extend(filter(None, (loc.get("facility"), loc.get("city"), loc.get("country"))))
+        if loc.get("country"):
+            countries.add(loc["country"])
+
+    phases = design_mod.get("phases", [])
+
+    return {
+        "nct_id": nct_id,
+        "overall_status": status_mod.get("overallStatus", ""),
+        "phases": f",{','.join(phases)}," if phases else "",
+        "study_type": design_mod.get("studyType", ""),
+        "lead_sponsor": lead,
+        "start_date": status_mod.get("startDateStruct", {}).get("date", ""),
+        "last_update": status_mod.get("lastUpdatePostDateStruct", {}).get("date", ""),
+        "countries": sorted(countries),
+        "fts": {
+            "title": " ".join(filter(None, (
+                id_mod.get("briefTitle"), id_mod.get("officialTitle"), id_mod.get("acronym"),
+            ))),
+            "conditions": " ; ".join(cond_mod.get("conditions", []) + cond_mod.get("keywords", [])),
+            "interventions": " ; ".join(filter(None, interventions)),
+            "sponsors": " ; ".join(filter(None, sponsors)),
+            "locations": " ; ".join(locations),
+            "body": desc_mod.get("briefSummary", ""),
+        },
+    }
+
+
+def upsert_studies(studies: Iterable[dict], path: Optional[Path] = None) -> tuple[int, str]:
+    """
+    Insert or replace study records. Returns (count, max LastUpdatePostDate seen).
+    """
+    conn = _connect(path)
+    count, max_update = 0, ""
+    batch = []
+
+    def _flush():
+        with conn:
+            for fields, raw in batch:
+                nct_id = fields["nct_id"]
+                conn.execute(
+                    """INSERT INTO studies (nct_id, overall_status, phases, study_type,
+                                            lead_sponsor, start_date, last_update, raw)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(nct_id) DO UPDATE SET
+                           overall_status = excluded.overall_status,
+                           phases = excluded.phases,
+                           study_type = excluded.study_type,
+                           lead_sponsor = excluded.lead_sponsor,
+                           start_date = excluded.start_date,
+                           last_update = excluded.last_update,
+                           raw = excluded.raw""",
+                    (nct_id, fields["overall_status"], fields["phases"], fields["study_type"],
+                     fields["lead_sponsor"], fields["start_date"], fields["last_update"], raw),
+                )
+                rowid = conn.execute("SELECT rowid FROM studies WHERE nct_id = ?", (nct_id,)).fetchone()[0]
+                fts = fields["fts"]
+                conn.execute("DELETE FROM studies_fts WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT INTO studies_fts (rowid, title, conditions, interventions, sponsors, locations, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (rowid, fts["title"], fts["conditions"], fts["interventions"],
+                     fts["sponsors"], fts["locations"], fts["body"]),
+                )
+                conn.execute("DELETE FROM study_countries WHERE nct_id = ?", (nct_id,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO study_countries (nct_id, country) VALUES (?, ?)",
+                    [(nct_id, c) for c in fields["countries"]],
+                )
+        batch.clear()
+
+    for study in studies:
+        fields = _index_fields(study)
+        if not fields:
+            continue
+        batch.append((fields, json.dumps(study, separators=(",", ":"))))
+        count += 1
+        max_update = max(max_update, fields["last_update"])
+        if len(batch) >= _BATCH:
+            _flush()
+    if batch:
+        _flush()
+
+    _invalidate_status()
+    return count, max_update
+
+
+def _record_sync(conn: sqlite3.Connection, max_update: str):
+    with conn:
+        if max_update and max_update > (_get_meta(conn, "last_update_max") or ""):
+            _set_meta(conn, "last_update_max", max_update)
+        _set_meta(conn, "synced_at", datetime.utcnow().isoformat())
+
+
+# =============================================================================
+# Seed + incremental sync
+# =============================================================================
+
+def _iter_export(path: Path) -> Iterator[dict]:
+    """Yield study dicts from a bulk export (.zip of per-study JSON, a directory, or one JSON file)."""
+
+    def _unpack(obj) -> Iterator[dict]:
+        if isinstance(obj, list):
+            yield from obj
+        elif isinstance(obj, dict) and "studies" in obj:
+            yield from obj["studies"]
+        elif isinstance(obj, dict):
+            yield obj
+
+    if path.is_dir():
+        for p in sorted(path.rglob("*.json")):
+            with open(p) as f:
+                yield from _unpack(json.load(f))
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                if name.endswith(".json"):
+                    with zf.open(name) as f:
+                        yield from _unpack(json.load(f))
+    else:
+        with open(path) as f:
+            yield from _unpack(json.load(f))
+
+
+def seed_from_export(export_path: str, path: Optional[Path] = None) -> int:
+    """Load the CT.gov bulk JSON export into the mirror. Safe to re-run."""
+    export_path = Path(export_path).expanduser()
+    print(f"  [CT.gov mirror] Seeding from {export_path}...")
+    t0 = time.time()
+    count, max_update = upsert_studies(_iter_export(export_path), path)
+    _record_sync(_connect(path), max_update)
+    print(f"  [CT.gov mirror] Seeded {count:,} studies in {time.time() - t0:.0f}s "
+          f"(latest update {max_update or 'n/a'})")
+    return count
+
+
+def sync_incremental(since: Optional[str] = None, path: Optional[Path] = None,
+                     max_pages: Optional[int] = None) -> int:
+    """
+    Pull every study updated on/after `since` (default: the latest
+    LastUpdatePostDate already in the mirror, minus a day of overlap) from
+    the live API. With an empty mirror and no `since`, this is a full crawl.
+    """
+    import ctgov_client  # lazy: the client imports this module
+
+    conn = _connect(path)
+    if since is None:
+        latest = _get_meta(conn, "last_update_max")
+        if latest:
+            since = (datetime.fromisoformat(latest) - timedelta(days=1)).date().isoformat()
+
+    params = {"pageSize": SYNC_PAGE_SIZE, "sort": "LastUpdatePostDate:asc"}
+    if since:
+        params["filter.advanced"] = f"AREA[LastUpdatePostDate]RANGE[{since},MAX]"
+    print(f"  [CT.gov mirror] Syncing studies updated since {since or 'the beginning'}...")
+
+    total, max_update, pages = 0, "", 0
+    t0 = time.time()
+    while True:
+        data = ctgov_client.get_json(params, timeout=60, live=True)
+        studies = data.get("studies", [])
+        if studies:
+            count, page_max = upsert_studies(studies, path)
+            total += count
+            max_update = max(max_update, page_max)
+        pages += 1
+        next_token = data.get("nextPageToken")
+        if not next_token or (max_pages and pages >= max_pages):
+            break
+        params["pageToken"] = next_token
+        if pages % 20 == 0:
+            print(f"    ... {total:,} studies ({pages} pages, {time.time() - t0:.0f}s)")
+
+    _record_sync(conn, max_update)
+    print(f"  [CT.gov mirror] Synced {total:,} studies in {pages} page(s), {time.time() - t0:.0f}s")
+    return total
+
+
+# =============================================================================
+# Status
+# =============================================================================
+
+_status_cache: dict = {"checked_at": 0.0, "status": None}
+_status_lock = threading.Lock()
+
+
+def _invalidate_status():
+    with _status_lock:
+        _status_cache["checked_at"] = 0.0
+
+
+def get_status(path: Optional[Path] = None) -> dict:
+    """Study count and sync metadata (no side effects if the DB doesn't exist)."""
+    path = Path(path or MIRROR_PATH)
+    if not path.exists():
+        return {"path": str(path), "exists": False, "studies": 0, "mode": MIRROR_MODE}
+    conn = _connect(path)
+    synced_at = _get_meta(conn, "synced_at")
+    age_hours = None
+    if synced_at:
+        age_hours = round((datetime.utcnow() - datetime.fromisoformat(synced_at)).total_seconds() / 3600, 1)
+    return {
+        "path": str(path),
+        "exists": True,
+        "mode": MIRROR_MODE,
+        "studies": conn.execute("SELECT COUNT(*) FROM studies").fetchone()[0],
+        "last_update_max": _get_meta(conn, "last_update_max"),
+        "synced_at": synced_at,
+        "age_hours": age_hours,
+    }
+
+
+def is_available() -> bool:
+    """True when the mirror should answer queries under the current mode."""
+    if MIRROR_MODE == "off":
+        return False
+    now = time.time()
+    with _status_lock:
+        if now - _status_cache["checked_at"] < _STATUS_RECHECK_SECONDS:
+            status = _status_cache["status"]
+        else:
+            status = None
+    if status is None:
+        try:
+            status = get_status()
+        except sqlite3.Error as e:
+            print(f"  [CT.gov mirror] Unavailable: {e}")
+            status = {"exists": False, "studies": 0}
+        with _status_lock:
+            _status_cache.update(checked_at=now, status=status)
+
+    if not status.get("studies"):
+        return False
+    if MIRROR_MODE == "only":
+        return True
+    age = status.get("age_hours")
+    return age is not None and age <= MAX_AGE_HOURS
+
+
+# =============================================================================
+# Query
+# =============================================================================
+
+def _fts_expr(text: str) -> Optional[str]:
+    """
+    Turn CT.gov-style query text into an FTS5 expression. "A OR B" becomes
+    alternatives; inside each, every word must appear (quoted, so FTS syntax
+    characters in drug codes like "GLP-1" or "ABBV-400" are literal).
+    """
+    alternatives = []
+    for alt in re.split(r"\s+OR\s+", text.strip()):
+        words = [w for w in re.findall(r"\w+", alt, re.UNICODE) if w not in ("AND", "NOT")]
+        if words:
+            alternatives.append("(" + " AND ".join(f'"{w}"' for w in words) + ")")
+    if not alternatives:
+        return None
+    return alternatives[0] if len(alternatives) == 1 else "(" + " OR ".join(alternatives) + ")"
+
+
+def _split_set(value) -> list[str]:
+    return [v.strip().upper() for v in str(value).split(",") if v.strip()]
+
+
+def _split_top(expr: str, operator: str) -> list[str]:
+    """Split on AND / OR outside parentheses and AREA[...] brackets."""
+    parts, depth, last = [], 0, 0
+    for m in re.finditer(rf"[()\[\]]|\s+{operator}\s+", expr):
+        token = m.group(0)
+        if token in "([":
+            depth += 1
+        elif token in ")]":
+            depth -= 1
+        elif depth == 0:
+            parts.append(expr[last:m.start()])
+            last = m.end()
+    parts.append(expr[last:])
+    return [p.strip() for p in parts]
+
+
+def _unwrap(expr: str) -> str:
+    """Drop parentheses that enclose the whole expression."""
+    while expr.startswith("(") and expr.endswith(")"):
+        depth = 0
+        for i, ch in enumerate(expr):
+            depth += ch == "("
+            depth -= ch == ")"
+            if depth == 0 and i < len(expr) - 1:
+                return expr
+        expr = expr[1:-1].strip()
+    return expr
+
+
+def _translate_advanced(value: str, spec: dict) -> bool:
+    """
+    Fold a filter.advanced expression into `spec`. _query ORs the values of
+    one field and ANDs different fields, so only that shape is served
+    locally: an AND of groups, each group one clause or an OR of clauses on
+    the same field (countries, phases; a date range stands alone). Anything
+    else — a field ANDed with itself or with a value from another param,
+    nested mixes — returns False so the live API answers.
+    """
+    seen = set()
+    for group in _split_top(_unwrap(value.strip()), "AND"):
+        fields = []
+        for clause in _split_top(_unwrap(group), "OR"):
+            clause = _unwrap(clause)
+            if m := _AREA_COUNTRY.match(clause):
+                fields.append(("countries", m.group(1)))
+            elif m := _AREA_RANGE.match(clause):
+                fields.append(("range", (m.group(1).strip(), m.group(2).strip())))
+            elif m := _AREA_PHASE.match(clause):
+                fields.append(("phases", m.group(1).upper()))
+            else:
+                return False
+        names = {name for name, _ in fields}
+        if len(names) != 1 or (names == {"range"} and len(fields) > 1):
+            return False
+        name = names.pop()
+        if name in seen:
+            return False
+        seen.add(name)
+        if name == "range":
+            if spec["updated_from"] or spec["updated_to"]:
+                return False
+            lo, hi = fields[0][1]
+            spec["updated_from"] = None if lo.upper() == "MIN" else lo
+            spec["updated_to"] = None if hi.upper() == "MAX" else hi
+        else:
+            if spec[name]:
+                return False  # another param set this field: the API would intersect
+            spec[name].extend(v for _, v in fields)
+    return True
+
+
+def _translate(params: dict) -> Optional[dict]:
+    """
+    Map CT.gov v2 search params to a mirror query spec, or None when the
+    request uses something the mirror can't reproduce faithfully.
+    """
+    spec = {"match": [], "statuses": [], "phases": [], "ids": [], "countries": [],
+            "updated_from": None, "updated_to": None, "sort": "relevance"}
+
+    for key, value in params.items():
+        if value is None or value == "":
+            continue
+        if key in _QUERY_COLUMNS:
+            expr = _fts_expr(str(value))
+            if expr is None:
+                return None
+            cols = _QUERY_COLUMNS[key]
+            spec["match"].append(f"{cols} : {expr}" if cols else expr)
+        elif key == "filter.overallStatus":
+            spec["statuses"] = _split_set(value)
+        elif key == "filter.phase":
+            if spec["phases"]:
+                return None  # AREA[Phase] already set: the API would intersect them
+            spec["phases"] = _split_set(value)
+        elif key == "filter.ids":
+            spec["ids"] = _split_set(value)
+        elif key == "filter.advanced":
+            if not _translate_advanced(str(value), spec):
+                return None
+        elif key == "sort":
+            sort = str(value).strip()
+            if sort in ("@relevance", ""):
+                spec["sort"] = "relevance"
+            elif sort.lower() in ("lastupdatepostdate", "lastupdatepostdate:desc"):
+                spec["sort"] = "updated_desc"
+            elif sort.lower() == "lastupdatepostdate:asc":
+                spec["sort"] = "updated_asc"
+            else:
+                return None
+        elif key not in _PASSTHROUGH_PARAMS:
+            return None
+    return spec
+
+
+def _query(spec: dict, limit: int, offset: int, count_total: bool = False,
+           path: Optional[Path] = None) -> tuple[list[dict], Optional[int]]:
+    conn = _connect(path)
+    joins, where, args = [], [], []
+
+    if spec["match"]:
+        joins.append(
+            "JOIN (SELECT rowid AS fts_rowid, bm25(studies_fts) AS rank "
+            "      FROM studies_fts WHERE studies_fts MATCH ?) f ON f.fts_rowid = s.rowid"
+        )
+        args.append(" AND ".join(f"({m})" for m in spec["match"]))
+    if spec["statuses"]:
+        where.append(f"s.overall_status IN ({','.join('?' * len(spec['statuses']))})")
+        args.extend(spec["statuses"])
+    if spec["phases"]:
+        where.append("(" + " OR ".join("s.phases LIKE ?" for _ in spec["phases"]) + ")")
+        args.extend(f"%,{p},%" for p in spec["phases"])
+    if spec["ids"]:
+        where.append(f"s.nct_id IN ({','.join('?' * len(spec['ids']))})")
+        args.extend(spec["ids"])
+    if spec["countries"]:
+        where.append(
+            f"s.nct_id IN (SELECT nct_id FROM study_countries "
+            f"WHERE country IN ({','.join('?' * len(spec['countries']))}))"
+        )
+        args.extend(spec["countries"])
+    if spec["updated_from"]:
+        where.append("s.last_update >= ?")
+        args.append(spec["updated_from"])
+    if spec["updated_to"]:
+        where.append("s.last_update <= ?")
+        args.append(spec["updated_to"])
+
+    base = "FROM studies s " + " ".join(joins)
+    if where:
+        base += " WHERE " + " AND ".join(where)
+
+    if spec["sort"] == "updated_asc":
+        order = "s.last_update ASC, s.nct_id"
+    elif spec["sort"] == "relevance" and spec["match"]:
+        order = "f.rank, s.last_update DESC"
+    else:
+        order = "s.last_update DESC, s.nct_id"
+
+    rows = conn.execute(
+        f"SELECT s.raw {base} ORDER BY {order} LIMIT ? OFFSET ?", args + [limit, offset]
+    ).fetchall()
+    total = None
+    if count_total:
+        total = conn.execute(f"SELECT COUNT(*) {base}", args).fetchone()[0]
+    return [json.loads(r[0]) for r in rows], total
+
+
+def get_study(nct_id: str, path: Optional[Path] = None) -> Optional[dict]:
+    """One study record from the mirror, or None if it isn't there."""
+    row = _connect(path).execute(
+        "SELECT raw FROM studies WHERE nct_id = ?", (nct_id.strip().upper(),)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def search_studies(
+    condition: str = "",
+    intervention: str = "",
+    sponsor: str = "",
+    phase: str = "",
+    status: str = "",
+    country: str = "",
+    term: str = "",
+    max_results: int = 100,
+    path: Optional[Path] = None,
+) -> list[dict]:
+    """
+    Query the mirror with the same filters as api_connectors.search_clinical_trials
+    (plus country / free-text term). Returns raw v2 study records.
+    """
+    params = {
+        "query.cond": condition,
+        "query.intr": intervention,
+        "query.spons": sponsor,
+        "query.term": term,
+        "filter.phase": phase,
+        "filter.overallStatus": status,
+    }
+    if country:
+        params["filter.advanced"] = f'AREA[LocationCountry] "{country}"'
+    spec = _translate(params)
+    if spec is None:
+        return []
+    studies, _ = _query(spec, max_results, 0, path=path)
+    return studies
+
+
+def answer(params: Optional[dict] = None, nct_id: str = "") -> Optional[dict]:
+    """
+    Serve a CT.gov v2 request from the mirror, shaped like the API response.
+
+    Returns None when the live API should handle it instead: mirror disabled
+    or stale, unsupported parameters, or (in auto mode) a first page with no
+    hits — CT.gov's synonym expansion sometimes finds what plain FTS can't.
+    Page tokens issued by the mirror are always answered locally.
+    """
+    params = dict(params or {})
+    token = str(params.get("pageToken") or "")
+    from_mirror_token = token.startswith(_TOKEN_PREFIX)
+    if token and not from_mirror_token:
+        return None
+    if not from_mirror_token and not is_available():
+        return None
+
+    try:
+        if nct_id:
+            return get_study(nct_id)
+
+        spec = _translate(params)
+        if spec is None:
+            return None
+        page_size = max(1, min(int(params.get("pageSize") or 10), SYNC_PAGE_SIZE))
+        offset = int(token[len(_TOKEN_PREFIX):] or 0) if from_mirror_token else 0
+        count_total = str(params.get("countTotal", "")).lower() == "true"
+
+        studies, total = _query(spec, page_size + 1, offset, count_total=count_total)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"  [CT.gov mirror] Query failed, using live API: {e}")
+        return None
+
+    if not studies and offset == 0 and MIRROR_MODE != "only":
+        return None
+
+    body = {"studies": studies[:page_size]}
+    if len(studies) > page_size:
+        body["nextPageToken"] = f"{_TOKEN_PREFIX}{offset + page_size}"
+    if total is not None:
+        body["totalCount"] = total
+    return body
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Local ClinicalTrials.gov mirror")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_seed = sub.add_parser("seed", help="Load the CT.gov bulk JSON export")
+    p_seed.add_argument("export", help="ctg-studies.json.zip, a directory of study JSON, or one JSON file")
+
+    p_sync = sub.add_parser("sync", help="Pull studies updated since the last sync")
+    p_sync.add_argument("--since", help="YYYY-MM-DD (default: latest update already mirrored)")
+    p_sync.add_argument("--max-pages", type=int, default=None)
+
+    sub.add_parser("status", help="Show mirror size and freshness")
+
+    p_search = sub.add_parser("search", help="Query the mirror")
+    for flag in ("condition", "intervention", "sponsor", "phase", "status", "country", "term"):
+        p_search.add_argument(f"--{flag}", default="")
+    p_search.add_argument("--max-results", type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        seed_from_export(args.export)
+    elif args.command == "sync":
+        sync_incremental(since=args.since, max_pages=args.max_pages)
+    elif args.command == "status":
+        print(json.dumps(get_status(), indent=2))
+    elif args.command == "search":
+        studies = search_studies(
+            condition=args.condition, intervention=args.intervention, sponsor=args.sponsor,
+            phase=args.phase, status=args.status, country=args.country, term=args.term,
+            max_results=args.max_results,
+        )
+        for study in studies:
+            id_mod = study.get("protocolSection", {}).get("identificationModule", {})
+            print(f"  {id_mod.get('nctId', '')}  {id_mod.get('briefTitle', '')[:100]}")
+        print(f"\n  {len(studies)} studies")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,32 +40,106 @@ USAGE:
     # Get drugs by target (walks the hierarchy tree)
     python3 drug_entities.py --target "KRAS"
 
+    # Rebuild the persisted target closure (also done by --setup)
+    python3 drug_entities.py --refresh-closure
+
     # Import from module:
     from drug_entities import lookup_drug, get_landscape, get_pubmed_terms_for_landscape
+
+LOOKUP CACHING:
+    lookup_drug() resolves names against an in-process alias index (every
+    drug_aliases row, reloaded every DRUG_ALIAS_INDEX_TTL seconds or on
+    refresh_alias_index()) and caches assembled drug records. Misses fall
+    back to one pooled query: exact alias, else substring via the pg_trgm
+    index on LOWER(alias), with aliases/targets/PubMed terms JSON-aggregated
+    in the same round trip. Callers beyond DRUG_DB_POOL_MAX wait for a free
+    connection (up to DRUG_DB_POOL_WAIT seconds) instead of failing, and
+    only one thread reloads an expired index while the rest keep using it.
+
+Environment:
+    NEON_DATABASE_URL       Postgres connection string (required)
+    DRUG_DB_POOL_MAX        pooled connections for lookups (default 5)
+    DRUG_DB_POOL_WAIT       seconds to wait for a free pooled connection (default 30)
+    DRUG_ALIAS_INDEX_TTL    seconds before the alias index reloads (default 300)
+    TARGET_TREE_TTL         seconds before the in-memory target tree reloads (default 600)
 """
 
 import os
 import sys
+import copy
 import json
+import time
 import argparse
-from typing import Optional
+import threading
+from typing import Callable, Optional
 
 from dotenv import load_dotenv
 load_dotenv()
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
 
 if not DATABASE_URL:
     raise ImportError("NEON_DATABASE_URL not set — drug entity database disabled")
 
+DRUG_DB_POOL_MAX = int(os.environ.get("DRUG_DB_POOL_MAX", 5))
+DRUG_DB_POOL_WAIT = float(os.environ.get("DRUG_DB_POOL_WAIT", 30))
+DRUG_ALIAS_INDEX_TTL = float(os.environ.get("DRUG_ALIAS_INDEX_TTL", 300))
+TARGET_TREE_TTL = float(os.environ.get("TARGET_TREE_TTL", 600))
+
 
 def get_conn():
     return psycopg2.connect(DATABASE_URL)
 
 
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises PoolError when exhausted; callers queue here instead
+_pool_slots = threading.BoundedSemaphore(DRUG_DB_POOL_MAX)
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(1, DRUG_DB_POOL_MAX, DATABASE_URL)
+    return _pool
+
+
+def _with_pooled_cursor(fn: Callable):
+    """
+    Run fn(cursor) on a pooled connection (read-only: the transaction is
+    rolled back afterwards). Neon drops idle connections, so a dead pooled
+    connection is discarded and the call retried once on a fresh one.
+    Blocks while DRUG_DB_POOL_MAX calls hold connections (PoolError after
+    DRUG_DB_POOL_WAIT seconds).
+    """
+    pool = _get_pool()
+    if not _pool_slots.acquire(timeout=DRUG_DB_POOL_WAIT):
+        raise PoolError(f"No drug DB connection free after {DRUG_DB_POOL_WAIT:.0f}s")
+    try:
+        for attempt in (1, 2):
+            conn = pool.getconn()
+            broken = False
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    return fn(cur)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                if attempt == 2:
+                    raise
+            finally:
+                if not broken and not conn.closed:
+                    conn.rollback()
+                pool.putconn(conn, close=broken or bool(conn.closed))
+    finally:
+        _pool_slots.release()
+
+
 # =============================================================================
 # Schema
 # =============================================================================
@@ -100,6 +174,18 @@ CREATE TABLE IF NOT EXISTS target_aliases (
 );
 CREATE INDEX IF NOT EXISTS idx_target_aliases_lower ON target_aliases (LOWER(alias));
 
+-- Materialized transitive closure of the tree: one row per (ancestor,
+-- descendant) pair, including each target with itself at depth 0. Lets SQL
+-- expand "KRAS" to its whole subtree with a join instead of a recursive CTE.
+-- Rewritten by sync_target_closure() whenever the targets table changes.
+CREATE TABLE IF NOT EXISTS target_closure (
+    ancestor_id     INTEGER NOT NULL REFERENCES targets(target_id) ON DELETE CASCADE,
+    descendant_id   INTEGER NOT NULL REFERENCES targets(target_id) ON DELETE CASCADE,
+    depth           INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+CREATE INDEX IF NOT EXISTS idx_target_closure_descendant ON target_closure (descendant_id);
+
 -- ─────────────────────────────────────────────────────────────────
 -- DISEASE → TARGET MAPPING
 -- Links diseases to ALL their relevant targets so landscape queries
@@ -163,6 +249,7 @@ CREATE TABLE IF NOT EXISTS drug_aliases (
 );
 CREATE INDEX IF NOT EXISTS idx_drug_aliases_lower ON drug_aliases (LOWER(alias));
 CREATE INDEX IF NOT EXISTS idx_drug_aliases_drug_id ON drug_aliases (drug_id);
+-- (the pg_trgm index for substring lookups is created in setup_tables)
 
 -- Links drugs to ClinicalTrials.gov trials
 CREATE TABLE IF NOT EXISTS drug_trials (
@@ -188,6 +275,15 @@ CREATE TABLE IF NOT EXISTS drug_pubmed_terms (
     term_type   TEXT DEFAULT 'drug',            -- drug, target, mechanism, landscape
     UNIQUE(drug_id, search_term)
 );
+CREATE INDEX IF NOT EXISTS idx_drug_pubmed_terms_drug ON drug_pubmed_terms (drug_id);
+"""
+
+# Trigram index so lookup_drug's LIKE '%name%' fallback doesn't scan every
+# alias. Separate from SCHEMA_SQL: the extension may not be installable, and
+# that shouldn't stop the tables being created.
+TRGM_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_drug_aliases_trgm ON drug_aliases USING gin (LOWER(alias) gin_trgm_ops);
 """
 
 
@@ -198,6 +294,13 @@ def setup_tables():
     cur.execute(SCHEMA_SQL)
     conn.commit()
     print("  ✓ Drug entity tables created")
+    try:
+        cur.execute(TRGM_SQL)
+        conn.commit()
+        print("  ✓ Trigram alias index created")
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"  ⚠ pg_trgm unavailable, substring lookups will scan: {e}")
     cur.close()
     conn.close()
 
@@ -724,6 +827,9 @@ def seed_targets():
     print(f"  ✓ Seeded {count} targets in hierarchy")
     cur.close()
     conn.close()
+
+    tree = refresh_target_tree()
+    print(f"  ✓ Target closure: {len(tree.closure_rows())} ancestor/descendant pairs")
     return target_id_map
 
 
@@ -1297,6 +1403,7 @@ def seed_drugs():
     print(f"  ✓ Seeded {count_new} new drugs, updated {count_skip} existing")
     cur.close()
     conn.close()
+    invalidate_drug_cache()
 
 
 def _generate_pubmed_terms(cur, drug_id, name, targets, mechanism, pathway, indication, aliases):
@@ -1369,23 +1476,204 @@ def _generate_pubmed_terms(cur, drug_id, name, targets, mechanism, pathway, indi
 # =============================================================================
 # Hierarchy Walking Helpers
 # =============================================================================
+# The targets tree is small (hundreds of nodes) and read on every landscape
+# query, so it lives in memory with its closure precomputed: subtree and
+# ancestor expansion are dict lookups instead of recursive CTEs. The same
+# closure is persisted to target_closure for SQL joins.
+
+class TargetTree:
+    """The targets table as an in-memory tree with ancestor/descendant closure."""
+
+    def __init__(self, targets: list[tuple[int, str, Optional[int]]], aliases: list[tuple[int, str]]):
+        """targets: (target_id, name, parent_id); aliases: (target_id, alias), both in id order."""
+        self.parent: dict[int, Optional[int]] = {tid: parent for tid, _, parent in targets}
+        self.names: dict[int, str] = {tid: name for tid, name, _ in targets}
+        self.by_name: dict[str, int] = {}
+        for tid, name, _ in targets:
+            self.by_name.setdefault(name.lower(), tid)
+        self.aliases: list[tuple[int, str]] = list(aliases)  # original case, for taggers
+        self.by_alias: dict[str, int] = {}
+        for tid, alias in aliases:
+            self.by_alias.setdefault(alias.lower(), tid)
+
+        children: dict[int, list[int]] = {}
+        for tid, _, parent in targets:
+            if parent is not None and parent in self.parent:
+                children.setdefault(parent, []).append(tid)
+
+        # Ancestors: nearest first. The visited set guards against a bad
+        # parent_id cycle, which a recursive CTE would loop on.
+        self.ancestors: dict[int, list[int]] = {}
+        for tid in self.parent:
+            chain, seen, node = [], {tid}, self.parent[tid]
+            while node is not None and node in self.parent and node not in seen:
+                chain.append(node)
+                seen.add(node)
+                node = self.parent[node]
+            self.ancestors[tid] = chain
+
+        # Descendants: the target itself, then breadth-first
+        self.descendants: dict[int, list[int]] = {}
+        for tid in self.parent:
+            order, seen = [tid], {tid}
+            for node in order:
+                for child in children.get(node, ()):
+                    if child not in seen:
+                        seen.add(child)
+                        order.append(child)
+            self.descendants[tid] = order
+
+    def __len__(self):
+        return len(self.parent)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Exact name → exact alias → shortest alias containing `name`."""
+        key = (name or "").strip().lower()
+        if not key:
+            return None
+        if key in self.by_name:
+            return self.by_name[key]
+        if key in self.by_alias:
+            return self.by_alias[key]
+        partial = [alias for alias in self.by_alias if key in alias]
+        if partial:
+            return self.by_alias[min(partial, key=len)]
+        return None
+
+    def closure_rows(self) -> list[tuple[int, int, int]]:
+        """(ancestor_id, descendant_id, depth) for target_closure, depth 0 = self."""
+        rows = []
+        for tid, chain in self.ancestors.items():
+            rows.append((tid, tid, 0))
+            rows.extend((ancestor, tid, depth) for depth, ancestor in enumerate(chain, 1))
+        return rows
+
+
+_target_tree: Optional[TargetTree] = None
+_target_tree_loaded_at = 0.0
+_target_tree_lock = threading.Lock()
+_target_tree_reload_lock = threading.Lock()
+_closure_write_lock = threading.Lock()
+
+
+def _closure_matches(cur, tree: TargetTree) -> bool:
+    """True if target_closure holds exactly `tree`'s closure rows."""
+    cur.execute("SELECT to_regclass('target_closure') IS NOT NULL AS present")
+    if not cur.fetchone()["present"]:
+        return False
+    cur.execute("SELECT ancestor_id, descendant_id, depth FROM target_closure "
+                "ORDER BY ancestor_id, descendant_id")
+    stored = [(r["ancestor_id"], r["descendant_id"], r["depth"]) for r in cur.fetchall()]
+    return stored == sorted(tree.closure_rows())
+
+
+def sync_target_closure(tree: TargetTree) -> bool:
+    """
+    Rewrite target_closure if it doesn't match `tree`; True if rewritten.
+
+    The write step behind refresh_target_tree (and seed_targets). Writers
+    are serialized in-process by a lock and across processes by a
+    transaction-scoped advisory lock, and re-check the table once they hold
+    it, so concurrent reloads rewrite it at most once.
+    """
+    with _closure_write_lock:
+        conn = get_conn()
+        try:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext('target_closure'))")
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS target_closure (
+                    ancestor_id     INTEGER NOT NULL REFERENCES targets(target_id) ON DELETE CASCADE,
+                    descendant_id   INTEGER NOT NULL REFERENCES targets(target_id) ON DELETE CASCADE,
+                    depth           INTEGER NOT NULL,
+                    PRIMARY KEY (ancestor_id, descendant_id)
+                )
+            """)
+            if _closure_matches(cur, tree):
+                conn.rollback()
+                return False
+            cur.execute("DELETE FROM target_closure")
+            execute_values(
+                cur,
+                "INSERT INTO target_closure (ancestor_id, descendant_id, depth) VALUES %s",
+                tree.closure_rows(),
+                page_size=1000,
+            )
+            conn.commit()
+            cur.close()
+            return True
+        except psycopg2.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def refresh_target_tree() -> TargetTree:
+    """
+    Reload the target tree from Postgres and bring target_closure in line
+    with it. Called by seed_targets and whenever TARGET_TREE_TTL has passed.
+    The load and the check are reads; only a stale closure takes the write
+    path (sync_target_closure).
+    """
+    with _target_tree_reload_lock:
+        return _load_target_tree()
+
+
+def _load_target_tree() -> TargetTree:
+    global _target_tree, _target_tree_loaded_at
+
+    def load(cur):
+        cur.execute("SELECT target_id, name, parent_id FROM targets ORDER BY target_id")
+        targets = [(r["target_id"], r["name"], r["parent_id"]) for r in cur.fetchall()]
+        cur.execute("SELECT target_id, alias FROM target_aliases ORDER BY id")
+        aliases = [(r["target_id"], r["alias"]) for r in cur.fetchall()]
+        tree = TargetTree(targets, aliases)
+        return tree, _closure_matches(cur, tree)
+
+    tree, closure_current = _with_pooled_cursor(load)
+    if not closure_current:
+        try:
+            if sync_target_closure(tree):
+                print(f"  ✓ target_closure rewritten ({len(tree)} targets)")
+        except psycopg2.Error as e:
+            print(f"  ⚠ Could not persist target_closure: {e}")
+
+    with _target_tree_lock:
+        _target_tree = tree
+        _target_tree_loaded_at = time.time()
+    return tree
+
+
+def get_target_tree() -> TargetTree:
+    """The shared in-memory target tree, reloaded every TARGET_TREE_TTL seconds."""
+    if _target_tree is not None and time.time() - _target_tree_loaded_at <= TARGET_TREE_TTL:
+        return _target_tree
+    # As with the alias index: one thread reloads, the rest keep the old tree
+    if not _target_tree_reload_lock.acquire(blocking=_target_tree is None):
+        return _target_tree
+    try:
+        if _target_tree is None or time.time() - _target_tree_loaded_at > TARGET_TREE_TTL:
+            return _load_target_tree()
+        return _target_tree
+    finally:
+        _target_tree_reload_lock.release()
+
+
+def invalidate_target_tree():
+    """Force a reload on next use (call after editing targets / target_aliases)."""
+    global _target_tree_loaded_at
+    with _target_tree_lock:
+        _target_tree_loaded_at = 0.0
+
 
 def _get_target_subtree_ids(cur, target_id) -> list:
     """
     Walk DOWN the target tree: given a target_id, return it plus ALL descendant IDs.
     E.g., for "KRAS" → returns IDs for KRAS, G12C, G12D, G12V, G12R, G13D, multi-selective.
-    Uses a recursive CTE in Postgres.
+    Served from the in-memory closure; `cur` is unused (kept for callers).
     """
-    cur.execute("""
-        WITH RECURSIVE subtree AS (
-            SELECT target_id FROM targets WHERE target_id = %s
-            UNION ALL
-            SELECT t.target_id FROM targets t
-            JOIN subtree s ON t.parent_id = s.target_id
-        )
-        SELECT target_id FROM subtree
-    """, (target_id,))
-    return [row["target_id"] if isinstance(row, dict) else row[0] for row in cur.fetchall()]
+    return list(get_target_tree().descendants.get(target_id, [target_id]))
 
 
 def _get_target_ancestor_ids(cur, target_id) -> list:
@@ -1393,108 +1681,190 @@ def _get_target_ancestor_ids(cur, target_id) -> list:
     Walk UP the target tree: given a target_id, return ALL ancestor IDs.
     E.g., for "KRAS G12C" → returns IDs for KRAS, RAS.
     """
-    cur.execute("""
-        WITH RECURSIVE ancestors AS (
-            SELECT parent_id FROM targets WHERE target_id = %s AND parent_id IS NOT NULL
-            UNION ALL
-            SELECT t.parent_id FROM targets t
-            JOIN ancestors a ON t.target_id = a.parent_id
-            WHERE t.parent_id IS NOT NULL
-        )
-        SELECT parent_id AS target_id FROM ancestors
-    """, (target_id,))
-    return [row["target_id"] if isinstance(row, dict) else row[0] for row in cur.fetchall()]
+    return list(get_target_tree().ancestors.get(target_id, []))
 
 
 def _resolve_target(cur, name: str):
     """Resolve a target name/alias to target_id (case-insensitive)."""
-    # Try exact match on targets table
-    cur.execute("SELECT target_id FROM targets WHERE LOWER(name) = LOWER(%s)", (name,))
-    row = cur.fetchone()
-    if row:
-        return row["target_id"] if isinstance(row, dict) else row[0]
-
-    # Try alias lookup
-    cur.execute("SELECT target_id FROM target_aliases WHERE LOWER(alias) = LOWER(%s)", (name,))
-    row = cur.fetchone()
-    if row:
-        return row["target_id"] if isinstance(row, dict) else row[0]
-
-    # Try LIKE match
-    cur.execute("SELECT target_id FROM target_aliases WHERE LOWER(alias) LIKE LOWER(%s) LIMIT 1",
-                (f"%{name}%",))
-    row = cur.fetchone()
-    if row:
-        return row["target_id"] if isinstance(row, dict) else row[0]
-    return None
+    return get_target_tree().resolve(name)
 
 
 # =============================================================================
 # Lookup Functions (used by the query router)
 # =============================================================================
 
-def lookup_drug(name: str) -> Optional[dict]:
-    """
-    Look up a drug by ANY name (canonical, alias, code, brand).
-    Returns the full drug record with all aliases, targets, and PubMed terms.
-    """
-    conn = get_conn()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
+# One round trip: the drug row plus its aliases, targets and PubMed terms as
+# JSON arrays. {match} is a CTE yielding (drug_id, matched_alias).
+_DRUG_RECORD_SQL = """
+    WITH match AS ({match})
+    SELECT d.*, m.matched_alias,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'alias', a.alias, 'alias_type', a.alias_type,
+                'is_current', a.is_current, 'notes', a.notes) ORDER BY a.alias_id)
+            FROM drug_aliases a WHERE a.drug_id = d.drug_id
+        ), '[]'::json) AS aliases,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'target_name', t.name, 'display_name', t.display_name,
+                'target_class', t.target_class, 'gene_symbol', t.gene_symbol,
+                'role', dt.role, 'selectivity', dt.selectivity,
+                'parent_target', p.name) ORDER BY dt.id)
+            FROM drug_targets dt
+            JOIN targets t ON dt.target_id = t.target_id
+            LEFT JOIN targets p ON t.parent_id = p.target_id
+            WHERE dt.drug_id = d.drug_id
+        ), '[]'::json) AS targets,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'search_term', pt.search_term, 'term_type', pt.term_type,
+                'indication', pt.indication) ORDER BY pt.id)
+            FROM drug_pubmed_terms pt WHERE pt.drug_id = d.drug_id
+        ), '[]'::json) AS pubmed_terms
+    FROM match m
+    JOIN drugs d ON d.drug_id = m.drug_id
+"""
 
-    # Try exact match on alias (case-insensitive)
-    cur.execute("""
-        SELECT d.*, da.alias AS matched_alias
-        FROM drugs d
-        JOIN drug_aliases da ON d.drug_id = da.drug_id
-        WHERE LOWER(da.alias) = LOWER(%s)
-    """, (name,))
-    row = cur.fetchone()
+# Exact alias first (functional index), else the shortest alias containing
+# the name (trigram index)
+_MATCH_BY_NAME_SQL = """
+    SELECT drug_id, alias AS matched_alias FROM drug_aliases
+    WHERE LOWER(alias) LIKE LOWER(%(like)s)
+    ORDER BY LOWER(alias) = LOWER(%(name)s) DESC, LENGTH(alias), alias_id
+    LIMIT 1
+"""
 
-    if not row:
-        # Try LIKE match for partial names
-        cur.execute("""
-            SELECT d.*, da.alias AS matched_alias
-            FROM drugs d
-            JOIN drug_aliases da ON d.drug_id = da.drug_id
-            WHERE LOWER(da.alias) LIKE LOWER(%s)
-            LIMIT 1
-        """, (f"%{name}%",))
-        row = cur.fetchone()
+_MATCH_BY_ID_SQL = "SELECT %(drug_id)s AS drug_id, %(alias)s::text AS matched_alias"
 
-    if row:
-        drug_id = row["drug_id"]
 
-        # Get all aliases
-        cur.execute("""
-            SELECT alias, alias_type, is_current, notes
-            FROM drug_aliases WHERE drug_id = %s
-        """, (drug_id,))
-        row["aliases"] = [dict(a) for a in cur.fetchall()]
+# In-process alias index: LOWER(alias) → (drug_id, alias). Assembled records
+# and fallback resolutions (including misses) are cached until the next reload.
+_alias_index: dict[str, tuple[int, str]] = {}
+_alias_entries: list[tuple[str, int, str]] = []  # (alias, drug_id, canonical_name), alias_id order
+_alias_index_loaded_at = 0.0
+_drug_records: dict[int, dict] = {}
+_fallback_matches: dict[str, Optional[tuple[int, str]]] = {}
+_cache_lock = threading.Lock()
+_alias_reload_lock = threading.Lock()  # held for the whole DB load, unlike _cache_lock
 
-        # Get targets (via junction table, with hierarchy info)
-        cur.execute("""
-            SELECT t.name AS target_name, t.display_name, t.target_class,
-                   t.gene_symbol, dt.role, dt.selectivity,
-                   p.name AS parent_target
-            FROM drug_targets dt
-            JOIN targets t ON dt.target_id = t.target_id
-            LEFT JOIN targets p ON t.parent_id = p.target_id
-            WHERE dt.drug_id = %s
-        """, (drug_id,))
-        row["targets"] = [dict(t) for t in cur.fetchall()]
 
-        # Get PubMed terms
-        cur.execute("""
-            SELECT search_term, term_type, indication
-            FROM drug_pubmed_terms WHERE drug_id = %s
-        """, (drug_id,))
-        row["pubmed_terms"] = [dict(t) for t in cur.fetchall()]
+def refresh_alias_index() -> int:
+    """(Re)load every drug alias into memory; returns the alias count."""
+    with _alias_reload_lock:
+        return _load_alias_index()
 
-    cur.close()
-    conn.close()
+
+def _load_alias_index() -> int:
+    global _alias_index, _alias_entries, _alias_index_loaded_at, _drug_records, _fallback_matches
+
+    def load(cur):
+        cur.execute("""
+            SELECT da.drug_id, da.alias, d.canonical_name
+            FROM drug_aliases da
+            JOIN drugs d ON d.drug_id = da.drug_id
+            ORDER BY da.alias_id
+        """)
+        return cur.fetchall()
+
+    index: dict[str, tuple[int, str]] = {}
+    entries = []
+    for row in _with_pooled_cursor(load):
+        index.setdefault(row["alias"].lower(), (row["drug_id"], row["alias"]))
+        entries.append((row["alias"], row["drug_id"], row["canonical_name"]))
+
+    with _cache_lock:
+        _alias_index = index
+        _alias_entries = entries
+        _drug_records = {}
+        _fallback_matches = {}
+        _alias_index_loaded_at = time.time()
+    return len(index)
+
+
+def _ensure_alias_index():
+    if time.time() - _alias_index_loaded_at <= DRUG_ALIAS_INDEX_TTL:
+        return
+    # One thread reloads; the others keep serving the current index, and
+    # only wait when there is none (first load, or after invalidation)
+    if not _alias_reload_lock.acquire(blocking=_alias_index_loaded_at == 0.0):
+        return
+    try:
+        if time.time() - _alias_index_loaded_at > DRUG_ALIAS_INDEX_TTL:
+            _load_alias_index()
+    except psycopg2.Error as e:
+        print(f"  ⚠ Drug alias index reload failed: {e}")
+    finally:
+        _alias_reload_lock.release()
+
+
+def get_alias_entries() -> list[tuple[str, int, str]]:
+    """Every (alias, drug_id, canonical_name), e.g. for mention_tagger."""
+    _ensure_alias_index()
+    with _cache_lock:
+        return list(_alias_entries)
+
+
+def invalidate_drug_cache():
+    """Force a reload on the next lookup (call after writing drugs/aliases)."""
+    global _alias_index_loaded_at
+    with _cache_lock:
+        _alias_index_loaded_at = 0.0
+
+
+def _fetch_record(match_sql: str, params: dict) -> Optional[dict]:
+    def query(cur):
+        cur.execute(_DRUG_RECORD_SQL.format(match=match_sql), params)
+        return cur.fetchone()
+
+    row = _with_pooled_cursor(query)
     return dict(row) if row else None
 
 
+def lookup_drug(name: str) -> Optional[dict]:
+    """
+    Look up a drug by ANY name (canonical, alias, code, brand).
+    Returns the full drug record with all aliases, targets, and PubMed terms.
+    """
+    key = (name or "").strip().lower()
+    if not key:
+        return None
+
+    _ensure_alias_index()
+
+    with _cache_lock:
+        hit = _alias_index.get(key)
+        if hit is None and key in _fallback_matches:
+            hit = _fallback_matches[key]
+            if hit is None:
+                return None
+
+    if hit is not None:
+        drug_id, matched_alias = hit
+        with _cache_lock:
+            record = _drug_records.get(drug_id)
+        if record is None:
+            record = _fetch_record(_MATCH_BY_ID_SQL, {"drug_id": drug_id, "alias": matched_alias})
+            if record is None:
+                return None
+            with _cache_lock:
+                _drug_records[drug_id] = record
+    else:
+        # Not an indexed alias: exact match added since the last reload, or
+        # a partial name — one query either way
+        record = _fetch_record(_MATCH_BY_NAME_SQL, {"name": key, "like": f"%{key}%"})
+        with _cache_lock:
+            if record is None:
+                _fallback_matches[key] = None
+                return None
+            _fallback_matches[key] = (record["drug_id"], record["matched_alias"])
+            _drug_records.setdefault(record["drug_id"], record)
+        matched_alias = record["matched_alias"]
+
+    result = copy.deepcopy(record)
+    result["matched_alias"] = matched_alias
+    return result
+
+
 def get_landscape(indication: str) -> list[dict]:
     """
     Get ALL drugs in development for a given indication.
@@ -1553,53 +1923,42 @@ def get_drugs_by_target(target_name: str) -> list[dict]:
       2. Walk DOWN to get all children (e.g., KRAS → G12C, G12D, ...)
       3. Walk UP to get ancestors (e.g., KRAS G12C → KRAS, RAS)
       4. Find all drugs linked to ANY of these target IDs
-    """
-    conn = get_conn()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
 
-    # Resolve target
-    target_id = _resolve_target(cur, target_name)
+    Steps 1-3 are in-memory (TargetTree); step 4 is one pooled query.
+    """
+    tree = get_target_tree()
+    target_id = tree.resolve(target_name)
     if not target_id:
-        cur.close()
-        conn.close()
         return []
 
     # Get all relevant target IDs (subtree + ancestors)
-    subtree_ids = _get_target_subtree_ids(cur, target_id)
-    ancestor_ids = _get_target_ancestor_ids(cur, target_id)
-    all_target_ids = list(set(subtree_ids + ancestor_ids))
-
-    if not all_target_ids:
-        cur.close()
-        conn.close()
-        return []
+    all_target_ids = list(set(tree.descendants.get(target_id, [target_id]) + tree.ancestors.get(target_id, [])))
 
-    # Find all drugs linked to any of these targets
-    cur.execute("""
-        SELECT d.*,
-            ARRAY_AGG(DISTINCT da.alias) FILTER (WHERE da.alias IS NOT NULL) AS all_aliases,
-            ARRAY_AGG(DISTINCT t.name) FILTER (WHERE t.name IS NOT NULL) AS target_names,
-            ARRAY_AGG(DISTINCT t.display_name) FILTER (WHERE t.display_name IS NOT NULL) AS target_displays,
-            ARRAY_AGG(DISTINCT dt.selectivity) FILTER (WHERE dt.selectivity IS NOT NULL) AS selectivities
-        FROM drugs d
-        JOIN drug_targets dt ON d.drug_id = dt.drug_id
-        JOIN targets t ON dt.target_id = t.target_id
-        LEFT JOIN drug_aliases da ON d.drug_id = da.drug_id
-        WHERE dt.target_id = ANY(%s::uuid[])
-        GROUP BY d.drug_id
-        ORDER BY
-            CASE d.phase_highest
-                WHEN 'Approved' THEN 1
-                WHEN 'Phase 3' THEN 2
-                WHEN 'Phase 2' THEN 3
-                ELSE 4
-            END
-    """, (all_target_ids,))
+    def query(cur):
+        # Find all drugs linked to any of these targets
+        cur.execute("""
+            SELECT d.*,
+                ARRAY_AGG(DISTINCT da.alias) FILTER (WHERE da.alias IS NOT NULL) AS all_aliases,
+                ARRAY_AGG(DISTINCT t.name) FILTER (WHERE t.name IS NOT NULL) AS target_names,
+                ARRAY_AGG(DISTINCT t.display_name) FILTER (WHERE t.display_name IS NOT NULL) AS target_displays,
+                ARRAY_AGG(DISTINCT dt.selectivity) FILTER (WHERE dt.selectivity IS NOT NULL) AS selectivities
+            FROM drugs d
+            JOIN drug_targets dt ON d.drug_id = dt.drug_id
+            JOIN targets t ON dt.target_id = t.target_id
+            LEFT JOIN drug_aliases da ON d.drug_id = da.drug_id
+            WHERE dt.target_id = ANY(%s::int[])
+            GROUP BY d.drug_id
+            ORDER BY
+                CASE d.phase_highest
+                    WHEN 'Approved' THEN 1
+                    WHEN 'Phase 3' THEN 2
+                    WHEN 'Phase 2' THEN 3
+                    ELSE 4
+                END
+        """, (all_target_ids,))
+        return [dict(r) for r in cur.fetchall()]
 
-    drugs = [dict(r) for r in cur.fetchall()]
-    cur.close()
-    conn.close()
-    return drugs
+    return _with_pooled_cursor(query)
 
 
 def get_disease_target_landscape(disease: str) -> dict:
@@ -1612,50 +1971,44 @@ def get_disease_target_landscape(disease: str) -> dict:
 
     This is what powers queries like "What is the Alzheimer's drug landscape?"
     — it shows drugs GROUPED BY their biological approach (amyloid, tau, neuro, etc.)
-    """
-    conn = get_conn()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-
-    # Find matching disease-target mappings (fuzzy match on disease name)
-    cur.execute("""
-        SELECT dt.disease, t.name AS target_name, t.display_name,
-               dt.relevance, dt.notes,
-               t.target_id
-        FROM disease_targets dt
-        JOIN targets t ON dt.target_id = t.target_id
-        WHERE LOWER(dt.disease) LIKE LOWER(%s)
-        ORDER BY
-            CASE dt.relevance
-                WHEN 'established' THEN 1
-                WHEN 'emerging' THEN 2
-                WHEN 'exploratory' THEN 3
-                ELSE 4
-            END,
-            t.name
-    """, (f"%{disease}%",))
-
-    mappings = [dict(r) for r in cur.fetchall()]
 
-    if not mappings:
-        cur.close()
-        conn.close()
-        return {"disease": disease, "target_groups": []}
-
-    actual_disease = mappings[0]["disease"]
-    target_groups = []
-
-    for m in mappings:
+    Every group's subtree is expanded through the target_closure table, so
+    the drugs for all groups come back in a single query.
+    """
+    def query(cur):
+        # Find matching disease-target mappings (fuzzy match on disease name)
+        cur.execute("""
+            SELECT dt.disease, t.name AS target_name, t.display_name,
+                   dt.relevance, dt.notes,
+                   t.target_id
+            FROM disease_targets dt
+            JOIN targets t ON dt.target_id = t.target_id
+            WHERE LOWER(dt.disease) LIKE LOWER(%s)
+            ORDER BY
+                CASE dt.relevance
+                    WHEN 'established' THEN 1
+                    WHEN 'emerging' THEN 2
+                    WHEN 'exploratory' THEN 3
+                    ELSE 4
+                END,
+                t.name
+        """, (f"%{disease}%",))
+        mappings = [dict(r) for r in cur.fetchall()]
+        if not mappings:
+            return mappings, []
+
+        actual_disease = mappings[0]["disease"]
         # For each target, find drugs (walking the subtree)
-        subtree_ids = _get_target_subtree_ids(cur, m["target_id"])
-
         cur.execute("""
-            SELECT d.canonical_name, d.company_name, d.company_ticker,
+            SELECT tc.ancestor_id AS group_target_id,
+                   d.canonical_name, d.company_name, d.company_ticker,
                    d.modality, d.mechanism, d.phase_highest, d.status,
                    t.name AS specific_target, dt.selectivity
-            FROM drugs d
-            JOIN drug_targets dt ON d.drug_id = dt.drug_id
+            FROM target_closure tc
+            JOIN drug_targets dt ON dt.target_id = tc.descendant_id
+            JOIN drugs d ON d.drug_id = dt.drug_id
             JOIN targets t ON dt.target_id = t.target_id
-            WHERE dt.target_id = ANY(%s::uuid[])
+            WHERE tc.ancestor_id = ANY(%s::int[])
               AND (LOWER(d.indication_primary) LIKE LOWER(%s)
                    OR EXISTS (SELECT 1 FROM unnest(d.indications) AS ind
                               WHERE LOWER(ind) LIKE LOWER(%s)))
@@ -1665,21 +2018,29 @@ def get_disease_target_landscape(disease: str) -> dict:
                     WHEN 'Phase 2' THEN 3 WHEN 'Phase 1' THEN 4
                     ELSE 5
                 END
-        """, (subtree_ids, f"%{actual_disease}%", f"%{actual_disease}%"))
+        """, (list({m["target_id"] for m in mappings}), f"%{actual_disease}%", f"%{actual_disease}%"))
+        return mappings, [dict(r) for r in cur.fetchall()]
+
+    get_target_tree()  # make sure target_closure is current
+    mappings, drug_rows = _with_pooled_cursor(query)
+    if not mappings:
+        return {"disease": disease, "target_groups": []}
 
-        drugs = [dict(r) for r in cur.fetchall()]
+    drugs_by_group: dict[int, list[dict]] = {}
+    for row in drug_rows:
+        drugs_by_group.setdefault(row.pop("group_target_id"), []).append(row)
 
+    target_groups = []
+    for m in mappings:
         target_groups.append({
             "target_name": m["target_name"],
             "display_name": m["display_name"],
             "relevance": m["relevance"],
             "notes": m["notes"],
-            "drugs": drugs,
+            "drugs": [dict(d) for d in drugs_by_group.get(m["target_id"], [])],
         })
 
-    cur.close()
-    conn.close()
-    return {"disease": actual_disease, "target_groups": target_groups}
+    return {"disease": mappings[0]["disease"], "target_groups": target_groups}
 
 
 def get_pubmed_terms_for_landscape(indication: str) -> list[str]:
@@ -1795,6 +2156,7 @@ if __name__ == "__main__":
     parser.add_argument("--disease", type=str, help="Get disease-target landscape (grouped by biological approach)")
     parser.add_argument("--target", type=str, help="Get all drugs for a target (walks hierarchy)")
     parser.add_argument("--pubmed-terms", type=str, help="Get PubMed search terms for an indication")
+    parser.add_argument("--refresh-closure", action="store_true", help="Rebuild the target_closure table")
     args = parser.parse_args()
 
     if args.setup:
@@ -1808,6 +2170,10 @@ if __name__ == "__main__":
         seed_drugs()
         print("\nDone! Run --lookup, --landscape, --disease, or --target to query.\n")
 
+    elif args.refresh_closure:
+        tree = refresh_target_tree()
+        print(f"\n  {len(tree)} targets, {len(tree.closure_rows())} closure rows\n")
+
     elif args.lookup:
         drug = lookup_drug(args.lookup)
         if drug:
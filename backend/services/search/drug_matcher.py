@@ -0,0 +1,584 @@
+"""
+SatyaBio — Compiled Drug Name Matcher
+
+One linear pass over a piece of text finds every drug mention, instead of
+looping each alias or regex over each trial. Used by
+api_connectors.extract_drug_assets (intervention → canonical drug via the
+entity DB alias map) and global_asset_discovery.build_landscape
+(DRUG_PATTERNS + INN stem detection).
+
+Four pieces:
+  1. AhoCorasick — a plain-Python multi-string automaton. All aliases are
+     matched at once in O(len(text) + matches).
+  2. PatternMatcher — compiles a {regex: payload} table (DRUG_PATTERNS).
+     Regexes that are really just literal alternations (the vast majority:
+     r'\\b(tirzepatide|LY3298176)\\b', r'\\b(CMK-?389)\\b') are expanded into
+     literals and loaded into the automaton, with \\b checked at the match
+     edges. Anything else stays a regex and is run individually.
+  3. AliasMatcher — wraps an {alias_lower: canonical} map with the same
+     exact → parenthetical-stripped → longest-substring lookup that
+     _normalize_intervention_name always did.
+  4. FuzzyIndex — bigram inverted index for typo-tolerant lookups. Narrows
+     a name to the few aliases that *could* reach a SequenceMatcher ratio
+     threshold, then scores only those (EntityResolver.resolve_drug).
+
+Matchers are cached per source table and rebuilt when the table changes
+(a new dict, or a different size), so every module shares one instance.
+
+Usage:
+    from drug_matcher import get_pattern_matcher, get_alias_matcher, INN_PATTERN
+
+    matcher = get_pattern_matcher(DRUG_PATTERNS)
+    for drug_name, moa in matcher.payloads(trial_text):
+        ...
+
+    canonical = get_alias_matcher(alias_map).normalize("Naltrexone XR (Vivitrol)")
+"""
+
+import re
+import math
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Iterable, Iterator, Optional
+
+try:
+    from re import _parser as _sre_parse    # Python 3.11+
+except ImportError:                          # pragma: no cover
+    import sre_parse as _sre_parse
+
+
+# =============================================================================
+# INN stems + pharma code names
+# =============================================================================
+# WHO-assigned naming stems that mark real pharmaceutical compounds. If a
+# word ends with one of these, it's almost certainly a drug.
+
+INN_STEMS = (
+    # Monoclonal antibodies
+    "mab", "zumab", "ximab", "mumab", "tumab", "lumab", "numab", "rumab",
+    # Kinase inhibitors
+    "tinib", "nib", "ciclib", "sertib", "metinib", "ratinib", "citinib", "letinib", "lisib",
+    # Peptides & receptor agonists
+    "tide", "glutide", "reotide", "nakin", "relbin",
+    # Cardiovascular / metabolic
+    "pril", "sartan", "olol", "statin", "vastatin", "prazole", "gliptin", "gliflozin",
+    # Anti-infectives
+    "cillin", "floxacin", "mycin", "cycline", "bactam", "fungin", "vudine", "virin",
+    # Anti-coagulants / respiratory
+    "parin", "lukast",
+    # Other stems (newer naming)
+    "tug", "kibart", "kecept", "nermin", "ceptin", "platin", "rubicin",
+    "fenacin", "lukine", "poetin", "tropin", "fibatide", "gatran",
+    # ADC / fusion / bispecific suffixes
+    "vedotin", "mertansine", "tansine", "ozogamicin", "ravtansine",
+    "fusp", "cept",
+)
+
+_STEM_ALT = "|".join(INN_STEMS)
+
+# A single token that ends in an INN stem (e.g. "nemolizumab", "abrocitinib")
+INN_PATTERN = re.compile(rf"^[a-z].*(?:{_STEM_ALT})$", re.IGNORECASE)
+
+# Every INN-stem word in free text, in one scan
+INN_MENTION_PATTERN = re.compile(rf"\b[a-z][\w-]*?(?:{_STEM_ALT})\b", re.IGNORECASE)
+
+# Alphanumeric codes for experimental compounds (KT-621, PF-06939926, BM512)
+CODE_NAME_PATTERN = re.compile(
+    r'^[A-Z]{1,5}[\-]?\d{2,7}[A-Z]?$|'          # KT-621, PJ009, BM512, PF-06939926
+    r'^[A-Z]{2,6}[\-]\d{2,}(?:[\-]\d+)?$|'       # ABT-494, SHR-1819, BAY81-2996
+    r'^[A-Z]\d{4,}$',                             # E7080
+    re.IGNORECASE
+)
+
+
+def find_inn_mentions(text: str) -> list[str]:
+    """All words in `text` carrying an INN stem, in order of appearance."""
+    return [m.group(0) for m in INN_MENTION_PATTERN.finditer(text or "")]
+
+
+# =============================================================================
+# Aho-Corasick automaton
+# =============================================================================
+
+class AhoCorasick:
+    """
+    Multi-string matcher. add() keys, build() once, then iter() yields every
+    (start, end, value) occurrence — overlapping ones included — in a single
+    pass over the text. Keys may be added after a build; the next iter()
+    rebuilds the failure links.
+    """
+
+    def __init__(self):
+        self._goto: list[dict] = [{}]
+        self._fail: list[int] = [0]
+        self._own: list[list] = [[]]   # keys ending exactly at each state
+        self._out: list[list] = [[]]   # _own plus outputs along failure links
+        self._built = False
+
+    def add(self, key: str, value):
+        if not key:
+            return
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            state = nxt
+        self._own[state].append((len(key), value))
+        self._built = False
+
+    def build(self):
+        """Compute failure links (BFS) and merge outputs along them."""
+        self._out = [list(own) for own in self._own]
+        queue = list(self._goto[0].values())
+        for s in queue:
+            self._fail[s] = 0
+        i = 0
+        while i < len(queue):
+            state = queue[i]
+            i += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def iter(self, text: str) -> Iterator[tuple[int, int, object]]:
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield i + 1 - length, i + 1, value
+
+    def __len__(self):
+        return len(self._goto) - 1
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    """Python's \\b: word/non-word transition (text edges count as non-word)."""
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
+
+
+# =============================================================================
+# Regex → literal expansion
+# =============================================================================
+
+_BOUNDARY = object()
+_MAX_EXPANSIONS = 64
+
+
+def _expand(items, limit: int) -> Optional[list[list]]:
+    """
+    Expand a parsed regex sequence into every literal string it can match.
+    Returns None when the pattern isn't a finite literal set (or is too big).
+    """
+    results: list[list] = [[]]
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            options = [[chr(av)]]
+        elif name == "IN":
+            options = []
+            for sub_op, sub_av in av:
+                if str(sub_op) != "LITERAL":
+                    return None
+                options.append([chr(sub_av)])
+        elif name == "SUBPATTERN":
+            options = _expand(av[-1], limit)
+        elif name == "BRANCH":
+            options = []
+            for branch in av[1]:
+                expanded = _expand(branch, limit)
+                if expanded is None:
+                    return None
+                options.extend(expanded)
+        elif name == "MAX_REPEAT" or name == "MIN_REPEAT":
+            lo, hi, sub = av
+            if (lo, hi) != (0, 1):
+                return None
+            expanded = _expand(sub, limit)
+            if expanded is None:
+                return None
+            options = [[]] + expanded
+        elif name == "AT" and str(av) == "AT_BOUNDARY":
+            options = [[_BOUNDARY]]
+        else:
+            return None
+        if options is None:
+            return None
+        results = [r + o for r in results for o in options]
+        if len(results) > limit:
+            return None
+    return results
+
+
+def expand_literal_pattern(pattern: str) -> Optional[list[tuple[str, bool, bool]]]:
+    """
+    Turn a literal-alternation regex into [(literal, needs_left_b, needs_right_b)].
+    Returns None if the regex uses anything beyond literals, [..] sets of
+    literals, ?, |, groups and \\b at the edges.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except re.error:
+        return None
+    expanded = _expand(list(parsed), _MAX_EXPANSIONS)
+    if not expanded:
+        return None
+
+    literals = []
+    for seq in expanded:
+        left = bool(seq) and seq[0] is _BOUNDARY
+        right = bool(seq) and seq[-1] is _BOUNDARY
+        core = seq[int(left):len(seq) - int(right)] if seq else []
+        if not core or any(c is _BOUNDARY for c in core):
+            return None
+        literals.append(("".join(core), left, right))
+    return literals
+
+
+# =============================================================================
+# Pattern table matcher (DRUG_PATTERNS)
+# =============================================================================
+
+class PatternMatcher:
+    """
+    Case-insensitive matcher for a {regex: payload} table. matches(text)
+    returns the same set of patterns that `re.search(p, text, re.I)` would
+    hit for each p, in table order.
+    """
+
+    def __init__(self, table: dict):
+        self.patterns = list(table.keys())
+        self.payload_list = list(table.values())
+        self._automaton = AhoCorasick()
+        self._fallback: list[tuple[int, re.Pattern]] = []
+
+        for idx, pattern in enumerate(self.patterns):
+            literals = expand_literal_pattern(pattern)
+            if literals is None:
+                self._fallback.append((idx, re.compile(pattern, re.IGNORECASE)))
+                continue
+            for literal, left, right in literals:
+                self._automaton.add(literal.lower(), (idx, left, right))
+        self._automaton.build()
+
+    def _regex_matches(self, text: str) -> list[int]:
+        return [i for i, p in enumerate(self.patterns) if re.search(p, text, re.IGNORECASE)]
+
+    def matches(self, text: str) -> list[int]:
+        """Indices of every pattern found in `text`, in table order."""
+        if not text:
+            return []
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rare Unicode case mappings shift offsets — fall back to plain regex
+            return self._regex_matches(text)
+
+        hit = set()
+        for start, end, (idx, left, right) in self._automaton.iter(lowered):
+            if idx in hit:
+                continue
+            if left and not _at_boundary(text, start):
+                continue
+            if right and not _at_boundary(text, end):
+                continue
+            hit.add(idx)
+        for idx, rx in self._fallback:
+            if rx.search(text):
+                hit.add(idx)
+        return sorted(hit)
+
+    def first(self, text: str) -> Optional[int]:
+        found = self.matches(text)
+        return found[0] if found else None
+
+    def payloads(self, text: str) -> list:
+        """Payloads of every matching pattern, in table order."""
+        return [self.payload_list[i] for i in self.matches(text)]
+
+
+# =============================================================================
+# Alias map matcher (drugs + drug_aliases)
+# =============================================================================
+
+_PAREN_RE = re.compile(r"\s*\([^)]*\)\s*")
+
+
+class AliasMatcher:
+    """
+    Normalizes free-text intervention names against {alias_lower: canonical}.
+    Lookup order: exact → parentheticals stripped → longest alias (≥ min_len
+    chars) occurring anywhere in the name, earliest-loaded alias on ties.
+    """
+
+    def __init__(self, alias_map: dict[str, str], min_len: int = 4):
+        self.alias_map = alias_map
+        self._automaton = AhoCorasick()
+        for order, alias in enumerate(alias_map):
+            if len(alias) >= min_len:
+                self._automaton.add(alias, (order, alias))
+        self._automaton.build()
+
+    def longest_alias(self, text: str) -> Optional[str]:
+        best = None
+        for _start, _end, (order, alias) in self._automaton.iter(text):
+            if best is None or len(alias) > len(best[1]) or (len(alias) == len(best[1]) and order < best[0]):
+                best = (order, alias)
+        return best[1] if best else None
+
+    def normalize(self, raw: str) -> str:
+        if not raw:
+            return raw
+        s = raw.lower().strip()
+        if s in self.alias_map:
+            return self.alias_map[s]
+        stripped = _PAREN_RE.sub(" ", s).strip()
+        if stripped and stripped in self.alias_map:
+            return self.alias_map[stripped]
+        alias = self.longest_alias(s)
+        if alias is not None:
+            return self.alias_map[alias]
+        return raw
+
+    def mentions(self, text: str) -> list[tuple[int, int, str]]:
+        """Every alias occurrence on word boundaries: [(start, end, canonical)]."""
+        lowered = (text or "").lower()
+        if len(lowered) != len(text or ""):
+            return []
+        return [
+            (start, end, self.alias_map[alias])
+            for start, end, (_order, alias) in self._automaton.iter(lowered)
+            if _at_boundary(lowered, start) and _at_boundary(lowered, end)
+        ]
+
+
+# =============================================================================
+# Fuzzy candidate index
+# =============================================================================
+
+def _bigrams(key: str) -> Counter:
+    padded = f"\x02{key}\x03"
+    return Counter(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+class FuzzyIndex:
+    """
+    Best SequenceMatcher match for a name among many keys, without scoring
+    every key.
+
+    SequenceMatcher.ratio() is 2*M / (len(a) + len(b)), where the M matched
+    characters form a common subsequence. So ratio >= t means the strings
+    are at most d = floor((len(a) + len(b)) * (1 - t)) insertions/deletions
+    apart, and each edit destroys at most two padded bigrams: a qualifying
+    key shares >= max(len(a), len(b)) + 1 - 2d bigrams with the query, and
+    its length lies within a t-dependent window. Keys failing either bound
+    can't reach t and are skipped; when the bigram bound is vacuous (very
+    short strings) the whole length bucket is scored.
+
+    best() returns exactly what scoring every key in insertion order would:
+    the first key with the highest ratio, if that ratio >= threshold.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._keys: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._by_length: dict[int, list[int]] = {}
+        # length → bigram → [(key id, count)]: only lengths in the query's
+        # window are ever read
+        self._postings: dict[int, dict[str, list[tuple[int, int]]]] = {}
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: str):
+        return key in self._ids
+
+    def add(self, key: str):
+        """Index a key; re-adding one keeps its original position."""
+        if key in self._ids:
+            return
+        key_id = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = key_id
+        self._by_length.setdefault(len(key), []).append(key_id)
+        postings = self._postings.setdefault(len(key), {})
+        for gram, count in _bigrams(key).items():
+            postings.setdefault(gram, []).append((key_id, count))
+
+    def candidates(self, query: str, threshold: float) -> list[int]:
+        """Ids of every key that could score >= threshold, in insertion order."""
+        la = len(query)
+        if la == 0 or threshold <= 0:
+            return list(range(len(self._keys)))
+        lo = math.ceil(la * threshold / (2 - threshold) - 1e-9)
+        hi = math.floor(la * (2 - threshold) / threshold + 1e-9)
+
+        # Minimum shared bigrams per candidate length (<= 0: no filtering)
+        required: dict[int, int] = {}
+        for lb in range(max(lo, 0), hi + 1):
+            if lb in self._by_length:
+                max_edits = math.floor((la + lb) * (1 - threshold) + 1e-9)
+                required[lb] = max(la, lb) + 1 - 2 * max_edits
+        if not required:
+            return []
+
+        grams = _bigrams(query).items()
+        ids = []
+        for lb, need in required.items():
+            if need <= 0:
+                ids.extend(self._by_length[lb])
+                continue
+            postings = self._postings[lb]
+            shared: dict[int, int] = {}
+            for gram, q_count in grams:
+                for key_id, k_count in postings.get(gram, ()):
+                    shared[key_id] = shared.get(key_id, 0) + (q_count if q_count < k_count else k_count)
+            ids.extend(k for k, n in shared.items() if n >= need)
+        ids.sort()
+        return ids
+
+    def best(self, query: str, threshold: float) -> Optional[tuple[str, float]]:
+        """(key, ratio) of the best match scoring >= threshold, else None."""
+        matcher = SequenceMatcher(None, query)
+        best_key, best_score = None, 0.0
+        for key_id in self.candidates(query, threshold):
+            key = self._keys[key_id]
+            matcher.set_seq2(key)
+            # quick_ratio() is an upper bound on ratio(); skip keys that can't win
+            if matcher.quick_ratio() <= best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score:
+                best_key, best_score = key, score
+        if best_key is None or best_score < threshold:
+            return None
+        return best_key, best_score
+
+    def top(self, query: str, threshold: float, limit: Optional[int] = None) -> list[tuple[str, float]]:
+        """Every (key, ratio) scoring >= threshold, best first (ties in insertion order)."""
+        matcher = SequenceMatcher(None, query)
+        scored = []
+        for key_id in self.candidates(query, threshold):
+            matcher.set_seq2(self._keys[key_id])
+            if matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score >= threshold:
+                scored.append((-score, key_id))
+        scored.sort()
+        if limit is not None:
+            scored = scored[:limit]
+        return [(self._keys[key_id], -neg) for neg, key_id in scored]
+
+
+# =============================================================================
+# Shared instances
+# =============================================================================
+
+_cache: dict[str, tuple[tuple, object]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cached(kind: str, table: dict, factory):
+    # Rebuild when the caller hands us a different table object or it has
+    # grown/shrunk since the last build.
+    signature = (id(table), len(table))
+    with _cache_lock:
+        hit = _cache.get(kind)
+        if hit and hit[0] == signature:
+            return hit[1]
+    matcher = factory(table)
+    with _cache_lock:
+        _cache[kind] = (signature, matcher)
+    return matcher
+
+
+def get_pattern_matcher(table: dict, name: str = "drug_patterns") -> PatternMatcher:
+    """Shared PatternMatcher for a regex table (e.g. DRUG_PATTERNS)."""
+    return _cached(f"patterns:{name}", table, PatternMatcher)
+
+
+def get_alias_matcher(alias_map: dict[str, str], name: str = "drug_aliases") -> AliasMatcher:
+    """Shared AliasMatcher for an alias map (e.g. api_connectors._get_drug_alias_map())."""
+    return _cached(f"aliases:{name}", alias_map, AliasMatcher)
+
+
+def invalidate():
+    """Drop every cached matcher (call after bulk alias/pattern edits)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+if __name__ == "__main__":
+    # Fuzzy lookup throughput: FuzzyIndex vs a full SequenceMatcher scan
+    #   python3 drug_matcher.py [n_aliases] [n_queries]
+    import sys
+    import time
+    import random
+
+    n_aliases = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    suffixes = ("mab", "tinib", "glutide", "-101", "")
+    aliases = list(dict.fromkeys(
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 14))) + rng.choice(suffixes)
+        for _ in range(n_aliases)
+    ))
+
+    def typo(word: str) -> str:
+        chars = list(word)
+        i = rng.randrange(len(chars))
+        chars[i:i + 1] = rng.choice(([], [rng.choice(letters)], [chars[i], rng.choice(letters)]))
+        return "".join(chars)
+
+    queries = [typo(rng.choice(aliases)) for _ in range(n_queries)]
+
+    start = time.perf_counter()
+    index = FuzzyIndex(aliases)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.best(q, 0.85) for q in queries]
+    index_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = []
+    for q in queries:
+        best, best_score = None, 0.0
+        for alias in aliases:
+            score = SequenceMatcher(None, q, alias).ratio()
+            if score > best_score:
+                best, best_score = alias, score
+        scanned.append((best, best_score) if best and best_score >= 0.85 else None)
+    scan_s = time.perf_counter() - start
+
+    print(f"{len(aliases):,} aliases, {n_queries} queries, threshold 0.85")
+    print(f"  index build   {build_s * 1000:8.1f} ms")
+    print(f"  FuzzyIndex    {n_queries / index_s:8.0f} lookups/s")
+    print(f"  full scan     {n_queries / scan_s:8.1f} lookups/s")
+    print(f"  same results: {indexed == scanned}")
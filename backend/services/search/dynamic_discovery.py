@@ -43,6 +43,8 @@ load_dotenv()
 
 import requests
 
+import ctgov_client
+
 try:
     import anthropic
     CLAUDE_AVAILABLE = True
@@ -59,7 +61,7 @@ except ImportError:
 
 DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
-CTGOV_BASE = "https://clinicaltrials.gov/api/v2/studies"
+CTGOV_BASE = ctgov_client.CTGOV_BASE
 OPENTARGETS_API = "https://api.platform.opentargets.org/api/v4/graphql"
 
 # Cache TTLs
@@ -1141,13 +1143,7 @@ def _fetch_ctgov(condition: str = "", intervention: str = "", term: str = "",
         params["query.locn"] = country
 
     try:
-        resp = requests.get(
-            CTGOV_BASE, params=params,
-            headers={"User-Agent": "SatyaBio/2.0 Dynamic Discovery"},
-            timeout=20,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        data = ctgov_client.get_json(params, timeout=20)
     except Exception as e:
         print(f"  [CT.gov] API error: {e}")
         return []
@@ -49,7 +49,7 @@ from datetime import datetime, timezone
 from dotenv import load_dotenv
 load_dotenv()
 
-import requests
+import ctgov_client
 
 # ─── Optional imports ─────────────────────────────────────────────────────────
 
@@ -68,7 +68,7 @@ except ImportError:
 
 DATABASE_URL = os.getenv("NEON_DATABASE_URL", "")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
-CTGOV_BASE = "https://clinicaltrials.gov/api/v2/studies"
+CTGOV_BASE = ctgov_client.CTGOV_BASE
 
 
 # ─── Layer 1: ClinicalTrials.gov Lookup ──────────────────────────────────────
@@ -104,15 +104,9 @@ def lookup_drug_on_ctgov(drug_name, max_results=10):
                 "query.intr": term,
                 "pageSize": max_results,
             }
-            resp = requests.get(
-                CTGOV_BASE, params=params,
-                headers={"User-Agent": "SatyaBio-Enrichment/1.0"},
-                timeout=15,
-            )
-            if resp.ok:
-                data = resp.json()
-                for study in data.get("studies", []):
-                    all_studies.append(study)
+            data = ctgov_client.get_json(params, timeout=15)
+            for study in data.get("studies", []):
+                all_studies.append(study)
         except Exception as e:
             print(f"    [CT.gov] Intervention search error for '{term}': {e}")
 
@@ -123,15 +117,9 @@ def lookup_drug_on_ctgov(drug_name, max_results=10):
                 "query.term": term,
                 "pageSize": max_results,
             }
-            resp = requests.get(
-                CTGOV_BASE, params=params,
-                headers={"User-Agent": "SatyaBio-Enrichment/1.0"},
-                timeout=15,
-            )
-            if resp.ok:
-                data = resp.json()
-                for study in data.get("studies", []):
-                    all_studies.append(study)
+            data = ctgov_client.get_json(params, timeout=15)
+            for study in data.get("studies", []):
+                all_studies.append(study)
         except Exception as e:
             print(f"    [CT.gov] Term search error for '{term}': {e}")
 
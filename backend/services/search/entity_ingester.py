@@ -75,6 +75,7 @@ def get_conn():
 
 # Import our other modules
 from api_connectors import search_clinical_trials, search_pubmed
+from entity_resolver import EntityResolver
 
 try:
     from drug_entities import get_conn, lookup_drug
@@ -460,29 +461,36 @@ def ingest_entities_from_document(
     stats = {"drugs_found": len(drugs_data), "new_drugs": 0, "new_aliases": 0, "updated": 0}
 
     for drug_data in drugs_data:
-        drug_name = drug_data.get("drug_name", "").strip()
-        if not drug_name or len(drug_name) < 2:
-            continue
-
         other_names = drug_data.get("other_names", [])
         if isinstance(other_names, str):
             other_names = [n.strip() for n in other_names.split(",")]
+        drug_data["other_names"] = other_names
+
+    # Check which drugs already exist (by any name) in one query. Exact
+    # aliases only: this path writes aliases, so no fuzzy merging.
+    resolver = EntityResolver()
+    resolver.connect(conn, load_caches=False)
+    batch = resolver.resolve_many(
+        (name for d in drugs_data for name in [d.get("drug_name", "")] + d["other_names"]),
+        source_document=filename,
+        fuzzy=False,
+    )
+    # lowercase name -> drug_id; grows as drugs and aliases are created below
+    known_ids = {name: int(entity.entity_id) for name, entity in batch.resolved.items()}
+    print(f"  {len(known_ids)}/{batch.stats['unique']} names already known")
 
-        # Check if drug exists (by any name)
+    for drug_data in drugs_data:
+        drug_name = drug_data.get("drug_name", "").strip()
+        if not drug_name or len(drug_name) < 2:
+            continue
+
+        other_names = drug_data["other_names"]
         all_names = [drug_name] + other_names
         existing_drug_id = None
 
         for name in all_names:
-            cur.execute("""
-                SELECT d.drug_id, d.canonical_name
-                FROM drugs d
-                JOIN drug_aliases da ON d.drug_id = da.drug_id
-                WHERE LOWER(da.alias) = LOWER(%s)
-                LIMIT 1
-            """, (name.strip(),))
-            row = cur.fetchone()
-            if row:
-                existing_drug_id = row["drug_id"]
+            existing_drug_id = known_ids.get(name.strip().lower())
+            if existing_drug_id:
                 break
 
         if existing_drug_id:
@@ -497,6 +505,7 @@ def ingest_entities_from_document(
                     """, (existing_drug_id, other_name, f"Auto-extracted from {filename}"))
                     if cur.rowcount > 0:
                         stats["new_aliases"] += 1
+                        known_ids.setdefault(other_name.lower(), existing_drug_id)
                         print(f"    + New alias: {other_name} → drug_id {existing_drug_id}")
 
             stats["updated"] += 1
@@ -527,6 +536,10 @@ def ingest_entities_from_document(
             if result:
                 drug_id = result["drug_id"]
                 stats["new_drugs"] += 1
+                # Later drugs in this document may name it too
+                for name in all_names:
+                    if name.strip():
+                        known_ids.setdefault(name.strip().lower(), drug_id)
 
                 # Add canonical + other aliases
                 cur.execute("""
@@ -7,7 +7,7 @@ to canonical entity IDs in the knowledge graph.
 This replaces the simple alias mapping table from the old SatyaBio system
 with a multi-strategy resolver that handles:
 - Direct alias lookup (fastest path)
-- Fuzzy matching for typos and abbreviations
+- Fuzzy matching for typos and abbreviations (bigram-indexed, see drug_matcher.FuzzyIndex)
 - Context-aware resolution (target + modality + company narrows to one drug)
 - IST detection (academic papers that reference a drug without naming the company)
 
@@ -30,15 +30,35 @@ Usage:
 
     # Bulk resolve from a document
     entities = resolver.resolve_document_entities(text="...press release text...")
+
+    # Batch-resolve candidate names (dedupes, one query for cache misses)
+    batch = resolver.resolve_many(["ASP2215", "Xospata", "gilteritinb"], context="ASH abstract")
+    batch.get("xospata")   # -> ResolvedEntity
+    batch.stats            # {"inputs": 3, "exact_alias": 2, "fuzzy": 1, ...}
+
+    # Database-free resolver over a curated alias map
+    resolver = EntityResolver.from_aliases({"keytruda": "pembrolizumab"})
 """
 
 import re
-from dataclasses import dataclass
-from difflib import SequenceMatcher
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+try:
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+except ImportError:
+    # from_aliases() resolvers work without a database
+    psycopg2 = None
+    RealDictCursor = None
+
+from drug_matcher import FuzzyIndex
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+# Unresolved names carry their closest aliases (at this ratio) for review
+REVIEW_THRESHOLD = 0.6
+REVIEW_CANDIDATES = 3
+
+_DIGITS = re.compile(r"\d+")
 
 
 @dataclass
@@ -62,23 +82,38 @@ class UnresolvedEntity:
     source_document: str
 
 
+@dataclass
+class BatchResolution:
+    """Outcome of EntityResolver.resolve_many()."""
+    resolved: dict = field(default_factory=dict)    # normalized name -> ResolvedEntity
+    unresolved: list = field(default_factory=list)  # [UnresolvedEntity, ...]
+    stats: dict = field(default_factory=dict)       # inputs, unique, hits per strategy, queries
+
+    def get(self, name: Optional[str]) -> Optional[ResolvedEntity]:
+        """The resolution for a name as it was passed in (any case/whitespace)."""
+        if not name:
+            return None
+        return self.resolved.get(name.strip().lower())
+
+
 class EntityResolver:
     """
     Multi-strategy entity resolver for biotech knowledge graph.
 
     Resolution priority:
     1. Exact alias match (case-insensitive) — instant
-    2. Fuzzy string match against all aliases — catches typos
+    2. Fuzzy string match against indexed candidate aliases — catches typos
     3. Context-based resolution — target + modality + company
     4. Provisional entity creation — new drug not yet in graph
     """
 
-    def __init__(self, db_url: str, fuzzy_threshold: float = 0.85):
+    def __init__(self, db_url: Optional[str] = None, fuzzy_threshold: float = 0.85):
         self.db_url = db_url
         self.fuzzy_threshold = fuzzy_threshold
         self._conn = None
         # Cache alias table in memory for fast lookups
         self._alias_cache: dict[str, tuple[str, str]] = {}  # lowercase alias -> (drug_id, canonical_name)
+        self._alias_index = FuzzyIndex()  # bigram index over _alias_cache keys
         self._target_cache: dict[str, str] = {}  # lowercase symbol -> target_id
         self._company_cache: dict[str, str] = {}  # lowercase name/ticker -> company_id
 
@@ -86,10 +121,29 @@ class EntityResolver:
     # Connection management
     # ------------------------------------------------------------------
 
-    def connect(self):
-        """Connect to Postgres and load caches."""
-        self._conn = psycopg2.connect(self.db_url)
-        self._load_caches()
+    def connect(self, conn=None, load_caches: bool = True):
+        """
+        Connect to Postgres (or adopt an open connection) and load caches.
+
+        With load_caches=False nothing is preloaded: resolve_many() then
+        answers every name with its single set-based query, which is cheaper
+        than loading the alias tables for a one-off batch.
+        """
+        self._conn = conn or psycopg2.connect(self.db_url)
+        if load_caches:
+            self._load_caches()
+
+    @classmethod
+    def from_aliases(cls, aliases: dict, fuzzy_threshold: float = 0.85) -> "EntityResolver":
+        """
+        Database-free resolver over an alias -> canonical name map (e.g. a
+        curated watchlist). The canonical name doubles as the entity_id.
+        """
+        resolver = cls(fuzzy_threshold=fuzzy_threshold)
+        for alias, canonical in aliases.items():
+            if alias and canonical:
+                resolver._cache_alias(alias, canonical, canonical)
+        return resolver
 
     def _load_caches(self):
         """Load alias tables into memory for fast resolution."""
@@ -101,17 +155,11 @@ class EntityResolver:
                 JOIN drugs d ON da.drug_id = d.drug_id
             """)
             for row in cur.fetchall():
-                self._alias_cache[row["alias"].lower()] = (
-                    str(row["drug_id"]),
-                    row["canonical_name"],
-                )
+                self._cache_alias(row["alias"], str(row["drug_id"]), row["canonical_name"])
             # Also add canonical names as aliases
             cur.execute("SELECT drug_id, canonical_name FROM drugs")
             for row in cur.fetchall():
-                self._alias_cache[row["canonical_name"].lower()] = (
-                    str(row["drug_id"]),
-                    row["canonical_name"],
-                )
+                self._cache_alias(row["canonical_name"], str(row["drug_id"]), row["canonical_name"])
 
             # Targets — use 'name' column (gene symbol) from existing schema
             cur.execute("SELECT target_id, name, display_name FROM targets")
@@ -125,6 +173,12 @@ class EntityResolver:
             for row in cur.fetchall():
                 self._target_cache[row["alias"].lower()] = str(row["target_id"])
 
+    def _cache_alias(self, alias: str, drug_id: str, canonical: str):
+        """Add an alias to the in-memory cache and the fuzzy index."""
+        key = alias.lower()
+        self._alias_cache[key] = (drug_id, canonical)
+        self._alias_index.add(key)
+
     # ------------------------------------------------------------------
     # Drug resolution
     # ------------------------------------------------------------------
@@ -148,17 +202,12 @@ class EntityResolver:
                 input_text=name,
             )
 
-        # Strategy 2: Fuzzy match
-        best_match = None
-        best_score = 0.0
-        for alias, (drug_id, canonical) in self._alias_cache.items():
-            score = SequenceMatcher(None, normalized, alias).ratio()
-            if score > best_score:
-                best_score = score
-                best_match = (drug_id, canonical, alias)
-
-        if best_match and best_score >= self.fuzzy_threshold:
-            drug_id, canonical, matched_alias = best_match
+        # Strategy 2: Fuzzy match — only aliases that can clear the threshold
+        # are scored; the winner is the same as a full SequenceMatcher scan.
+        match = self._alias_index.best(normalized, self.fuzzy_threshold)
+        if match:
+            matched_alias, best_score = match
+            drug_id, canonical = self._alias_cache[matched_alias]
             return ResolvedEntity(
                 entity_type="drug",
                 entity_id=drug_id,
@@ -170,6 +219,126 @@ class EntityResolver:
 
         return None
 
+    def resolve_many(
+        self,
+        names: Iterable[str],
+        context: str = "",
+        source_document: str = "unknown",
+        fuzzy: bool = True,
+    ) -> BatchResolution:
+        """
+        Resolve a batch of drug names in one pass.
+
+        Names are de-duplicated case-insensitively, then:
+        1. Exact alias hits come straight from the in-memory cache.
+        2. The remaining names go to the database in ONE query (aliases and
+           canonical names added since the cache was loaded); hits are
+           cached for later calls.
+        3. What's left is fuzzy-matched against the alias index, as in
+           resolve_drug(), except that a match must contain the same digits
+           as the input, so development codes one digit apart (AZD5305 vs
+           AZD5363) are never merged. fuzzy=False skips this step.
+        Names still unresolved come back as UnresolvedEntity records with
+        `context`, `source_document` and their closest aliases.
+        """
+        stats = {
+            "inputs": 0, "unique": 0, "exact_alias": 0, "database": 0,
+            "fuzzy": 0, "unresolved": 0, "queries": 0,
+        }
+        spellings: dict[str, str] = {}  # normalized -> first spelling seen
+        for name in names:
+            stats["inputs"] += 1
+            normalized = (name or "").strip().lower()
+            if normalized and normalized not in spellings:
+                spellings[normalized] = name
+        stats["unique"] = len(spellings)
+
+        batch = BatchResolution(stats=stats)
+        misses = []
+        for normalized, name in spellings.items():
+            if normalized in self._alias_cache:
+                batch.resolved[normalized] = self._resolved(normalized, "exact_alias", 1.0, name)
+                stats["exact_alias"] += 1
+            else:
+                misses.append(normalized)
+
+        if misses and self._conn is not None:
+            found = self._lookup_aliases(misses)
+            stats["queries"] += 1
+            still_missing = []
+            for normalized in misses:
+                if normalized in found:
+                    drug_id, canonical = found[normalized]
+                    self._cache_alias(normalized, drug_id, canonical)
+                    batch.resolved[normalized] = self._resolved(
+                        normalized, "exact_alias", 1.0, spellings[normalized]
+                    )
+                    stats["database"] += 1
+                else:
+                    still_missing.append(normalized)
+            misses = still_missing
+
+        for normalized in misses:
+            ranked = self._alias_index.top(normalized, min(REVIEW_THRESHOLD, self.fuzzy_threshold))
+            if fuzzy:
+                digits = _DIGITS.findall(normalized)
+                match = next(
+                    (
+                        (alias, score) for alias, score in ranked
+                        if score >= self.fuzzy_threshold and _DIGITS.findall(alias) == digits
+                    ),
+                    None,
+                )
+                if match:
+                    batch.resolved[normalized] = self._resolved(
+                        match[0], "fuzzy", match[1], spellings[normalized]
+                    )
+                    stats["fuzzy"] += 1
+                    continue
+            batch.unresolved.append(UnresolvedEntity(
+                entity_type="drug",
+                input_text=spellings[normalized],
+                context=context,
+                candidates=[
+                    {"alias": alias, "canonical_name": self._alias_cache[alias][1], "score": round(score, 3)}
+                    for alias, score in ranked[:REVIEW_CANDIDATES]
+                ],
+                source_document=source_document,
+            ))
+            stats["unresolved"] += 1
+
+        return batch
+
+    def _resolved(self, alias: str, method: str, confidence: float, name: str) -> ResolvedEntity:
+        drug_id, canonical = self._alias_cache[alias]
+        return ResolvedEntity(
+            entity_type="drug",
+            entity_id=drug_id,
+            canonical_name=canonical,
+            match_method=method,
+            confidence=confidence,
+            input_text=name,
+        )
+
+    def _lookup_aliases(self, normalized_names: list) -> dict:
+        """One query for many names: lowercase alias/canonical name -> (drug_id, canonical_name)."""
+        with self._conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT LOWER(da.alias) AS name, d.drug_id, d.canonical_name
+                FROM drug_aliases da
+                JOIN drugs d ON da.drug_id = d.drug_id
+                WHERE LOWER(da.alias) = ANY(%s)
+                UNION ALL
+                SELECT LOWER(d.canonical_name) AS name, d.drug_id, d.canonical_name
+                FROM drugs d
+                WHERE LOWER(d.canonical_name) = ANY(%s)
+            """, (normalized_names, normalized_names))
+            rows = cur.fetchall()
+        found = {}
+        for row in rows:
+            found.setdefault(row["name"], (str(row["drug_id"]), row["canonical_name"]))
+        return found
+
     def resolve_drug_by_context(
         self,
         target: Optional[str] = None,
@@ -363,7 +532,7 @@ class EntityResolver:
             )
             row = cur.fetchone()
             if row:
-                self._alias_cache[alias.lower()] = (drug_id, row["canonical_name"])
+                self._cache_alias(alias, drug_id, row["canonical_name"])
 
     def create_provisional_drug(
         self,
@@ -398,5 +567,5 @@ class EntityResolver:
         self._conn.commit()
 
         # Update cache
-        self._alias_cache[name.lower()] = (drug_id, name)
+        self._cache_alias(name, drug_id, name)
         return drug_id
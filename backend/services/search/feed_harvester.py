@@ -0,0 +1,237 @@
+"""
+SatyaBio — Concurrent Feed Harvester
+
+Fetches RSS feeds, listing pages and article bodies for the regional news
+miner concurrently instead of one at a time with a sleep between each.
+Politeness is applied per domain, not globally: a dozen different hosts are
+fetched in parallel while requests to the same host stay spaced out.
+
+What it does:
+  1. asyncio fan-out over a pooled requests.Session (each GET runs in a
+     worker thread, as ctgov_client.aget_json does), capped at
+     NEWS_HARVEST_MAX_CONNECTIONS requests in flight overall.
+  2. HostLimiter: at most NEWS_HARVEST_PER_HOST requests in flight per host
+     and NEWS_HARVEST_HOST_INTERVAL seconds between request starts to it.
+  3. Conditional GET for feeds and listing pages: the last body is kept on
+     disk with its ETag / Last-Modified, revalidated with If-None-Match /
+     If-Modified-Since, and a 304 is answered from the stored body.
+
+Usage:
+    from feed_harvester import fetch_many, run_sync
+
+    pages = run_sync(fetch_many(feed_urls, conditional=True))
+    for url, page in pages.items():
+        if page.ok:
+            parse(page.body)
+
+Environment:
+    NEWS_HARVEST_PER_HOST         concurrent requests per host (default 2)
+    NEWS_HARVEST_HOST_INTERVAL    seconds between request starts per host (default 1.0)
+    NEWS_HARVEST_MAX_CONNECTIONS  concurrent requests overall (default 16)
+    NEWS_FEED_CACHE_DIR           default: <repo>/data/cache/news_feeds
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+import concurrent.futures
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+PER_HOST = int(os.environ.get("NEWS_HARVEST_PER_HOST", 2))
+HOST_INTERVAL = float(os.environ.get("NEWS_HARVEST_HOST_INTERVAL", 1.0))
+MAX_CONNECTIONS = int(os.environ.get("NEWS_HARVEST_MAX_CONNECTIONS", 16))
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+CACHE_DIR = Path(os.environ.get("NEWS_FEED_CACHE_DIR", _REPO_ROOT / "data" / "cache" / "news_feeds"))
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) SatyaBio-NewsMiner/1.0"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+@dataclass
+class Fetched:
+    """One harvested URL. body is None when nothing usable came back."""
+    url: str
+    status: int
+    body: Optional[str]
+    not_modified: bool = False    # 304 — body is the stored copy
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.body is not None
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session sized for the harvester's concurrency."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=MAX_CONNECTIONS, pool_maxsize=MAX_CONNECTIONS)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update({"User-Agent": USER_AGENT})
+                _session = s
+    return _session
+
+
+# =============================================================================
+# Per-host politeness
+# =============================================================================
+
+class HostLimiter:
+    """
+    Per-host concurrency and spacing for asyncio fetches.
+
+    Each host gets its own semaphore (per_host slots) and a schedule of
+    request start times `interval` seconds apart; different hosts never wait
+    on each other. Use one limiter per event loop.
+    """
+
+    def __init__(self, per_host: int = PER_HOST, interval: float = HOST_INTERVAL):
+        self.per_host = max(1, per_host)
+        self.interval = max(0.0, interval)
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = self.host(url)
+        semaphore = self._slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            # Reserve the next start time before awaiting, so concurrent
+            # waiters on the same host queue up interval apart
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+# =============================================================================
+# Conditional-GET cache (feeds and listing pages)
+# =============================================================================
+
+def _cache_path(url: str) -> Path:
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _read_cache(url: str) -> Optional[dict]:
+    try:
+        with open(_cache_path(url)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    except Exception as e:
+        print(f"  [Feed cache] read error: {e}")
+        return None
+
+
+def _write_cache(url: str, entry: dict):
+    path = _cache_path(url)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"  [Feed cache] write error: {e}")
+
+
+def _get(url: str, headers: dict, timeout: float) -> requests.Response:
+    # Certificates are always verified; an SSLError is a failed fetch
+    return get_session().get(url, headers=headers, timeout=timeout, allow_redirects=True)
+
+
+def _fetch_blocking(url: str, headers: Optional[dict], conditional: bool, timeout: float) -> Fetched:
+    entry = _read_cache(url) if conditional else None
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        resp = _get(url, request_headers, timeout)
+    except requests.RequestException as e:
+        return Fetched(url, 0, None, error=str(e))
+
+    if resp.status_code == 304 and entry:
+        return Fetched(url, 304, entry["body"], not_modified=True)
+    if resp.status_code != 200:
+        return Fetched(url, resp.status_code, None, error=f"HTTP {resp.status_code}")
+
+    body = resp.text
+    if conditional and (resp.headers.get("ETag") or resp.headers.get("Last-Modified")):
+        _write_cache(url, {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "body": body,
+        })
+    return Fetched(url, 200, body)
+
+
+# =============================================================================
+# Harvest
+# =============================================================================
+
+async def fetch_many(urls, conditional: bool = False, headers: Optional[dict] = None,
+                     timeout: float = 20, limiter: Optional[HostLimiter] = None) -> dict[str, Fetched]:
+    """
+    Fetch URLs concurrently under per-host limits. Returns url → Fetched for
+    every distinct input URL, in input order.
+
+    Args:
+        urls: URLs to fetch (duplicates are fetched once)
+        conditional: Revalidate against the stored ETag / Last-Modified and
+                     keep the body for next time (feeds and listing pages)
+        headers: Extra request headers
+        timeout: Per-request timeout in seconds
+        limiter: HostLimiter to share across calls on the same event loop
+    """
+    limiter = limiter or HostLimiter()
+    overall = asyncio.Semaphore(MAX_CONNECTIONS)
+    unique = list(dict.fromkeys(u for u in urls if u))
+
+    async def _one(url):
+        async with limiter.slot(url):
+            async with overall:
+                return await asyncio.to_thread(_fetch_blocking, url, headers, conditional, timeout)
+
+    results = await asyncio.gather(*(_one(u) for u in unique))
+    return dict(zip(unique, results))
+
+
+def run_sync(coro):
+    """Run a coroutine from sync code, even when this thread already has an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
@@ -0,0 +1,382 @@
+"""
+SatyaBio — Trial Forecaster Benchmark & Regression Suite
+
+Offline benchmarks for the forecaster hot path (EffectEstimator, the
+MonteCarloSimulator stages, PowerCalculator.conditional_power_curve) over a
+fixed set of fixture trials — one per endpoint type — so performance and
+PoS changes show up before they ship. No network access is needed.
+
+What it does:
+  1. Builds fixture TrialDesign / ComparatorTrial / EventProjection inputs for
+     a time-to-event, a binary and a continuous trial.
+  2. For each fixture and iteration count, times every stage (best of a
+     few repeats) and records its peak traced memory, plus the seeded PoS
+     and its Monte Carlo standard error.
+  3. Compares a run with the stored baseline: a stage fails if it is slower
+     than FORECAST_BENCH_TIME_TOLERANCE x baseline (after scaling by a
+     machine-speed calibration loop), uses more than
+     FORECAST_BENCH_MEMORY_TOLERANCE x baseline memory, or moves PoS by more
+     than FORECAST_BENCH_SIGMAS Monte Carlo standard errors.
+
+Usage:
+    python3 forecast_benchmark.py                    # print report + compare
+    python3 forecast_benchmark.py --update-baseline  # re-record the baseline
+    python -m pytest tests/test_forecaster_benchmark.py -v
+
+Environment:
+    FORECAST_BENCH_TIME_TOLERANCE     allowed slowdown factor (default 1.5)
+    FORECAST_BENCH_MEMORY_TOLERANCE   allowed peak-memory growth factor (default 1.25)
+    FORECAST_BENCH_SIGMAS             allowed PoS shift in standard errors (default 4)
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import statistics
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from trial_forecaster import (
+    BlendedEffect,
+    ComparatorTrial,
+    EffectEstimator,
+    EndpointModel,
+    EndpointType,
+    EventProjection,
+    MonteCarloSimulator,
+    PowerCalculator,
+    PrimaryEndpoint,
+    RandomDraws,
+    SimulationParams,
+    TrialArm,
+    TrialDesign,
+    TrialPhase,
+)
+
+BASELINE_PATH = Path(__file__).resolve().parents[3] / "tests" / "data" / "forecaster_benchmark_baseline.json"
+
+ITERATION_COUNTS = (10000, 50000)
+REPEATS = 5
+SEED = 20240601
+
+TIME_TOLERANCE = float(os.environ.get("FORECAST_BENCH_TIME_TOLERANCE", 1.5))
+MEMORY_TOLERANCE = float(os.environ.get("FORECAST_BENCH_MEMORY_TOLERANCE", 1.25))
+POS_SIGMAS = float(os.environ.get("FORECAST_BENCH_SIGMAS", 4))
+
+# Budgets under this are dominated by scheduler noise (a stage only fails
+# past it), so the signal comes from the 50k-iteration cases.
+TIME_FLOOR_S = 0.02
+MEMORY_FLOOR_MB = 1.0
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _comparator(nct_id: str, effect: float, success: bool) -> ComparatorTrial:
+    return ComparatorTrial(
+        nct_id=nct_id, title=f"Comparator {nct_id}", drug_name="comparator",
+        indication="fixture", phase=TrialPhase.PHASE3, completion_date="2020-01-01",
+        primary_outcome="primary", observed_effect_size=effect, n_events=500,
+        sample_size=5000, success=success,
+    )
+
+
+def _trial(nct_id, endpoint, enrollment, condition, intervention) -> TrialDesign:
+    return TrialDesign(
+        nct_id=nct_id,
+        title=f"Benchmark fixture ({endpoint.endpoint_type.value})",
+        phase=TrialPhase.PHASE3,
+        status="ACTIVE_NOT_RECRUITING",
+        primary_endpoint=endpoint,
+        target_enrollment=enrollment,
+        arms=[
+            TrialArm("treatment", "Drug", "Active drug", enrollment // 2),
+            TrialArm("control", "Placebo", "Matching placebo", enrollment // 2),
+        ],
+        condition=condition,
+        intervention=intervention,
+        intervention_class="fixture",
+        sponsor="Fixture Pharma",
+        start_date="2022-01-01",
+        estimated_completion="2027-06-01",
+        design_type="superiority",
+        control_type="placebo",
+        primary_completion="2026-12-01",
+    )
+
+
+FIXTURES: Dict[str, Callable[[], Dict]] = {
+    # CV outcomes trial: composite MACE, event-driven, gradual onset (CETP-like)
+    "tte_cv_outcomes": lambda: {
+        "trial": _trial(
+            "NCTBENCH0001",
+            PrimaryEndpoint("Time to first MACE", EndpointType.TIME_TO_EVENT, 48),
+            9500, "Atherosclerotic cardiovascular disease", "CETP inhibitor",
+        ),
+        "comparators": [_comparator("NCTCOMP0001", 0.91, True),
+                        _comparator("NCTCOMP0002", 0.85, True),
+                        _comparator("NCTCOMP0003", 1.02, False)],
+        "event_projection": EventProjection(1000, 320.0, 24.0, 48.0, 0.04, 0.005),
+        "endpoint_model": EndpointModel(
+            EndpointType.TIME_TO_EVENT, ["CV death", "MI", "stroke", "revascularization"],
+            [0.3, 0.3, 0.2, 0.2],
+        ),
+    },
+    # Responder analysis, fixed sample size
+    "binary_responder": lambda: {
+        "trial": _trial(
+            "NCTBENCH0002",
+            PrimaryEndpoint("EASI-75 at week 52", EndpointType.BINARY, 12),
+            1500, "Moderate-to-severe atopic dermatitis", "anti-IL-13 antibody",
+        ),
+        "comparators": [_comparator("NCTCOMP0011", 0.72, True),
+                        _comparator("NCTCOMP0012", 0.80, True)],
+        "event_projection": EventProjection(0, 0.0, 12.0, 12.0, 0.25, 0.03),
+        "endpoint_model": EndpointModel(EndpointType.BINARY),
+    },
+    # Change-from-baseline, measurement noise
+    "continuous_change": lambda: {
+        "trial": _trial(
+            "NCTBENCH0003",
+            PrimaryEndpoint("Change in HbA1c at week 40", EndpointType.CONTINUOUS, 10),
+            900, "Type 2 diabetes", "oral GLP-1 receptor agonist",
+        ),
+        "comparators": [],
+        "event_projection": EventProjection(0, 0.0, 12.0, 10.0, 0.10, 0.02),
+        "endpoint_model": EndpointModel(EndpointType.CONTINUOUS, measurement_noise_sd=12.0),
+    },
+}
+
+
+def build_fixture(name: str) -> Dict:
+    """Fixture inputs plus the BlendedEffect the anchor stage produces for them."""
+    inputs = FIXTURES[name]()
+    inputs["blended_effect"] = _estimate(inputs)
+    return inputs
+
+
+def _estimate(inputs: Dict) -> BlendedEffect:
+    estimator = EffectEstimator()
+    trial = inputs["trial"]
+    return estimator.build_from_research([
+        estimator.estimate_from_class_history(trial, inputs["comparators"]),
+        estimator.estimate_from_indication_baserate(trial),
+        estimator.estimate_from_mechanism(trial),
+    ])
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def _measure(fn: Callable[[], object], repeats: int = REPEATS) -> Tuple[Dict, object]:
+    """Best wall time over `repeats` and peak traced memory of one run."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_mb": peak / 2**20}, out
+
+
+def calibrate(repeats: int = 5) -> float:
+    """Seconds for a fixed NumPy workload — the machine-speed yardstick for timings."""
+    rng = np.random.default_rng(0)
+
+    def workload():
+        x = rng.standard_normal(2_000_000)
+        np.sort(np.exp(x * 0.1) + np.log1p(np.abs(x)))
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        workload()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_case(name: str, n_iterations: int, repeats: int = REPEATS, seed: int = SEED) -> Dict:
+    """Time every forecaster stage for one fixture at one iteration count."""
+    inputs = build_fixture(name)
+    trial, blended = inputs["trial"], inputs["blended_effect"]
+    ep, em = inputs["event_projection"], inputs["endpoint_model"]
+    params = SimulationParams()
+    simulator = MonteCarloSimulator(n_iterations=n_iterations, seed=seed)
+
+    draws = RandomDraws(blended, seed=seed)
+    draws_n = draws.view(n_iterations)
+    memo = OrderedDict()
+
+    def statistical_test():
+        # Stage 5 alone: stages 2-4 are served from a pre-filled memo
+        return simulator._simulate_scenarios(trial, blended, ep, em, [params], draws_n, memo)
+
+    stages: Dict[str, Dict] = {}
+    stages["anchors"], _ = _measure(lambda: _estimate(inputs), repeats)
+    stages["draws"], _ = _measure(lambda: RandomDraws(blended, seed=seed).view(n_iterations), repeats)
+    stages["accrual"], _ = _measure(
+        lambda: simulator._simulate_accrual(trial, ep, em, [params], draws_n), repeats,
+    )
+    statistical_test()  # fill the memo
+    stages["statistical_test"], _ = _measure(statistical_test, repeats)
+    stages["sensitivity"], _ = _measure(
+        lambda: simulator._calculate_sensitivity_with_simulations(
+            trial, blended, ep, em, params, draws=draws_n,
+        ),
+        repeats,
+    )
+    stages["power_curve"], _ = _measure(
+        lambda: PowerCalculator.conditional_power_curve(trial, np.linspace(0.6, 1.1, 50)), repeats,
+    )
+    stages["run_simulation"], result = _measure(
+        lambda: simulator.run_simulation(trial, blended, ep, em, params), repeats,
+    )
+
+    return {
+        "fixture": name,
+        "n_iterations": n_iterations,
+        "probability_of_success": result.probability_of_success,
+        "pos_standard_error": result.pos_standard_error,
+        "stages": stages,
+    }
+
+
+def run_benchmarks(
+    fixtures: Optional[List[str]] = None,
+    iteration_counts: Tuple[int, ...] = ITERATION_COUNTS,
+    repeats: int = REPEATS,
+) -> Dict:
+    """The full report: calibration + one case per (fixture, iteration count)."""
+    logging.getLogger("trial_forecaster").setLevel(logging.WARNING)
+
+    return {
+        "calibration_s": calibrate(),
+        "numpy": np.__version__,
+        "python": sys.version.split()[0],
+        "seed": SEED,
+        "cases": [
+            bench_case(name, n, repeats)
+            for name in (fixtures or list(FIXTURES))
+            for n in iteration_counts
+        ],
+    }
+
+
+# =============================================================================
+# Baseline comparison
+# =============================================================================
+
+def _case_key(case: Dict) -> str:
+    return f"{case['fixture']}@{case['n_iterations']}"
+
+
+def compare(report: Dict, baseline: Dict) -> List[str]:
+    """Regressions of `report` against `baseline`, as human-readable strings."""
+    failures = []
+    speed = report["calibration_s"] / baseline["calibration_s"]
+    cases = {_case_key(c): c for c in baseline["cases"]}
+
+    for case in report["cases"]:
+        key = _case_key(case)
+        base = cases.get(key)
+        if base is None:
+            continue
+
+        # PoS: same seed, so any shift is a behaviour change; allow what two
+        # independent Monte Carlo estimates could plausibly differ by.
+        se = max(base["pos_standard_error"], case["pos_standard_error"], 1.0 / case["n_iterations"])
+        shift = abs(case["probability_of_success"] - base["probability_of_success"])
+        if shift > POS_SIGMAS * np.sqrt(2) * se:
+            failures.append(
+                f"{key}: PoS {case['probability_of_success']:.4f} vs baseline "
+                f"{base['probability_of_success']:.4f} (shift {shift / se:.1f} SE)"
+            )
+
+        for stage, now in case["stages"].items():
+            then = base["stages"].get(stage)
+            if then is None:
+                continue
+            budget = max(then["seconds"] * speed * TIME_TOLERANCE, TIME_FLOOR_S)
+            if now["seconds"] > budget:
+                failures.append(
+                    f"{key} {stage}: {now['seconds'] * 1000:.1f} ms > budget {budget * 1000:.1f} ms "
+                    f"(baseline {then['seconds'] * 1000:.1f} ms, machine x{speed:.2f})"
+                )
+            mem_budget = max(then["peak_mb"] * MEMORY_TOLERANCE, then["peak_mb"] + MEMORY_FLOOR_MB)
+            if now["peak_mb"] > mem_budget:
+                failures.append(
+                    f"{key} {stage}: peak {now['peak_mb']:.1f} MB > budget {mem_budget:.1f} MB "
+                    f"(baseline {then['peak_mb']:.1f} MB)"
+                )
+    return failures
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(report: Dict, path: Path = BASELINE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def print_report(report: Dict):
+    print(f"Calibration {report['calibration_s'] * 1000:.1f} ms  "
+          f"(numpy {report['numpy']}, python {report['python']}, seed {report['seed']})")
+    for case in report["cases"]:
+        print(f"\n{_case_key(case)}  PoS {case['probability_of_success']:.4f} "
+              f"± {case['pos_standard_error']:.4f}")
+        for stage, m in case["stages"].items():
+            print(f"  {stage:<18} {m['seconds'] * 1000:9.2f} ms  {m['peak_mb']:8.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trial forecaster hot path")
+    parser.add_argument("--fixture", action="append", choices=list(FIXTURES), help="Only this fixture (repeatable)")
+    parser.add_argument("--iterations", help="Comma-separated iteration counts (default 10000,50000)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write the report to {BASELINE_PATH.name}")
+    args = parser.parse_args()
+
+    counts = tuple(int(n) for n in args.iterations.split(",")) if args.iterations else ITERATION_COUNTS
+    report = run_benchmarks(args.fixture, counts, args.repeats)
+    print_report(report)
+
+    if args.update_baseline:
+        save_baseline(report)
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return
+
+    baseline = load_baseline()
+    if baseline is None:
+        print("\nNo baseline yet — run with --update-baseline")
+        return
+    failures = compare(report, baseline)
+    print(f"\n{len(failures)} regression(s) against baseline")
+    for failure in failures:
+        print(f"  {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
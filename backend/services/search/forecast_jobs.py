@@ -0,0 +1,335 @@
+"""
+SatyaBio — Forecast Job Executor
+
+Runs trial-forecaster Monte Carlo simulations in a dedicated process pool
+instead of on the uvicorn event loop. Before this, forecast_trial ran the
+50,000-iteration NumPy pipeline (plus the sensitivity scenarios) inline in
+an async function, so one forecast stalled every other route in the process.
+
+What it does:
+  1. run_session(): awaitable offload of one simulation to a spawn-context
+     worker process, with a per-call timeout. Workers rebuild the session's
+     draws from its seed and keep their own stage memo, so each session is
+     pinned to one worker ("lane") and its recomputes hit that memo. A
+     simulation that overruns its timeout has its worker terminated and
+     replaced — an abandoned await would otherwise leave it occupying the
+     pool.
+  2. Forecast jobs: submit_forecast() starts a full analysis (CT.gov fetch,
+     optional deep research, simulation) as a background task. At most
+     FORECAST_QUEUE_MAX jobs may be queued or running; at most
+     FORECAST_MAX_CONCURRENT run at once. Each job records its step /
+     result / error events, which the job status endpoint and the /analyze
+     SSE stream both read.
+
+Usage:
+    from forecast_jobs import submit_forecast, get_job
+
+    job = submit_forecast("NCT05202860", {"effect_scale": 0.9}, 10000)
+    ...
+    get_job(job.job_id).to_dict()
+
+Environment:
+    FORECAST_WORKERS          simulation processes / lanes (default min(2, cpus)); 0 = thread pool
+    FORECAST_MAX_CONCURRENT   jobs running at once (default max(FORECAST_WORKERS, 2))
+    FORECAST_QUEUE_MAX        queued + running jobs before submit is refused (default 16)
+    FORECAST_JOB_TIMEOUT      seconds per job, and per simulation (default 300)
+    FORECAST_JOB_RETENTION    seconds a finished job stays readable (default 3600)
+"""
+
+import os
+import time
+import zlib
+import uuid
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from trial_forecaster import (
+    ForecastResult,
+    ForecastSession,
+    SimulationParams,
+    run_forecast,
+    simulate_session,
+)
+
+logger = logging.getLogger(__name__)
+
+FORECAST_WORKERS = int(os.environ.get("FORECAST_WORKERS", min(2, os.cpu_count() or 1)))
+FORECAST_MAX_CONCURRENT = int(os.environ.get("FORECAST_MAX_CONCURRENT", max(FORECAST_WORKERS, 2)))
+FORECAST_QUEUE_MAX = int(os.environ.get("FORECAST_QUEUE_MAX", 16))
+FORECAST_JOB_TIMEOUT = float(os.environ.get("FORECAST_JOB_TIMEOUT", 300))
+FORECAST_JOB_RETENTION = float(os.environ.get("FORECAST_JOB_RETENTION", 3600))
+
+
+class ForecastQueueFull(RuntimeError):
+    """Raised by submit_forecast when FORECAST_QUEUE_MAX jobs are already pending."""
+
+
+# =============================================================================
+# Process pool
+# =============================================================================
+
+_lanes: Dict[int, ProcessPoolExecutor] = {}  # lane → single-worker pool
+_pool_lock = threading.Lock()
+
+
+def _lane_for(session_id: str) -> int:
+    """Stable lane for a session, so its recomputes reuse one worker's stage memo."""
+    return zlib.crc32(session_id.encode()) % FORECAST_WORKERS
+
+
+def _get_lane(lane: int) -> ProcessPoolExecutor:
+    with _pool_lock:
+        pool = _lanes.get(lane)
+        if pool is None:
+            # spawn, not fork: the server process has live threads (DB pools,
+            # the CT.gov session) whose locks must not be copied mid-use.
+            pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            _lanes[lane] = pool
+        return pool
+
+
+def _reset_lane(lane: int, pool: ProcessPoolExecutor, terminate: bool = False):
+    """
+    Drop a lane's pool so the next submit starts a fresh worker. With
+    terminate, the worker is killed first — a running call can't be
+    cancelled, and calls queued behind it fail with BrokenProcessPool
+    (run_session resubmits those).
+    """
+    with _pool_lock:
+        if _lanes.get(lane) is pool:
+            del _lanes[lane]
+    if terminate:
+        # ProcessPoolExecutor has no public way to stop a busy worker (before 3.14)
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False)
+
+
+def shutdown_pool():
+    """Stop the worker processes (app shutdown, tests)."""
+    with _pool_lock:
+        lanes = list(_lanes.items())
+    for lane, pool in lanes:
+        _reset_lane(lane, pool)
+
+
+async def run_session(
+    session: ForecastSession,
+    params: SimulationParams,
+    timeout: Optional[float] = None,
+) -> ForecastResult:
+    """
+    Simulate one parameter set for a session off the event loop.
+
+    A call abandoned mid-run — by this timeout or by cancellation from a
+    caller, e.g. the job-level timeout in _run_job — has its worker
+    terminated, so it doesn't keep the lane busy for later sessions.
+
+    Raises:
+        asyncio.TimeoutError if the simulation exceeds `timeout` (its worker is recycled)
+        RuntimeError if the worker process died
+    """
+    timeout = timeout or FORECAST_JOB_TIMEOUT
+    if FORECAST_WORKERS <= 0:
+        # Thread mode: an overrunning simulation can't be stopped, only abandoned
+        future = asyncio.get_running_loop().run_in_executor(None, simulate_session, session, params)
+        return await asyncio.wait_for(future, timeout)
+
+    lane = _lane_for(session.session_id)
+    for attempt in (1, 2):
+        pool = _get_lane(lane)
+        try:
+            call = pool.submit(simulate_session, session, params)
+        except (BrokenProcessPool, RuntimeError):
+            _reset_lane(lane, pool)
+            continue
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(call), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if not call.cancel():  # already running in the worker
+                reason = f"overran {timeout:.0f}s" if isinstance(e, asyncio.TimeoutError) else "was cancelled"
+                logger.warning(f"Forecast {session.session_id} {reason} — recycling its worker")
+                _reset_lane(lane, pool, terminate=True)
+            raise
+        except BrokenProcessPool as e:
+            _reset_lane(lane, pool)
+            if attempt == 2:
+                raise RuntimeError(f"Forecast worker crashed: {e}") from e
+    raise RuntimeError("Forecast worker pool unavailable")
+
+
+# =============================================================================
+# Jobs
+# =============================================================================
+
+@dataclass
+class ForecastJob:
+    """One queued/running/finished forecast and the events it has produced."""
+    job_id: str
+    query: str
+    params: Optional[Dict] = None
+    n_iterations: int = 50000
+    target_se: Optional[float] = None  # adaptive precision; n_iterations is then the cap
+    kind: str = "forecast"  # forecast | portfolio
+    timeout: Optional[float] = None  # seconds; FORECAST_JOB_TIMEOUT if unset
+    status: str = "queued"  # queued | running | done | error
+    events: List[Tuple[str, Any]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _source: Optional[Callable[[], AsyncIterator[Tuple[str, Any]]]] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    @property
+    def result(self) -> Optional[Dict]:
+        return next((data for kind, data in reversed(self.events) if kind == "result"), None)
+
+    @property
+    def error(self) -> Optional[str]:
+        return next((data for kind, data in reversed(self.events) if kind == "error"), None)
+
+    def add_event(self, kind: str, data: Any):
+        self.events.append((kind, data))
+        self._changed.set()
+
+    async def stream(self) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield every event (past and future) until the job finishes."""
+        sent = 0
+        while True:
+            self._changed.clear()
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.finished:
+                return
+            await self._changed.wait()
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """Serialize for GET /api/trial-forecaster/jobs/{job_id}."""
+        out = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "query": self.query,
+            "status": self.status,
+            "steps": [data for kind, data in self.events if kind == "step"],
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            out["result"] = self.result
+        return out
+
+
+_jobs: Dict[str, ForecastJob] = {}
+_tasks: set = set()  # strong refs so running job tasks aren't garbage-collected
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _prune_jobs():
+    cutoff = time.time() - FORECAST_JOB_RETENTION
+    for job_id in [j for j, job in _jobs.items() if job.finished and job.finished_at < cutoff]:
+        del _jobs[job_id]
+
+
+def _pending_count() -> int:
+    return sum(1 for job in _jobs.values() if not job.finished)
+
+
+async def _run_job(job: ForecastJob):
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(FORECAST_MAX_CONCURRENT)
+
+    async with _semaphore:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            await asyncio.wait_for(_drive(job), job.timeout or FORECAST_JOB_TIMEOUT)
+        except asyncio.TimeoutError:
+            job.add_event("error", f"Forecast timed out after {job.timeout or FORECAST_JOB_TIMEOUT:.0f}s")
+        except Exception as e:
+            logger.error(f"Forecast job {job.job_id} failed: {e}")
+            job.add_event("error", str(e))
+        finally:
+            job.finished_at = time.time()
+            job.status = "done" if job.result is not None else "error"
+            job._changed.set()
+
+
+async def _drive(job: ForecastJob):
+    if job._source is not None:
+        events = job._source()
+    else:
+        events = run_forecast(job.query, job.params, job.n_iterations, job.target_se)
+    async for kind, data in events:
+        job.add_event(kind, data)
+
+
+def submit_job(job: ForecastJob) -> ForecastJob:
+    """
+    Queue a job; must be called from a running event loop.
+
+    Raises:
+        ForecastQueueFull when FORECAST_QUEUE_MAX jobs are queued or running
+    """
+    _prune_jobs()
+    if _pending_count() >= FORECAST_QUEUE_MAX:
+        raise ForecastQueueFull(
+            f"{FORECAST_QUEUE_MAX} forecasts already queued — try again shortly"
+        )
+
+    _jobs[job.job_id] = job
+    task = asyncio.get_running_loop().create_task(_run_job(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def submit_forecast(
+    query: str,
+    params: Optional[Dict] = None,
+    n_iterations: int = 50000,
+    target_se: Optional[float] = None,
+) -> ForecastJob:
+    """Queue a full single-trial forecast (see submit_job)."""
+    return submit_job(ForecastJob(
+        job_id=new_job_id(),
+        query=query,
+        params=params,
+        n_iterations=n_iterations,
+        target_se=target_se,
+    ))
+
+
+def get_job(job_id: str) -> Optional[ForecastJob]:
+    return _jobs.get(job_id)
+
+
+def get_executor_status() -> Dict:
+    """Pool and queue occupancy for the status endpoint."""
+    return {
+        "mode": "process" if FORECAST_WORKERS > 0 else "thread",
+        "workers": FORECAST_WORKERS,
+        "live_workers": len(_lanes),
+        "max_concurrent": FORECAST_MAX_CONCURRENT,
+        "queue_max": FORECAST_QUEUE_MAX,
+        "queued": sum(1 for job in _jobs.values() if job.status == "queued"),
+        "running": sum(1 for job in _jobs.values() if job.status == "running"),
+        "job_timeout_s": FORECAST_JOB_TIMEOUT,
+    }
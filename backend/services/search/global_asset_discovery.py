@@ -26,6 +26,7 @@ DATA SOURCES (by region):
 PIPELINE:
   1. DISCOVER — Pull trial/patent/IR data from regional sources
   2. TRANSLATE — Use Claude to translate non-English content to English
+                (sentence-level translation memory; only unseen sentences are sent)
   3. RESOLVE — Cross-lingual entity resolution (恒瑞医药 → Hengrui, レンビマ → lenvatinib)
   4. ENRICH — Add target, MoA, phase, company metadata from drug_entities.py
   5. EMBED — Chunk + Voyage AI embed → pgvector in Neon
@@ -47,6 +48,11 @@ Usage:
     # Novel asset alert: find drugs NOT in our entity database
     python3 global_asset_discovery.py --novel --target "ADC"
 
+    # Drug asset landscape — stored per target/region; a stale snapshot is
+    # refreshed with only the trials updated since it was last built
+    python3 global_asset_discovery.py --landscape --target "KRAS"
+    python3 global_asset_discovery.py --landscape --target "KRAS" --rebuild
+
     # Health check on all regional sources
     python3 global_asset_discovery.py --health
 
@@ -63,6 +69,7 @@ import json
 import time
 import hashlib
 import argparse
+import threading
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse, quote_plus
 from collections import OrderedDict
@@ -73,6 +80,12 @@ load_dotenv()
 import requests
 from bs4 import BeautifulSoup
 
+import ctgov_client
+from drug_matcher import get_pattern_matcher, INN_PATTERN, CODE_NAME_PATTERN
+from entity_resolver import EntityResolver
+import landscape_store
+import translation_memory
+
 try:
     import psycopg2
 except ImportError:
@@ -376,7 +389,7 @@ TRIAL_REGISTRY_PREFIXES = {
 # API docs: https://clinicaltrials.gov/data-api/api
 # =============================================================================
 
-CTGOV_API_BASE = "https://clinicaltrials.gov/api/v2/studies"
+CTGOV_API_BASE = ctgov_client.CTGOV_BASE
 
 # Map regions to country filter values for ClinicalTrials.gov API
 REGION_TO_COUNTRIES = {
@@ -389,7 +402,8 @@ REGION_TO_COUNTRIES = {
 }
 
 
-def search_trials_global(query, region="all", max_results=50, phase=None, status=None):
+def search_trials_global(query, region="all", max_results=50, phase=None, status=None, updated_since=None,
+                         raise_errors=False):
     """
     Search ClinicalTrials.gov API v2 for trials worldwide.
 
@@ -402,6 +416,9 @@ def search_trials_global(query, region="all", max_results=50, phase=None, status
         max_results: Max number of trials to return
         phase: Optional phase filter (e.g., "PHASE3", "PHASE2")
         status: Optional status filter (e.g., "RECRUITING", "COMPLETED")
+        updated_since: Optional "YYYY-MM-DD" — only trials updated on or after it
+        raise_errors: Re-raise fetch errors instead of returning what was fetched
+            (delta refreshes must not mistake a failure for "nothing changed")
 
     Returns:
         List of trial dicts
@@ -418,12 +435,10 @@ def search_trials_global(query, region="all", max_results=50, phase=None, status
     # Build query — search across interventions and conditions
     params["query.intr"] = query
 
-    # Add country filter for non-"all" regions
-    countries = REGION_TO_COUNTRIES.get(region, [])
-    if countries:
-        # ClinicalTrials.gov uses AREA[LocationCountry] for country filter
-        country_filter = " OR ".join(f'AREA[LocationCountry] "{c}"' for c in countries)
-        params["filter.advanced"] = country_filter
+    # Country filter for non-"all" regions, plus the update-date window
+    advanced = _advanced_filter(REGION_TO_COUNTRIES.get(region, []), updated_since)
+    if advanced:
+        params["filter.advanced"] = advanced
 
     # Phase filter
     if phase:
@@ -435,20 +450,21 @@ def search_trials_global(query, region="all", max_results=50, phase=None, status
 
     try:
         print(f"  [CT.gov API] Searching: {query} (region={region})...")
-        resp = requests.get(CTGOV_API_BASE, params=params, headers=HEADERS, timeout=30)
-
-        if resp.status_code != 200:
-            print(f"  [CT.gov API] HTTP {resp.status_code}")
+        try:
+            data = ctgov_client.get_json(params)
+        except requests.HTTPError as e:
+            print(f"  [CT.gov API] {e}")
             # Try broader search with query.term instead
             params.pop("query.intr", None)
             params["query.term"] = query
-            resp = requests.get(CTGOV_API_BASE, params=params, headers=HEADERS, timeout=30)
-
-        if resp.status_code != 200:
-            print(f"  [CT.gov API] HTTP {resp.status_code} on retry")
-            return trials
+            try:
+                data = ctgov_client.get_json(params)
+            except requests.HTTPError as e:
+                print(f"  [CT.gov API] {e} on retry")
+                if raise_errors:
+                    raise
+                return trials
 
-        data = resp.json()
         total = data.get("totalCount", 0)
         studies = data.get("studies", [])
 
@@ -464,28 +480,43 @@ def search_trials_global(query, region="all", max_results=50, phase=None, status
         pages_fetched = 1
         while next_token and len(trials) < max_results and pages_fetched < 5:
             params["pageToken"] = next_token
-            time.sleep(0.5)  # rate limit
             try:
-                resp = requests.get(CTGOV_API_BASE, params=params, headers=HEADERS, timeout=30)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    for study in data.get("studies", []):
-                        trial = _parse_ctgov_study(study)
-                        if trial:
-                            trials.append(trial)
-                    next_token = data.get("nextPageToken")
-                    pages_fetched += 1
-                else:
-                    break
+                data = ctgov_client.get_json(params)
+                for study in data.get("studies", []):
+                    trial = _parse_ctgov_study(study)
+                    if trial:
+                        trials.append(trial)
+                next_token = data.get("nextPageToken")
+                pages_fetched += 1
             except Exception:
+                if raise_errors:
+                    raise
                 break
 
     except Exception as e:
         print(f"  [CT.gov API] Error: {e}")
+        if raise_errors:
+            raise
 
     return trials[:max_results]
 
 
+def _advanced_filter(countries, updated_since=None):
+    """
+    filter.advanced expression for a country list and an optional
+    LastUpdatePostDate lower bound ("YYYY-MM-DD"), or None for neither.
+    """
+    clauses = []
+    if countries:
+        # ClinicalTrials.gov uses AREA[LocationCountry] for country filter
+        clauses.append(" OR ".join(f'AREA[LocationCountry] "{c}"' for c in countries))
+    if updated_since:
+        clauses.append(f"AREA[LastUpdatePostDate]RANGE[{updated_since},MAX]")
+    if len(clauses) > 1:
+        return " AND ".join(f"({c})" for c in clauses)
+    return clauses[0] if clauses else None
+
+
 def _parse_ctgov_study(study):
     """Parse a single study from ClinicalTrials.gov API v2 JSON response."""
     try:
@@ -543,6 +574,7 @@ def _parse_ctgov_study(study):
             "phase": phase_str,
             "countries": ", ".join(countries),
             "date_registered": status_mod.get("studyFirstPostDateStruct", {}).get("date", ""),
+            "last_update": status_mod.get("lastUpdatePostDateStruct", {}).get("date", ""),
             "source_registry": source_registry,
             "sponsor": sponsor_name,
             "interventions": ", ".join(intervention_names),
@@ -568,7 +600,7 @@ def _identify_registry(trial_id):
 # SOURCE 1b: Search trials by COUNTRY specifically (for regional coverage)
 # =============================================================================
 
-def search_trials_by_country(query, country, max_results=30):
+def search_trials_by_country(query, country, max_results=30, updated_since=None, raise_errors=False):
     """
     Search ClinicalTrials.gov specifically for trials in a given country.
     Useful for finding China-only, Korea-only, Japan-only trials.
@@ -577,28 +609,28 @@ def search_trials_by_country(query, country, max_results=30):
         "format": "json",
         "pageSize": min(max_results, 100),
         "query.term": query,
-        "filter.advanced": f'AREA[LocationCountry] "{country}"',
+        "filter.advanced": _advanced_filter([country], updated_since),
         "countTotal": "true",
     }
 
     trials = []
     try:
-        resp = requests.get(CTGOV_API_BASE, params=params, headers=HEADERS, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            for study in data.get("studies", []):
-                trial = _parse_ctgov_study(study)
-                if trial:
-                    trials.append(trial)
-            total = data.get("totalCount", 0)
-            print(f"  [CT.gov] {country}: {len(trials)} trials (total: {total})")
+        data = ctgov_client.get_json(params)
+        for study in data.get("studies", []):
+            trial = _parse_ctgov_study(study)
+            if trial:
+                trials.append(trial)
+        total = data.get("totalCount", 0)
+        print(f"  [CT.gov] {country}: {len(trials)} trials (total: {total})")
     except Exception as e:
         print(f"  [CT.gov] Error for {country}: {e}")
+        if raise_errors:
+            raise
 
     return trials
 
 
-def search_trials_by_term(query, region="all", max_results=100):
+def search_trials_by_term(query, region="all", max_results=100, updated_since=None, raise_errors=False):
     """
     Search ClinicalTrials.gov using query.term (searches titles, conditions,
     interventions, keywords). Use this for gene targets like KRAS, BRAF, EGFR
@@ -611,25 +643,24 @@ def search_trials_by_term(query, region="all", max_results=100):
         "countTotal": "true",
     }
 
-    countries = REGION_TO_COUNTRIES.get(region, [])
-    if countries:
-        country_filter = " OR ".join(f'AREA[LocationCountry] "{c}"' for c in countries)
-        params["filter.advanced"] = country_filter
+    advanced = _advanced_filter(REGION_TO_COUNTRIES.get(region, []), updated_since)
+    if advanced:
+        params["filter.advanced"] = advanced
 
     trials = []
     try:
         print(f"  [CT.gov term search] Searching: {query} (region={region})...")
-        resp = requests.get(CTGOV_API_BASE, params=params, headers=HEADERS, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            for study in data.get("studies", []):
-                trial = _parse_ctgov_study(study)
-                if trial:
-                    trials.append(trial)
-            total = data.get("totalCount", 0)
-            print(f"  [CT.gov term search] Found {len(trials)} trials (total: {total})")
+        data = ctgov_client.get_json(params)
+        for study in data.get("studies", []):
+            trial = _parse_ctgov_study(study)
+            if trial:
+                trials.append(trial)
+        total = data.get("totalCount", 0)
+        print(f"  [CT.gov term search] Found {len(trials)} trials (total: {total})")
     except Exception as e:
         print(f"  [CT.gov term search] Error: {e}")
+        if raise_errors:
+            raise
 
     return trials
 
@@ -986,6 +1017,9 @@ def translate_content(text, source_lang="auto", target_lang="en", context="biote
     Translate non-English biotech content to English using Claude.
     Handles drug names, targets, and biotech-specific terminology.
 
+    Sentences already in the translation memory are reused; only new ones
+    are sent to Claude (see translate_many).
+
     Args:
         text: The text to translate
         source_lang: Source language (auto-detected if "auto")
@@ -993,15 +1027,60 @@ def translate_content(text, source_lang="auto", target_lang="en", context="biote
         context: Domain context for better translation (default: biotech)
 
     Returns:
-        Dict with: translated_text, detected_language, entities_found
+        Dict with: translated_text, detected_language, entities
+    """
+    return translate_many([text], source_lang, target_lang, context)[0]
+
+
+def translate_many(texts, source_lang="auto", target_lang="en", context="biotech"):
+    """
+    Translate many texts at once through the translation memory.
+
+    Texts are split into sentences; sentences seen before (same language
+    pair and context) come from translation_memory, and the rest are sent to
+    Claude in batches of many short segments per call. Drug codes, numbers
+    and English fragments inside CJK / Korean text are never sent.
+
+    Returns:
+        One dict per text: translated_text, detected_language, entities,
+        segments_reused, segments_translated
     """
+    results = [None] * len(texts)
     if not ANTHROPIC_API_KEY:
         print("  [Translate] No ANTHROPIC_API_KEY set")
-        return {"translated_text": text, "detected_language": "unknown", "entities_found": []}
+        return [{"translated_text": t, "detected_language": "unknown", "entities": []} for t in texts]
+
+    by_language = OrderedDict()
+    for i, text in enumerate(texts):
+        lang = _detect_language(text or "") if source_lang == "auto" else source_lang
+        by_language.setdefault(lang, []).append(i)
 
+    for lang, indexes in by_language.items():
+        translated = translation_memory.translate_many(
+            [texts[i] for i in indexes], lang, target_lang, context,
+            translate_batch=_translate_segments_with_claude,
+        )
+        for i, result in zip(indexes, translated):
+            results[i] = dict(result, detected_language=lang)
+
+    reused = sum(r["segments_reused"] for r in results)
+    sent = sum(r["segments_translated"] for r in results)
+    if reused or sent:
+        print(f"  [Translate] {reused} segments from translation memory, {sent} translated")
+    return results
+
+
+def _translate_segments_with_claude(segments, source_lang, target_lang, context):
+    """
+    One Claude call for a batch of numbered segments (translation_memory's
+    translate_batch). Returns [{"translation", "entities"}] in segment order;
+    segments missing from the response come back as None.
+    """
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    numbered = "\n".join(f"[{i + 1}] {seg}" for i, seg in enumerate(segments))
 
-    prompt = f"""You are a biotech/pharma translation specialist. Translate the following text to English.
+    prompt = f"""You are a biotech/pharma translation specialist. Translate each numbered segment
+below from {source_lang} to {target_lang}. The segments come from {context} content.
 
 CRITICAL RULES:
 1. Keep drug names in their original form AND add the English/INN name in parentheses
@@ -1013,70 +1092,93 @@ CRITICAL RULES:
 4. Translate clinical terms to standard English
    Example: 客观缓解率 → ORR (objective response rate)
 5. Preserve all numbers, percentages, p-values exactly
+6. Translate each segment on its own — do not merge, split or skip segments
 
-After the translation, list ALL biotech entities you found:
-- Drug names (both local and English/INN)
-- Company names
-- Targets/pathways
-- Clinical trial IDs
-- Diseases/indications
+For each segment, also list the biotech entities it mentions:
+drug names, company names, targets/pathways, clinical trial IDs, diseases/indications.
 
-TEXT TO TRANSLATE:
-{text[:4000]}
+SEGMENTS:
+{numbered}
 
 FORMAT YOUR RESPONSE AS JSON:
 {{
-    "translated_text": "...",
-    "detected_language": "zh/ja/ko/hi/de/fr/...",
-    "entities": [
-        {{"type": "drug", "local_name": "...", "english_name": "...", "context": "..."}},
-        {{"type": "company", "local_name": "...", "english_name": "...", "context": "..."}},
-        {{"type": "target", "local_name": "...", "english_name": "...", "context": "..."}},
-        {{"type": "trial_id", "id": "...", "registry": "..."}},
-        {{"type": "indication", "local_name": "...", "english_name": "..."}}
+    "segments": [
+        {{
+            "n": 1,
+            "translation": "...",
+            "entities": [
+                {{"type": "drug", "local_name": "...", "english_name": "...", "context": "..."}},
+                {{"type": "company", "local_name": "...", "english_name": "...", "context": "..."}},
+                {{"type": "target", "local_name": "...", "english_name": "...", "context": "..."}},
+                {{"type": "trial_id", "id": "...", "registry": "..."}},
+                {{"type": "indication", "local_name": "...", "english_name": "..."}}
+            ]
+        }}
     ]
 }}"""
 
-    try:
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        result_text = response.content[0].text
-
-        # Parse JSON from response
-        json_match = re.search(r'\{[\s\S]*\}', result_text)
-        if json_match:
-            result = json.loads(json_match.group())
-            return result
-        else:
-            return {"translated_text": result_text, "detected_language": "unknown", "entities_found": []}
+    response = client.messages.create(
+        model="claude-sonnet-4-20250514",
+        max_tokens=8192,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    result_text = response.content[0].text
 
-    except Exception as e:
-        print(f"  [Translate] Error: {e}")
-        return {"translated_text": text, "detected_language": "unknown", "entities_found": []}
+    json_match = re.search(r'\{[\s\S]*\}', result_text)
+    if not json_match:
+        raise ValueError("no JSON in translation response")
+    by_number = {}
+    for item in json.loads(json_match.group()).get("segments", []):
+        try:
+            by_number[int(item.get("n"))] = item
+        except (TypeError, ValueError):
+            continue
+    return [by_number.get(i + 1) for i in range(len(segments))]
 
 
 # =============================================================================
 # ENTITY RESOLUTION — Map non-English entities to drug_entities.py
 # =============================================================================
 
-def resolve_entities(entities, conn=None):
+# Loaded once per process; later runs only hand it their connection. Aliases
+# added since the load are still found by resolve_many's database query.
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def _shared_resolver(conn) -> EntityResolver:
+    """The process-wide EntityResolver, bound to `conn` for this run."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            resolver = EntityResolver()
+            resolver.connect(conn)
+            _resolver = resolver
+        else:
+            _resolver.connect(conn, load_caches=False)
+        return _resolver
+
+
+def resolve_entities(entities, conn=None, resolver=None):
     """
     Cross-lingual entity resolution: match discovered entities to our drug_entities database.
 
     For each entity:
       1. Check KNOWN_ENTITY_ALIASES for direct match
-      2. Check drug_entities.py drug_aliases table
+      2. Check drug_entities.py drug_aliases table — all names at once via
+         EntityResolver.resolve_many (memory, then one query, then fuzzy)
       3. If no match → flag as NOVEL (potential new asset to track)
 
+    Pass `resolver` to use a specific EntityResolver; otherwise the shared
+    one (alias caches loaded on first use) is bound to `conn`.
+
     Returns:
         resolved: list of matched entities with drug_entity_id
         novel: list of unmatched entities (potential new assets)
     """
     resolved = []
     novel = []
+    pending = []
 
     for entity in entities:
         if entity.get("type") not in ("drug", "company", "target"):
@@ -1092,33 +1194,34 @@ def resolve_entities(entities, conn=None):
             entity["resolved_name"] = canonical
             entity["resolution_method"] = "known_alias"
             resolved.append(entity)
-            continue
+        else:
+            pending.append(entity)
 
-        # Step 2: Check drug_entities database
-        if conn:
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT d.id, d.generic_name, d.brand_name, d.company
-                        FROM drugs d
-                        JOIN drug_aliases da ON da.drug_id = d.id
-                        WHERE LOWER(da.alias) = LOWER(%s)
-                           OR LOWER(da.alias) = LOWER(%s)
-                           OR LOWER(d.generic_name) = LOWER(%s)
-                           OR LOWER(d.generic_name) = LOWER(%s)
-                        LIMIT 1
-                    """, (local_name, english_name, local_name, english_name))
-
-                    row = cur.fetchone()
-                    if row:
-                        entity["resolved_name"] = row[1] or row[2]
-                        entity["drug_entity_id"] = row[0]
-                        entity["company"] = row[3]
-                        entity["resolution_method"] = "database"
-                        resolved.append(entity)
-                        continue
-            except Exception:
-                pass
+    # Step 2: Check drug_entities database, one batch for every name
+    batch = None
+    if pending and (resolver is not None or conn is not None):
+        try:
+            if resolver is None:
+                resolver = _shared_resolver(conn)
+            batch = resolver.resolve_many(
+                (name for e in pending for name in (e.get("local_name", ""), e.get("english_name", ""))),
+                context="global asset discovery",
+            )
+            counts = batch.stats
+            print(f"  DB resolution: {counts['exact_alias']} cached, {counts['database']} queried, "
+                  f"{counts['fuzzy']} fuzzy, {counts['unresolved']} unresolved ({counts['queries']} queries)")
+        except Exception as e:
+            print(f"  ⚠ Entity resolution failed: {e}")
+
+    for entity in pending:
+        match = batch and (batch.get(entity.get("local_name")) or batch.get(entity.get("english_name")))
+        if match:
+            entity["resolved_name"] = match.canonical_name
+            entity["drug_entity_id"] = match.entity_id
+            entity["resolution_method"] = "database" if match.match_method == "exact_alias" else match.match_method
+            entity["resolution_confidence"] = match.confidence
+            resolved.append(entity)
+            continue
 
         # Step 3: No match → novel asset
         entity["resolution_method"] = "novel"
@@ -1287,30 +1390,28 @@ def run_full_pipeline(target=None, query=None, region="all", max_results=50, dry
     # ─── Step 4: Translate non-English content ───
     print("\n  STEP 4: Translating non-English content...")
 
-    translated_count = 0
-    for trial in results["trials"]:
-        title = trial.get("title", "")
-        # Detect non-English content (simple heuristic: contains CJK characters)
-        if _contains_cjk(title) or _contains_korean(title):
-            translated = translate_content(title, context="clinical trial")
-            trial["title_original"] = title
-            trial["title"] = translated.get("translated_text", title)
-            trial["detected_language"] = translated.get("detected_language", "")
-            all_entities.extend(translated.get("entities", []))
-            translated_count += 1
-
-    for patent in results["patents"]:
-        title = patent.get("title", "")
-        if _contains_cjk(title) or _contains_korean(title):
-            translated = translate_content(
-                f"Title: {title}\nAbstract: {patent.get('abstract', '')}",
-                context="pharmaceutical patent"
-            )
-            patent["title_original"] = title
-            patent["title"] = translated.get("translated_text", title)
-            all_entities.extend(translated.get("entities", []))
-            translated_count += 1
+    foreign_trials = [t for t in results["trials"]
+                      if _contains_cjk(t.get("title", "")) or _contains_korean(t.get("title", ""))]
+    foreign_patents = [p for p in results["patents"]
+                       if _contains_cjk(p.get("title", "")) or _contains_korean(p.get("title", ""))]
+
+    trial_translations = translate_many([t["title"] for t in foreign_trials], context="clinical trial")
+    for trial, translated in zip(foreign_trials, trial_translations):
+        trial["title_original"] = trial["title"]
+        trial["title"] = translated.get("translated_text", trial["title"])
+        trial["detected_language"] = translated.get("detected_language", "")
+        all_entities.extend(translated.get("entities", []))
+
+    patent_translations = translate_many(
+        [f"Title: {p['title']}\nAbstract: {p.get('abstract', '')}" for p in foreign_patents],
+        context="pharmaceutical patent",
+    )
+    for patent, translated in zip(foreign_patents, patent_translations):
+        patent["title_original"] = patent["title"]
+        patent["title"] = translated.get("translated_text", patent["title"])
+        all_entities.extend(translated.get("entities", []))
 
+    translated_count = len(foreign_trials) + len(foreign_patents)
     print(f"  Translated {translated_count} non-English items")
 
     # ─── Step 5: Entity resolution ───
@@ -1674,7 +1775,8 @@ PHASE_RANK = {
 }
 
 
-def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False, use_patents=False):
+def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False, use_patents=False,
+                    force_refresh=False):
     """
     Build a drug asset landscape from global trial data + optional patent search.
 
@@ -1684,16 +1786,36 @@ def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False
       3. Optional LLM extraction for remaining ambiguous trials
       4. Optional patent search for preclinical/early-stage assets
 
+    Landscapes are stored per (target, region, options) in landscape_store.
+    A fresh snapshot is returned as is; a stale one is refreshed with only the
+    trials updated since its last refresh; an expired or missing one is rebuilt.
+
     Args:
         target_or_query: e.g., "GLP-1", "ADC", "PD-1", "KRAS", "Atopic Dermatitis"
         region: "all", "china", "korea", "japan", "india", "europe"
         max_trials: Max trials to fetch
         use_llm: If True, use Claude to extract drug names from ambiguous trials
         use_patents: If True, also search patent databases for early-stage assets
+        force_refresh: Skip the stored snapshot and rebuild
 
     Returns:
-        Dict with landscape data grouped by drug asset
+        Dict with landscape data grouped by drug asset, plus a "freshness" block
+        (status, built_at, refreshed_at, age_hours, served_from, delta_trials)
     """
+    options = {"max_trials": max_trials, "use_llm": use_llm, "use_patents": use_patents}
+    key = landscape_store.snapshot_key(target_or_query, region, options)
+    snapshot = None if force_refresh else landscape_store.load(key)
+
+    if snapshot is not None:
+        status = landscape_store.freshness(snapshot)["status"]
+        if status == "fresh":
+            print(f"  [Landscape] Cache hit for '{target_or_query}' (region={region})")
+            return _landscape_result(snapshot, served_from="cache")
+        if status == "stale":
+            snapshot, counts = _refresh_landscape(snapshot, use_llm=use_llm)
+            return _landscape_result(snapshot, served_from="stale" if counts.get("failed") else "delta",
+                                     delta_trials=counts["added"] + counts["updated"])
+
     print(f"\n{'='*80}")
     print(f"  DRUG ASSET LANDSCAPE: {target_or_query}")
     print(f"  Region: {region}")
@@ -1701,7 +1823,115 @@ def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False
 
     # Step 1: Fetch trials
     print("  Step 1: Fetching global trial data...")
-    trials = search_trials_global(target_or_query, region=region, max_results=max_trials)
+    trials = _fetch_landscape_trials(target_or_query, region, max_trials)
+    print(f"  Total trials fetched: {len(trials)}\n")
+
+    # All DRUG_PATTERNS compiled into one automaton — one pass per text
+    pattern_matcher = get_pattern_matcher(DRUG_PATTERNS)
+
+    # Step 1b: Optional patent search for preclinical/early-stage assets
+    patent_assets = {}
+    if use_patents:
+        print("  Step 1b: Searching global patent databases...")
+        patent_assets = _search_patent_assets(target_or_query, pattern_matcher)
+
+    # Step 2: Assign drug assets to each trial (patterns → direct → Claude)
+    print("  Step 2: Extracting drug assets...")
+    assignments = _assign_trial_drugs(trials, target_or_query, pattern_matcher, use_llm=use_llm)
+
+    snapshot = landscape_store.new_snapshot(
+        target_or_query, region, options, trials, assignments,
+        patent_assets=[
+            dict(a, countries=sorted(a["countries"]), indications=sorted(a["indications"]))
+            for a in patent_assets.values()
+        ],
+    )
+    if trials:
+        # An empty fetch is more likely an API failure than an empty landscape
+        landscape_store.save(snapshot)
+    return _landscape_result(snapshot, served_from="rebuild", delta_trials=len(trials))
+
+
+def serve_landscape(target_or_query, region="all", max_trials=200, use_llm=False, use_patents=False):
+    """
+    Answer a landscape question from the stored snapshot without waiting on a refresh.
+
+    A stale or expired snapshot is returned immediately and refreshed in a
+    background thread (freshness["refresh"] says whether one was scheduled or
+    is already running). Only a landscape that was never built blocks on
+    build_landscape().
+    """
+    options = {"max_trials": max_trials, "use_llm": use_llm, "use_patents": use_patents}
+    key = landscape_store.snapshot_key(target_or_query, region, options)
+    snapshot = landscape_store.load(key)
+    if snapshot is None:
+        return build_landscape(target_or_query, region=region, max_trials=max_trials,
+                               use_llm=use_llm, use_patents=use_patents)
+
+    refresh = "none"
+    if landscape_store.freshness(snapshot)["status"] != "fresh":
+        refresh = "in_progress"
+        if landscape_store.begin_refresh(key):
+            refresh = "scheduled"
+            threading.Thread(
+                target=_refresh_in_background,
+                args=(key, target_or_query, region, max_trials, use_llm, use_patents),
+                name=f"landscape-refresh-{key[:8]}",
+                daemon=True,
+            ).start()
+
+    result = _landscape_result(snapshot, served_from="cache", verbose=False)
+    result["freshness"]["refresh"] = refresh
+    return result
+
+
+def _refresh_in_background(key, target_or_query, region, max_trials, use_llm, use_patents):
+    try:
+        build_landscape(target_or_query, region=region, max_trials=max_trials,
+                        use_llm=use_llm, use_patents=use_patents)
+    except Exception as e:
+        print(f"  [Landscape] Background refresh failed for '{target_or_query}': {e}")
+    finally:
+        landscape_store.end_refresh(key)
+
+
+def _refresh_landscape(snapshot, use_llm=False):
+    """
+    Fetch only the trials updated since the snapshot's last refresh, extract
+    drugs from those, and merge them into a new stored snapshot.
+    Patent assets are kept until the next full rebuild.
+
+    If any delta search fails, the stored snapshot is returned untouched
+    (counts["failed"] is True): merging would advance refreshed_at past a
+    window that was never fetched.
+    """
+    query, region = snapshot["query"], snapshot["region"]
+    since = landscape_store.delta_since(snapshot)
+    print(f"  [Landscape] Refreshing '{query}' (region={region}) with trials updated since {since}...")
+
+    try:
+        trials = _fetch_landscape_trials(query, region, snapshot["options"]["max_trials"],
+                                         updated_since=since, raise_errors=True)
+    except Exception as e:
+        print(f"  [Landscape] Delta fetch failed ({e}) — serving the stored snapshot, watermark kept at {since}")
+        return snapshot, {"added": 0, "updated": 0, "failed": True}
+    assignments = _assign_trial_drugs(
+        trials, query, get_pattern_matcher(DRUG_PATTERNS), use_llm=use_llm,
+        already_found=landscape_store.pattern_drugs(snapshot),
+    )
+    snapshot, counts = landscape_store.merge_trials(snapshot, trials, assignments)
+    landscape_store.save(snapshot)
+    print(f"  [Landscape] Merged {counts['updated']} updated and {counts['added']} new trials")
+    return snapshot, counts
+
+
+def _fetch_landscape_trials(target_or_query, region, max_trials, updated_since=None, raise_errors=False):
+    """
+    Run every trial search a landscape is built from, deduplicated by trial ID.
+    With raise_errors, any failed search raises instead of contributing [].
+    """
+    trials = search_trials_global(target_or_query, region=region, max_results=max_trials,
+                                  updated_since=updated_since, raise_errors=raise_errors)
 
     # For targets like KRAS that are rarely in the intervention field,
     # also do a broader term search to capture trials mentioning the target
@@ -1709,7 +1939,8 @@ def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False
     TARGET_KEYWORDS = {"KRAS", "BRAF", "EGFR", "ALK", "ROS1", "MET", "HER2", "RAS", "SHP2", "STK11"}
     if target_or_query.upper() in TARGET_KEYWORDS:
         print(f"  [Broadening search] {target_or_query} is a gene target — also searching by term...")
-        broader = search_trials_by_term(target_or_query, region=region, max_results=max_trials)
+        broader = search_trials_by_term(target_or_query, region=region, max_results=max_trials,
+                                        updated_since=updated_since, raise_errors=raise_errors)
         existing = {t["trial_id"] for t in trials}
         added = 0
         for t in broader:
@@ -1726,229 +1957,179 @@ def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False
         "japan": "Japan", "india": "India",
     }
     if region in region_country_map:
-        extra = search_trials_by_country(target_or_query, region_country_map[region], max_results=50)
+        extra = search_trials_by_country(target_or_query, region_country_map[region], max_results=50,
+                                         updated_since=updated_since, raise_errors=raise_errors)
         existing = {t["trial_id"] for t in trials}
         trials.extend(t for t in extra if t["trial_id"] not in existing)
     elif region == "all":
         # For "all", also fetch from top pharma countries specifically
         for country in ["China", "Japan", "Korea, Republic of"]:
-            extra = search_trials_by_country(target_or_query, country, max_results=30)
+            extra = search_trials_by_country(target_or_query, country, max_results=30,
+                                             updated_since=updated_since, raise_errors=raise_errors)
             existing = {t["trial_id"] for t in trials}
             trials.extend(t for t in extra if t["trial_id"] not in existing)
 
-    print(f"  Total trials fetched: {len(trials)}\n")
-
-    # Step 1b: Optional patent search for preclinical/early-stage assets
-    patent_assets = {}
-    if use_patents:
-        print("  Step 1b: Searching global patent databases...")
-        try:
-            patents = search_patents_lens(target_or_query, max_results=50)
-            print(f"  Found {len(patents)} patent filings")
-
-            for patent in patents:
-                title = patent.get("title", "")
-                # Try to extract a drug name from patent title using same patterns
-                for pattern, (drug_name, moa) in DRUG_PATTERNS.items():
-                    if re.search(pattern, title, re.IGNORECASE):
-                        if drug_name not in patent_assets:
-                            patent_assets[drug_name] = {
-                                "drug_name": drug_name,
-                                "target_moa": moa,
-                                "sponsor": patent.get("applicant", ""),
-                                "highest_phase": "Preclinical/Patent",
-                                "highest_phase_rank": 0.5,
-                                "trials": [],
-                                "countries": set(),
-                                "indications": set(),
-                                "active_trials": 0,
-                                "total_trials": 0,
-                                "patent_ids": [],
-                                "source": "patent_search",
-                            }
-                        patent_assets[drug_name]["patent_ids"].append(
-                            patent.get("id", patent.get("patent_number", ""))
-                        )
-                        jurisdictions = patent.get("jurisdictions", patent.get("country", ""))
-                        if isinstance(jurisdictions, list):
-                            patent_assets[drug_name]["countries"].update(jurisdictions)
-                        elif jurisdictions:
-                            patent_assets[drug_name]["countries"].add(jurisdictions)
-                        break
-
-            # Also try extracting code names from patent titles
-            for patent in patents:
-                title = patent.get("title", "")
-                code_matches = re.findall(
-                    r'\b([A-Z]{1,5}[\s-]?\d{3,6}[A-Z]?)\b', title
-                )
-                for code in code_matches:
-                    code = code.strip()
-                    if code not in patent_assets and len(code) >= 4:
-                        patent_assets[code] = {
-                            "drug_name": code,
-                            "target_moa": f"Patent-disclosed ({target_or_query})",
-                            "sponsor": patent.get("applicant", ""),
-                            "highest_phase": "Preclinical/Patent",
-                            "highest_phase_rank": 0.5,
-                            "trials": [],
-                            "countries": set(),
-                            "indications": set(),
-                            "active_trials": 0,
-                            "total_trials": 0,
-                            "patent_ids": [patent.get("id", "")],
-                            "source": "patent_search",
-                        }
-
-            print(f"  Patent search found {len(patent_assets)} drug assets")
-        except Exception as e:
-            print(f"  [Patent search] Error: {e}")
-
-    # Step 2: Extract drug assets from trials
-    print("  Step 2: Extracting drug assets...")
-    assets = {}  # drug_name → asset dict
+    return trials
 
-    unmatched_trials = []
 
-    for trial in trials:
-        # Search in title + interventions
-        search_text = f"{trial.get('title', '')} {trial.get('interventions', '')}"
+def _search_patent_assets(target_or_query, pattern_matcher):
+    """Drug assets named in patent titles (preclinical / early-stage)."""
+    patent_assets = {}
+    try:
+        patents = search_patents_lens(target_or_query, max_results=50)
+        print(f"  Found {len(patents)} patent filings")
 
-        matched = False
-        for pattern, (drug_name, moa) in DRUG_PATTERNS.items():
-            if re.search(pattern, search_text, re.IGNORECASE):
-                matched = True
-                if drug_name not in assets:
-                    assets[drug_name] = {
+        for patent in patents:
+            title = patent.get("title", "")
+            # Try to extract a drug name from patent title using same patterns
+            first = pattern_matcher.first(title)
+            if first is not None:
+                drug_name, moa = pattern_matcher.payload_list[first]
+                if drug_name not in patent_assets:
+                    patent_assets[drug_name] = {
                         "drug_name": drug_name,
                         "target_moa": moa,
-                        "sponsor": "",
-                        "highest_phase": "",
-                        "highest_phase_rank": 0,
+                        "sponsor": patent.get("applicant", ""),
+                        "highest_phase": "Preclinical/Patent",
+                        "highest_phase_rank": 0.5,
+                        "trials": [],
+                        "countries": set(),
+                        "indications": set(),
+                        "active_trials": 0,
+                        "total_trials": 0,
+                        "patent_ids": [],
+                        "source": "patent_search",
+                    }
+                patent_assets[drug_name]["patent_ids"].append(
+                    patent.get("id", patent.get("patent_number", ""))
+                )
+                jurisdictions = patent.get("jurisdictions", patent.get("country", ""))
+                if isinstance(jurisdictions, list):
+                    patent_assets[drug_name]["countries"].update(jurisdictions)
+                elif jurisdictions:
+                    patent_assets[drug_name]["countries"].add(jurisdictions)
+
+        # Also try extracting code names from patent titles
+        for patent in patents:
+            title = patent.get("title", "")
+            code_matches = re.findall(
+                r'\b([A-Z]{1,5}[\s-]?\d{3,6}[A-Z]?)\b', title
+            )
+            for code in code_matches:
+                code = code.strip()
+                if code not in patent_assets and len(code) >= 4:
+                    patent_assets[code] = {
+                        "drug_name": code,
+                        "target_moa": f"Patent-disclosed ({target_or_query})",
+                        "sponsor": patent.get("applicant", ""),
+                        "highest_phase": "Preclinical/Patent",
+                        "highest_phase_rank": 0.5,
                         "trials": [],
                         "countries": set(),
                         "indications": set(),
                         "active_trials": 0,
                         "total_trials": 0,
+                        "patent_ids": [patent.get("id", "")],
+                        "source": "patent_search",
                     }
 
-                asset = assets[drug_name]
-                asset["trials"].append(trial["trial_id"])
-                asset["total_trials"] += 1
-
-                # Track highest phase
-                phase = trial.get("phase", "")
-                phase_rank = PHASE_RANK.get(phase, 0)
-                if phase_rank > asset["highest_phase_rank"]:
-                    asset["highest_phase"] = phase
-                    asset["highest_phase_rank"] = phase_rank
-
-                # Track sponsor (use most common)
-                if trial.get("sponsor") and not asset["sponsor"]:
-                    asset["sponsor"] = trial["sponsor"]
-
-                # Track countries
-                for country in trial.get("countries", "").split(", "):
-                    country = country.strip()
-                    if country:
-                        asset["countries"].add(country)
-
-                # Track indications
-                for cond in trial.get("conditions", "").split(", "):
-                    cond = cond.strip()
-                    if cond and len(cond) > 3:
-                        asset["indications"].add(cond)
-
-                # Count active trials
-                if trial.get("status") in ("RECRUITING", "ACTIVE_NOT_RECRUITING", "NOT_YET_RECRUITING"):
-                    asset["active_trials"] += 1
-
-        if not matched:
+        print(f"  Patent search found {len(patent_assets)} drug assets")
+    except Exception as e:
+        print(f"  [Patent search] Error: {e}")
+    return patent_assets
+
+
+def _assign_trial_drugs(trials, query_context, pattern_matcher, use_llm=False, already_found=()):
+    """
+    Decide which drug assets each trial belongs to.
+
+    Returns trial_id → [[stage, drug_name, target_moa, source], ...] where stage
+    is the extractor that found the drug: "pattern" (DRUG_PATTERNS), "direct"
+    (intervention names of trials no pattern matched) or "llm" (Claude, for
+    trials still unmatched). already_found lists pattern drugs from trials
+    outside this batch, so direct extraction skips them as a full build would.
+    """
+    assignments = {t["trial_id"]: [] for t in trials}
+    pattern_found = set(already_found)
+    unmatched_trials = []
+
+    for trial in trials:
+        # Search in title + interventions
+        search_text = f"{trial.get('title', '')} {trial.get('interventions', '')}"
+        rows = assignments[trial["trial_id"]]
+        for drug_name, moa in pattern_matcher.payloads(search_text):
+            rows.append(["pattern", drug_name, moa, ""])
+            pattern_found.add(drug_name)
+        if not rows:
             unmatched_trials.append(trial)
 
     # Step 2a: Extract novel drugs directly from intervention names (no regex needed)
-    direct_extracted = 0
     if unmatched_trials:
         print(f"\n  Step 2a: Extracting drugs directly from {len(unmatched_trials)} unmatched trial interventions...")
-        direct_assets = _extract_interventions_direct(unmatched_trials, set(assets.keys()))
-        for drug_name, asset_data in direct_assets.items():
-            if drug_name not in assets:
-                assets[drug_name] = asset_data
-                direct_extracted += 1
-            else:
-                # Merge into existing
-                existing = assets[drug_name]
-                existing["trials"].extend(asset_data["trials"])
-                existing["total_trials"] += asset_data["total_trials"]
-                existing["countries"].update(asset_data["countries"])
-                existing["indications"].update(asset_data["indications"])
-                existing["active_trials"] += asset_data["active_trials"]
-        print(f"  Direct extraction found {direct_extracted} novel drug assets")
-        # Update unmatched: remove trials that were matched by direct extraction
-        matched_trial_ids = set()
-        for a in direct_assets.values():
-            matched_trial_ids.update(a["trials"])
-        unmatched_trials = [t for t in unmatched_trials if t["trial_id"] not in matched_trial_ids]
+        direct_assets = _extract_interventions_direct(unmatched_trials, pattern_found)
+        _assign_from_assets(assignments, "direct", direct_assets)
+        print(f"  Direct extraction found {len(direct_assets)} novel drug assets")
+        unmatched_trials = [t for t in unmatched_trials if not assignments[t["trial_id"]]]
         print(f"  Remaining unmatched trials: {len(unmatched_trials)}")
 
     # Step 2b: Use Claude to extract drugs from remaining unmatched trials (optional)
-    llm_extracted = 0
     if use_llm and unmatched_trials and ANTHROPIC_API_KEY:
         print(f"\n  Step 2b: Using Claude to extract drugs from {len(unmatched_trials)} unmatched trials...")
-        llm_assets = _extract_drugs_with_llm(unmatched_trials, target_or_query)
-        for drug_name, asset_data in llm_assets.items():
-            if drug_name not in assets:
-                assets[drug_name] = asset_data
-                llm_extracted += 1
-            else:
-                # Merge into existing
-                existing = assets[drug_name]
-                existing["trials"].extend(asset_data["trials"])
-                existing["total_trials"] += asset_data["total_trials"]
-                existing["countries"].update(asset_data["countries"])
-                existing["indications"].update(asset_data["indications"])
-                existing["active_trials"] += asset_data["active_trials"]
-
-        print(f"  Claude extracted {llm_extracted} additional drug assets")
-
-    # Step 2c: Merge patent-discovered assets (if any)
-    patent_only = 0
-    if patent_assets:
-        for drug_name, patent_data in patent_assets.items():
-            if drug_name not in assets:
-                assets[drug_name] = patent_data
-                patent_only += 1
-            else:
-                # Add patent info to existing clinical asset
-                existing = assets[drug_name]
-                if "patent_ids" not in existing:
-                    existing["patent_ids"] = []
-                existing["patent_ids"].extend(patent_data.get("patent_ids", []))
-                existing["countries"].update(patent_data.get("countries", set())
-                    if isinstance(patent_data.get("countries"), set)
-                    else set(patent_data.get("countries", [])))
-        if patent_only:
-            print(f"\n  Step 2c: {patent_only} additional assets found only in patent filings (preclinical)")
-
-    # Step 3: Sort and format
-    asset_list = sorted(assets.values(), key=lambda a: (-a["highest_phase_rank"], -a["total_trials"]))
-
-    # Convert sets to sorted lists for display
-    for asset in asset_list:
-        asset["countries"] = sorted(asset["countries"])
-        asset["indications"] = sorted(asset["indications"])[:5]  # top 5
+        llm_assets = _extract_drugs_with_llm(unmatched_trials, query_context)
+        _assign_from_assets(assignments, "llm", llm_assets)
+        print(f"  Claude extracted {len(llm_assets)} drug assets")
+
+    return assignments
+
+
+def _assign_from_assets(assignments, stage, assets):
+    """Record an extractor's drug → trials output as per-trial assignments."""
+    for drug_name, asset in assets.items():
+        for trial_id in asset["trials"]:
+            assignments[trial_id].append(
+                [stage, drug_name, asset.get("target_moa", ""), asset.get("source", "")]
+            )
+
+
+def _landscape_result(snapshot, served_from, delta_trials=0, verbose=True):
+    """Aggregate a snapshot into the landscape dict build_landscape returns."""
+    target_or_query, region = snapshot["query"], snapshot["region"]
+    asset_list, stats = landscape_store.aggregate_assets(snapshot, PHASE_RANK)
+    freshness = landscape_store.freshness(snapshot)
+    freshness.update(served_from=served_from, delta_trials=delta_trials)
+    total_trials = len(snapshot["trials"])
+    unmatched = stats["unmatched"]
+
+    if verbose and stats["patent_only"]:
+        print(f"\n  Step 2c: {stats['patent_only']} additional assets found only in patent filings (preclinical)")
+
+    if not asset_list:
+        if verbose:
+            print("  No drug assets extracted. Try --landscape-llm for Claude-powered extraction.")
+            print(f"  ({unmatched} trials could not be matched to known drugs)")
+        return {"assets": [], "unmatched": unmatched, "total_trials": total_trials, "freshness": freshness}
+
+    if verbose:
+        _print_landscape(target_or_query, region, asset_list, stats, total_trials)
+
+    # Return structured data
+    return {
+        "query": target_or_query,
+        "region": region,
+        "assets": asset_list,
+        "total_trials": total_trials,
+        "unmatched_trials": unmatched,
+        "timestamp": snapshot["refreshed_at"],
+        "freshness": freshness,
+    }
 
-    # Step 4: Print landscape
+
+def _print_landscape(target_or_query, region, asset_list, stats, total_trials):
     print(f"\n{'='*80}")
     print(f"  LANDSCAPE: {target_or_query.upper()} — {len(asset_list)} drug assets found")
-    print(f"  From {len(trials)} clinical trials across {region}")
+    print(f"  From {total_trials} clinical trials across {region}")
     print(f"{'='*80}\n")
 
-    if not asset_list:
-        print("  No drug assets extracted. Try --landscape-llm for Claude-powered extraction.")
-        print(f"  ({len(unmatched_trials)} trials could not be matched to known drugs)")
-        return {"assets": [], "unmatched": len(unmatched_trials), "total_trials": len(trials)}
-
     # Header
     print(f"  {'Drug':30s} {'Target/MoA':22s} {'Phase':10s} {'Trials':7s} {'Active':7s} {'Sponsor':30s} {'Countries'}")
     print(f"  {'─'*140}")
@@ -1986,21 +2167,11 @@ def build_landscape(target_or_query, region="all", max_trials=200, use_llm=False
     print(f"    Phase 3+:             {sum(1 for a in asset_list if a['highest_phase_rank'] >= 4)}")
     print(f"    Phase 2:              {sum(1 for a in asset_list if 2.5 <= a['highest_phase_rank'] < 4)}")
     print(f"    Phase 1:              {sum(1 for a in asset_list if 1 <= a['highest_phase_rank'] < 2.5)}")
-    print(f"    Auto-discovered:      {direct_extracted} (from intervention fields)")
-    if llm_extracted:
-        print(f"    LLM-extracted:        {llm_extracted} (from Claude)")
-    print(f"    Unmatched trials:     {len(unmatched_trials)} (use --landscape-llm to extract)")
-    print(f"    Total trials scanned: {len(trials)}")
-
-    # Return structured data
-    return {
-        "query": target_or_query,
-        "region": region,
-        "assets": asset_list,
-        "total_trials": len(trials),
-        "unmatched_trials": len(unmatched_trials),
-        "timestamp": datetime.now().isoformat(),
-    }
+    print(f"    Auto-discovered:      {stats['direct']} (from intervention fields)")
+    if stats["llm"]:
+        print(f"    LLM-extracted:        {stats['llm']} (from Claude)")
+    print(f"    Unmatched trials:     {stats['unmatched']} (use --landscape-llm to extract)")
+    print(f"    Total trials scanned: {total_trials}")
 
 
 def _extract_interventions_direct(trials, already_found):
@@ -2019,41 +2190,9 @@ def _extract_interventions_direct(trials, already_found):
     Returns:
         Dict of drug_name → asset dict
     """
-    # ── INN (International Nonproprietary Name) suffix patterns ──
-    # These are WHO-assigned naming stems that mark real pharmaceutical compounds.
-    # If a word ends with one of these, it's almost certainly a drug.
-    INN_PATTERN = re.compile(
-        r'^[a-z].*(?:'
-        # Monoclonal antibodies
-        r'mab|zumab|ximab|mumab|tumab|lumab|numab|rumab|'
-        # Kinase inhibitors
-        r'tinib|nib|ciclib|sertib|metinib|ratinib|citinib|letinib|lisib|'
-        # Peptides & receptor agonists
-        r'tide|glutide|reotide|nakin|relbin|'
-        # Cardiovascular / metabolic
-        r'pril|sartan|olol|statin|vastatin|prazole|gliptin|gliflozin|'
-        # Anti-infectives
-        r'cillin|floxacin|mycin|cycline|bactam|fungin|vudine|virin|'
-        # Anti-coagulants / respiratory
-        r'parin|lukast|'
-        # Other stems (newer naming)
-        r'tug|kibart|kecept|nermin|ceptin|platin|rubicin|'
-        r'fenacin|lukine|poetin|tropin|fibatide|gatran|'
-        # ADC / fusion / bispecific suffixes
-        r'vedotin|mertansine|tansine|ozogamicin|ravtansine|'
-        r'fusp|cept'
-        r')$',
-        re.IGNORECASE
-    )
-
-    # ── Code name patterns (e.g., KT-621, PF-06939926, BM512) ──
-    # Pharma companies use alphanumeric codes for experimental compounds.
-    CODE_NAME_PATTERN = re.compile(
-        r'^[A-Z]{1,5}[\-]?\d{2,7}[A-Z]?$|'          # KT-621, PJ009, BM512, PF-06939926
-        r'^[A-Z]{2,6}[\-]\d{2,}(?:[\-]\d+)?$|'       # ABT-494, SHR-1819, BAY81-2996
-        r'^[A-Z]\d{4,}$',                             # E7080
-        re.IGNORECASE
-    )
+    # INN naming stems (nemolizumab, abrocitinib) and pharma code names
+    # (KT-621, PF-06939926) come from drug_matcher.INN_PATTERN /
+    # CODE_NAME_PATTERN, compiled once and shared with the mention tagger.
 
     # ── Known non-drug terms — broad blocklist ──
     # Clinical trials list all sorts of non-drug "interventions" that we need to skip.
@@ -2357,6 +2496,7 @@ Examples:
   %(prog)s --landscape --target "ADC" --region china     ADC landscape, China focus
   %(prog)s --landscape-llm --target "PD-1"              Landscape + Claude extraction
   %(prog)s --landscape-patents --target "KRAS"          Landscape + patent search (preclinical)
+  %(prog)s --landscape --target "GLP-1" --rebuild       Ignore the stored landscape and rebuild
   %(prog)s --trials --target "GLP-1"                    Raw trial search
   %(prog)s --trials --target "GLP-1" --region china     China-specific trials
   %(prog)s --patents --query "KRAS inhibitor"           Search global patents
@@ -2372,6 +2512,7 @@ Examples:
     parser.add_argument("--landscape", action="store_true", help="Build drug asset landscape (grouped by drug)")
     parser.add_argument("--landscape-llm", action="store_true", help="Landscape with Claude-powered extraction")
     parser.add_argument("--landscape-patents", action="store_true", help="Landscape + patent search for preclinical assets")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the landscape instead of using the stored snapshot")
     parser.add_argument("--trials", action="store_true", help="Search clinical trial registries only")
     parser.add_argument("--patents", action="store_true", help="Search patent databases only")
     parser.add_argument("--ir", action="store_true", help="Scrape regional IR pages only")
@@ -2410,6 +2551,7 @@ Examples:
         result = build_landscape(
             search_term, region=args.region,
             max_trials=max_trials, use_llm=use_llm, use_patents=use_patents,
+            force_refresh=args.rebuild,
         )
 
         # Save to JSON
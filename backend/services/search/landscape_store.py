@@ -0,0 +1,385 @@
+"""
+SatyaBio — Landscape Store
+
+Persists build_landscape() results per (query, region, options) together with
+the per-trial drug assignments they were aggregated from. A repeat landscape
+question is answered from the stored snapshot; a refresh only re-extracts the
+trials ClinicalTrials.gov reports as updated since the last build and merges
+them into the snapshot, so DRUG_PATTERNS, intervention extraction and the
+optional Claude pass never re-run over trials that have not changed.
+
+What it does:
+  - snapshot_key(): one snapshot per normalized (query, region, options)
+  - freshness(): fresh / stale / expired, from LANDSCAPE_FRESH_HOURS and LANDSCAPE_MAX_AGE_DAYS
+  - merge_trials(): replace updated trials (and their drug assignments) in a snapshot
+  - aggregate_assets(): rebuild the asset map from per-trial assignments — no network, no LLM
+  - load() / save(): process memory first, then Neon (landscape_snapshots table)
+
+Freshness policy:
+  fresh    refreshed less than LANDSCAPE_FRESH_HOURS ago — served as is
+  stale    older than that — served, then refreshed with a delta fetch
+           (trials with LastUpdatePostDate since the last refresh, one day overlap)
+  expired  first built more than LANDSCAPE_MAX_AGE_DAYS ago — rebuilt from scratch,
+           which also drops trials that no longer match the query
+
+Usage:
+    import landscape_store
+
+    key = landscape_store.snapshot_key("KRAS", "all", {"max_trials": 200})
+    snapshot = landscape_store.load(key)
+    if snapshot and landscape_store.freshness(snapshot)["status"] == "fresh":
+        assets, stats = landscape_store.aggregate_assets(snapshot, PHASE_RANK)
+
+Environment:
+    NEON_DATABASE_URL         snapshots persist across processes when set
+    LANDSCAPE_FRESH_HOURS     serve without refreshing below this age (default 24)
+    LANDSCAPE_MAX_AGE_DAYS    full rebuild instead of a delta refresh above this age (default 30)
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+try:
+    import psycopg2
+    import psycopg2.extras
+except ImportError:
+    psycopg2 = None
+
+DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
+FRESH_HOURS = float(os.environ.get("LANDSCAPE_FRESH_HOURS", 24))
+MAX_AGE_DAYS = float(os.environ.get("LANDSCAPE_MAX_AGE_DAYS", 30))
+DELTA_OVERLAP_DAYS = 1   # LastUpdatePostDate is date-granular
+
+# Extraction stages, in the order build_landscape runs them. Assets are
+# aggregated stage by stage so a rebuilt map ranks ties exactly as a fresh build.
+STAGES = ("pattern", "direct", "llm")
+ACTIVE_STATUSES = ("RECRUITING", "ACTIVE_NOT_RECRUITING", "NOT_YET_RECRUITING")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS landscape_snapshots (
+    snapshot_key    TEXT PRIMARY KEY,
+    query           TEXT NOT NULL,
+    region          TEXT NOT NULL,
+    snapshot        JSONB NOT NULL,
+    built_at        TIMESTAMPTZ NOT NULL,
+    refreshed_at    TIMESTAMPTZ NOT NULL,
+    hit_count       INTEGER DEFAULT 0
+);
+"""
+
+_memory: dict[str, dict] = {}
+_refreshing: set[str] = set()
+_lock = threading.Lock()
+_table_ready = False
+
+
+# =============================================================================
+# SNAPSHOTS
+# =============================================================================
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def snapshot_key(query: str, region: str, options: Optional[dict] = None) -> str:
+    """Deterministic key for a (query, region, options) landscape."""
+    normalized = json.dumps(
+        [query.strip().lower(), (region or "all").strip().lower(), options or {}],
+        sort_keys=True,
+    )
+    return hashlib.sha256(f"landscape:{normalized}".encode()).hexdigest()[:32]
+
+
+def new_snapshot(query: str, region: str, options: dict, trials: list[dict],
+                 assignments: dict, patent_assets: Optional[list[dict]] = None,
+                 now: Optional[datetime] = None) -> dict:
+    """
+    Build a snapshot from a full fetch.
+
+    assignments maps trial_id → [[stage, drug_name, target_moa, source], ...];
+    trials without an entry (or with an empty list) count as unmatched.
+    """
+    stamp = (now or _now()).isoformat()
+    return {
+        "key": snapshot_key(query, region, options),
+        "query": query,
+        "region": region,
+        "options": options,
+        "built_at": stamp,
+        "refreshed_at": stamp,
+        "refreshes": 0,
+        "trials": {t["trial_id"]: t for t in trials},
+        "assignments": {t["trial_id"]: assignments.get(t["trial_id"], []) for t in trials},
+        "patent_assets": patent_assets or [],
+    }
+
+
+def freshness(snapshot: dict, now: Optional[datetime] = None) -> dict:
+    """Age of a snapshot and where it sits in the freshness policy."""
+    now = now or _now()
+    refreshed = _parse_time(snapshot["refreshed_at"])
+    built = _parse_time(snapshot["built_at"])
+    age_hours = (now - refreshed).total_seconds() / 3600
+    if now - built > timedelta(days=MAX_AGE_DAYS):
+        status = "expired"
+    elif age_hours >= FRESH_HOURS:
+        status = "stale"
+    else:
+        status = "fresh"
+    return {
+        "status": status,
+        "built_at": snapshot["built_at"],
+        "refreshed_at": snapshot["refreshed_at"],
+        "age_hours": round(age_hours, 1),
+    }
+
+
+def delta_since(snapshot: dict) -> str:
+    """LastUpdatePostDate lower bound for the next delta fetch (YYYY-MM-DD)."""
+    refreshed = _parse_time(snapshot["refreshed_at"]) - timedelta(days=DELTA_OVERLAP_DAYS)
+    return refreshed.strftime("%Y-%m-%d")
+
+
+def pattern_drugs(snapshot: dict) -> set[str]:
+    """Drug names DRUG_PATTERNS found anywhere in the snapshot."""
+    return {
+        row[1]
+        for rows in snapshot["assignments"].values()
+        for row in rows if row[0] == "pattern"
+    }
+
+
+def merge_trials(snapshot: dict, trials: list[dict], assignments: dict,
+                 now: Optional[datetime] = None) -> tuple[dict, dict]:
+    """
+    Merge a delta fetch into a snapshot.
+
+    Updated trials replace their previous record and drug assignments in place
+    (keeping their position); new trials are appended. The input snapshot is
+    not modified — readers may still be aggregating it — a new one is returned
+    with counts of added and updated trials.
+    """
+    merged = dict(snapshot)
+    merged["trials"] = dict(snapshot["trials"])
+    merged["assignments"] = dict(snapshot["assignments"])
+    counts = {"added": 0, "updated": 0}
+    for trial in trials:
+        trial_id = trial["trial_id"]
+        counts["updated" if trial_id in merged["trials"] else "added"] += 1
+        merged["trials"][trial_id] = trial
+        merged["assignments"][trial_id] = assignments.get(trial_id, [])
+    merged["refreshed_at"] = (now or _now()).isoformat()
+    merged["refreshes"] = snapshot.get("refreshes", 0) + 1
+    return merged, counts
+
+
+def aggregate_assets(snapshot: dict, phase_rank: dict) -> tuple[list[dict], dict]:
+    """
+    Rebuild the landscape asset list from per-trial assignments.
+
+    Returns (assets sorted by highest phase then trial count, stats) where
+    stats counts the assets each stage contributed first, the patent-only
+    assets, and the trials no stage matched.
+    """
+    assets = {}
+    stats = {stage: 0 for stage in STAGES}
+    trials = snapshot["trials"]
+
+    for stage in STAGES:
+        for trial_id, rows in snapshot["assignments"].items():
+            trial = trials[trial_id]
+            for row_stage, drug_name, target_moa, source in rows:
+                if row_stage != stage:
+                    continue
+                asset = assets.get(drug_name)
+                if asset is None:
+                    asset = assets[drug_name] = {
+                        "drug_name": drug_name,
+                        "target_moa": target_moa,
+                        "sponsor": "",
+                        "highest_phase": "",
+                        "highest_phase_rank": 0,
+                        "trials": [],
+                        "countries": set(),
+                        "indications": set(),
+                        "active_trials": 0,
+                        "total_trials": 0,
+                    }
+                    if source:
+                        asset["source"] = source
+                    stats[stage] += 1
+                _count_trial(asset, trial, phase_rank)
+
+    stats["patent_only"] = 0
+    for patent in snapshot.get("patent_assets", []):
+        existing = assets.get(patent["drug_name"])
+        if existing is None:
+            assets[patent["drug_name"]] = dict(
+                patent,
+                countries=set(patent.get("countries", [])),
+                indications=set(patent.get("indications", [])),
+            )
+            stats["patent_only"] += 1
+        else:
+            existing.setdefault("patent_ids", []).extend(patent.get("patent_ids", []))
+            existing["countries"].update(patent.get("countries", []))
+
+    stats["unmatched"] = sum(1 for rows in snapshot["assignments"].values() if not rows)
+
+    asset_list = sorted(assets.values(), key=lambda a: (-a["highest_phase_rank"], -a["total_trials"]))
+    for asset in asset_list:
+        asset["countries"] = sorted(asset["countries"])
+        asset["indications"] = sorted(asset["indications"])[:5]  # top 5
+    return asset_list, stats
+
+
+def _count_trial(asset: dict, trial: dict, phase_rank: dict):
+    """Fold one trial into an asset's counts, phase, sponsor, countries and indications."""
+    asset["trials"].append(trial["trial_id"])
+    asset["total_trials"] += 1
+
+    phase = trial.get("phase", "")
+    rank = phase_rank.get(phase, 0)
+    if rank > asset["highest_phase_rank"]:
+        asset["highest_phase"] = phase
+        asset["highest_phase_rank"] = rank
+
+    if trial.get("sponsor") and not asset["sponsor"]:
+        asset["sponsor"] = trial["sponsor"]
+
+    for country in trial.get("countries", "").split(", "):
+        country = country.strip()
+        if country:
+            asset["countries"].add(country)
+
+    for cond in trial.get("conditions", "").split(", "):
+        cond = cond.strip()
+        if cond and len(cond) > 3:
+            asset["indications"].add(cond)
+
+    if trial.get("status") in ACTIVE_STATUSES:
+        asset["active_trials"] += 1
+
+
+# =============================================================================
+# PERSISTENCE — process memory, then Neon
+# =============================================================================
+
+def _get_conn():
+    if psycopg2 is None or not DATABASE_URL:
+        return None
+    try:
+        return psycopg2.connect(DATABASE_URL)
+    except Exception as e:
+        print(f"  [Landscape store] DB connect error: {e}")
+        return None
+
+
+def _ensure_table(conn) -> bool:
+    global _table_ready
+    if _table_ready:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA)
+        conn.commit()
+        _table_ready = True
+    except Exception as e:
+        print(f"  [Landscape store] Setup error: {e}")
+        conn.rollback()
+    return _table_ready
+
+
+def load(key: str) -> Optional[dict]:
+    """Stored snapshot for a key, or None. Treat the result as read-only."""
+    with _lock:
+        snapshot = _memory.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    conn = _get_conn()
+    if not conn:
+        return None
+    try:
+        if not _ensure_table(conn):
+            return None
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                UPDATE landscape_snapshots SET hit_count = hit_count + 1
+                WHERE snapshot_key = %s
+                RETURNING snapshot
+            """, (key,))
+            row = cur.fetchone()
+        conn.commit()
+    except Exception as e:
+        print(f"  [Landscape store] Read error: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+    if not row:
+        return None
+    snapshot = row["snapshot"]
+    with _lock:
+        _memory[key] = snapshot
+    return snapshot
+
+
+def save(snapshot: dict):
+    """Store a snapshot in memory and, when configured, in Neon."""
+    with _lock:
+        _memory[snapshot["key"]] = snapshot
+
+    conn = _get_conn()
+    if not conn:
+        return
+    try:
+        if not _ensure_table(conn):
+            return
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO landscape_snapshots
+                    (snapshot_key, query, region, snapshot, built_at, refreshed_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (snapshot_key) DO UPDATE SET
+                    snapshot = EXCLUDED.snapshot,
+                    built_at = EXCLUDED.built_at,
+                    refreshed_at = EXCLUDED.refreshed_at
+            """, (snapshot["key"], snapshot["query"].strip().lower(), snapshot["region"],
+                  json.dumps(snapshot, default=str), snapshot["built_at"], snapshot["refreshed_at"]))
+        conn.commit()
+    except Exception as e:
+        print(f"  [Landscape store] Write error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def begin_refresh(key: str) -> bool:
+    """Claim the refresh of a snapshot; False if one is already running in this process."""
+    with _lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        return True
+
+
+def end_refresh(key: str):
+    with _lock:
+        _refreshing.discard(key)
+
+
+def clear_memory():
+    """Drop the in-process snapshots (the Neon copies are kept)."""
+    with _lock:
+        _memory.clear()
@@ -0,0 +1,433 @@
+"""
+SatyaBio — Drug / Target / Indication Mention Tagger
+
+One pass over a query or a full document finds every known drug, target
+and indication mention, with character spans and entity IDs. Replaces the
+per-module keyword lists and substring loops (query_router's target list,
+the news miner's regexes, therapeutic_areas / portfolio_intelligence
+indication maps, auto_drug_extractor's per-target LIKE queries).
+
+What it does:
+  1. MentionTagger holds named alias sources ("known_drugs", "drug_aliases",
+     "targets", ...) in one drug_matcher.AhoCorasick automaton. tag(text)
+     returns Mention spans: leftmost-longest by default, or every hit with
+     overlapping=True. Matches must sit on word boundaries (prefix sources
+     only need the left one, so "tumor" also tags "tumors"). Acronyms that
+     are also everyday words ("ALL", "MET") only match in capitals.
+  2. Incremental rebuilds: a new source, or one that only grew, is inserted
+     into the live trie; a changed source rebuilds the trie. Failure links
+     are recomputed once, on the next tag(). Unchanged sources are no-ops.
+  3. is_confident(text, mentions): at least one known drug is tagged, every
+     drug-shaped token (INN stem word or code name like "BG-68501") is
+     covered by a mention, and the text has no CJK/Hangul script. Callers can
+     then skip LLM extraction; text that names no drug at all (an unnamed
+     asset) is never confident.
+  4. get_mention_tagger(): shared tagger over the static tables
+     (known_drugs_baseline, drug_entities TARGET_HIERARCHY /
+     DISEASE_TARGET_MAP, therapeutic_areas' indication map) plus the live
+     drug_aliases / targets tables when the database is reachable. Modules
+     add their own static lists once with register_source().
+
+Usage:
+    from mention_tagger import get_mention_tagger
+
+    tagger = get_mention_tagger()
+    for m in tagger.tag("Keytruda plus a KRAS G12C inhibitor in NSCLC"):
+        print(m.entity_type, m.canonical, m.entity_id, m.start, m.end)
+
+    mentions = tagger.tag(article_text)
+    if tagger.is_confident(article_text, mentions):
+        ...  # no need to ask Claude
+
+Environment:
+    MENTION_TAGGER_TTL   seconds between reloads of the DB alias/target sources (default 300)
+"""
+
+import os
+import re
+import time
+import threading
+from dataclasses import dataclass
+from typing import Iterable, NamedTuple, Optional
+
+from drug_matcher import AhoCorasick, INN_MENTION_PATTERN
+
+MENTION_TAGGER_TTL = float(os.environ.get("MENTION_TAGGER_TTL", 300))
+
+# Upper-case acronyms that are also ordinary words: matched case-sensitively
+AMBIGUOUS_ACRONYMS = {
+    "ALL", "AS", "AT", "CAN", "IS", "IT", "MAY", "MET", "MS", "NO", "ON", "ONE", "OR", "SET", "US",
+}
+
+# Compound codes in free text (KT-621, PF-06939926, BM512)
+CODE_MENTION_PATTERN = re.compile(r"\b[A-Z]{1,5}-?\d{2,7}[A-Z]?\b")
+
+# Point mutations look like codes (G12C, V600E, T790M) but aren't drugs
+MUTATION_PATTERN = re.compile(r"^[A-Z]\d{1,4}[A-Z]$")
+
+# Code-shaped tokens that are not drugs (diseases, meetings, fiscal periods)
+NON_DRUG_CODE_PREFIXES = {
+    "COVID", "SARS", "MERS", "HTTP", "HTML", "NULL", "ISO", "FY", "CY", "Q", "H",
+    "ASCO", "ESMO", "ASH", "AACR", "EHA", "ADA", "EASD", "WCLC", "SABCS", "AAN", "NCT",
+}
+
+_NON_LATIN_SCRIPT = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+
+
+@dataclass(frozen=True)
+class Mention:
+    """One tagged span of the input text."""
+    start: int
+    end: int
+    text: str            # the span as written
+    entity_type: str     # 'drug', 'target', 'indication'
+    entity_id: object    # DB id, or the canonical name for static tables
+    canonical: str
+    source: str          # alias source that produced the match
+    priority: tuple      # (source rank, row) — lower means listed earlier
+
+
+class _Entry(NamedTuple):
+    surface: str
+    entity_type: str
+    entity_id: object
+    canonical: str
+    source: str
+    priority: tuple
+    case_sensitive: bool
+    prefix: bool
+    bounded: bool
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _left_ok(text: str, start: int) -> bool:
+    return start == 0 or not (_is_word(text[start - 1]) and _is_word(text[start]))
+
+
+def _right_ok(text: str, end: int) -> bool:
+    return end == len(text) or not (_is_word(text[end - 1]) and _is_word(text[end]))
+
+
+def _lower_same_length(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few code points lower-case to two characters; keep offsets aligned
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class MentionTagger:
+    """Dictionary tagger over named alias sources (see module docstring)."""
+
+    def __init__(self):
+        self._sources: dict[str, list[_Entry]] = {}
+        self._signatures: dict[str, tuple] = {}  # name -> (entity_type, prefix, rows)
+        self._ranks: dict[str, int] = {}
+        self._automaton = AhoCorasick()
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._sources.values())
+
+    def sources(self) -> dict[str, int]:
+        """Source name → entry count."""
+        return {name: len(entries) for name, entries in self._sources.items()}
+
+    def set_source(
+        self,
+        name: str,
+        entity_type: str,
+        entries: Iterable[tuple],
+        prefix: bool = False,
+    ) -> bool:
+        """
+        Load (or replace) a source. entries: (surface, entity_id, canonical).
+        Returns False when the source is unchanged.
+        """
+        rows = []
+        for surface, entity_id, canonical in entries:
+            surface = (surface or "").strip()
+            if len(surface) >= 2:
+                rows.append((surface, entity_id, canonical or surface))
+        signature = (entity_type, prefix, rows)
+
+        with self._lock:
+            old = self._signatures.get(name)
+            if old == signature:
+                return False
+            rank = self._ranks.setdefault(name, len(self._ranks))
+            built = [
+                _Entry(
+                    surface=surface,
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    canonical=canonical,
+                    source=name,
+                    priority=(rank, i),
+                    case_sensitive=surface in AMBIGUOUS_ACRONYMS,
+                    prefix=prefix and len(surface) > 3,
+                    bounded=not _NON_LATIN_SCRIPT.search(surface),
+                )
+                for i, (surface, entity_id, canonical) in enumerate(rows)
+            ]
+
+            # New or append-only: insert just the new rows into the live trie
+            grown = old is not None and old[:2] == signature[:2] and rows[:len(old[2])] == old[2]
+            self._sources[name] = built
+            self._signatures[name] = signature
+            if old is None or grown:
+                for entry in built[len(old[2]) if old else 0:]:
+                    self._automaton.add(_lower_same_length(entry.surface), entry)
+            else:
+                self._rebuild()
+            self.version += 1
+        return True
+
+    def remove_source(self, name: str):
+        with self._lock:
+            if self._sources.pop(name, None) is not None:
+                self._signatures.pop(name, None)
+                self._rebuild()
+                self.version += 1
+
+    def _rebuild(self):
+        automaton = AhoCorasick()
+        for entries in self._sources.values():
+            for entry in entries:
+                automaton.add(_lower_same_length(entry.surface), entry)
+        self._automaton = automaton
+
+    def _hits(self, text: str, types: Optional[Iterable[str]], sources: Optional[Iterable[str]]) -> list:
+        wanted = set(types) if types else None
+        from_sources = set(sources) if sources else None
+        lowered = _lower_same_length(text)
+        hits = []
+        # The scan holds the lock: set_source() may be growing this trie
+        with self._lock:
+            for start, end, entry in self._automaton.iter(lowered):
+                if wanted is not None and entry.entity_type not in wanted:
+                    continue
+                if from_sources is not None and entry.source not in from_sources:
+                    continue
+                if entry.case_sensitive and text[start:end] != entry.surface:
+                    continue
+                if entry.bounded:
+                    if not _left_ok(text, start):
+                        continue
+                    if not entry.prefix and not _right_ok(text, end):
+                        continue
+                hits.append((start, end, entry))
+        return hits
+
+    def tag(
+        self,
+        text: str,
+        types: Optional[Iterable[str]] = None,
+        overlapping: bool = False,
+        sources: Optional[Iterable[str]] = None,
+    ) -> list[Mention]:
+        """
+        Every mention in `text`, in order of position.
+
+        By default overlapping hits are resolved leftmost-longest ("KRAS G12C"
+        wins over "KRAS"); a span that names several entity types (a target
+        that is also an indication) keeps one mention per type, the
+        earliest-listed alias winning. overlapping=True returns every hit.
+        `types` / `sources` restrict the entity types / alias sources used.
+        """
+        if not text:
+            return []
+        best: dict[tuple, _Entry] = {}  # (start, end, entity_type) -> entry
+        for start, end, entry in self._hits(text, types, sources):
+            key = (start, end, entry.entity_type) if not overlapping else (start, end, entry.entity_type, entry.entity_id)
+            if key not in best or entry.priority < best[key].priority:
+                best[key] = entry
+
+        spans = sorted(best.items(), key=lambda kv: (kv[0][0], kv[0][0] - kv[0][1], kv[1].priority))
+        mentions = []
+        covered_to = -1
+        kept_span = None
+        for key, entry in spans:
+            start, end = key[0], key[1]
+            if not overlapping:
+                if (start, end) != kept_span and start < covered_to:
+                    continue
+                if (start, end) != kept_span:
+                    kept_span, covered_to = (start, end), end
+            mentions.append(Mention(
+                start=start,
+                end=end,
+                text=text[start:end],
+                entity_type=entry.entity_type,
+                entity_id=entry.entity_id,
+                canonical=entry.canonical,
+                source=entry.source,
+                priority=entry.priority,
+            ))
+        return mentions
+
+    def first(self, text: str, entity_type: str, sources: Optional[Iterable[str]] = None) -> Optional[Mention]:
+        """The earliest-listed entity of one type found anywhere in `text`."""
+        found = self.tag(text, types=(entity_type,), overlapping=True, sources=sources)
+        return min(found, key=lambda m: m.priority) if found else None
+
+    @staticmethod
+    def drug_shaped_spans(text: str) -> list[tuple[int, int]]:
+        """Spans of INN-stem words and compound-code tokens in `text`."""
+        spans = [m.span() for m in INN_MENTION_PATTERN.finditer(text or "")]
+        for m in CODE_MENTION_PATTERN.finditer(text or ""):
+            token = m.group(0)
+            if MUTATION_PATTERN.match(token) or re.match(r"[A-Z]+", token).group(0) in NON_DRUG_CODE_PREFIXES:
+                continue
+            spans.append(m.span())
+        return spans
+
+    def is_confident(self, text: str, mentions: Optional[list[Mention]] = None) -> bool:
+        """
+        True when the tagger has probably found every drug in `text`: no
+        CJK/Hangul script, at least one known drug mention ("licenses a novel
+        bispecific" names none), and each drug-shaped token lies inside a
+        tagged mention (a known drug, or a target/indication such as "GLP-1").
+        """
+        if not text:
+            return True
+        if _NON_LATIN_SCRIPT.search(text):
+            return False
+        if mentions is None:
+            mentions = self.tag(text)
+        if not any(m.entity_type == "drug" for m in mentions):
+            return False
+        spans = [(m.start, m.end) for m in mentions]
+        return all(
+            any(s <= start and end <= e for s, e in spans)
+            for start, end in self.drug_shaped_spans(text)
+        )
+
+
+# =============================================================================
+# Shared tagger
+# =============================================================================
+
+def _static_drug_entries():
+    try:
+        from known_drugs_baseline import KNOWN_DRUGS
+    except ImportError:
+        return []
+    return [
+        (alias, canonical, canonical)
+        for canonical, aliases in KNOWN_DRUGS.items()
+        for alias in [canonical] + sorted(aliases)
+    ]
+
+
+def _static_target_and_disease_entries():
+    try:
+        from drug_entities import DISEASE_TARGET_MAP, TARGET_HIERARCHY
+    except ImportError:
+        return [], []
+    targets = []
+    for name, display, _parent, _cls, _gene, _desc, _keywords, aliases in TARGET_HIERARCHY:
+        for surface in [name, display] + list(aliases):
+            targets.append((surface, name, name))
+    diseases = [(disease, disease, disease) for disease, *_ in DISEASE_TARGET_MAP]
+    return targets, diseases
+
+
+def _static_indication_entries():
+    try:
+        from therapeutic_areas import list_indication_mappings
+    except ImportError:
+        return []
+    return [(indication, ta_id, indication) for indication, ta_id in list_indication_mappings().items()]
+
+
+def _db_entries():
+    """(drug alias entries, target entries) from the live tables, or None offline."""
+    try:
+        from drug_entities import get_alias_entries, get_target_tree
+    except ImportError:
+        return None
+    try:
+        drugs = get_alias_entries()
+        tree = get_target_tree()
+    except Exception as e:
+        print(f"  ⚠ Mention tagger DB sources unavailable: {e}")
+        return None
+    # Original-case surfaces: lowered keys would defeat the AMBIGUOUS_ACRONYMS guard
+    targets = [(name, tid, name) for tid, name in tree.names.items()]
+    targets += [(alias, tid, tree.names[tid]) for tid, alias in tree.aliases if tid in tree.names]
+    return drugs, targets
+
+
+_shared: Optional[MentionTagger] = None
+_shared_lock = threading.Lock()
+_db_loaded_at = 0.0
+_registered: dict[str, tuple] = {}  # name -> (entity_type, entries, prefix)
+
+
+def register_source(name: str, entity_type: str, entries: Iterable[tuple], prefix: bool = False):
+    """
+    Add a static source to the shared tagger — call once, at import time.
+    Applied now if the tagger exists, else when it is first built, so
+    request paths never mutate the shared automaton.
+    """
+    entries = list(entries)
+    with _shared_lock:
+        _registered[name] = (entity_type, entries, prefix)
+        tagger = _shared
+    if tagger is not None:
+        tagger.set_source(name, entity_type, entries, prefix=prefix)
+
+
+def get_mention_tagger(refresh: bool = False) -> MentionTagger:
+    """
+    The process-wide tagger. Static tables load once; DB sources are
+    re-read every MENTION_TAGGER_TTL seconds (or with refresh=True) and
+    only rebuild the automaton when their rows changed.
+    """
+    global _shared, _db_loaded_at
+    with _shared_lock:
+        if _shared is None:
+            tagger = MentionTagger()
+            targets, diseases = _static_target_and_disease_entries()
+            tagger.set_source("known_drugs", "drug", _static_drug_entries())
+            tagger.set_source("target_hierarchy", "target", targets)
+            tagger.set_source("indication_map", "indication", _static_indication_entries(), prefix=True)
+            tagger.set_source("disease_targets", "indication", diseases)
+            for name, (entity_type, entries, prefix) in _registered.items():
+                tagger.set_source(name, entity_type, entries, prefix=prefix)
+            _shared = tagger
+        tagger = _shared
+        due = refresh or time.time() - _db_loaded_at > MENTION_TAGGER_TTL
+        if due:
+            _db_loaded_at = time.time()
+
+    if due:
+        loaded = _db_entries()
+        if loaded is not None:
+            drugs, targets = loaded
+            tagger.set_source("drug_aliases", "drug", drugs)
+            tagger.set_source("targets", "target", targets)
+    return tagger
+
+
+def invalidate_mention_tagger():
+    """Re-read the DB sources on the next get_mention_tagger() call."""
+    global _db_loaded_at
+    with _shared_lock:
+        _db_loaded_at = 0.0
+
+
+if __name__ == "__main__":
+    import sys
+
+    tagger = get_mention_tagger()
+    print(f"Mention tagger: {len(tagger)} aliases from {tagger.sources()}")
+    text = " ".join(sys.argv[1:]) or "Keytruda plus a KRAS G12C inhibitor (AZD5305) in NSCLC and AML"
+    for m in tagger.tag(text):
+        print(f"  [{m.start:3d}:{m.end:3d}] {m.entity_type:10s} {m.text!r:24s} → {m.canonical} ({m.entity_id})")
+    print(f"  confident: {tagger.is_confident(text)}")
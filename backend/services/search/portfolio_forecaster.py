@@ -0,0 +1,577 @@
+"""
+SatyaBio — Portfolio Batch Forecasting
+
+Runs the trial forecaster over a whole set of trials at once — a company's
+pivotal catalog, every Phase 3 readout in a catalyst window, or an explicit
+NCT list — and stores a ranked table of PoS, effect and event distributions.
+Before this, ranking risk across a portfolio meant calling forecast_trial
+dozens of times by hand.
+
+How it works:
+  1. select_trials() turns a ticker / catalyst window / NCT list into NCT IDs
+     with one paged CT.gov search (shared ctgov_client: pooled, rate-limited,
+     cached, mirror-first).
+  2. Trial designs and anchors are prepared concurrently on the event loop
+     (prepare_forecast_session), bounded by PORTFOLIO_FETCH_CONCURRENCY.
+  3. Simulations fan out across the forecast_jobs process pool.
+  4. Rows are ranked riskiest-first (lowest PoS) and saved to Neon
+     (portfolio_forecast_runs / portfolio_forecasts), or to
+     data/forecasts/portfolio_<run_id>.json when no database is configured.
+
+Usage:
+    python3 portfolio_forecaster.py --ticker VKTX
+    python3 portfolio_forecaster.py --window 2026-10-01:2027-03-31 --phase PHASE3
+    python3 portfolio_forecaster.py --nct NCT05202860,NCT04650321 --iterations 20000
+    python3 portfolio_forecaster.py --show <run_id>
+
+    # From async code
+    run = await forecast_portfolio(ticker="VKTX")
+    run["rows"][0]  # riskiest trial
+
+Environment:
+    PORTFOLIO_FETCH_CONCURRENCY   concurrent trial preparations (default 8)
+    PORTFOLIO_MAX_TRIALS          cap on trials per run (default 60)
+    PORTFOLIO_TRIAL_SECONDS       job-timeout allowance per selected trial (default 10)
+    PORTFOLIO_MIN_TIMEOUT         floor on a portfolio job's timeout in seconds (default 300)
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import numpy as np
+
+import ctgov_client
+from trial_forecaster import (
+    ForecastResult,
+    ForecastSession,
+    params_from_dict,
+    prepare_forecast_session,
+)
+from forecast_jobs import ForecastJob, new_job_id, run_session, submit_job
+
+try:
+    import psycopg2
+    from psycopg2.extras import Json
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
+FETCH_CONCURRENCY = int(os.environ.get("PORTFOLIO_FETCH_CONCURRENCY", 8))
+MAX_TRIALS = int(os.environ.get("PORTFOLIO_MAX_TRIALS", 60))
+# ~2s of simulation per trial on one core, plus fetches
+TRIAL_SECONDS = float(os.environ.get("PORTFOLIO_TRIAL_SECONDS", 10))
+MIN_TIMEOUT = float(os.environ.get("PORTFOLIO_MIN_TIMEOUT", 300))
+LOCAL_DIR = _REPO_ROOT / "data" / "forecasts"
+
+# Trials that haven't read out yet; COMPLETED is added for catalyst windows,
+# since a trial can finish its primary completion before results are public.
+ACTIVE_STATUSES = ["RECRUITING", "ACTIVE_NOT_RECRUITING", "ENROLLING_BY_INVITATION", "NOT_YET_RECRUITING"]
+
+
+# =============================================================================
+# Trial selection
+# =============================================================================
+
+def sponsor_for_ticker(ticker: str) -> str:
+    """CT.gov lead-sponsor search text for one of our tickers."""
+    ticker = ticker.upper()
+    try:
+        from backend.services.scraper.precompute_assets import TICKER_TO_SPONSOR
+        if ticker in TICKER_TO_SPONSOR:
+            return TICKER_TO_SPONSOR[ticker]
+    except Exception:
+        pass
+    try:
+        from app.configs.companies import COMPANY_UNIVERSE
+        if ticker in COMPANY_UNIVERSE:
+            return COMPANY_UNIVERSE[ticker]["name"]
+    except Exception:
+        pass
+    return ticker
+
+
+def parse_window(window: str) -> Tuple[str, str]:
+    """'2026-10-01:2027-03-31' → ('2026-10-01', '2027-03-31'); either side may be empty."""
+    start, _, end = window.partition(":")
+    for value in (start, end):
+        if value:
+            datetime.strptime(value, "%Y-%m-%d")  # ValueError on a bad date
+    return start or "MIN", end or "MAX"
+
+
+def select_trials(
+    ticker: Optional[str] = None,
+    window: Optional[str] = None,
+    nct_ids: Optional[List[str]] = None,
+    phases: Tuple[str, ...] = ("PHASE3",),
+    limit: int = MAX_TRIALS,
+) -> List[str]:
+    """
+    Resolve a portfolio selector to NCT IDs.
+
+    An explicit NCT list wins. Otherwise a ticker (lead sponsor) and/or a
+    primary-completion window are combined into one CT.gov search limited
+    to `phases`.
+    """
+    if nct_ids:
+        seen = []
+        for nct in nct_ids:
+            nct = nct.strip().upper()
+            if nct and nct not in seen:
+                seen.append(nct)
+        return seen[:limit]
+    if not ticker and not window:
+        raise ValueError("Give a ticker, a catalyst window or a list of NCT IDs")
+
+    statuses = list(ACTIVE_STATUSES)
+    advanced = []
+    if phases:
+        advanced.append("(" + " OR ".join(f"AREA[Phase]{p}" for p in phases) + ")")
+    if window:
+        start, end = parse_window(window)
+        advanced.append(f"AREA[PrimaryCompletionDate]RANGE[{start},{end}]")
+        statuses.append("COMPLETED")
+
+    params = {
+        "filter.overallStatus": ",".join(statuses),
+        "filter.advanced": " AND ".join(advanced),
+        "pageSize": min(limit, 100),
+    }
+    if ticker:
+        params["query.spons"] = sponsor_for_ticker(ticker)
+
+    found: List[str] = []
+    while len(found) < limit:
+        data = ctgov_client.get_json(params, timeout=20)
+        for study in data.get("studies", []):
+            nct = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+            if nct and nct not in found:
+                found.append(nct)
+        token = data.get("nextPageToken")
+        if not token:
+            break
+        params["pageToken"] = token
+    return found[:limit]
+
+
+# =============================================================================
+# Batch forecast
+# =============================================================================
+
+def _row(session: ForecastSession, result: ForecastResult) -> Dict:
+    """One ranked-table row: PoS, effect distribution, event / readout timing."""
+    trial = session.trial
+    events = result.event_distribution or [0.0]
+    return {
+        "nct_id": trial.nct_id,
+        "title": trial.title,
+        "sponsor": trial.sponsor,
+        "condition": trial.condition,
+        "intervention": trial.intervention,
+        "phase": trial.phase.value,
+        "status": trial.status,
+        "primary_completion": trial.primary_completion or trial.estimated_completion,
+        "probability_of_success": result.probability_of_success,
+        "pos_standard_error": result.pos_standard_error,
+        "n_iterations": result.n_iterations,
+        "median_true_effect": result.median_true_effect,
+        "true_effect_ci": list(result.true_effect_ci),
+        "median_observed_effect_if_success": result.median_observed_effect_if_success,
+        "conditional_power_at_estimate": result.conditional_power_at_estimate,
+        "events_p10": float(np.percentile(events, 10)),
+        "events_median": float(np.median(events)),
+        "events_p90": float(np.percentile(events, 90)),
+        "true_effect_distribution": result.true_effect_distribution,
+        "event_distribution": result.event_distribution,
+        "error": None,
+    }
+
+
+def rank_rows(rows: List[Dict]) -> List[Dict]:
+    """Riskiest first (lowest PoS); trials that failed to forecast go last."""
+    rows = sorted(
+        rows,
+        key=lambda r: (r["error"] is not None, r.get("probability_of_success") or 0.0),
+    )
+    for i, row in enumerate(rows, 1):
+        row["risk_rank"] = i
+    return rows
+
+
+async def run_portfolio(
+    nct_ids: List[str],
+    params: Optional[Dict] = None,
+    n_iterations: int = 20000,
+    target_se: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, object]]:
+    """
+    Forecast every trial in `nct_ids`; yields ("step", msg) progress events and
+    finally ("rows", ranked_rows). Individual trial failures become error rows.
+    With `target_se`, each trial stops as soon as its PoS is that precise.
+    """
+    sim_params = params_from_dict(params)
+    fetch_gate = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def forecast_one(nct_id: str) -> Dict:
+        try:
+            async with fetch_gate:
+                session = await prepare_forecast_session(nct_id, n_iterations, target_se)
+            result = await run_session(session, sim_params)
+            return _row(session, result)
+        except Exception as e:
+            logger.warning(f"Portfolio forecast failed for {nct_id}: {e}")
+            return {"nct_id": nct_id, "probability_of_success": None, "error": str(e)}
+
+    if target_se:
+        yield ("step", f"Forecasting {len(nct_ids)} trials (to SE < {target_se:.3f}, max {n_iterations:,} iterations each)...")
+    else:
+        yield ("step", f"Forecasting {len(nct_ids)} trials ({n_iterations:,} iterations each)...")
+    rows = []
+    tasks = [asyncio.ensure_future(forecast_one(nct)) for nct in nct_ids]
+    try:
+        for done in asyncio.as_completed(tasks):
+            row = await done
+            rows.append(row)
+            if row["error"] is None:
+                yield ("step", f"[{len(rows)}/{len(nct_ids)}] {row['nct_id']}: "
+                               f"PoS {row['probability_of_success']:.1%}")
+            else:
+                yield ("step", f"[{len(rows)}/{len(nct_ids)}] {row['nct_id']}: failed")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield ("rows", rank_rows(rows))
+
+
+async def forecast_portfolio(
+    ticker: Optional[str] = None,
+    window: Optional[str] = None,
+    nct_ids: Optional[List[str]] = None,
+    phases: Tuple[str, ...] = ("PHASE3",),
+    params: Optional[Dict] = None,
+    n_iterations: int = 20000,
+    save: bool = True,
+    target_se: Optional[float] = None,
+) -> Dict:
+    """Select, forecast, rank and (optionally) persist one portfolio run."""
+    async for kind, data in portfolio_events(
+        ticker, window, nct_ids, phases, params, n_iterations, save, target_se,
+    ):
+        if kind == "result":
+            return data
+        if kind == "error":
+            raise RuntimeError(data)
+        logger.info(data)
+    raise RuntimeError("Portfolio forecast produced no result")
+
+
+async def portfolio_events(
+    ticker: Optional[str] = None,
+    window: Optional[str] = None,
+    nct_ids: Optional[List[str]] = None,
+    phases: Tuple[str, ...] = ("PHASE3",),
+    params: Optional[Dict] = None,
+    n_iterations: int = 20000,
+    save: bool = True,
+    target_se: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, object]]:
+    """
+    The full run as a job event stream: ("step", msg)..., ("result", run) or
+    ("error", msg). Used by the portfolio job endpoint and forecast_portfolio.
+    """
+    selector = {"ticker": ticker, "window": window, "nct_ids": nct_ids, "phases": list(phases)}
+    yield ("step", "Selecting trials on ClinicalTrials.gov...")
+    try:
+        ids = await asyncio.to_thread(select_trials, ticker, window, nct_ids, phases)
+    except Exception as e:
+        yield ("error", f"Trial selection failed: {e}")
+        return
+    if not ids:
+        yield ("error", "No trials matched this portfolio selector")
+        return
+
+    rows: List[Dict] = []
+    async for kind, data in run_portfolio(ids, params, n_iterations, target_se):
+        if kind == "rows":
+            rows = data
+        else:
+            yield (kind, data)
+
+    run = {
+        "run_id": uuid.uuid4().hex[:12],
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "selector": selector,
+        "params": params or {},
+        "n_iterations": n_iterations,
+        "target_se": target_se,
+        "rows": rows,
+    }
+    if save:
+        run["stored_in"] = await asyncio.to_thread(save_run, run)
+        yield ("step", f"Saved run {run['run_id']} ({run['stored_in']})")
+    yield ("result", run)
+
+
+def portfolio_timeout(nct_ids: Optional[List[str]] = None) -> float:
+    """
+    Job timeout for a portfolio run. An explicit NCT list is sized exactly;
+    a ticker / window selection isn't known until CT.gov answers, so it is
+    budgeted at the MAX_TRIALS cap.
+    """
+    n_trials = len(select_trials(nct_ids=nct_ids)) if nct_ids else MAX_TRIALS
+    return max(MIN_TIMEOUT, TRIAL_SECONDS * n_trials)
+
+
+def submit_portfolio_job(
+    ticker: Optional[str] = None,
+    window: Optional[str] = None,
+    nct_ids: Optional[List[str]] = None,
+    phases: Tuple[str, ...] = ("PHASE3",),
+    params: Optional[Dict] = None,
+    n_iterations: int = 20000,
+    target_se: Optional[float] = None,
+) -> ForecastJob:
+    """Queue a portfolio run on the forecast job queue (see forecast_jobs.submit_job)."""
+    label = ticker or window or ",".join(nct_ids or [])
+    return submit_job(ForecastJob(
+        job_id=new_job_id(),
+        query=label,
+        params=params,
+        n_iterations=n_iterations,
+        target_se=target_se,
+        kind="portfolio",
+        timeout=portfolio_timeout(nct_ids),
+        _source=lambda: portfolio_events(
+            ticker, window, nct_ids, phases, params, n_iterations, True, target_se,
+        ),
+    ))
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+def _get_db():
+    if not PSYCOPG2_AVAILABLE or not DATABASE_URL:
+        return None
+    try:
+        return psycopg2.connect(DATABASE_URL)
+    except Exception as e:
+        logger.warning(f"Portfolio forecast DB connection failed: {e}")
+        return None
+
+
+def setup_tables(conn):
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS portfolio_forecast_runs (
+            run_id TEXT PRIMARY KEY,
+            selector JSONB,
+            params JSONB,
+            n_iterations INTEGER,
+            n_trials INTEGER,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS portfolio_forecasts (
+            run_id TEXT NOT NULL REFERENCES portfolio_forecast_runs(run_id) ON DELETE CASCADE,
+            risk_rank INTEGER NOT NULL,
+            nct_id VARCHAR(20) NOT NULL,
+            title TEXT,
+            sponsor TEXT,
+            condition TEXT,
+            phase VARCHAR(20),
+            status VARCHAR(40),
+            primary_completion VARCHAR(20),
+            probability_of_success DOUBLE PRECISION,
+            median_true_effect DOUBLE PRECISION,
+            effect_ci_low DOUBLE PRECISION,
+            effect_ci_high DOUBLE PRECISION,
+            events_p10 DOUBLE PRECISION,
+            events_median DOUBLE PRECISION,
+            events_p90 DOUBLE PRECISION,
+            distributions JSONB,
+            error TEXT,
+            PRIMARY KEY (run_id, nct_id)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_forecasts_nct ON portfolio_forecasts(nct_id)")
+    conn.commit()
+
+
+def save_run(run: Dict) -> str:
+    """Persist a run; returns "neon" or the local JSON path it was written to."""
+    conn = _get_db()
+    if conn is None:
+        LOCAL_DIR.mkdir(parents=True, exist_ok=True)
+        path = LOCAL_DIR / f"portfolio_{run['run_id']}.json"
+        with open(path, "w") as f:
+            json.dump(run, f, indent=2)
+        return str(path)
+
+    try:
+        setup_tables(conn)
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO portfolio_forecast_runs (run_id, selector, params, n_iterations, n_trials) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            (run["run_id"], Json(run["selector"]), Json(run["params"]),
+             run["n_iterations"], len(run["rows"])),
+        )
+        for row in run["rows"]:
+            ci = row.get("true_effect_ci") or [None, None]
+            cur.execute("""
+                INSERT INTO portfolio_forecasts
+                    (run_id, risk_rank, nct_id, title, sponsor, condition, phase, status,
+                     primary_completion, probability_of_success, median_true_effect,
+                     effect_ci_low, effect_ci_high, events_p10, events_median, events_p90,
+                     distributions, error)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                run["run_id"], row["risk_rank"], row["nct_id"], row.get("title"),
+                row.get("sponsor"), row.get("condition"), row.get("phase"), row.get("status"),
+                row.get("primary_completion"), row.get("probability_of_success"),
+                row.get("median_true_effect"), ci[0], ci[1], row.get("events_p10"),
+                row.get("events_median"), row.get("events_p90"),
+                Json({
+                    "true_effect": row.get("true_effect_distribution", []),
+                    "events": row.get("event_distribution", []),
+                }),
+                row.get("error"),
+            ))
+        conn.commit()
+        return "neon"
+    finally:
+        conn.close()
+
+
+def load_run(run_id: str) -> Optional[Dict]:
+    """Read a saved run back (Neon first, then the local JSON fallback)."""
+    conn = _get_db()
+    if conn is not None:
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT selector, params, n_iterations, created_at "
+                "FROM portfolio_forecast_runs WHERE run_id = %s",
+                (run_id,),
+            )
+            meta = cur.fetchone()
+            if meta:
+                cur.execute("""
+                    SELECT risk_rank, nct_id, title, sponsor, condition, phase, status,
+                           primary_completion, probability_of_success, median_true_effect,
+                           effect_ci_low, effect_ci_high, events_p10, events_median,
+                           events_p90, distributions, error
+                    FROM portfolio_forecasts WHERE run_id = %s ORDER BY risk_rank
+                """, (run_id,))
+                rows = []
+                for r in cur.fetchall():
+                    dists = r[15] or {}
+                    rows.append({
+                        "risk_rank": r[0], "nct_id": r[1], "title": r[2], "sponsor": r[3],
+                        "condition": r[4], "phase": r[5], "status": r[6],
+                        "primary_completion": r[7], "probability_of_success": r[8],
+                        "median_true_effect": r[9], "true_effect_ci": [r[10], r[11]],
+                        "events_p10": r[12], "events_median": r[13], "events_p90": r[14],
+                        "true_effect_distribution": dists.get("true_effect", []),
+                        "event_distribution": dists.get("events", []),
+                        "error": r[16],
+                    })
+                return {
+                    "run_id": run_id, "selector": meta[0], "params": meta[1],
+                    "n_iterations": meta[2], "created_at": meta[3].isoformat() + "Z",
+                    "rows": rows, "stored_in": "neon",
+                }
+        except Exception as e:
+            logger.warning(f"Portfolio run lookup failed: {e}")
+        finally:
+            conn.close()
+
+    path = LOCAL_DIR / f"portfolio_{run_id}.json"
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return None
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def print_table(run: Dict):
+    print(f"\nRun {run['run_id']} — {len(run['rows'])} trials, {run['n_iterations']:,} iterations")
+    print(f"{'#':>3}  {'NCT ID':<12} {'PoS':>6}  {'Effect (95% CI)':<20} {'Events p10-p90':<16} {'Readout':<10}  Title")
+    for row in run["rows"]:
+        if row.get("error"):
+            print(f"{row['risk_rank']:>3}  {row['nct_id']:<12} {'—':>6}  error: {row['error']}")
+            continue
+        lo, hi = row["true_effect_ci"]
+        print(
+            f"{row['risk_rank']:>3}  {row['nct_id']:<12} {row['probability_of_success']:>6.1%}  "
+            f"{row['median_true_effect']:.2f} ({lo:.2f}-{hi:.2f}){'':<4} "
+            f"{row['events_p10']:>6.0f}-{row['events_p90']:<9.0f} "
+            f"{(row.get('primary_completion') or '?'):<10}  {(row.get('title') or '')[:60]}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-forecast a portfolio of trials")
+    parser.add_argument("--ticker", help="Company ticker (lead sponsor on CT.gov)")
+    parser.add_argument("--window", help="Primary-completion window START:END (YYYY-MM-DD)")
+    parser.add_argument("--nct", help="Comma-separated NCT IDs")
+    parser.add_argument("--phase", default="PHASE3", help="Comma-separated phases (default PHASE3)")
+    parser.add_argument("--iterations", type=int, default=20000, help="Monte Carlo iterations per trial")
+    parser.add_argument("--target-se", type=float, help="Stop each trial once its PoS standard error is below this")
+    parser.add_argument("--no-save", action="store_true", help="Print only, don't persist the run")
+    parser.add_argument("--show", help="Print a saved run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.show:
+        run = load_run(args.show)
+        if run is None:
+            print(f"Run {args.show} not found")
+            sys.exit(1)
+        print_table(run)
+        return
+
+    if not (args.ticker or args.window or args.nct):
+        parser.print_help()
+        return
+
+    start = time.time()
+    run = asyncio.run(forecast_portfolio(
+        ticker=args.ticker,
+        window=args.window,
+        nct_ids=args.nct.split(",") if args.nct else None,
+        phases=tuple(p.strip().upper() for p in args.phase.split(",") if p.strip()),
+        n_iterations=args.iterations,
+        save=not args.no_save,
+        target_se=args.target_se,
+    ))
+    print_table(run)
+    print(f"\nDone in {time.time() - start:.1f}s" + (f" — saved to {run['stored_in']}" if "stored_in" in run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""
+SatyaBio — Shared PubMed (NCBI E-utilities) Client
+
+One pooled, rate-limited, PMID-cached client for every module that reads
+PubMed: pubmed_scraper, pubmed_deepdive, api_connectors.search_pubmed and
+the KOL extractor (src/scrapers/pubmed_kol_extractor). Before this each of
+them built its own esearch/efetch calls and slept 0.35–1.5 s between
+requests on its own schedule, so parallel deep dives still tripped NCBI's
+limit while single ones were slower than they needed to be.
+
+What it does:
+  1. Keep-alive session; 429/5xx and connection errors are retried by
+     _request itself (Retry-After honoured), so every retry takes a token.
+  2. One process-wide token bucket: 3 requests/s, or 10/s with NCBI_API_KEY,
+     with capacity 1 so even a cold start never bursts past the limit.
+  3. search(): esearch on the history server (usehistory=y) — large result
+     sets are paged through WebEnv/query_key instead of re-running the query.
+  4. fetch_articles(): PMID-keyed disk cache of PubmedArticle records; only
+     PMIDs not in the cache are fetched, by efetch in batches of 200 (posted
+     to the history server with epost first when there are more than 200).
+  5. fetch_pmc_xml() / pmc_ids(): PMC full-text XML cached per PMC ID, and
+     PubMed → PMC links read from cached records before falling back to elink.
+
+Records are cached as the raw <PubmedArticle> XML so every caller keeps its
+own parser (and its own output format); article_summary() is the small
+common parse for callers that only need citation fields.
+
+Usage:
+    import pubmed_client
+
+    result = pubmed_client.search("obefazimod ulcerative colitis", max_results=500)
+    articles = pubmed_client.fetch_articles(result.pmids)   # {pmid: Element}
+    summaries = [pubmed_client.article_summary(a) for a in articles.values()]
+
+Environment:
+    NCBI_API_KEY              raises the limit from 3 to 10 requests/s
+    PUBMED_RATE_PER_SEC       override the limiter rate
+    PUBMED_CACHE_DIR          default: <repo>/data/cache/pubmed
+    PUBMED_CACHE_TTL_DAYS     article / PMC entry freshness, default 30
+"""
+
+import os
+import gzip
+import time
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import TokenBucket
+
+
+EUTILS_BASE = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+USER_AGENT = "SatyaBio/1.0 (biotech-research; contact@satyabio.com)"
+
+NCBI_API_KEY = os.environ.get("NCBI_API_KEY", "")
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+CACHE_DIR = Path(os.environ.get("PUBMED_CACHE_DIR", _REPO_ROOT / "data" / "cache" / "pubmed"))
+CACHE_TTL = float(os.environ.get("PUBMED_CACHE_TTL_DAYS", 30)) * 86400
+
+EFETCH_BATCH = 200          # PMIDs per efetch call
+ESEARCH_PAGE = 5000         # PMIDs per esearch page on the history server
+ESEARCH_MAX = 10000         # PubMed will not page esearch past this
+
+MAX_RETRIES = 3             # extra attempts on 429/5xx or a dropped connection
+RETRY_BACKOFF = 0.5         # seconds, doubled per attempt unless Retry-After says otherwise
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def _default_rate() -> float:
+    return float(os.environ.get("PUBMED_RATE_PER_SEC", 10 if NCBI_API_KEY else 3))
+
+
+def _new_bucket() -> TokenBucket:
+    # Capacity 1: requests are spaced 1/rate apart from the first one on, so
+    # NCBI never sees a burst larger than its per-second limit.
+    return TokenBucket(rate=_default_rate(), capacity=1)
+
+
+# =============================================================================
+# Session + limiter (process-wide singletons)
+# =============================================================================
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_bucket = _new_bucket()
+
+_stats = {"hits": 0, "misses": 0, "requests": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _bump(key: str, n: int = 1):
+    with _stats_lock:
+        _stats[key] += n
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session with connection pooling (retries happen in _request)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+                s.mount("https://", adapter)
+                s.headers.update({"User-Agent": USER_AGENT})
+                _session = s
+    return _session
+
+
+def get_rate_limiter() -> TokenBucket:
+    """The shared NCBI token bucket."""
+    return _bucket
+
+
+def set_api_key(api_key: str):
+    """Use an explicit NCBI key (and its 10 requests/s budget) for this process."""
+    global NCBI_API_KEY, _bucket
+    if api_key and api_key != NCBI_API_KEY:
+        NCBI_API_KEY = api_key
+        _bucket = _new_bucket()
+
+
+def _retry_wait(resp: Optional[requests.Response], attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (1-based): Retry-After if given, else backoff."""
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return RETRY_BACKOFF * 2 ** (attempt - 1)
+
+
+def _request(endpoint: str, params: dict, post: bool = False, timeout: float = 30) -> requests.Response:
+    """
+    One rate-limited E-utilities call, retried up to MAX_RETRIES times on
+    429/5xx or a dropped connection. Every attempt takes a token from the
+    shared bucket. Raises requests.HTTPError on a non-2xx final answer.
+    """
+    params = dict(params)
+    if NCBI_API_KEY:
+        params["api_key"] = NCBI_API_KEY
+    url = f"{EUTILS_BASE}/{endpoint}"
+    session = get_session()
+    verify = True
+    attempt = 0
+    while True:
+        _bucket.acquire()
+        _bump("requests")
+        resp = None
+        try:
+            if post:
+                resp = session.post(url, data=params, timeout=timeout, verify=verify)
+            else:
+                resp = session.get(url, params=params, timeout=timeout, verify=verify)
+        except requests.exceptions.SSLError:
+            if not verify:
+                raise
+            # Retry without SSL verification as fallback (macOS cert issue)
+            verify = False
+            continue
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= MAX_RETRIES:
+                raise
+        if resp is not None and resp.status_code not in RETRY_STATUSES:
+            break
+        if attempt >= MAX_RETRIES:
+            break
+        attempt += 1
+        time.sleep(_retry_wait(resp, attempt))
+    if resp.status_code >= 400:
+        _bump("errors")
+        resp.raise_for_status()
+    return resp
+
+
+# =============================================================================
+# Search (history server)
+# =============================================================================
+
+@dataclass
+class SearchResult:
+    pmids: list[str] = field(default_factory=list)
+    count: int = 0
+    webenv: str = ""
+    query_key: str = ""
+
+
+def search(term: str, max_results: int = 20, sort: str = "relevance", **params) -> SearchResult:
+    """
+    esearch with usehistory=y. Extra params (datetype, mindate, maxdate, ...)
+    are passed through. Result sets larger than one page are read page by
+    page from the history server.
+    """
+    max_results = min(int(max_results), ESEARCH_MAX)
+    base = {"db": "pubmed", "term": term, "sort": sort, "retmode": "json", **params}
+    resp = _request("esearch.fcgi", {**base, "usehistory": "y", "retmax": min(max_results, ESEARCH_PAGE)})
+    data = resp.json().get("esearchresult", {})
+    result = SearchResult(
+        pmids=list(data.get("idlist", [])),
+        count=int(data.get("count", 0) or 0),
+        webenv=data.get("webenv", ""),
+        query_key=str(data.get("querykey", "")),
+    )
+
+    target = min(max_results, result.count)
+    while result.webenv and len(result.pmids) < target:
+        page = _request("esearch.fcgi", {
+            "db": "pubmed", "retmode": "json", "sort": sort,
+            "WebEnv": result.webenv, "query_key": result.query_key,
+            "retstart": len(result.pmids), "retmax": min(ESEARCH_PAGE, target - len(result.pmids)),
+        }).json().get("esearchresult", {})
+        ids = page.get("idlist", [])
+        if not ids:
+            break
+        result.pmids.extend(ids)
+    result.pmids = result.pmids[:max_results]
+    return result
+
+
+# =============================================================================
+# PMID cache
+# =============================================================================
+
+def _cache_path(kind: str, key: str) -> Path:
+    return CACHE_DIR / kind / key[-2:] / f"{key}.xml.gz"
+
+
+def _read_cache(kind: str, key: str) -> Optional[bytes]:
+    path = _cache_path(kind, key)
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL:
+            return None
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    except (FileNotFoundError, OSError, EOFError):
+        return None
+
+
+def _write_cache(kind: str, key: str, data: bytes):
+    path = _cache_path(kind, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"  [PubMed cache] write error: {e}")
+
+
+def _pmid_of(article: ET.Element) -> str:
+    return (article.findtext("MedlineCitation/PMID") or article.findtext(".//PMID") or "").strip()
+
+
+def _store_efetch(xml_bytes: bytes, found: dict):
+    try:
+        root = ET.fromstring(xml_bytes)
+    except ET.ParseError as e:
+        print(f"  [PubMed] efetch parse error: {e}")
+        return
+    for article in root.findall(".//PubmedArticle"):
+        pmid = _pmid_of(article)
+        if pmid:
+            _write_cache("articles", pmid, ET.tostring(article))
+            found[pmid] = article
+
+
+def fetch_articles(pmids: list[str]) -> dict[str, ET.Element]:
+    """
+    PubmedArticle elements keyed by PMID, in the order given. Cached records
+    are read from disk; the rest are fetched in batches of EFETCH_BATCH.
+    PMIDs PubMed does not return (withdrawn, books) are left out.
+    """
+    pmids = list(dict.fromkeys(str(p).strip() for p in pmids if str(p).strip()))
+    found: dict[str, ET.Element] = {}
+    missing = []
+    for pmid in pmids:
+        data = _read_cache("articles", pmid)
+        if data is None:
+            missing.append(pmid)
+            continue
+        try:
+            found[pmid] = ET.fromstring(data)
+        except ET.ParseError:
+            missing.append(pmid)
+    _bump("hits", len(found))
+    _bump("misses", len(missing))
+
+    if len(missing) > EFETCH_BATCH:
+        # Post the ID list once, then page through it on the history server
+        root = ET.fromstring(_request("epost.fcgi", {"db": "pubmed", "id": ",".join(missing)}, post=True).content)
+        webenv, query_key = root.findtext("WebEnv"), root.findtext("QueryKey")
+        for start in range(0, len(missing), EFETCH_BATCH):
+            resp = _request("efetch.fcgi", {
+                "db": "pubmed", "retmode": "xml", "WebEnv": webenv, "query_key": query_key,
+                "retstart": start, "retmax": EFETCH_BATCH,
+            }, post=True, timeout=60)
+            _store_efetch(resp.content, found)
+    elif missing:
+        resp = _request("efetch.fcgi", {"db": "pubmed", "retmode": "xml", "id": ",".join(missing)},
+                        post=True, timeout=60)
+        _store_efetch(resp.content, found)
+
+    return {pmid: found[pmid] for pmid in pmids if pmid in found}
+
+
+def fetch_article_elements(pmids: list[str]) -> list[ET.Element]:
+    """fetch_articles() as a list, in PMID order."""
+    return list(fetch_articles(pmids).values())
+
+
+# =============================================================================
+# PMC full text
+# =============================================================================
+
+def _normalize_pmc(pmc_id: str) -> str:
+    pmc_id = str(pmc_id).strip().upper()
+    return pmc_id if pmc_id.startswith("PMC") else f"PMC{pmc_id}"
+
+
+def pmc_ids(pmids: list[str]) -> dict[str, str]:
+    """PMID → "PMC…" for articles with a PMC copy (cached records first, then one elink call)."""
+    out = {}
+    unknown = []
+    for pmid, article in fetch_articles(pmids).items():
+        pmc = next((el.text for el in article.findall(".//PubmedData/ArticleIdList/ArticleId")
+                    if el.get("IdType") == "pmc" and el.text), "")
+        if pmc:
+            out[pmid] = _normalize_pmc(pmc)
+        else:
+            unknown.append(pmid)
+    if not unknown:
+        return out
+
+    try:
+        # Repeated id= params (a list) give one linkset per PMID instead of a merged set
+        resp = _request("elink.fcgi", {"dbfrom": "pubmed", "db": "pmc", "linkname": "pubmed_pmc",
+                                       "id": unknown, "retmode": "json"}, post=True)
+        data = resp.json()
+    except Exception as e:
+        print(f"  [PubMed] elink error: {e}")
+        return out
+    for linkset in data.get("linksets", []):
+        ids = linkset.get("ids") or [None]
+        for link_db in linkset.get("linksetdbs", []):
+            if link_db.get("linkname", "pubmed_pmc") == "pubmed_pmc" and link_db.get("links"):
+                out[str(ids[0])] = _normalize_pmc(link_db["links"][0])
+    return out
+
+
+def fetch_pmc_xml(pmc_id: str) -> Optional[bytes]:
+    """Full-text XML of a PMC article (cached), or None when PMC has no copy."""
+    if not pmc_id:
+        return None
+    pmc_id = _normalize_pmc(pmc_id)
+    data = _read_cache("pmc", pmc_id)
+    if data is not None:
+        _bump("hits")
+        return data
+    _bump("misses")
+    resp = _request("efetch.fcgi", {"db": "pmc", "id": pmc_id[3:], "rettype": "xml", "retmode": "xml"},
+                    timeout=30)
+    _write_cache("pmc", pmc_id, resp.content)
+    return resp.content
+
+
+# =============================================================================
+# Common parse
+# =============================================================================
+
+def article_summary(article: ET.Element) -> dict:
+    """Citation fields of a PubmedArticle: pmid, title, authors, journal, pub_date, doi, url."""
+    pmid = _pmid_of(article)
+    art = article.find("MedlineCitation/Article")
+    if art is None:
+        art = ET.Element("Article")
+    authors = []
+    for author in art.findall("AuthorList/Author"):
+        last = author.findtext("LastName", "")
+        if last:
+            authors.append(f"{last} {author.findtext('Initials', '')}".strip())
+        elif author.findtext("CollectiveName"):
+            authors.append(author.findtext("CollectiveName"))
+    date_el = art.find("Journal/JournalIssue/PubDate")
+    if date_el is not None:
+        pub_date = date_el.findtext("MedlineDate") or " ".join(
+            p for p in (date_el.findtext("Year"), date_el.findtext("Month"), date_el.findtext("Day")) if p)
+    else:
+        pub_date = ""
+    doi = next((el.text for el in article.findall(".//PubmedData/ArticleIdList/ArticleId")
+                if el.get("IdType") == "doi" and el.text), "")
+    return {
+        "pmid": pmid,
+        "title": "".join(art.find("ArticleTitle").itertext()).strip() if art.find("ArticleTitle") is not None else "",
+        "authors": authors,
+        "journal": art.findtext("Journal/Title", "") or art.findtext("Journal/ISOAbbreviation", ""),
+        "pub_date": pub_date,
+        "doi": doi,
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+    }
+
+
+# =============================================================================
+# Cache maintenance
+# =============================================================================
+
+def get_cache_stats() -> dict:
+    """Hit/miss/request counters since process start plus on-disk entry counts."""
+    with _stats_lock:
+        stats = dict(_stats)
+    for kind in ("articles", "pmc"):
+        try:
+            stats[kind] = sum(1 for _ in (CACHE_DIR / kind).glob("*/*.xml.gz"))
+        except Exception:
+            stats[kind] = 0
+    return stats
+
+
+def purge_cache(older_than_seconds: Optional[int] = None) -> int:
+    """Delete cached records (all, or those written more than N seconds ago)."""
+    removed = 0
+    cutoff = time.time() - older_than_seconds if older_than_seconds is not None else None
+    for path in CACHE_DIR.glob("*/*/*.xml.gz"):
+        try:
+            if cutoff is not None and path.stat().st_mtime >= cutoff:
+                continue
+            path.unlink()
+            removed += 1
+        except Exception:
+            continue
+    return removed
@@ -23,53 +23,22 @@ Usage:
     results = deep_search("GTX-102 Angelman", max_papers=5)
     context = format_deep_literature_for_claude(results)
 
-Rate limits:
-  - Without API key: 3 requests/sec
-  - With NCBI_API_KEY: 10 requests/sec
-  - We batch requests and add small delays to stay safe
+Rate limits and caching are handled by pubmed_client: one shared limiter
+(3 requests/sec, 10 with NCBI_API_KEY) and a PMID / PMC-ID keyed cache, so a
+repeated deep dive only fetches papers it has not seen before.
 """
 
-import os
 import re
-import time
-import requests
 import xml.etree.ElementTree as ET
-from typing import Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 load_dotenv()
 
-# ── NCBI API endpoints ──
-ESEARCH = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-EFETCH = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-ELINK = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/elink.fcgi"
-PMC_OA_API = "https://www.ncbi.nlm.nih.gov/pmc/utils/oa/oa.fcgi"
+import pubmed_client
 
-NCBI_API_KEY = os.environ.get("NCBI_API_KEY", "")
-HEADERS = {"User-Agent": "SatyaBio/1.0 (biotech-research; contact@satyabio.com)"}
-
-# Rate limiting
-_last_request_time = 0.0
-_min_interval = 0.35 if NCBI_API_KEY else 0.5  # seconds between requests
-
-
-def _rate_limit():
-    """Ensure we don't exceed NCBI rate limits."""
-    global _last_request_time
-    now = time.time()
-    elapsed = now - _last_request_time
-    if elapsed < _min_interval:
-        time.sleep(_min_interval - elapsed)
-    _last_request_time = time.time()
-
-
-def _base_params() -> dict:
-    """Common params for all NCBI requests."""
-    params = {}
-    if NCBI_API_KEY:
-        params["api_key"] = NCBI_API_KEY
-    return params
+# Drug searches run concurrently; the shared limiter keeps them within NCBI's budget
+SEARCH_WORKERS = 4
 
 
 # =============================================================================
@@ -88,20 +57,8 @@ def search_with_abstracts(
     abstract, doi, pmc_id (if open access).
     """
     # Step 1: Search for PMIDs
-    _rate_limit()
-    search_params = {
-        **_base_params(),
-        "db": "pubmed",
-        "term": query,
-        "retmax": max_results,
-        "sort": sort,
-        "retmode": "json",
-    }
-
     try:
-        resp = requests.get(ESEARCH, params=search_params, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
-        pmids = resp.json().get("esearchresult", {}).get("idlist", [])
+        pmids = pubmed_client.search(query, max_results=max_results, sort=sort).pmids
     except Exception as e:
         print(f"  PubMed search error: {e}")
         return []
@@ -109,20 +66,9 @@ def search_with_abstracts(
     if not pmids:
         return []
 
-    # Step 2: Fetch full abstracts via efetch XML
-    _rate_limit()
-    fetch_params = {
-        **_base_params(),
-        "db": "pubmed",
-        "id": ",".join(pmids),
-        "rettype": "xml",
-        "retmode": "xml",
-    }
-
+    # Step 2: Full abstracts (efetch XML, cached per PMID)
     try:
-        resp = requests.get(EFETCH, params=fetch_params, headers=HEADERS, timeout=20)
-        resp.raise_for_status()
-        articles = _parse_pubmed_xml(resp.text)
+        articles = [a for a in map(_parse_pubmed_article, pubmed_client.fetch_article_elements(pmids)) if a]
     except Exception as e:
         print(f"  PubMed efetch error: {e}")
         return []
@@ -139,97 +85,97 @@ def search_with_abstracts(
 
 def _parse_pubmed_xml(xml_text: str) -> list[dict]:
     """Parse PubMed efetch XML into structured article dicts with full abstracts."""
-    articles = []
     try:
         root = ET.fromstring(xml_text)
     except ET.ParseError:
         return []
-
-    for article_el in root.findall(".//PubmedArticle"):
-        citation = article_el.find(".//MedlineCitation")
-        if citation is None:
-            continue
-
-        pmid_el = citation.find("PMID")
-        pmid = pmid_el.text if pmid_el is not None else ""
-
-        article_data = citation.find("Article")
-        if article_data is None:
-            continue
-
-        # Title
-        title_el = article_data.find("ArticleTitle")
-        title = _get_text(title_el)
-
-        # Abstract — concatenate all AbstractText elements
-        abstract_parts = []
-        abstract_el = article_data.find("Abstract")
-        if abstract_el is not None:
-            for abs_text in abstract_el.findall("AbstractText"):
-                label = abs_text.get("Label", "")
-                text = _get_text(abs_text)
-                if label and text:
-                    abstract_parts.append(f"{label}: {text}")
-                elif text:
-                    abstract_parts.append(text)
-        abstract = " ".join(abstract_parts)
-
-        # Authors
-        authors = []
-        author_list = article_data.find("AuthorList")
-        if author_list is not None:
-            for author in author_list.findall("Author"):
-                last = author.find("LastName")
-                fore = author.find("ForeName")
-                if last is not None:
-                    name = last.text or ""
-                    if fore is not None and fore.text:
-                        name = f"{fore.text} {name}"
-                    authors.append(name)
-
-        # Journal
-        journal_el = article_data.find(".//Journal/Title")
-        journal = journal_el.text if journal_el is not None else ""
-
-        # Date
-        pub_date = ""
-        date_el = article_data.find(".//PubDate")
-        if date_el is not None:
-            year = date_el.find("Year")
-            month = date_el.find("Month")
-            if year is not None:
-                pub_date = year.text or ""
-                if month is not None and month.text:
-                    pub_date = f"{month.text} {pub_date}"
-
-        # DOI
-        doi = ""
-        for id_el in article_el.findall(".//ArticleIdList/ArticleId"):
-            if id_el.get("IdType") == "doi":
-                doi = id_el.text or ""
-                break
-
-        # PMC ID
-        pmc_id = ""
-        for id_el in article_el.findall(".//ArticleIdList/ArticleId"):
-            if id_el.get("IdType") == "pmc":
-                pmc_id = id_el.text or ""
-                break
-
-        articles.append({
-            "pmid": pmid,
-            "title": title,
-            "authors": authors[:6],
-            "journal": journal,
-            "pub_date": pub_date,
-            "abstract": abstract,
-            "doi": doi,
-            "pmc_id": pmc_id,
-            "full_text": "",  # Filled in later if PMC available
-            "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-        })
-
-    return articles
+    return [a for a in map(_parse_pubmed_article, root.findall(".//PubmedArticle")) if a]
+
+
+def _parse_pubmed_article(article_el) -> dict:
+    """One PubmedArticle element → article dict (None if it has no citation)."""
+    citation = article_el.find(".//MedlineCitation")
+    if citation is None:
+        return None
+
+    pmid_el = citation.find("PMID")
+    pmid = pmid_el.text if pmid_el is not None else ""
+
+    article_data = citation.find("Article")
+    if article_data is None:
+        return None
+
+    # Title
+    title_el = article_data.find("ArticleTitle")
+    title = _get_text(title_el)
+
+    # Abstract — concatenate all AbstractText elements
+    abstract_parts = []
+    abstract_el = article_data.find("Abstract")
+    if abstract_el is not None:
+        for abs_text in abstract_el.findall("AbstractText"):
+            label = abs_text.get("Label", "")
+            text = _get_text(abs_text)
+            if label and text:
+                abstract_parts.append(f"{label}: {text}")
+            elif text:
+                abstract_parts.append(text)
+    abstract = " ".join(abstract_parts)
+
+    # Authors
+    authors = []
+    author_list = article_data.find("AuthorList")
+    if author_list is not None:
+        for author in author_list.findall("Author"):
+            last = author.find("LastName")
+            fore = author.find("ForeName")
+            if last is not None:
+                name = last.text or ""
+                if fore is not None and fore.text:
+                    name = f"{fore.text} {name}"
+                authors.append(name)
+
+    # Journal
+    journal_el = article_data.find(".//Journal/Title")
+    journal = journal_el.text if journal_el is not None else ""
+
+    # Date
+    pub_date = ""
+    date_el = article_data.find(".//PubDate")
+    if date_el is not None:
+        year = date_el.find("Year")
+        month = date_el.find("Month")
+        if year is not None:
+            pub_date = year.text or ""
+            if month is not None and month.text:
+                pub_date = f"{month.text} {pub_date}"
+
+    # DOI
+    doi = ""
+    for id_el in article_el.findall(".//ArticleIdList/ArticleId"):
+        if id_el.get("IdType") == "doi":
+            doi = id_el.text or ""
+            break
+
+    # PMC ID
+    pmc_id = ""
+    for id_el in article_el.findall(".//ArticleIdList/ArticleId"):
+        if id_el.get("IdType") == "pmc":
+            pmc_id = id_el.text or ""
+            break
+
+    return {
+        "pmid": pmid,
+        "title": title,
+        "authors": authors[:6],
+        "journal": journal,
+        "pub_date": pub_date,
+        "abstract": abstract,
+        "doi": doi,
+        "pmc_id": pmc_id,
+        "full_text": "",  # Filled in later if PMC available
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+    }
 
 
 def _get_text(el) -> str:
@@ -244,34 +190,11 @@ def _get_pmc_ids(pmids: list[str]) -> dict:
     """Find PMC IDs for a list of PubMed IDs (indicates full-text availability)."""
     if not pmids:
         return {}
-
-    _rate_limit()
-    params = {
-        **_base_params(),
-        "dbfrom": "pubmed",
-        "db": "pmc",
-        "id": ",".join(pmids),
-        "retmode": "json",
-    }
-
     try:
-        resp = requests.get(ELINK, params=params, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        return pubmed_client.pmc_ids(pmids)
     except Exception:
         return {}
 
-    pmc_map = {}
-    for linkset in data.get("linksets", []):
-        pmid = str(linkset.get("ids", [None])[0])
-        links = linkset.get("linksetdbs", [])
-        for link_db in links:
-            if link_db.get("dbto") == "pmc":
-                pmc_links = link_db.get("links", [])
-                if pmc_links:
-                    pmc_map[pmid] = f"PMC{pmc_links[0]}"
-    return pmc_map
-
 
 # =============================================================================
 # 2. FETCH PMC FULL TEXT (open-access papers)
@@ -284,24 +207,12 @@ def fetch_pmc_fulltext(pmc_id: str, max_chars: int = 15000) -> str:
     Returns extracted text (capped at max_chars). Returns empty string
     if not available or not open access.
     """
-    # Remove "PMC" prefix if present for the API
-    pmc_num = pmc_id.replace("PMC", "")
-
-    _rate_limit()
-    params = {
-        **_base_params(),
-        "db": "pmc",
-        "id": pmc_num,
-        "rettype": "xml",
-        "retmode": "xml",
-    }
-
     try:
-        resp = requests.get(EFETCH, params=params, headers=HEADERS, timeout=20)
-        if resp.status_code != 200:
+        xml = pubmed_client.fetch_pmc_xml(pmc_id)
+        if not xml:
             return ""
 
-        text = _extract_text_from_pmc_xml(resp.text)
+        text = _extract_text_from_pmc_xml(xml)
         return text[:max_chars] if text else ""
     except Exception as e:
         print(f"  PMC fetch error for {pmc_id}: {e}")
@@ -396,7 +307,7 @@ def deep_search_for_drugs(
     all_results = []
     fulltext_count = 0
 
-    for drug in drugs:
+    def search_drug(drug: str) -> list[dict]:
         # Search for this drug + disease
         query = f'"{drug}" AND "{disease}"'
         papers = search_with_abstracts(query, max_results=max_papers_per_drug)
@@ -405,7 +316,12 @@ def deep_search_for_drugs(
             # Try without quotes (for multi-word drug names)
             query = f'{drug} {disease} clinical trial OR preclinical'
             papers = search_with_abstracts(query, max_results=max_papers_per_drug)
+        return papers
+
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+        papers_by_drug = list(pool.map(search_drug, drugs))
 
+    for drug, papers in zip(drugs, papers_by_drug):
         for paper in papers:
             paper["search_drug"] = drug  # Tag which drug this was found for
 
@@ -16,8 +16,9 @@ Requires in .env:
     NEON_DATABASE_URL=postgresql://...
     VOYAGE_API_KEY=your-voyage-key
 
-Uses NCBI E-utilities (free, no API key required for <3 requests/sec).
-Set NCBI_API_KEY in .env for higher rate limits (10 req/sec).
+Uses NCBI E-utilities through pubmed_client (shared rate limiter, history
+server paging, PMID cache). No API key is required for 3 requests/sec; set
+NCBI_API_KEY in .env for 10 req/sec.
 """
 
 import os
@@ -26,7 +27,6 @@ import re
 import json
 import hashlib
 import argparse
-import time
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from pathlib import Path
@@ -35,12 +35,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Try importing required packages
-try:
-    import requests
-except ImportError:
-    os.system(f"{sys.executable} -m pip install requests --quiet")
-    import requests
-
 try:
     import psycopg2
 except ImportError:
@@ -53,6 +47,8 @@ except ImportError:
     os.system(f"{sys.executable} -m pip install voyageai --quiet")
     import voyageai
 
+import pubmed_client
+
 
 # ---------------------------------------------------------------------------
 # Config
@@ -60,18 +56,11 @@ except ImportError:
 
 DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
 VOYAGE_API_KEY = os.environ.get("VOYAGE_API_KEY", "")
-NCBI_API_KEY = os.environ.get("NCBI_API_KEY", "")  # Optional — get from ncbi.nlm.nih.gov/account
 EMBED_MODEL = "voyage-3"
 EMBED_BATCH_SIZE = 32
 CHUNK_SIZE = 400
 CHUNK_OVERLAP = 50
 
-EUTILS_BASE = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
-PMC_OA_BASE = "https://www.ncbi.nlm.nih.gov/pmc/utils/oa/oa.fcgi"
-
-# Rate limiting: 3/sec without API key, 10/sec with
-REQUEST_DELAY = 0.35 if NCBI_API_KEY else 1.0
-
 # Drug/company search queries — ticker to PubMed search terms
 SEARCH_QUERIES = {
     # Existing portfolio
@@ -123,62 +112,41 @@ SEARCH_QUERIES = {
 # NCBI E-utilities
 # ---------------------------------------------------------------------------
 
-def _eutils_params():
-    """Common params for all E-utilities requests."""
-    params = {"retmode": "xml"}
-    if NCBI_API_KEY:
-        params["api_key"] = NCBI_API_KEY
-    return params
-
-
 def search_pubmed(query, max_results=20):
-    """Search PubMed and return list of PMIDs."""
-    params = {
-        **_eutils_params(),
-        "db": "pubmed",
-        "term": query,
-        "retmax": max_results,
-        "sort": "date",
-        "datetype": "pdat",
-        "mindate": "2023/01/01",  # Last ~3 years
-        "maxdate": "2026/12/31",
-    }
+    """Search PubMed and return (PMIDs, total hit count)."""
     try:
-        r = requests.get(f"{EUTILS_BASE}/esearch.fcgi", params=params, timeout=15)
-        root = ET.fromstring(r.text)
-        pmids = [id_elem.text for id_elem in root.findall(".//Id")]
-        count = root.findtext(".//Count", "0")
-        return pmids, int(count)
+        result = pubmed_client.search(
+            query,
+            max_results=max_results,
+            sort="date",
+            datetype="pdat",
+            mindate="2023/01/01",  # Last ~3 years
+            maxdate="2026/12/31",
+        )
+        return result.pmids, result.count
     except Exception as e:
         print(f"    Search error: {e}")
         return [], 0
 
 
 def fetch_pubmed_articles(pmids):
-    """Fetch full article records for a list of PMIDs."""
+    """Fetch full article records for a list of PMIDs (cached ones are not re-fetched)."""
     if not pmids:
         return []
 
-    params = {
-        **_eutils_params(),
-        "db": "pubmed",
-        "id": ",".join(pmids),
-        "rettype": "xml",
-    }
     try:
-        r = requests.get(f"{EUTILS_BASE}/efetch.fcgi", params=params, timeout=30)
-        root = ET.fromstring(r.text)
-
-        articles = []
-        for article_elem in root.findall(".//PubmedArticle"):
-            article = _parse_article(article_elem)
-            if article:
-                articles.append(article)
-        return articles
+        elements = pubmed_client.fetch_article_elements(pmids)
     except Exception as e:
         print(f"    Fetch error: {e}")
         return []
 
+    articles = []
+    for article_elem in elements:
+        article = _parse_article(article_elem)
+        if article:
+            articles.append(article)
+    return articles
+
 
 def _parse_article(elem):
     """Parse a PubmedArticle XML element into a dict."""
@@ -276,16 +244,11 @@ def fetch_pmc_fulltext(pmc_id):
         return None
 
     try:
-        # Use PMC OA service to check if available
-        params = {"id": pmc_id}
-        r = requests.get(f"{EUTILS_BASE}/efetch.fcgi",
-                         params={"db": "pmc", "id": pmc_id, "rettype": "xml", **_eutils_params()},
-                         timeout=20)
-
-        if r.status_code != 200:
+        xml = pubmed_client.fetch_pmc_xml(pmc_id)
+        if not xml:
             return None
 
-        root = ET.fromstring(r.text)
+        root = ET.fromstring(xml)
 
         # Extract body text from PMC XML
         body = root.find(".//body")
@@ -395,7 +358,6 @@ def process_article(conn, vo_client, article, tickers):
         full_text = fetch_pmc_fulltext(article["pmc_id"])
         if full_text:
             print(f"      Found open-access full text ({len(full_text.split())} words)")
-        time.sleep(REQUEST_DELAY)
 
     # Build the text for embedding
     has_fulltext = full_text is not None
@@ -533,22 +495,20 @@ def run(args):
             print(f"\n[{ticker}] Searching: {query}")
 
             pmids, total_count = search_pubmed(query, max_results=max_results)
-            print(f"  Found {total_count} total results, fetching top {len(pmids)}")
-            time.sleep(REQUEST_DELAY)
+            new_pmids = [p for p in pmids if not publication_exists(conn, p)]
+            print(f"  Found {total_count} total results, {len(new_pmids)} of the top {len(pmids)} not stored yet")
 
-            if not pmids:
+            if not new_pmids:
                 continue
 
-            articles = fetch_pubmed_articles(pmids)
+            articles = fetch_pubmed_articles(new_pmids)
             print(f"  Parsed {len(articles)} articles")
-            time.sleep(REQUEST_DELAY)
 
             for article in articles:
                 try:
                     was_new = process_article(conn, vo_client, article, [ticker])
                     if was_new:
                         total_new += 1
-                    time.sleep(REQUEST_DELAY)
                 except Exception as e:
                     print(f"    Error: {e}")
                     conn.rollback()
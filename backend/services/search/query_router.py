@@ -30,7 +30,7 @@ import os
 import json
 import time
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -51,6 +51,8 @@ from api_connectors import (
     search_pubmed,
     format_api_results_for_claude,
 )
+from search_tracing import start_trace, submit_traced
+from mention_tagger import get_mention_tagger, register_source
 
 # Portfolio intelligence — state tracking, TA scoring, tension narrative
 try:
@@ -87,6 +89,7 @@ try:
         setup_cache_tables,
     )
     GLOBAL_LANDSCAPE_AVAILABLE = True
+    landscape_search = discover_landscape
     # Ensure cache tables exist on first import
     try:
         setup_cache_tables()
@@ -101,10 +104,13 @@ if not GLOBAL_LANDSCAPE_AVAILABLE:
     try:
         from global_asset_discovery import (
             build_landscape,
+            serve_landscape,
             search_trials_global,
             search_trials_by_country,
         )
         GLOBAL_LANDSCAPE_AVAILABLE = True
+        # Stored landscapes answer repeat questions at once; stale ones refresh in the background
+        landscape_search = serve_landscape
         print("  ⚠ Using legacy global_asset_discovery (hardcoded patterns)")
     except ImportError:
         pass
@@ -299,6 +305,16 @@ def classify_query(query: str) -> dict:
 # Step 1.5: Drug Entity Enrichment
 # =============================================================================
 
+# Target names always recognised in queries, on top of the targets table
+QUERY_TARGET_KEYWORDS = [
+    "KRAS", "EGFR", "HER2", "ALK", "ROS1", "BRAF", "MEK", "PI3K", "mTOR",
+    "PD-1", "PD-L1", "TROP2", "CDK4/6", "PARP", "GLP-1",
+    "amyloid", "tau", "BACE", "LRRK2", "alpha-synuclein", "GBA1", "TREM2",
+    "neuroinflammation",
+]
+register_source("query_targets", "target", ((kw, kw, kw) for kw in QUERY_TARGET_KEYWORDS))
+
+
 def enrich_with_drug_entities(query: str, plan: dict) -> dict:
     """
     Enrich the query plan with intelligence from the drug entity database.
@@ -311,6 +327,10 @@ def enrich_with_drug_entities(query: str, plan: dict) -> dict:
 
     The enrichment adds an 'entity_context' key to the plan with structured data
     that gets injected into the Claude synthesis prompt.
+
+    Drug, target and indication mentions come from one mention_tagger pass
+    over the query; they fill in whatever the classifier left blank (all of
+    it when classification fell back after an error).
     """
     if not DRUG_DB_AVAILABLE:
         return plan
@@ -321,14 +341,25 @@ def enrich_with_drug_entities(query: str, plan: dict) -> dict:
         "disease_landscape": None,  # If query is about a disease with multiple target approaches
         "target_drugs": [],         # If query is about a specific target
         "extra_pubmed_terms": [],   # Auto-generated PubMed terms from drug biology
+        "mentions": [],             # Tagged drug/target/indication spans in the query
     }
 
     query_type = plan.get("query_type", "general")
-    query_lower = query.lower()
+
+    mentions = get_mention_tagger().tag(query)
+    entity_context["mentions"] = [
+        {"type": m.entity_type, "text": m.text, "canonical": m.canonical, "start": m.start, "end": m.end}
+        for m in mentions
+    ]
+    tagged = {}
+    for m in mentions:
+        tagged.setdefault(m.entity_type, m)  # first mention of each type
 
     # --- Drug-specific enrichment ---
     # If the classifier identified a drug, or we detect a drug name in the query
     drug_name = plan.get("ct_intervention") or plan.get("fda_drug")
+    if not drug_name and "drug" in tagged:
+        drug_name = tagged["drug"].text
     if drug_name:
         drug_info = lookup_drug(drug_name)
         if drug_info:
@@ -347,6 +378,8 @@ def enrich_with_drug_entities(query: str, plan: dict) -> dict:
     if query_type in ("landscape", "comparison", "general"):
         # Check if the query mentions an indication
         indication = plan.get("ct_condition") or plan.get("fda_condition")
+        if "indication" in tagged and (not indication or indication == query):
+            indication = tagged["indication"].canonical
         if indication:
             # Try disease-target landscape first (for multi-target diseases like AD)
             disease_landscape = get_disease_target_landscape(indication)
@@ -363,22 +396,15 @@ def enrich_with_drug_entities(query: str, plan: dict) -> dict:
             entity_context["extra_pubmed_terms"].extend(pubmed_terms)
 
     # --- Target-specific enrichment ---
-    # Detect target mentions in the query (KRAS, HER2, EGFR, amyloid, tau, etc.)
-    target_keywords = [
-        "KRAS", "EGFR", "HER2", "ALK", "ROS1", "BRAF", "MEK", "PI3K", "mTOR",
-        "PD-1", "PD-L1", "TROP2", "CDK4/6", "PARP", "GLP-1",
-        "amyloid", "tau", "BACE", "LRRK2", "alpha-synuclein", "GBA1", "TREM2",
-        "neuroinflammation",
-    ]
-    for kw in target_keywords:
-        if kw.lower() in query_lower:
-            target_drugs = get_drugs_by_target(kw)
-            if target_drugs:
-                entity_context["target_drugs"] = target_drugs
-                # Also get PubMed terms for drugs that hit this target
-                for d in target_drugs[:5]:  # Top 5 to avoid too many terms
-                    entity_context["extra_pubmed_terms"].append(f'"{d["canonical_name"]}"')
-            break  # Use the first matching target
+    # The first target mentioned (KRAS G12C, HER2, amyloid, tau, etc.) —
+    # longest match wins, so "KRAS G12C" beats "KRAS"
+    if "target" in tagged:
+        target_drugs = get_drugs_by_target(tagged["target"].canonical)
+        if target_drugs:
+            entity_context["target_drugs"] = target_drugs
+            # Also get PubMed terms for drugs that hit this target
+            for d in target_drugs[:5]:  # Top 5 to avoid too many terms
+                entity_context["extra_pubmed_terms"].append(f'"{d["canonical_name"]}"')
 
     # Deduplicate PubMed terms
     entity_context["extra_pubmed_terms"] = list(set(entity_context["extra_pubmed_terms"]))
@@ -428,7 +454,8 @@ def execute_query_plan(plan: dict) -> dict:
             rag_query = plan.get("rag_query", "")
             ticker_filter = plan.get("rag_ticker_filter", None)
             if rag_query:
-                futures["RAG"] = executor.submit(
+                futures["RAG"] = submit_traced(
+                    executor, "rag",
                     rag_search.search,
                     rag_query,
                     top_k=25,
@@ -450,8 +477,8 @@ def execute_query_plan(plan: dict) -> dict:
                 ct_kwargs["phase"] = plan["ct_phase"]
             if ct_kwargs:
                 ct_kwargs["max_results"] = 30
-                futures["CLINICAL_TRIALS"] = executor.submit(
-                    search_clinical_trials, **ct_kwargs
+                futures["CLINICAL_TRIALS"] = submit_traced(
+                    executor, "api.CLINICAL_TRIALS", search_clinical_trials, **ct_kwargs
                 )
 
         # Submit FDA search
@@ -463,8 +490,8 @@ def execute_query_plan(plan: dict) -> dict:
                 fda_kwargs["drug_name"] = plan["fda_drug"]
             if fda_kwargs:
                 fda_kwargs["max_results"] = 10
-                futures["FDA"] = executor.submit(
-                    search_fda_drugs, **fda_kwargs
+                futures["FDA"] = submit_traced(
+                    executor, "api.FDA", search_fda_drugs, **fda_kwargs
                 )
 
         # Submit Global Landscape search (dynamic discovery — no hardcoded patterns)
@@ -472,8 +499,9 @@ def execute_query_plan(plan: dict) -> dict:
             landscape_target = plan.get("landscape_target", plan.get("ct_intervention", ""))
             landscape_region = plan.get("landscape_region", "all")
             if landscape_target:
-                futures["GLOBAL_LANDSCAPE"] = executor.submit(
-                    discover_landscape,
+                futures["GLOBAL_LANDSCAPE"] = submit_traced(
+                    executor, "api.GLOBAL_LANDSCAPE",
+                    landscape_search,
                     landscape_target,
                     region=landscape_region,
                     max_trials=200,
@@ -482,8 +510,8 @@ def execute_query_plan(plan: dict) -> dict:
         # Submit News Miner search
         if "NEWS_MINER" in sources and NEWS_MINER_AVAILABLE:
             news_region = plan.get("landscape_region", "all")
-            futures["NEWS_MINER"] = executor.submit(
-                news_mine_region, news_region, use_llm=False,  # regex-only for speed
+            futures["NEWS_MINER"] = submit_traced(
+                executor, "api.NEWS_MINER", news_mine_region, news_region, use_llm=False,  # regex-only for speed
             )
 
         # Submit FDA regulatory decisions search (approvals + CRLs)
@@ -491,29 +519,29 @@ def execute_query_plan(plan: dict) -> dict:
             crl_query = plan.get("ct_condition", "") or plan.get("ct_intervention", "") or plan.get("rag_query", "")
             if crl_query:
                 try:
-                    futures["FDA_CRL"] = executor.submit(
-                        search_fda_decisions, crl_query, 8
+                    futures["FDA_CRL"] = submit_traced(
+                        executor, "api.FDA_CRL", search_fda_decisions, crl_query, 8
                     )
                 except NameError:
                     # Fall back to legacy function if unified not available
-                    futures["FDA_CRL"] = executor.submit(
-                        search_crl_database, crl_query, 8
+                    futures["FDA_CRL"] = submit_traced(
+                        executor, "api.FDA_CRL", search_crl_database, crl_query, 8
                     )
 
         # Submit Disease Space Intelligence (rare disease ecosystem mapping)
         if "DISEASE_SPACE" in sources and DISEASE_SPACE_AVAILABLE:
             space_disease = plan.get("ct_condition", "") or plan.get("landscape_target", "")
             if space_disease:
-                futures["DISEASE_SPACE"] = executor.submit(
-                    get_disease_space, space_disease
+                futures["DISEASE_SPACE"] = submit_traced(
+                    executor, "api.DISEASE_SPACE", get_disease_space, space_disease
                 )
 
         # Submit PubMed search (primary + extra entity-derived queries)
         if "PUBMED" in sources:
             pubmed_query = plan.get("pubmed_query", "")
             if pubmed_query:
-                futures["PUBMED"] = executor.submit(
-                    search_pubmed, pubmed_query, max_results=8
+                futures["PUBMED"] = submit_traced(
+                    executor, "api.PUBMED", search_pubmed, pubmed_query, max_results=8
                 )
             # Run ONE extra PubMed query from drug entity enrichment
             # (Running multiple in parallel causes 429 rate limiting from NCBI)
@@ -521,8 +549,8 @@ def execute_query_plan(plan: dict) -> dict:
             if extra_pm:
                 # Combine top terms into a single OR query instead of separate requests
                 combined_terms = " OR ".join(extra_pm[:4])
-                futures["PUBMED_EXTRA_0"] = executor.submit(
-                    search_pubmed, combined_terms, max_results=5
+                futures["PUBMED_EXTRA_0"] = submit_traced(
+                    executor, "api.PUBMED", search_pubmed, combined_terms, max_results=5
                 )
 
         # Collect results
@@ -632,7 +660,8 @@ def execute_query_plan(plan: dict) -> dict:
             with concurrent.futures.ThreadPoolExecutor(max_workers=6) as drill_executor:
                 drill_futures = {}
                 for ticker in drill_tickers:
-                    drill_futures[ticker] = drill_executor.submit(
+                    drill_futures[ticker] = submit_traced(
+                        drill_executor, "rag_drill",
                         rag_search.search,
                         rag_query,
                         top_k=8,
@@ -665,6 +694,36 @@ def execute_query_plan(plan: dict) -> dict:
 # Step 2b: Format Global Landscape for Claude
 # =============================================================================
 
+def _landscape_staleness_note(landscape_data):
+    """
+    One line saying how old a landscape is, flagged when it is past its
+    freshness window (stored landscapes carry a "freshness" block; dynamic
+    discovery results only a build timestamp).
+    """
+    freshness = landscape_data.get("freshness") or {}
+    as_of = freshness.get("refreshed_at") or landscape_data.get("timestamp", "")
+    if not as_of:
+        return ""
+    age_hours = freshness.get("age_hours")
+    if age_hours is None:
+        try:
+            built = datetime.fromisoformat(as_of)
+            if built.tzinfo is None:
+                built = built.astimezone()
+            age_hours = (datetime.now(timezone.utc) - built).total_seconds() / 3600
+        except ValueError:
+            return ""
+
+    note = f"Data as of {as_of[:16].replace('T', ' ')} ({age_hours:.0f}h old)"
+    if freshness.get("status") in ("stale", "expired"):
+        refresh = freshness.get("refresh", "none")
+        note += " — STALE"
+        if refresh in ("scheduled", "in_progress"):
+            note += ", refresh in progress"
+        note += "; recent trial updates may be missing"
+    return note
+
+
 def format_global_landscape_for_claude(landscape_data):
     """
     Format landscape result into a context block Claude can use
@@ -674,10 +733,13 @@ def format_global_landscape_for_claude(landscape_data):
     if not landscape_data or not landscape_data.get("assets"):
         return ""
 
+    staleness = _landscape_staleness_note(landscape_data)
+
     # Dynamic discovery format has 'drug_classes' key
     if "drug_classes" in landscape_data:
         try:
-            return format_dynamic_landscape(landscape_data)
+            formatted = format_dynamic_landscape(landscape_data)
+            return f"{staleness}\n{formatted}" if staleness and formatted else formatted
         except Exception:
             pass  # Fall through to legacy format
 
@@ -697,6 +759,8 @@ def format_global_landscape_for_claude(landscape_data):
         "Drug assets ranked by development stage (highest phase first):",
         "",
     ]
+    if staleness:
+        lines.insert(2, staleness)
 
     for i, asset in enumerate(assets, 1):
         phase = asset.get("highest_phase", "N/A").replace("PHASE", "Phase ")
@@ -1538,13 +1602,15 @@ def answer_query(query: str) -> dict:
         metadata: dict — total docs searched, chunks retrieved, etc.
     """
     total_start = time.time()
+    trace = start_trace("answer_query", query=query)
 
     # Step 1: Classify the query
     print(f"\n{'='*60}")
     print(f"  Query: {query}")
     print(f"{'='*60}")
 
-    plan = classify_query(query)
+    with trace.span("classify"):
+        plan = classify_query(query)
     print(f"  Sources: {plan.get('sources', [])}")
     print(f"  Type: {plan.get('query_type', 'unknown')}")
     print(f"  Persona: {plan.get('persona', 'investor')}")
@@ -1552,7 +1618,8 @@ def answer_query(query: str) -> dict:
 
     # Step 1.5: Enrich with drug entity intelligence
     if DRUG_DB_AVAILABLE:
-        plan = enrich_with_drug_entities(query, plan)
+        with trace.span("entity_enrichment"):
+            plan = enrich_with_drug_entities(query, plan)
         entity_ctx = plan.get("entity_context", {})
         if entity_ctx.get("drug_info"):
             print(f"  Drug entity: {entity_ctx['drug_info']['canonical_name']}")
@@ -1565,7 +1632,8 @@ def answer_query(query: str) -> dict:
             print(f"  Extra PubMed terms: {len(entity_ctx['extra_pubmed_terms'])}")
 
     # Step 2: Execute queries in parallel
-    data = execute_query_plan(plan)
+    with trace.span("execute"):
+        data = execute_query_plan(plan)
     print(f"  Timing: {data['timing']}")
     landscape = data.get("global_landscape")
     landscape_count = len(landscape["assets"]) if landscape and landscape.get("assets") else 0
@@ -1576,7 +1644,8 @@ def answer_query(query: str) -> dict:
     # Step 2.5: Source-priority routing — reweight RAG results + pull AdCom context
     if SOURCE_ROUTER_AVAILABLE:
         try:
-            routing = prioritized_search(query, plan, top_k=25)
+            with trace.span("source_routing"):
+                routing = prioritized_search(query, plan, top_k=25)
             # Replace flat RAG results with priority-weighted results
             if routing.get("rag_results"):
                 data["rag_results"] = routing["rag_results"]
@@ -1590,7 +1659,9 @@ def answer_query(query: str) -> dict:
             print(f"  Source routing failed (falling back to flat): {e}")
 
     # Step 3: Synthesize answer
-    result = synthesize_answer(query, data, plan)
+    with trace.span("synthesize"):
+        result = synthesize_answer(query, data, plan)
+    trace.finish()
 
     total_time = round(time.time() - total_start, 2)
     print(f"  Total time: {total_time}s")
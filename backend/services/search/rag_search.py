@@ -8,7 +8,8 @@ CHANGES FROM v1:
   - Larger candidate pool: Fetches 3x top_k candidates, reranks down to top_k
   - Better handling of exact terms (NCT numbers, drug names, gene symbols)
 
-Used by the search router for cross-document search.
+Used by the search router for cross-document search. Webcast hits are
+anchored to the moment in the recording that matched (webcast_index).
 """
 
 import os
@@ -20,6 +21,9 @@ load_dotenv()
 import psycopg2
 import voyageai
 
+from search_tracing import span
+from webcast_index import attach_moments
+
 DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
 VOYAGE_API_KEY = os.environ.get("VOYAGE_API_KEY", "")
 
@@ -344,29 +348,38 @@ def search(query: str, top_k: int = 50, ticker_filter: str = None) -> list[dict]
 
     # Step 1: Embed the query
     try:
-        result = vo.embed([query], model=EMBED_MODEL, input_type="query")
+        with span("embed"):
+            result = vo.embed([query], model=EMBED_MODEL, input_type="query")
         query_embedding = result.embeddings[0]
     except Exception as e:
         print(f"RAG search embedding error: {e}")
         return []
 
     # Step 2: Vector search (semantic)
-    vector_results = _vector_search(conn, query_embedding, top_k, ticker_filter)
+    with span("vector_sql"):
+        vector_results = _vector_search(conn, query_embedding, top_k, ticker_filter)
 
     # Step 3: Keyword search (exact terms — NCT numbers, drug names, genes)
-    keyword_results = _keyword_search(conn, query, top_k, ticker_filter)
+    with span("keyword_sql"):
+        keyword_results = _keyword_search(conn, query, top_k, ticker_filter)
 
     # Step 4: Merge and score
     merged = _merge_and_score(vector_results, keyword_results)
 
     # Step 5: Rerank the top candidates
     rerank_pool = merged[:top_k * 3]
-    reranked = _rerank(vo, query, rerank_pool, top_k)
+    with span("rerank"):
+        reranked = _rerank(vo, query, rerank_pool, top_k)
+
+    # Step 6: Time anchors for webcast chunks — one indexed lookup, no transcript scan
+    if any(r["doc_type"] == "webcast" for r in reranked):
+        with span("webcast_moments"):
+            attach_moments(conn, query, reranked)
 
     # Clean up output format
     results = []
     for r in reranked:
-        results.append({
+        result = {
             "content": r["content"],
             "page_number": r["page_number"],
             "filename": r["filename"],
@@ -377,7 +390,11 @@ def search(query: str, top_k: int = 50, ticker_filter: str = None) -> list[dict]
             "file_path": r.get("file_path", ""),
             "doc_date": r.get("doc_date", ""),
             "similarity": round(float(r.get("similarity", 0)), 4),
-        })
+        }
+        if r.get("start_time") is not None:
+            for key in ("start_time", "end_time", "timestamp", "section_title", "jump_url", "moments"):
+                result[key] = r.get(key)
+        results.append(result)
 
     return results
 
@@ -412,6 +429,9 @@ def format_context_for_claude(results: list[dict]) -> str:
             "content": r["content"],
             "page": r["page_number"],
             "similarity": r["similarity"],
+            "timestamp": r.get("timestamp"),
+            "section": r.get("section_title"),
+            "jump_url": r.get("jump_url"),
         })
 
     parts = []
@@ -431,7 +451,11 @@ def format_context_for_claude(results: list[dict]) -> str:
         parts.append(f"== [Doc {doc['doc_num']}] {doc['ticker']} | {doc['company']} | {doc['title']} ({doc['doc_type']}) ==")
         parts.append(f"   CITE THIS AS: {{doc:{doc['ticker']}|{doc['title']}}}")
         for chunk in doc["chunks"]:
-            parts.append(f"   [Page {chunk['page']}, relevance: {chunk['similarity']}]")
+            if chunk["timestamp"]:
+                link = f", link: {chunk['jump_url']}" if chunk["jump_url"] else ""
+                parts.append(f"   [At {chunk['timestamp']} — {chunk['section']}, relevance: {chunk['similarity']}{link}]")
+            else:
+                parts.append(f"   [Page {chunk['page']}, relevance: {chunk['similarity']}]")
             parts.append(f"   {chunk['content']}")
             parts.append("")
         parts.append("")
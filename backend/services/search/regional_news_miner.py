@@ -27,10 +27,23 @@ Data Sources:
   - ClinicalTrials.gov country-filtered searches
   - Claude API for translation + entity extraction from non-English content
 
+Harvesting:
+  Sources are fetched concurrently through feed_harvester — politeness is
+  per host, and feeds / listing pages are revalidated with ETag and
+  Last-Modified. Scheduled runs skip article URLs already in mined_articles.
+
+Near-duplicates:
+  Syndicated copies and rewrites of the same story are clustered by
+  article_dedup (MinHash over title + body, within a publication window,
+  including stories stored by recent runs). Only one representative per
+  story goes to Claude extraction and RAG embedding; the other copies are
+  attached to it as citations and stored with the same cluster_key.
+
 Usage:
     python3 regional_news_miner.py --mine                    # Mine all regions
     python3 regional_news_miner.py --mine --region china     # China only
     python3 regional_news_miner.py --mine --region korea     # Korea only
+    python3 regional_news_miner.py --mine --refetch          # Reprocess already-stored articles
     python3 regional_news_miner.py --extract --query "KRAS"  # Extract drug assets from news
     python3 regional_news_miner.py --alerts                  # Show novel assets found
     python3 regional_news_miner.py --status                  # Show mining stats
@@ -46,6 +59,7 @@ import re
 import json
 import hashlib
 import argparse
+import asyncio
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -85,6 +99,12 @@ try:
 except ImportError:
     VOYAGEAI_AVAILABLE = False
 
+import ctgov_client
+from article_dedup import WINDOW_HOURS as DEDUP_WINDOW_HOURS, cluster_articles
+from entity_resolver import EntityResolver
+from feed_harvester import HostLimiter, fetch_many, run_sync
+from mention_tagger import get_mention_tagger
+
 # ─── Config ──────────────────────────────────────────────────────────────────
 
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -93,6 +113,12 @@ VOYAGE_API_KEY = os.environ.get("VOYAGE_API_KEY", "")
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) SatyaBio-NewsMiner/1.0"
 }
+ARTICLE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+}
 
 # ─── Regional News Sources ───────────────────────────────────────────────────
 # Each source has: name, url, region, language, source_type, parse_fn
@@ -478,11 +504,14 @@ ALL_WATCHLISTS = {
 
 # ─── Source Parsers ──────────────────────────────────────────────────────────
 
-def parse_rss_feed(source):
-    """Parse an RSS feed. Returns list of article dicts."""
+def parse_rss_feed(source, content=None):
+    """
+    Parse an RSS feed. Returns list of article dicts.
+    content is the already-fetched feed body; without it the feed is downloaded.
+    """
     articles = []
     try:
-        feed = feedparser.parse(source["url"])
+        feed = feedparser.parse(content if content is not None else source["url"])
         for entry in feed.entries[:30]:  # Cap at 30 per feed
             pub_date = None
             if hasattr(entry, "published_parsed") and entry.published_parsed:
@@ -527,21 +556,19 @@ def fetch_full_article_text(url, timeout=15):
         return ""
 
     try:
-        resp = requests.get(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                              "AppleWebKit/537.36 (KHTML, like Gecko) "
-                              "Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml",
-            },
-            timeout=timeout,
-            allow_redirects=True,
-        )
+        resp = requests.get(url, headers=ARTICLE_HEADERS, timeout=timeout, allow_redirects=True)
         if resp.status_code != 200:
             return ""
+        return extract_article_body(resp.text)
+    except Exception as e:
+        print(f"    [Article] fetch error for {url}: {e}")
+        return ""
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+
+def extract_article_body(html):
+    """Article body text from a news page's HTML (ads, nav, footer stripped), or ""."""
+    try:
+        soup = BeautifulSoup(html, "html.parser")
 
         # Remove noise elements before extracting text
         for tag in soup.find_all(["script", "style", "nav", "footer", "header",
@@ -602,6 +629,7 @@ def fetch_full_article_text(url, timeout=15):
         return body_text
 
     except Exception as e:
+        print(f"    [Article] parse error: {e}")
         return ""
 
 
@@ -609,49 +637,55 @@ def enrich_articles_with_full_text(articles, max_articles=20, delay=1.5):
     """
     Fetch full body text for a batch of articles.
 
-    Only fetches for articles that don't already have full_text.
-    Rate-limited to avoid being blocked.
+    Only fetches for articles that don't already have full_text. Bodies are
+    fetched concurrently; politeness is per host (feed_harvester.HostLimiter),
+    so articles from different sites don't wait on each other.
 
     Args:
         articles: List of article dicts from parse_rss_feed()
         max_articles: Max number of articles to fetch full text for
-        delay: Seconds to wait between requests (rate limiting)
+        delay: Seconds between requests to the same host (rate limiting)
 
     Returns:
         Same list with full_text field populated
     """
-    fetched = 0
-    for article in articles:
-        if fetched >= max_articles:
-            break
-        if article.get("full_text"):
-            continue  # Already has full text
-        if not article.get("url"):
-            continue
+    pending = [a for a in articles if not a.get("full_text") and a.get("url")][:max_articles]
+    if not pending:
+        return articles
 
-        text = fetch_full_article_text(article["url"])
+    pages = run_sync(fetch_many(
+        [a["url"] for a in pending], headers=ARTICLE_HEADERS, timeout=15,
+        limiter=HostLimiter(interval=delay),
+    ))
+
+    fetched = 0
+    for article in pending:
+        page = pages.get(article["url"])
+        text = extract_article_body(page.body) if page and page.ok else ""
         if text and len(text) > 100:
             article["full_text"] = text
             fetched += 1
-            if fetched % 5 == 0:
-                print(f"      Fetched full text for {fetched}/{max_articles} articles...")
-            time.sleep(delay)  # Rate limit
 
     if fetched > 0:
-        print(f"    Enriched {fetched} articles with full body text")
+        print(f"    Enriched {fetched}/{len(pending)} articles with full body text")
     return articles
 
 
-def parse_html_listing(source):
-    """Parse an HTML page listing articles/news items. Returns list of article dicts."""
+def parse_html_listing(source, html=None):
+    """
+    Parse an HTML page listing articles/news items. Returns list of article dicts.
+    html is the already-fetched page; without it the page is downloaded.
+    """
     articles = []
     try:
-        resp = requests.get(source["url"], headers=HEADERS, timeout=20)
-        if resp.status_code != 200:
-            print(f"    [{source['name']}] HTTP {resp.status_code}")
-            return []
+        if html is None:
+            resp = requests.get(source["url"], headers=HEADERS, timeout=20)
+            if resp.status_code != 200:
+                print(f"    [{source['name']}] HTTP {resp.status_code}")
+                return []
+            html = resp.text
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(html, "html.parser")
 
         # Find article links — look for common patterns
         # BioSpectrum, NMPA, and most news sites use <a> inside article/listing containers
@@ -724,12 +758,8 @@ def parse_ctgov_api(source):
             **source.get("params", {}),
         }
 
-        resp = requests.get(source["url"], params=params, headers=HEADERS, timeout=30)
-        if resp.status_code != 200:
-            print(f"    [{source['name']}] HTTP {resp.status_code}")
-            return []
-
-        data = resp.json()
+        # Shared CT.gov client: rate-limited, mirror-first, revalidated with ETags
+        data = ctgov_client.get_json(params)
         studies = data.get("studies", [])
 
         for study in studies:
@@ -808,6 +838,37 @@ def extract_drug_entities_with_claude(articles, region="all"):
         print("  [Claude extraction] No API key — using regex fallback")
         return extract_drug_entities_regex(articles)
 
+    # Articles whose every drug-shaped name is already a known drug are
+    # tagged deterministically; only the rest are sent to Claude.
+    tagger = get_mention_tagger()
+    tagged_candidates = []
+    seen = set()
+    pending = []
+    for a in articles:
+        text = _article_text(a)
+        mentions = tagger.tag(text)
+        if not tagger.is_confident(text, mentions):
+            pending.append(a)
+            continue
+        found = [
+            _tagged_candidate(m, mentions, a, "high")
+            for m in mentions
+            if m.entity_type == "drug" and m.canonical.lower() not in seen
+        ]
+        # Downstream needs sponsor and phase; without them Claude reads the article
+        if any(not c["company"] or not c["phase"] for c in found):
+            pending.append(a)
+            continue
+        for c in found:
+            if c["drug_name"].lower() not in seen:
+                seen.add(c["drug_name"].lower())
+                tagged_candidates.append(c)
+    print(f"  [Tagger] {len(articles) - len(pending)}/{len(articles)} articles fully tagged "
+          f"({len(tagged_candidates)} known drugs) — {len(pending)} sent to Claude")
+    if not pending:
+        return tagged_candidates
+    articles = pending
+
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
     # Build context from articles
@@ -819,6 +880,8 @@ def extract_drug_entities_with_claude(articles, region="all"):
             text += f"Summary: {a['summary'][:500]}\n"
         if a.get("full_text"):
             text += f"Content: {a['full_text'][:800]}\n"
+        if a.get("citations"):
+            text += f"Also reported by: {', '.join(c['source_name'] for c in a['citations'])}\n"
         article_texts.append(text)
 
     batch_text = "\n---\n".join(article_texts)
@@ -873,60 +936,138 @@ Only return the JSON array, no other text."""
 
         candidates = json.loads(text)
         print(f"  [Claude] Extracted {len(candidates)} drug candidates")
-        return candidates
+        return candidates + tagged_candidates
 
     except json.JSONDecodeError as e:
         print(f"  [Claude] JSON parse error: {e}")
-        return extract_drug_entities_regex(articles)
+        return extract_drug_entities_regex(articles) + tagged_candidates
     except Exception as e:
         print(f"  [Claude] API error: {e}")
-        return extract_drug_entities_regex(articles)
+        return extract_drug_entities_regex(articles) + tagged_candidates
+
+
+# Drug-name shapes for names the tagger doesn't know, as one alternation:
+# ADC names (X vedotin — tried first so the full name wins), code names
+# (ABC-12345), INN suffixes, antibody suffixes
+_UNKNOWN_DRUG_PATTERN = re.compile(
+    r'\b(\w+ (?:vedotin|deruxtecan|govitecan|maytansine|mafodotin|ravtansine))\b'
+    r'|\b([A-Z]{2,5}[-\s]?\d{3,6}[A-Za-z]?)\b'
+    r'|\b(\w{4,}(?:mab|nib|lib|sib|tib|cib|rib|pib|ertinib|afenib|lisib|tinib))\b'
+    r'|\b(\w{4,}(?:umab|zumab|ximab|limab|tumab|vimab|nimab|rimab))\b',
+    re.IGNORECASE,
+)
+
+
+def _article_text(article):
+    return f"{article['title']} {article.get('summary', '')} {article.get('full_text', '')}"
+
+
+# "Phase 2", "Phase II", "phase 1/2" (first mention wins)
+_PHASE_IN_TEXT = re.compile(r"\bphase\s*(I{1,3}|[1-3])(?:\s*/\s*(?:I{1,3}|[1-3]))?\b", re.IGNORECASE)
+_ROMAN_PHASE = {"I": "1", "II": "2", "III": "3"}
+_REGION_COUNTRY = {"china": "China", "korea": "South Korea", "japan": "Japan"}
+
+
+def _candidate_company(drug_name, article):
+    """Trial sponsor, else the watchlist company that owns the drug or is named in the article."""
+    sponsor = (article.get("metadata") or {}).get("sponsor")
+    if sponsor:
+        return sponsor
+    text = _article_text(article).lower()
+    named = ""
+    for watchlist in ALL_WATCHLISTS.values():
+        for company, info in watchlist.items():
+            if drug_name.lower() in (d.lower() for d in info.get("known_drugs", [])):
+                return company
+            if not named and any(n.lower() in text for n in [company] + info.get("aliases", [])):
+                named = company
+    return named
+
+
+def _candidate_phase(article):
+    phase = (article.get("metadata") or {}).get("phase", "")
+    if phase and phase != "N/A":
+        # CT.gov enum: PHASE2, EARLY_PHASE1, NA
+        digits = re.sub(r"\D", "", phase)
+        return f"Phase {digits}" if digits else phase.title()
+    match = _PHASE_IN_TEXT.search(_article_text(article))
+    if not match:
+        return ""
+    stage = match.group(1).upper()
+    return f"Phase {_ROMAN_PHASE.get(stage, stage)}"
+
+
+def _candidate_countries(article):
+    countries = (article.get("metadata") or {}).get("countries")
+    if countries:
+        return list(countries)
+    country = _REGION_COUNTRY.get(article.get("region", ""))
+    return [country] if country else []
+
+
+def _tagged_candidate(mention, mentions, article, confidence):
+    """Candidate dict for a drug the mention tagger recognised."""
+    target = next((m.canonical for m in mentions if m.entity_type == "target"), "")
+    indication = next((m.canonical for m in mentions if m.entity_type == "indication"), "")
+    return {
+        "drug_name": mention.canonical,
+        "company": _candidate_company(mention.canonical, article),
+        "target_moa": target,
+        "phase": _candidate_phase(article),
+        "indication": indication,
+        "countries": _candidate_countries(article),
+        "source_article": article["title"][:60],
+        "confidence": confidence,
+        "novelty_signal": "no",
+    }
 
 
 def extract_drug_entities_regex(articles):
     """
     Regex fallback for drug entity extraction when Claude API isn't available.
-    Looks for common drug naming patterns: code names, -mab/-nib/-lib suffixes, etc.
+    Known drugs come from the mention tagger (canonical names); names it
+    doesn't know are caught by drug naming patterns: code names,
+    -mab/-nib/-lib suffixes, ADC names.
     """
-    # Common drug name patterns
-    patterns = [
-        # Code names: ABC-12345, ABC12345
-        r'\b([A-Z]{2,5}[-\s]?\d{3,6}[A-Za-z]?)\b',
-        # INN suffixes
-        r'\b(\w{4,}(?:mab|nib|lib|sib|tib|cib|rib|pib|ertinib|afenib|lisib|tinib))\b',
-        # -umab, -zumab, -ximab
-        r'\b(\w{4,}(?:umab|zumab|ximab|limab|tumab|vimab|nimab|rimab))\b',
-        # ADC names (X vedotin, X deruxtecan, etc.)
-        r'\b(\w+ (?:vedotin|deruxtecan|govitecan|maytansine|mafodotin|ravtansine))\b',
-    ]
-
+    tagger = get_mention_tagger()
     candidates = []
     seen = set()
 
     for article in articles:
-        search_text = f"{article['title']} {article.get('summary', '')} {article.get('full_text', '')}"
+        search_text = _article_text(article)
+        mentions = tagger.tag(search_text)
+        drug_spans = []
 
-        for pattern in patterns:
-            matches = re.findall(pattern, search_text, re.IGNORECASE)
-            for match in matches:
-                name = match.strip()
-                if name.lower() in seen or len(name) < 3:
-                    continue
-                # Filter out common false positives
-                if name.upper() in {"COVID", "SARS", "MERS", "HTTP", "HTML", "NULL"}:
-                    continue
-                seen.add(name.lower())
-                candidates.append({
-                    "drug_name": name,
-                    "company": "",
-                    "target_moa": "",
-                    "phase": "",
-                    "indication": "",
-                    "countries": [],
-                    "source_article": article["title"][:60],
-                    "confidence": "low",
-                    "novelty_signal": "maybe",
-                })
+        for m in mentions:
+            if m.entity_type != "drug":
+                continue
+            drug_spans.append((m.start, m.end))
+            if m.canonical.lower() in seen:
+                continue
+            seen.add(m.canonical.lower())
+            candidates.append(_tagged_candidate(m, mentions, article, "medium"))
+
+        for match in _UNKNOWN_DRUG_PATTERN.finditer(search_text):
+            if any(s <= match.start() and match.end() <= e for s, e in drug_spans):
+                continue
+            name = next(g for g in match.groups() if g).strip()
+            if name.lower() in seen or len(name) < 3:
+                continue
+            # Filter out common false positives
+            if name.upper() in {"COVID", "SARS", "MERS", "HTTP", "HTML", "NULL"}:
+                continue
+            seen.add(name.lower())
+            candidates.append({
+                "drug_name": name,
+                "company": "",
+                "target_moa": "",
+                "phase": "",
+                "indication": "",
+                "countries": [],
+                "source_article": article["title"][:60],
+                "confidence": "low",
+                "novelty_signal": "maybe",
+            })
 
     print(f"  [Regex] Extracted {len(candidates)} drug candidates")
     return candidates
@@ -938,6 +1079,10 @@ def resolve_cross_lingual(candidates):
     """
     Resolve Chinese/Korean/Japanese drug names to English canonical names.
     Uses the watchlist aliases + Claude for unknown entities.
+
+    Drug names are resolved as one batch (EntityResolver.resolve_many):
+    exact watchlist aliases first, then fuzzy matches that keep the same
+    code digits (transliteration / hyphenation variants).
     """
     # Build a reverse lookup from all watchlists
     alias_to_canonical = {}
@@ -948,15 +1093,19 @@ def resolve_cross_lingual(candidates):
             for drug in info.get("known_drugs", []):
                 alias_to_canonical[drug.lower()] = drug
 
+    batch = EntityResolver.from_aliases(alias_to_canonical).resolve_many(
+        (c["drug_name"] for c in candidates), context="regional news"
+    )
+
     resolved = []
     for c in candidates:
-        drug_lower = c["drug_name"].lower()
+        match = batch.get(c["drug_name"])
         company_lower = c.get("company", "").lower()
 
         # Check if drug or company matches a known alias
-        if drug_lower in alias_to_canonical:
-            c["canonical_name"] = alias_to_canonical[drug_lower]
-            c["resolution"] = "alias_match"
+        if match:
+            c["canonical_name"] = match.canonical_name
+            c["resolution"] = "alias_match" if match.match_method == "exact_alias" else "fuzzy_match"
         elif company_lower in alias_to_canonical:
             c["parent_company"] = alias_to_canonical[company_lower]
             c["resolution"] = "company_match"
@@ -966,7 +1115,8 @@ def resolve_cross_lingual(candidates):
         resolved.append(c)
 
     matched = sum(1 for c in resolved if c["resolution"] != "unresolved")
-    print(f"  [Resolution] {matched}/{len(resolved)} candidates matched to known entities")
+    print(f"  [Resolution] {matched}/{len(resolved)} candidates matched to known entities "
+          f"({batch.stats['unique']} distinct names, {batch.stats['fuzzy']} fuzzy)")
     return resolved
 
 
@@ -976,6 +1126,10 @@ def detect_novel_assets(candidates, known_drugs=None):
     """
     Flag drug candidates that are NOT in our known drug database.
     These are the "under the radar" assets the paper talks about.
+
+    Each distinct name is checked once: a batch resolve_many() against the
+    known aliases (exact, then digit-preserving fuzzy), then the partial
+    name match ("enfortumab" ~ "enfortumab vedotin") for what's left.
     """
     if known_drugs is None:
         # Primary: use the curated known drugs baseline (~250 drugs, ~500+ aliases)
@@ -997,30 +1151,35 @@ def detect_novel_assets(candidates, known_drugs=None):
                 known_drugs = set()
                 print("  [Novelty] WARNING: No known drugs baseline found — all candidates will be flagged as novel")
 
-    # Also try the smarter matching from known_drugs_baseline
+    # Also try the smarter matching from known_drugs_baseline (partial
+    # matches of any length against the baseline set)
     try:
-        from known_drugs_baseline import is_known_drug as _is_known
-        use_smart_match = True
+        from known_drugs_baseline import get_known_drug_set as _baseline_set
+        match_set = _baseline_set()
+        min_partial = 1
     except ImportError:
-        use_smart_match = False
+        # Fallback: skip very short aliases to avoid false positives
+        match_set = known_drugs
+        min_partial = 4
+
+    batch = EntityResolver.from_aliases({kd: kd for kd in match_set}).resolve_many(
+        c["drug_name"] for c in candidates
+    )
+    partial_known = {}  # lowercase name -> bool, for names the batch missed
 
     novel = []
     known_list = []
     for c in candidates:
         drug_lower = c["drug_name"].lower().strip()
-        is_known = False
+        is_known = batch.get(drug_lower) is not None
 
-        if use_smart_match:
-            is_known = _is_known(c["drug_name"])
-        else:
-            # Fallback: exact + substring match (skip very short aliases to avoid false positives)
-            if drug_lower in known_drugs:
-                is_known = True
-            else:
-                for kd in known_drugs:
-                    if len(kd) >= 4 and (drug_lower in kd or kd in drug_lower):
-                        is_known = True
-                        break
+        if not is_known:
+            if drug_lower not in partial_known:
+                partial_known[drug_lower] = any(
+                    len(kd) >= min_partial and (drug_lower in kd or kd in drug_lower)
+                    for kd in match_set
+                )
+            is_known = partial_known[drug_lower]
 
         if is_known:
             c["novelty"] = "known"
@@ -1053,6 +1212,11 @@ def ensure_miner_tables(conn):
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
         )
     """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_mined_articles_url ON mined_articles(url)")
+    # Near-duplicate clustering (article_dedup): copies of one story share a cluster_key
+    cur.execute("ALTER TABLE mined_articles ADD COLUMN IF NOT EXISTS cluster_key VARCHAR(32)")
+    cur.execute("ALTER TABLE mined_articles ADD COLUMN IF NOT EXISTS minhash BIGINT[]")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_mined_articles_cluster ON mined_articles(cluster_key)")
     cur.execute("""
         CREATE TABLE IF NOT EXISTS drug_candidates (
             id SERIAL PRIMARY KEY,
@@ -1085,8 +1249,9 @@ def store_article(conn, article):
     try:
         cur.execute("""
             INSERT INTO mined_articles (article_hash, title, url, source_name, region,
-                                        language, published_at, summary, full_text)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                                        language, published_at, summary, full_text,
+                                        cluster_key, minhash)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (article_hash) DO NOTHING
             RETURNING id
         """, (
@@ -1099,6 +1264,8 @@ def store_article(conn, article):
             article.get("published"),
             article.get("summary", ""),
             article.get("full_text", ""),
+            article.get("cluster_key"),
+            article.get("minhash") or None,
         ))
         result = cur.fetchone()
         conn.commit()
@@ -1110,6 +1277,76 @@ def store_article(conn, article):
         return None
 
 
+def load_stored_articles(conn, urls):
+    """url → {"summary", "full_text"} for the given article URLs already stored by store_article()."""
+    urls = [u for u in dict.fromkeys(urls) if u]
+    if not urls:
+        return {}
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT DISTINCT ON (url) url, summary, full_text
+            FROM mined_articles
+            WHERE url = ANY(%s)
+            ORDER BY url, id DESC
+        """, (urls,))
+        rows = cur.fetchall()
+    except Exception as e:
+        conn.rollback()
+        print(f"    Stored-article lookup failed: {e}")
+        rows = []
+    finally:
+        cur.close()
+    return {url: {"summary": summary or "", "full_text": full_text or ""} for url, summary, full_text in rows}
+
+
+def load_recent_signatures(conn, exclude_urls=(), hours=DEDUP_WINDOW_HOURS):
+    """
+    (cluster_key, minhash, published) of stored articles from the last
+    2 x hours, for clustering new articles against stories already processed.
+    Rows for exclude_urls (articles being reprocessed) are left out.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT cluster_key, minhash, COALESCE(published_at, created_at)
+            FROM mined_articles
+            WHERE minhash IS NOT NULL AND cluster_key IS NOT NULL
+              AND COALESCE(published_at, created_at) > NOW() - %s * INTERVAL '1 hour'
+              AND NOT (url = ANY(%s))
+        """, (2 * hours, [u for u in exclude_urls if u]))
+        rows = cur.fetchall()
+    except Exception as e:
+        conn.rollback()
+        print(f"    Stored-signature lookup failed: {e}")
+        rows = []
+    finally:
+        cur.close()
+    return rows
+
+
+def dedupe_articles(articles, conn=None):
+    """
+    Cluster near-duplicate stories and return one representative per story
+    (in input order), each with the other copies attached as "citations".
+
+    Every article gets a cluster_key and minhash for store_article(). Copies
+    of a story already stored in the window are dropped here — it was
+    extracted and embedded when first seen. CT.gov items always pass through.
+    """
+    web = [a for a in articles if not a.get("metadata", {}).get("nct_id")]
+    prior = load_recent_signatures(conn, [a.get("url") for a in web]) if conn is not None else []
+    clusters = cluster_articles(web, prior=prior)
+
+    keep = {id(c.representative) for c in clusters if c.representative is not None}
+    representatives = [a for a in articles if id(a) in keep or a.get("metadata", {}).get("nct_id")]
+    seen_before = sum(len(c.members) for c in clusters if c.prior)
+    if len(representatives) < len(articles):
+        print(f"  Near-duplicates: {len(articles)} articles → {len(representatives)} stories "
+              f"({seen_before} copies of stories already processed)")
+    return representatives
+
+
 def store_candidate(conn, candidate, article_id=None):
     """Store a drug candidate."""
     cur = conn.cursor()
@@ -1148,56 +1385,131 @@ def store_candidate(conn, candidate, article_id=None):
 
 # ─── Main Pipeline ───────────────────────────────────────────────────────────
 
-def mine_region(region, use_llm=True, query_filter=None):
+def harvest_sources(sources):
     """
-    Mine a single region for drug asset candidates.
+    Fetch every source concurrently and parse it into article dicts (in source order).
 
-    Returns:
-        dict with articles, candidates, novel_assets
+    RSS feeds and listing pages go through feed_harvester — per-host
+    concurrency limits and ETag / Last-Modified revalidation; CT.gov sources
+    through the shared ctgov_client, in worker threads alongside them.
     """
-    print(f"\n{'='*70}")
-    print(f"  REGIONAL NEWS MINER — {region.upper()}")
-    print(f"{'='*70}\n")
+    web = [s for s in sources if s.get("parse_type", "rss") in ("rss", "html_listing")]
+    trials = [s for s in sources if s.get("parse_type") == "ctgov_api"]
+
+    async def _harvest():
+        return await asyncio.gather(
+            fetch_many([s["url"] for s in web], conditional=True, headers=HEADERS),
+            asyncio.gather(*(asyncio.to_thread(parse_ctgov_api, s) for s in trials)),
+        )
+
+    pages, trial_articles = run_sync(_harvest())
+    trial_articles = dict(zip((id(s) for s in trials), trial_articles))
 
-    # Determine which sources to fetch
-    sources = REGIONAL_SOURCES.get(region, [])
-    if region == "all":
-        sources = []
-        for r, s_list in REGIONAL_SOURCES.items():
-            for s in s_list:
-                s_copy = dict(s)
-                s_copy["region"] = r
-                sources.append(s_copy)
-
-    if not sources:
-        print(f"  No sources configured for region: {region}")
-        return {"articles": [], "candidates": [], "novel": []}
-
-    # Step 1: Fetch articles from all sources
-    print(f"  Step 1: Fetching from {len(sources)} sources...")
     all_articles = []
+    not_modified = 0
     for source in sources:
-        source["region"] = source.get("region", region)
         parse_type = source.get("parse_type", "rss")
-
+        if parse_type == "ctgov_api":
+            all_articles.extend(trial_articles[id(source)])
+            continue
+        if parse_type not in ("rss", "html_listing"):
+            continue
+        page = pages[source["url"]]
+        if not page.ok:
+            print(f"    [{source['name']}] {page.error or 'fetch failed'}")
+            continue
+        not_modified += page.not_modified
         if parse_type == "rss":
-            articles = parse_rss_feed(source)
-        elif parse_type == "html_listing":
-            articles = parse_html_listing(source)
-        elif parse_type == "ctgov_api":
-            articles = parse_ctgov_api(source)
+            all_articles.extend(parse_rss_feed(source, content=page.body))
         else:
-            articles = []
+            all_articles.extend(parse_html_listing(source, html=page.body))
 
-        all_articles.extend(articles)
-        time.sleep(1)  # Rate limit
+    if not_modified:
+        print(f"    {not_modified} feeds unchanged since last harvest (HTTP 304)")
+    return all_articles
 
+
+def collect_articles(sources, conn=None, skip_stored=False, max_fulltext=100):
+    """
+    Harvest sources, then fill in article bodies.
+
+    Articles already stored by store_article() are dropped when skip_stored
+    is set (scheduled runs only want what is new); otherwise their stored
+    text is reused instead of re-fetching the page. CT.gov items are never
+    skipped — a trial reappears in the feed because it was updated.
+    """
+    print(f"  Step 1: Fetching from {len(sources)} sources...")
+    all_articles = harvest_sources(sources)
     print(f"\n  Total articles fetched: {len(all_articles)}")
 
+    if conn is not None:
+        web_articles = [a for a in all_articles if not a.get("metadata", {}).get("nct_id")]
+        stored = load_stored_articles(conn, [a["url"] for a in web_articles])
+        if stored:
+            if skip_stored:
+                all_articles = [a for a in all_articles
+                                if a.get("metadata", {}).get("nct_id") or a.get("url") not in stored]
+                print(f"  Skipping {len(stored)} articles already stored")
+            else:
+                for a in web_articles:
+                    if a.get("url") in stored and not a.get("full_text"):
+                        a["full_text"] = stored[a["url"]]["full_text"]
+                print(f"  Reusing stored text for {len(stored)} articles")
+
     # Step 1b: Fetch full article text for richer entity extraction
-    max_fulltext = 100  # Process all articles — this runs on a schedule
     print(f"\n  Step 1b: Fetching full article text (up to {max_fulltext} articles)...")
-    all_articles = enrich_articles_with_full_text(all_articles, max_articles=max_fulltext, delay=1.0)
+    return enrich_articles_with_full_text(all_articles, max_articles=max_fulltext, delay=1.0)
+
+
+def _connect_miner_db():
+    """Connection with the miner tables ready, or None when no database is configured."""
+    if not (DB_AVAILABLE and DATABASE_URL):
+        return None
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        ensure_miner_tables(conn)
+        return conn
+    except Exception as e:
+        print(f"  DB connection error: {e}")
+        return None
+
+
+def mine_region(region, use_llm=True, query_filter=None, skip_stored=False, articles=None):
+    """
+    Mine a single region for drug asset candidates.
+
+    Args:
+        region: Key of REGIONAL_SOURCES, or "all"
+        use_llm: Extract entities with Claude (regex + tagger otherwise)
+        query_filter: Keep only articles mentioning this keyword
+        skip_stored: Drop articles already in mined_articles (scheduled runs)
+        articles: Already-collected articles for this region (mine_all_regions)
+
+    Returns:
+        dict with articles, candidates, novel_assets
+    """
+    print(f"\n{'='*70}")
+    print(f"  REGIONAL NEWS MINER — {region.upper()}")
+    print(f"{'='*70}\n")
+
+    conn = _connect_miner_db()
+
+    if articles is not None:
+        all_articles = articles
+    else:
+        # Determine which sources to fetch
+        sources = [dict(s, region=region) for s in REGIONAL_SOURCES.get(region, [])]
+        if region == "all":
+            sources = [dict(s, region=r) for r, s_list in REGIONAL_SOURCES.items() for s in s_list]
+
+        if not sources:
+            print(f"  No sources configured for region: {region}")
+            if conn:
+                conn.close()
+            return {"articles": [], "candidates": [], "novel": []}
+
+        # Process all articles — this runs on a schedule
+        all_articles = collect_articles(sources, conn=conn, skip_stored=skip_stored, max_fulltext=100)
 
     # Step 1c (optional): Filter articles by query keyword
     if query_filter:
@@ -1214,12 +1526,15 @@ def mine_region(region, use_llm=True, query_filter=None):
         print(f"\n  Step 1c: Filtered to {len(filtered)}/{len(all_articles)} articles matching '{query_filter}'")
         all_articles = filtered
 
+    # Step 1d: One representative per near-duplicate story
+    stories = dedupe_articles(all_articles, conn=conn)
+
     # Step 2: Extract drug entities
     print(f"\n  Step 2: Extracting drug entities...")
     if use_llm:
-        candidates = extract_drug_entities_with_claude(all_articles, region=region)
+        candidates = extract_drug_entities_with_claude(stories, region=region)
     else:
-        candidates = extract_drug_entities_regex(all_articles)
+        candidates = extract_drug_entities_regex(stories)
 
     # Step 3: Cross-lingual resolution
     print(f"\n  Step 3: Cross-lingual entity resolution...")
@@ -1230,11 +1545,8 @@ def mine_region(region, use_llm=True, query_filter=None):
     novel, known = detect_novel_assets(candidates)
 
     # Step 5: Store results
-    conn = None
-    if DB_AVAILABLE and DATABASE_URL:
+    if conn:
         try:
-            conn = psycopg2.connect(DATABASE_URL)
-            ensure_miner_tables(conn)
             stored_articles = 0
             for a in all_articles:
                 aid = store_article(conn, a)
@@ -1245,20 +1557,20 @@ def mine_region(region, use_llm=True, query_filter=None):
                 store_candidate(conn, c)
                 stored_candidates += 1
             print(f"\n  Stored: {stored_articles} articles, {stored_candidates} candidates")
-            conn.close()
         except Exception as e:
             print(f"\n  DB storage error: {e}")
-            if conn:
-                conn.close()
+        finally:
+            conn.close()
 
     # Step 6: Embed articles with full text into RAG for search
-    embedded = embed_articles_to_rag(all_articles, source_label=f"news_miner_{region}")
+    embedded = embed_articles_to_rag(stories, source_label=f"news_miner_{region}")
 
     # Print summary
     print(f"\n{'='*70}")
     print(f"  MINING RESULTS — {region.upper()}")
     print(f"{'='*70}")
     print(f"  Articles scraped:    {len(all_articles)}")
+    print(f"  Distinct stories:    {len(stories)}")
     print(f"  Drug candidates:     {len(candidates)}")
     print(f"  Novel (under radar): {len(novel)}")
     print(f"  Known (in our DB):   {len(known)}")
@@ -1489,13 +1801,14 @@ def backfill_topic(query, use_llm=True, max_articles=50):
     # Step 2: Fetch full article text
     print(f"\n  Step 2: Fetching full article text ({len(all_articles)} articles)...")
     all_articles = enrich_articles_with_full_text(all_articles, max_articles=max_articles, delay=1.5)
+    stories = dedupe_articles(all_articles)
 
     # Step 3: Extract drug entities
     print(f"\n  Step 3: Extracting drug entities...")
     if use_llm:
-        candidates = extract_drug_entities_with_claude(all_articles, region="global")
+        candidates = extract_drug_entities_with_claude(stories, region="global")
     else:
-        candidates = extract_drug_entities_regex(all_articles)
+        candidates = extract_drug_entities_regex(stories)
 
     # Step 4: Cross-lingual resolution
     print(f"\n  Step 4: Cross-lingual entity resolution...")
@@ -1526,7 +1839,7 @@ def backfill_topic(query, use_llm=True, max_articles=50):
             print(f"  DB storage error: {e}")
 
     # Step 7: Embed into RAG
-    articles_with_text = [a for a in all_articles if a.get("full_text")]
+    articles_with_text = [a for a in stories if a.get("full_text")]
     if articles_with_text:
         print(f"\n  [RAG Embed] Embedding {len(articles_with_text)} articles into vector database...")
         embed_articles_to_rag(articles_with_text, source_label=f"backfill_{query.replace(' ', '_')}")
@@ -1561,11 +1874,31 @@ def backfill_topic(query, use_llm=True, max_articles=50):
     }
 
 
-def mine_all_regions(use_llm=True, query_filter=None):
-    """Mine all regions and aggregate results."""
+def mine_all_regions(use_llm=True, query_filter=None, skip_stored=True):
+    """
+    Mine all regions and aggregate results.
+
+    Every region's sources are harvested in one concurrent pass (hosts shared
+    across regions stay on one politeness schedule), then each region runs
+    extraction, resolution and storage on its share. Scheduled runs skip
+    articles already stored; pass skip_stored=False to reprocess them.
+    """
+    regions = ["global", "china", "korea", "japan", "india", "europe"]
+    sources = [dict(s, region=r) for r in regions for s in REGIONAL_SOURCES.get(r, [])]
+
+    conn = _connect_miner_db()
+    try:
+        articles = collect_articles(sources, conn=conn, skip_stored=skip_stored,
+                                    max_fulltext=100 * len(regions))
+    finally:
+        if conn:
+            conn.close()
+
     all_results = {}
-    for region in ["global", "china", "korea", "japan", "india", "europe"]:
-        result = mine_region(region, use_llm=use_llm, query_filter=query_filter)
+    for region in regions:
+        region_articles = [a for a in articles if a.get("region") == region]
+        result = mine_region(region, use_llm=use_llm, query_filter=query_filter,
+                             skip_stored=skip_stored, articles=region_articles)
         all_results[region] = result
 
     # Aggregate
@@ -1631,6 +1964,9 @@ def embed_articles_to_rag(articles, source_label="news_miner"):
             source_name = article.get("source_name", source_label)
             pub_date = article.get("published")
             full_text = article["full_text"]
+            header = f"[{source_name}] {title}"
+            if article.get("citations"):
+                header += f"\nAlso reported by: {', '.join(c['source_name'] for c in article['citations'])}"
 
             # Check if we already embedded this URL
             cur.execute("SELECT id FROM documents WHERE file_path = %s", (url,))
@@ -1652,7 +1988,7 @@ def embed_articles_to_rag(articles, source_label="news_miner"):
                     continue
                 chunk_text = " ".join(chunk_words)
                 chunks.append({
-                    "content": f"[{source_name}] {title}\n\n{chunk_text}",
+                    "content": f"{header}\n\n{chunk_text}",
                     "page_number": 1,
                     "section_title": title,
                 })
@@ -1733,6 +2069,8 @@ Examples:
                         help="Region to mine: all, china, korea, japan, india, europe, global")
     parser.add_argument("--no-llm", action="store_true",
                         help="Skip Claude extraction, use regex only")
+    parser.add_argument("--refetch", action="store_true",
+                        help="Reprocess articles already stored (default: skip them)")
     parser.add_argument("--status", action="store_true",
                         help="Show mining statistics from DB")
     parser.add_argument("--watchlist", action="store_true",
@@ -1803,9 +2141,9 @@ Examples:
     elif args.mine:
         use_llm = not args.no_llm
         if args.region == "all":
-            mine_all_regions(use_llm=use_llm, query_filter=args.query)
+            mine_all_regions(use_llm=use_llm, query_filter=args.query, skip_stored=not args.refetch)
         else:
-            mine_region(args.region, use_llm=use_llm, query_filter=args.query)
+            mine_region(args.region, use_llm=use_llm, query_filter=args.query, skip_stored=not args.refetch)
 
     else:
         parser.print_help()
@@ -0,0 +1,300 @@
+"""
+SatyaBio — Search Pipeline Tracing & Latency Metrics
+
+Lightweight, dependency-free tracing for the search pipeline. Every stage of a
+query (classify → entity enrichment → embed / vector SQL / keyword SQL / rerank
+→ external APIs → context formatting → Claude stream) is wrapped in a span.
+Spans do two things:
+
+  1. Roll up into in-process latency histograms (one per stage), exposed in
+     Prometheus text format at GET /api/search/metrics.
+  2. Attach to the active request trace, so a finished query can be written
+     to the slow-query log with its full per-stage breakdown.
+
+Stage names are short and stable so dashboards don't break:
+    classify, entity_enrichment, embed, vector_sql, keyword_sql, rerank,
+    api.<SOURCE>, format_context, claude_ttft, claude_stream, total
+
+Usage:
+    from search_tracing import start_trace, span
+
+    trace = start_trace("search", query=query)
+    with trace.span("classify"):
+        plan = classify_query(query)
+    ...
+    trace.finish()
+
+    # Deep inside a helper (e.g. rag_search) — attaches to the active trace
+    with span("vector_sql"):
+        cur.execute(...)
+
+Slow-query log (optional):
+    SEARCH_SLOW_QUERY_SECONDS=8           # log traces slower than this
+    SEARCH_SLOW_QUERY_LOG=data/slow_queries.jsonl   # default path
+"""
+
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+# Histogram buckets in seconds — spans from sub-10ms SQL up to minute-long
+# landscape builds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "satyabio_search"
+
+_slow_threshold_env = os.environ.get("SEARCH_SLOW_QUERY_SECONDS", "")
+SLOW_QUERY_SECONDS = float(_slow_threshold_env) if _slow_threshold_env else None
+SLOW_QUERY_LOG = os.environ.get("SEARCH_SLOW_QUERY_LOG", "data/slow_queries.jsonl")
+
+
+# =============================================================================
+# Histograms
+# =============================================================================
+
+class Histogram:
+    """Cumulative latency histogram for one stage (Prometheus semantics)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.count += 1
+        self.sum += seconds
+        if error:
+            self.errors += 1
+        for i, upper in enumerate(self.buckets):
+            if seconds <= upper:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return [(upper_bound, cumulative_count), ...] excluding +Inf."""
+        out, running = [], 0
+        for upper, c in zip(self.buckets, self.counts):
+            running += c
+            out.append((upper, running))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile (upper bucket bound) — good enough for /metrics summaries."""
+        if not self.count:
+            return None
+        target = q * self.count
+        for upper, running in self.cumulative():
+            if running >= target:
+                return upper
+        return float("inf")
+
+
+_histograms: dict[str, Histogram] = {}
+_hist_lock = threading.Lock()
+
+
+def observe(stage: str, seconds: float, error: bool = False):
+    """Record one stage duration into its histogram."""
+    with _hist_lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.observe(seconds, error=error)
+
+
+def reset_metrics():
+    """Clear all histograms (tests / admin reset)."""
+    with _hist_lock:
+        _histograms.clear()
+
+
+def get_latency_summary() -> dict:
+    """JSON-friendly summary of every stage: count, mean, p50, p95, errors."""
+    with _hist_lock:
+        summary = {}
+        for stage, h in sorted(_histograms.items()):
+            summary[stage] = {
+                "count": h.count,
+                "mean": round(h.sum / h.count, 4) if h.count else None,
+                "p50": h.quantile(0.5),
+                "p95": h.quantile(0.95),
+                "errors": h.errors,
+            }
+        return summary
+
+
+def render_prometheus() -> str:
+    """Render all stage histograms in Prometheus text exposition format."""
+    name = f"{METRIC_PREFIX}_stage_seconds"
+    err_name = f"{METRIC_PREFIX}_stage_errors_total"
+    lines = [
+        f"# HELP {name} Latency of search pipeline stages in seconds.",
+        f"# TYPE {name} histogram",
+    ]
+    with _hist_lock:
+        snapshot = {k: (h.cumulative(), h.count, h.sum, h.errors) for k, h in sorted(_histograms.items())}
+
+    for stage, (cumulative, count, total, _errors) in snapshot.items():
+        for upper, running in cumulative:
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{upper!r}"}} {running}')
+        lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {total:.6f}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+
+    lines.append(f"# HELP {err_name} Search pipeline stages that raised an exception.")
+    lines.append(f"# TYPE {err_name} counter")
+    for stage, (_c, _n, _s, errors) in snapshot.items():
+        lines.append(f'{err_name}{{stage="{stage}"}} {errors}')
+
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# Request traces
+# =============================================================================
+
+_active_trace: contextvars.ContextVar = contextvars.ContextVar("search_trace", default=None)
+
+
+class Trace:
+    """All spans recorded for one search request."""
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.utcnow().isoformat()
+        self._t0 = time.perf_counter()
+        self.spans: list[dict] = []
+        self.total: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, error: bool = False, **attrs):
+        """Record a span that was timed manually (e.g. Claude time-to-first-token)."""
+        observe(stage, seconds, error=error)
+        entry = {"stage": stage, "seconds": round(seconds, 4)}
+        if error:
+            entry["error"] = True
+        if attrs:
+            entry.update(attrs)
+        with self._lock:
+            self.spans.append(entry)
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        """Time a block and make this trace the active one while it runs."""
+        token = _active_trace.set(self)
+        t0 = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - t0, error=error, **attrs)
+            _active_trace.reset(token)
+
+    def timing(self) -> dict:
+        """Per-stage seconds (summed when a stage ran more than once)."""
+        out: dict[str, float] = {}
+        with self._lock:
+            for s in self.spans:
+                out[s["stage"]] = round(out.get(s["stage"], 0.0) + s["seconds"], 3)
+        return out
+
+    def finish(self) -> float:
+        """Close the trace: record total latency and write the slow-query log."""
+        if self.total is None:
+            self.total = time.perf_counter() - self._t0
+            observe("total", self.total)
+            if SLOW_QUERY_SECONDS is not None and self.total >= SLOW_QUERY_SECONDS:
+                _write_slow_query(self)
+        return self.total
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "total": round(self.total, 3) if self.total is not None else None,
+            "attrs": self.attrs,
+            "spans": spans,
+        }
+
+
+def start_trace(name: str, **attrs) -> Trace:
+    """Create a new request trace."""
+    return Trace(name, **attrs)
+
+
+def current_trace() -> Optional[Trace]:
+    return _active_trace.get()
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """
+    Time a block. Always feeds the stage histogram; also attaches to the
+    active request trace when there is one.
+    """
+    trace = _active_trace.get()
+    if trace is not None:
+        with trace.span(stage, **attrs):
+            yield
+        return
+
+    t0 = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe(stage, time.perf_counter() - t0, error=error)
+
+
+def submit_traced(executor, stage: str, fn, *args, **kwargs):
+    """
+    executor.submit() that carries the active trace into the worker thread
+    and wraps the call in a span. ThreadPoolExecutor does not copy
+    contextvars on its own.
+    """
+    ctx = contextvars.copy_context()
+
+    def _run():
+        with span(stage):
+            return fn(*args, **kwargs)
+
+    return executor.submit(ctx.run, _run)
+
+
+# =============================================================================
+# Slow-query log
+# =============================================================================
+
+_slow_log_lock = threading.Lock()
+
+
+def _write_slow_query(trace: Trace):
+    entry = trace.to_dict()
+    print(f"  ⚠ Slow query ({entry['total']}s): {trace.attrs.get('query', '')[:80]}")
+    try:
+        os.makedirs(os.path.dirname(SLOW_QUERY_LOG) or ".", exist_ok=True)
+        with _slow_log_lock, open(SLOW_QUERY_LOG, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+    except Exception as e:
+        print(f"  Slow-query log write failed: {e}")
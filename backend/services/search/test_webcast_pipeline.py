@@ -160,6 +160,27 @@ def _():
             f"Chunk {c['chunk_index']} has {c['word_count']} words (limit ~{CHUNK_WORDS})"
 
 
+@test("plan_segments: cuts move to nearby silences and ranges overlap")
+def _():
+    from webcast_pipeline import plan_segments
+    plan = plan_segments(1000, [(290, 291), (610, 612)], target=300, overlap=2, search=30)
+    assert [r["cut_end"] for r in plan] == [290.5, 611.0, 1000]
+    assert plan[1]["start"] == 288.5 and plan[1]["end"] == 613.0
+    assert plan_segments(400, [], target=300)[0]["cut_end"] == 400  # short tail is not split off
+
+
+@test("stitch_segments: offsets timestamps and drops the overlap owned by a neighbour")
+def _():
+    from webcast_pipeline import plan_segments, stitch_segments
+    second = plan_segments(1000, [(290, 291), (610, 612)], target=300, overlap=2, search=30)[1]
+    segments = [{"start": 0, "end": 3, "text": " tail of range 0"},
+                {"start": 1, "end": 5, "text": "first words"},
+                {"start": 300, "end": 310, "text": "later"}]
+    stitched = stitch_segments(second, segments)
+    assert [s["text"] for s in stitched] == ["first words", "later"]
+    assert stitched[0]["start"] == 289.5 and stitched[1]["end"] == 598.5
+
+
 # ===========================================================================
 # 3. SECTION INFERENCE
 # ===========================================================================
@@ -26,6 +26,8 @@ Usage:
 from dataclasses import dataclass, field
 from typing import Optional
 
+from mention_tagger import MentionTagger
+
 
 @dataclass
 class EndpointDefinition:
@@ -643,13 +645,41 @@ def get_ta_config(ta_id: str) -> TherapeuticAreaConfig:
     return config
 
 
+# Indication-name tagger over _INDICATION_TA_MAP; register_indication_mapping
+# updates it in place (a new key is an incremental insert)
+_indication_tagger: Optional[MentionTagger] = None
+
+
+def _load_indication_tagger(tagger: MentionTagger):
+    tagger.set_source(
+        "indication_map", "indication",
+        ((key, ta_id, key) for key, ta_id in _INDICATION_TA_MAP.items()),
+        prefix=True,
+    )
+
+
+def _get_indication_tagger() -> MentionTagger:
+    global _indication_tagger
+    if _indication_tagger is None:
+        tagger = MentionTagger()
+        _load_indication_tagger(tagger)
+        _indication_tagger = tagger
+    return _indication_tagger
+
+
 def get_ta_config_for_indication(indication: str) -> Optional[TherapeuticAreaConfig]:
-    """Look up the therapeutic area for a given indication name."""
-    indication_lower = indication.lower()
-    for key, ta_id in _INDICATION_TA_MAP.items():
-        if key.lower() in indication_lower:
-            return _TA_REGISTRY[ta_id]
-    return None
+    """
+    Look up the therapeutic area for a given indication name. Keys match on
+    word starts ("melanoma" also hits "melanomas", "ALL" doesn't hit "small");
+    the first key in _INDICATION_TA_MAP order wins.
+    """
+    mention = _get_indication_tagger().first(indication or "", "indication")
+    return _TA_REGISTRY[mention.entity_id] if mention else None
+
+
+def list_indication_mappings() -> dict[str, str]:
+    """Indication name → TA id (a copy), e.g. for mention_tagger."""
+    return dict(_INDICATION_TA_MAP)
 
 
 def list_therapeutic_areas() -> list[str]:
@@ -674,3 +704,5 @@ def register_therapeutic_area(config: TherapeuticAreaConfig, aliases: list[str]
 def register_indication_mapping(indication: str, ta_id: str):
     """Map an indication name to a therapeutic area."""
     _INDICATION_TA_MAP[indication] = ta_id
+    if _indication_tagger is not None:
+        _load_indication_tagger(_indication_tagger)
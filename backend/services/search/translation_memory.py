@@ -0,0 +1,289 @@
+"""
+SatyaBio — Translation Memory
+
+Segment-level memory for global_asset_discovery's Claude translations.
+Regional IR pages, registry titles and patent abstracts repeat the same
+company names, drug codes and boilerplate sentences run after run; each
+sentence is translated once, stored, and reused from then on.
+
+What it does:
+  - split_segments(): sentence / line segments, keeping the separators so a
+    translated text is reassembled with its original layout
+  - segment_key(): one entry per (normalized segment, language pair, context)
+  - translate_many(): looks every segment up, sends only the misses to the
+    caller's batch translator — many short segments per LLM call, within
+    TRANSLATION_BATCH_SEGMENTS / TRANSLATION_BATCH_CHARS — and stores the results
+  - load_many() / save_many(): process memory first, then Neon (translation_memory table)
+
+Segments with nothing to translate never reach the translator: numbers,
+trial IDs and codes, and plain-ASCII fragments (drug codes, English company
+names) inside CJK / Korean text are copied through as they are.
+
+Usage:
+    import translation_memory
+
+    results = translation_memory.translate_many(
+        texts, "zh", "en", "clinical trial", translate_batch=my_llm_batch)
+    # translate_batch(segments, source_lang, target_lang, context)
+    #   -> list of {"translation": str, "entities": [...]} in segment order
+
+Environment:
+    NEON_DATABASE_URL            memory persists across processes when set
+    TRANSLATION_BATCH_SEGMENTS   max segments per translator call (default 40)
+    TRANSLATION_BATCH_CHARS      max source characters per translator call (default 6000)
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from typing import Callable
+
+try:
+    import psycopg2
+    import psycopg2.extras
+except ImportError:
+    psycopg2 = None
+
+DATABASE_URL = os.environ.get("NEON_DATABASE_URL", "")
+BATCH_SEGMENTS = int(os.environ.get("TRANSLATION_BATCH_SEGMENTS", 40))
+BATCH_CHARS = int(os.environ.get("TRANSLATION_BATCH_CHARS", 6000))
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS translation_memory (
+        segment_key VARCHAR(64) PRIMARY KEY,
+        source_lang VARCHAR(10),
+        target_lang VARCHAR(10),
+        context VARCHAR(100),
+        source_text TEXT NOT NULL,
+        translation TEXT NOT NULL,
+        entities JSONB DEFAULT '[]',
+        hit_count INTEGER DEFAULT 0,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    )
+"""
+
+# Sentence ends (CJK and Latin), then line breaks — the separator is captured
+_SPLIT = re.compile(r"([ \t]*\n\s*|(?<=[。！？!?；])[ \t]*|(?<=\.)[ \t]+)")
+_UNSPACED_LANGS = ("zh", "ja")
+_ASIAN = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯ᄀ-ᇿ]")
+
+_memory: dict[str, dict] = {}
+_table_ready = False
+_lock = threading.Lock()
+
+
+# =============================================================================
+# SEGMENTS
+# =============================================================================
+
+def normalize(segment: str) -> str:
+    """Form the memory matches on: NFKC (full-width → ASCII) and collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFKC", segment).split())
+
+
+def segment_key(segment: str, source_lang: str, target_lang: str, context: str) -> str:
+    raw = f"{source_lang}>{target_lang}|{context.strip().lower()}|{normalize(segment)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def split_segments(text: str) -> list[tuple[str, str]]:
+    """(segment, separator) pairs; "".join(s + sep) reproduces text."""
+    parts = _SPLIT.split(text)
+    pairs = []
+    for i in range(0, len(parts), 2):
+        sep = parts[i + 1] if i + 1 < len(parts) else ""
+        if parts[i] or sep:
+            pairs.append((parts[i], sep))
+    return pairs
+
+
+def needs_translation(segment: str, text: str) -> bool:
+    """False for segments copied through untranslated (see module docstring)."""
+    if not any(ch.isalpha() for ch in segment):
+        return False
+    if segment.isascii() and _ASIAN.search(text):
+        return False
+    return True
+
+
+# =============================================================================
+# TRANSLATE
+# =============================================================================
+
+def _batches(items: list[tuple[str, str]]):
+    batch, chars = [], 0
+    for key, segment in items:
+        if batch and (len(batch) >= BATCH_SEGMENTS or chars + len(segment) > BATCH_CHARS):
+            yield batch
+            batch, chars = [], 0
+        batch.append((key, segment))
+        chars += len(segment)
+    if batch:
+        yield batch
+
+
+def translate_many(texts: list[str], source_lang: str, target_lang: str, context: str,
+                   translate_batch: Callable) -> list[dict]:
+    """
+    Translate texts segment by segment, sending only segments the memory has
+    not seen to translate_batch.
+
+    Returns one dict per text: translated_text, entities (deduplicated over
+    its segments), segments_reused, segments_translated. Segments the
+    translator fails on are left in the original language and not stored.
+    """
+    layouts = []
+    pending: dict[str, str] = {}
+    for text in texts:
+        layout = []
+        for segment, sep in split_segments(text or ""):
+            key = segment_key(segment, source_lang, target_lang, context) \
+                if needs_translation(segment, text) else None
+            layout.append((segment, sep, key))
+            if key:
+                pending.setdefault(key, segment.strip())
+        layouts.append(layout)
+
+    found = load_many(list(pending))
+    misses = [(k, s) for k, s in pending.items() if k not in found]
+    fresh = {}
+    for batch in _batches(misses):
+        try:
+            out = translate_batch([s for _, s in batch], source_lang, target_lang, context)
+        except Exception as e:
+            print(f"  [Translation memory] Batch of {len(batch)} failed: {e}")
+            continue
+        for (key, segment), item in zip(batch, out or []):
+            if item and item.get("translation"):
+                fresh[key] = {"source_text": segment, "translation": item["translation"],
+                              "entities": item.get("entities") or []}
+    if fresh:
+        save_many(fresh, source_lang, target_lang, context)
+    entries = {**found, **fresh}
+
+    results = []
+    for layout in layouts:
+        pieces, entities, seen = [], [], set()
+        reused = translated = 0
+        for n, (segment, sep, key) in enumerate(layout):
+            entry = entries.get(key) if key else None
+            if entry is None:
+                pieces.append(segment + sep)
+                continue
+            reused += key in found
+            translated += key in fresh
+            lead = segment[:len(segment) - len(segment.lstrip())]
+            if not sep and n < len(layout) - 1 and target_lang not in _UNSPACED_LANGS:
+                sep = " "   # CJK sentences run together; translated ones need a space
+            pieces.append(lead + entry["translation"] + sep)
+            for ent in entry["entities"]:
+                marker = json.dumps(ent, sort_keys=True, ensure_ascii=False)
+                if marker not in seen:
+                    seen.add(marker)
+                    entities.append(ent)
+        results.append({"translated_text": "".join(pieces), "entities": entities,
+                        "segments_reused": reused, "segments_translated": translated})
+    return results
+
+
+# =============================================================================
+# PERSISTENCE — process memory, then Neon
+# =============================================================================
+
+def _get_conn():
+    if psycopg2 is None or not DATABASE_URL:
+        return None
+    try:
+        return psycopg2.connect(DATABASE_URL)
+    except Exception as e:
+        print(f"  [Translation memory] DB connect error: {e}")
+        return None
+
+
+def _ensure_table(conn) -> bool:
+    global _table_ready
+    if _table_ready:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA)
+        conn.commit()
+        _table_ready = True
+    except Exception as e:
+        print(f"  [Translation memory] Setup error: {e}")
+        conn.rollback()
+    return _table_ready
+
+
+def load_many(keys: list[str]) -> dict[str, dict]:
+    """key → {"source_text", "translation", "entities"} for the keys in memory."""
+    with _lock:
+        found = {k: _memory[k] for k in keys if k in _memory}
+    missing = [k for k in keys if k not in found]
+    if not missing:
+        return found
+
+    conn = _get_conn()
+    if not conn:
+        return found
+    try:
+        if not _ensure_table(conn):
+            return found
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                UPDATE translation_memory SET hit_count = hit_count + 1
+                WHERE segment_key = ANY(%s)
+                RETURNING segment_key, source_text, translation, entities
+            """, (missing,))
+            rows = cur.fetchall()
+        conn.commit()
+    except Exception as e:
+        print(f"  [Translation memory] Read error: {e}")
+        conn.rollback()
+        return found
+    finally:
+        conn.close()
+
+    loaded = {r["segment_key"]: {"source_text": r["source_text"], "translation": r["translation"],
+                                 "entities": r["entities"] or []} for r in rows}
+    with _lock:
+        _memory.update(loaded)
+    return {**found, **loaded}
+
+
+def save_many(entries: dict[str, dict], source_lang: str, target_lang: str, context: str):
+    """Store translated segments in memory and, when configured, in Neon."""
+    with _lock:
+        _memory.update(entries)
+
+    conn = _get_conn()
+    if not conn:
+        return
+    try:
+        if not _ensure_table(conn):
+            return
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO translation_memory
+                    (segment_key, source_lang, target_lang, context, source_text, translation, entities)
+                VALUES %s
+                ON CONFLICT (segment_key) DO UPDATE SET
+                    translation = EXCLUDED.translation,
+                    entities = EXCLUDED.entities
+            """, [(key, source_lang, target_lang, context[:100], e["source_text"], e["translation"],
+                   json.dumps(e["entities"], ensure_ascii=False)) for key, e in entries.items()])
+        conn.commit()
+    except Exception as e:
+        print(f"  [Translation memory] Write error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def clear_memory():
+    """Drop the in-process entries (the Neon copies are kept)."""
+    with _lock:
+        _memory.clear()
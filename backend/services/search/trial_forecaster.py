@@ -19,12 +19,13 @@ Version: 2.0.0 (Warpspeed-Quality)
 """
 
 import asyncio
-import copy
 import json
 import logging
 import os
+import threading
 import time
-from dataclasses import dataclass, field, asdict
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict, replace
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 from enum import Enum
@@ -44,9 +45,9 @@ except ImportError:
     SCIPY_AVAILABLE = False
 
 try:
-    import httpx
+    import ctgov_client
 except ImportError:
-    httpx = None
+    ctgov_client = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -144,6 +145,7 @@ class TrialDesign:
     control_type: str  # "placebo" or "active"
     inclusion_criteria_summary: str = ""
     exclusion_criteria_summary: str = ""
+    primary_completion: Optional[str] = None  # Expected primary readout
 
     def to_dict(self) -> Dict:
         """Serialize to dictionary for JSON output."""
@@ -156,6 +158,7 @@ class TrialDesign:
             "condition": self.condition,
             "intervention": self.intervention,
             "sponsor": self.sponsor,
+            "primary_completion": self.primary_completion,
         }
 
 
@@ -382,6 +385,13 @@ class ForecastResult:
     n_iterations: int = 50000
     computation_time_ms: float = 0.0
     parameters_used: Dict = field(default_factory=dict)
+    session_id: Optional[str] = None  # Pass to recompute_forecast() for slider reruns
+
+    # Achieved Monte Carlo precision (n_iterations above is the count actually run)
+    pos_standard_error: float = 0.0
+    target_standard_error: Optional[float] = None  # None = fixed iteration count
+    converged: bool = True  # False if the iteration cap was hit before the target SE
+    seed: Optional[int] = None  # Re-running with this seed reproduces the draws
 
     def to_dict(self) -> Dict:
         """Serialize to dictionary for JSON output."""
@@ -408,6 +418,11 @@ class ForecastResult:
             "trial_summary": self.trial_summary,
             "n_iterations": self.n_iterations,
             "computation_time_ms": self.computation_time_ms,
+            "session_id": self.session_id,
+            "pos_standard_error": self.pos_standard_error,
+            "target_standard_error": self.target_standard_error,
+            "converged": self.converged,
+            "seed": self.seed,
         }
 
 
@@ -416,33 +431,23 @@ class ForecastResult:
 # ============================================================================
 
 class TrialDataFetcher:
-    """Fetches clinical trial data from ClinicalTrials.gov API v2."""
-
-    BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
+    """
+    Fetches clinical trial data from ClinicalTrials.gov API v2.
 
-    def __init__(self):
-        """Initialize the fetcher."""
-        self.client = None
+    Requests go through the shared ctgov_client (pooled, rate-limited,
+    disk-cached), so repeat forecasts of the same trial don't refetch it.
+    """
 
-    async def _get_client(self) -> "httpx.AsyncClient":
-        """Get or create async HTTP client."""
-        if self.client is None and httpx is not None:
-            self.client = httpx.AsyncClient(timeout=30.0)
-        return self.client
+    BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
 
     async def fetch_by_nct_id(self, nct_id: str) -> Optional[TrialDesign]:
         """Fetch a single trial by NCT ID."""
-        if httpx is None:
-            logger.warning("httpx not available; skipping API call")
+        if ctgov_client is None:
+            logger.warning("ctgov_client not available; skipping API call")
             return None
 
         try:
-            client = await self._get_client()
-            url = f"{self.BASE_URL}/{nct_id}"
-            response = await client.get(url)
-            response.raise_for_status()
-
-            data = response.json()
+            data = await ctgov_client.aget_json(nct_id=nct_id)
             trial_data = data.get("protocolSection", {})
             return self._parse_trial_data(trial_data)
         except Exception as e:
@@ -453,13 +458,11 @@ class TrialDataFetcher:
         self, drug_name: str, condition: Optional[str] = None, limit: int = 5
     ) -> List[TrialDesign]:
         """Search for trials by drug name and optionally condition."""
-        if httpx is None:
-            logger.warning("httpx not available; returning empty list")
+        if ctgov_client is None:
+            logger.warning("ctgov_client not available; returning empty list")
             return []
 
         try:
-            client = await self._get_client()
-
             # ClinicalTrials.gov API v2 uses plain text for query.term
             # (not field:value syntax like v1)
             query = drug_name
@@ -475,10 +478,7 @@ class TrialDataFetcher:
             active_statuses = "RECRUITING,ENROLLING_BY_INVITATION,ACTIVE_NOT_RECRUITING,NOT_YET_RECRUITING"
             params["filter.overallStatus"] = active_statuses
 
-            response = await client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = await ctgov_client.aget_json(params)
             trials = []
             for study in data.get("studies", []):
                 trial_data = study.get("protocolSection", {})
@@ -490,9 +490,7 @@ class TrialDataFetcher:
             if not trials:
                 logger.info(f"No active trials found for '{drug_name}', searching all statuses...")
                 params.pop("filter.overallStatus", None)
-                response = await client.get(self.BASE_URL, params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = await ctgov_client.aget_json(params)
                 for study in data.get("studies", []):
                     trial_data = study.get("protocolSection", {})
                     trial = self._parse_trial_data(trial_data)
@@ -508,12 +506,11 @@ class TrialDataFetcher:
         self, trial: TrialDesign, limit: int = 5
     ) -> List[ComparatorTrial]:
         """Find completed Phase 3 trials with same condition for effect estimation."""
-        if httpx is None:
-            logger.warning("httpx not available; returning empty list")
+        if ctgov_client is None:
+            logger.warning("ctgov_client not available; returning empty list")
             return []
 
         try:
-            client = await self._get_client()
             query = f"condition:{trial.condition}"
 
             params = {
@@ -523,10 +520,7 @@ class TrialDataFetcher:
                 "pageSize": limit,
             }
 
-            response = await client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = await ctgov_client.aget_json(params)
             comparators = []
             for study in data.get("studies", []):
                 comparator = self._parse_comparator_trial(study)
@@ -609,6 +603,7 @@ class TrialDataFetcher:
                 estimated_completion=status_info.get("completionDateStruct", {}).get("date", None),
                 design_type="superiority",
                 control_type="placebo",
+                primary_completion=status_info.get("primaryCompletionDateStruct", {}).get("date", None),
             )
             return trial
         except Exception as e:
@@ -653,9 +648,8 @@ class TrialDataFetcher:
             return None
 
     async def close(self):
-        """Close the HTTP client."""
-        if self.client:
-            await self.client.aclose()
+        """No-op: the shared CT.gov session is process-wide and stays open."""
+        return None
 
 
 # ============================================================================
@@ -962,6 +956,111 @@ class PowerCalculator:
 # MONTE CARLO SIMULATOR - 6-STAGE WARPSPEED PIPELINE
 # ============================================================================
 
+# Stage 2-4 rows kept per forecast session: the base run plus its 8
+# sensitivity scenarios, for the current and the previous slider position.
+FORECAST_STAGE_MEMO_ROWS = 18
+
+# Iterations per random-draw chunk. Also the adaptive-precision step: the PoS
+# standard error is checked after each chunk.
+FORECAST_CHUNK_SIZE = int(os.environ.get("FORECAST_CHUNK_SIZE", 10000))
+
+
+def pos_standard_error(successes: float, n: int) -> float:
+    """
+    Agresti-Coull standard error of a PoS estimate (successes out of n).
+
+    Unlike the Wald sqrt(p(1-p)/n) it stays positive at p = 0 or 1, so an
+    adaptive run can't stop on one chunk that happened to be all successes.
+    """
+    n_adj = n + 4.0
+    p_adj = (successes + 2.0) / n_adj
+    return float(np.sqrt(p_adj * (1 - p_adj) / n_adj))
+
+# Tornado-chart scenarios: (parameter, label, overrides on the base params)
+SENSITIVITY_SCENARIOS = [
+    ("effect_scale", "0.8x", {"effect_scale": 0.8}),
+    ("effect_scale", "1.2x", {"effect_scale": 1.2}),
+    ("alpha", "0.01", {"alpha": 0.01}),
+    ("alpha", "0.05", {"alpha": 0.05}),
+    ("discontinuation_rate", "5%", {"discontinuation_rate": 0.05}),
+    ("discontinuation_rate", "20%", {"discontinuation_rate": 0.20}),
+    ("benefit_timing", "immediate", {"benefit_timing": "immediate"}),
+    ("benefit_timing", "delayed", {"benefit_timing": "delayed"}),
+]
+
+
+class RandomDraws:
+    """
+    Common random numbers for the pipeline, drawn in reproducible chunks.
+
+    Every random number a forecast needs is drawn up front as a standardized
+    value; parameter-dependent transforms (effect scale, dilution, alpha, ...)
+    are applied afterwards, so any number of parameter scenarios can share
+    them. Stages 1-2 (anchor selection and the unscaled effect draw) don't
+    depend on any adjustable parameter, so they are computed here too.
+
+    Chunk k comes from its own np.random.Generator seeded by (seed, k), so
+    the first n draws are identical however far the draws are later
+    extended — an adaptive run stops at n, a rerun in another worker
+    process regenerates exactly the same prefix. Standardized draws are
+    stored as float32; derived effects stay float64.
+    """
+
+    def __init__(self, blended_effect: BlendedEffect, seed: Optional[int] = None,
+                 chunk_size: int = FORECAST_CHUNK_SIZE):
+        self.blended_effect = blended_effect
+        self.seed = int(np.random.SeedSequence().entropy % 2**63) if seed is None else int(seed)
+        self.chunk_size = chunk_size
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._chunks) * self.chunk_size
+
+    def _draw_chunk(self, index: int) -> Dict[str, np.ndarray]:
+        rng = np.random.default_rng([self.seed, index])
+        n = self.chunk_size
+        blended = self.blended_effect
+        chunk = {
+            "anchor_indices": rng.choice(len(blended.anchors_used), size=n, p=blended.weights),
+            "effect_z": rng.standard_normal(n, dtype=np.float32),
+            "onset": rng.beta(3, 1.5, n).astype(np.float32),
+            "fraction_z": rng.standard_normal(n, dtype=np.float32),
+            "control_z": rng.standard_normal(n, dtype=np.float32),
+            "test_z": rng.standard_normal(n, dtype=np.float32),
+            "observed_z": rng.standard_normal(n, dtype=np.float32),
+        }
+
+        # ---- STAGES 1-2: ANCHOR SELECTION + EFFECT DRAW ----
+        base_effects = np.zeros(n)
+        for i, anchor in enumerate(blended.anchors_used):
+            mask = chunk["anchor_indices"] == i
+            if not mask.any():
+                continue
+            z = chunk["effect_z"][mask].astype(np.float64)
+            if anchor.distribution_type == "lognormal":
+                base_effects[mask] = np.exp(np.log(anchor.median_effect) + anchor.standard_error * z)
+            else:  # normal
+                base_effects[mask] = anchor.median_effect + anchor.standard_error * z
+        chunk["base_effects"] = base_effects
+        return chunk
+
+    def ensure(self, n: int):
+        """Extend the draws (whole chunks) until at least n are available."""
+        if len(self) >= n:
+            return
+        while len(self) < n:
+            self._chunks.append(self._draw_chunk(len(self._chunks)))
+        self._arrays = {
+            name: np.concatenate([c[name] for c in self._chunks]) for name in self._chunks[0]
+        }
+
+    def view(self, n: int, start: int = 0) -> Dict[str, np.ndarray]:
+        """Draws [start, n) as a dict of arrays (extending if needed)."""
+        self.ensure(n)
+        return {name: arr[start:n] for name, arr in self._arrays.items()}
+
+
 class MonteCarloSimulator:
     """
     Warpspeed-quality 6-stage Monte Carlo pipeline for clinical trial forecasting.
@@ -973,13 +1072,38 @@ class MonteCarloSimulator:
     Stage 5: STATISTICAL TESTING — Generate test statistic and determine significance
     Stage 6: OUTCOME RECORDING — Record observed effects with winner's curse
 
-    All 50,000+ iterations run as vectorized numpy array operations (~2-3 seconds).
+    All 50,000+ iterations run as vectorized numpy array operations (well under
+    a second with sensitivity; see forecast_benchmark.py for per-stage numbers).
+    Parameter scenarios (sensitivity analysis) add a leading array axis over
+    one shared set of random draws.
+
+    Adaptive precision: with `target_se`, iterations are drawn `chunk_size`
+    at a time and the run stops once the PoS standard error (Agresti-Coull,
+    see pos_standard_error) falls below the target (n_iterations is then the
+    cap). Trials far from the decision threshold converge in one or two
+    chunks, and the chunk results are reused for the final outputs.
     """
 
-    def __init__(self, n_iterations: int = 50000):
-        """Initialize with number of Monte Carlo iterations."""
+    def __init__(
+        self,
+        n_iterations: int = 50000,
+        target_se: Optional[float] = None,
+        chunk_size: int = FORECAST_CHUNK_SIZE,
+        seed: Optional[int] = None,
+    ):
+        """Initialize with number of Monte Carlo iterations (the cap in adaptive mode)."""
         self.n_iterations = n_iterations
-        logger.info(f"Initialized MonteCarloSimulator with {n_iterations} vectorized iterations")
+        self.target_se = target_se
+        self.chunk_size = chunk_size
+        self.seed = seed
+        logger.info(
+            f"Initialized MonteCarloSimulator with {n_iterations} vectorized iterations"
+            + (f" (adaptive, target SE {target_se})" if target_se else "")
+        )
+
+    def new_draws(self, blended_effect: BlendedEffect) -> RandomDraws:
+        """Fresh seeded draws sized for this simulator's chunking."""
+        return RandomDraws(blended_effect, seed=self.seed, chunk_size=self.chunk_size)
 
     def run_simulation(
         self,
@@ -989,6 +1113,8 @@ class MonteCarloSimulator:
         endpoint_model: EndpointModel,
         params: SimulationParams,
         _skip_sensitivity: bool = False,
+        draws: Optional[RandomDraws] = None,
+        memo: Optional["OrderedDict"] = None,
     ) -> ForecastResult:
         """
         Run complete 6-stage Monte Carlo simulation.
@@ -999,7 +1125,10 @@ class MonteCarloSimulator:
             event_projection: Expected event accrual model
             endpoint_model: Endpoint-specific parameters
             params: Simulation parameters (adjustable)
-            _skip_sensitivity: Internal flag to prevent recursion in mini-sims
+            _skip_sensitivity: Skip the batched sensitivity scenarios
+            draws: Seeded draws from an earlier run of the same trial (a
+                   ForecastSession); drawn fresh from self.seed if omitted
+            memo: Stage 2-4 cache from that session (see _simulate_scenarios)
 
         Returns:
             ForecastResult with all outputs
@@ -1007,126 +1136,43 @@ class MonteCarloSimulator:
         start_time = time.time()
         logger.info("Starting 6-stage Monte Carlo simulation...")
 
-        # ---- STAGE 1: ANCHOR SELECTION ----
-        # Draw which anchor to use for each iteration (mixture model)
-        anchor_indices = np.random.choice(
-            len(blended_effect.anchors_used),
-            size=self.n_iterations,
-            p=blended_effect.weights,
-        )
-        logger.info(f"  Stage 1: Anchor selection complete ({self.n_iterations} iterations)")
+        # One shared set of random draws (common random numbers). The base
+        # forecast and every sensitivity scenario are evaluated on the same
+        # draws, so scenario deltas reflect the parameter change, not noise.
+        if draws is None:
+            draws = self.new_draws(blended_effect)
 
-        # ---- STAGE 2: EFFECT DRAW ----
-        # For each iteration, draw from the selected anchor's distribution
-        true_effects = np.zeros(self.n_iterations)
-        for i, anchor in enumerate(blended_effect.anchors_used):
-            mask = anchor_indices == i
-            n_draws = mask.sum()
-            if n_draws > 0:
-                if anchor.distribution_type == "lognormal":
-                    true_effects[mask] = np.random.lognormal(
-                        np.log(anchor.median_effect),
-                        anchor.standard_error,
-                        n_draws,
-                    )
-                else:  # normal
-                    true_effects[mask] = np.random.normal(
-                        anchor.median_effect,
-                        anchor.standard_error,
-                        n_draws,
-                    )
+        # ---- STAGES 1-5 (vectorized; scenario axis of length 1 here) ----
+        n, sim = self._iterations_needed(
+            trial, blended_effect, event_projection, endpoint_model, params, draws, memo,
+        )
+        draws_n = draws.view(n)
+        if sim is None:
+            sim = self._simulate_scenarios(
+                trial, blended_effect, event_projection, endpoint_model, [params], draws_n, memo,
+            )
+        anchor_indices = draws_n["anchor_indices"]
+        true_effects = sim["true_effects"][0]
+        final_effects = sim["final_effects"][0]
+        total_events = sim["total_events"][0]
+        is_significant = sim["is_significant"][0]
 
-        # Apply user's effect scale
-        true_effects = true_effects * params.effect_scale
+        logger.info(f"  Stage 1: Anchor selection complete ({n} iterations)")
         logger.info(f"  Stage 2: Effect draws complete (median={np.median(true_effects):.3f})")
-
-        # ---- STAGE 3: ADJUSTMENTS ----
-        # When anchors are pre-adjusted (Warpspeed-style), they already
-        # incorporate timing delays and dilution. Skip re-applying.
         if params.anchors_pre_adjusted:
-            final_effects = true_effects
             logger.info(f"  Stage 3: Skipped (anchors are pre-adjusted ITT-level estimates)")
         else:
-            # 3a. Benefit timing adjustment (from class-specific data)
-            adjusted_effects = self._apply_benefit_timing(
-                true_effects, params.benefit_timing,
-                event_projection.followup_months / 12.0
-            )
-            logger.info(f"  Stage 3a: Benefit timing applied")
-
-            # 3b. Treatment dilution (more realistic than simple multiplication)
-            diluted_effects = self._apply_realistic_dilution(
-                adjusted_effects,
-                params.discontinuation_rate,
-                event_projection.followup_months / 12.0,
-            )
-            logger.info(f"  Stage 3b: Treatment dilution applied")
-
-            # 3c. Crossover contamination
-            if params.crossover_rate > 0:
-                crossover_factor = 1 + params.crossover_rate * 0.5
-                diluted_effects = diluted_effects * crossover_factor
-                diluted_effects = np.minimum(diluted_effects, 1.05)
-
-            # 3d. Composite endpoint adjustment (if applicable)
-            if endpoint_model.composite_components:
-                final_effects = self._apply_composite_adjustment(
-                    diluted_effects,
-                    endpoint_model.component_weights,
-                )
-            else:
-                final_effects = diluted_effects
             logger.info(f"  Stage 3: Adjustments complete")
-
-        # ---- STAGE 4: EVENT ACCRUAL ----
-        # Draw control event rate with uncertainty
-        control_rate = np.random.normal(
-            event_projection.annual_control_event_rate,
-            event_projection.annual_control_event_rate_se,
-            self.n_iterations,
-        )
-        control_rate = np.clip(control_rate, 0.01, 0.30)
-
-        trial_years = event_projection.followup_months / 12.0
-        n_per_arm = trial.target_enrollment // 2
-
-        # Expected events using exponential model
-        control_events = n_per_arm * (1 - np.exp(-control_rate * trial_years))
-        treatment_events = n_per_arm * (1 - np.exp(-control_rate * final_effects * trial_years))
-        total_events = control_events + treatment_events
-
-        # Gate: respect protocol-specified event target (±10%)
-        if event_projection.total_events_expected > 0:
-            total_events = np.clip(
-                total_events,
-                event_projection.total_events_expected * 0.9,
-                event_projection.total_events_expected * 1.1,
-            )
-
         logger.info(f"  Stage 4: Event accrual (median={np.median(total_events):.0f} events)")
-
-        # ---- STAGE 5: STATISTICAL TESTING ----
-        # Calculate test statistic based on endpoint type
-        is_significant = self._statistical_test(
-            control_events,
-            treatment_events,
-            final_effects,
-            total_events,
-            endpoint_model.endpoint_type,
-            params.alpha,
-            params.expected_mean_control,
-            endpoint_model.measurement_noise_sd,
-        )
         logger.info(f"  Stage 5: Statistical testing complete")
 
         probability_of_success = np.mean(is_significant)
+        pos_se = pos_standard_error(float(is_significant.sum()), n)
 
         # ---- STAGE 6: OUTCOME RECORDING (Winner's Curse) ----
         # Add sampling noise to true effect
-        observed_log_hr = np.log(final_effects) + np.random.normal(
-            0,
-            1.0 / np.sqrt(np.maximum(total_events / 4, 1)),
-            self.n_iterations,
+        observed_log_hr = np.log(final_effects) + draws_n["observed_z"] / np.sqrt(
+            np.maximum(total_events / 4, 1)
         )
         observed_effects = np.exp(observed_log_hr)
 
@@ -1183,12 +1229,12 @@ class MonteCarloSimulator:
         )
 
         # ---- SENSITIVITY ANALYSIS ----
-        # Skip sensitivity in mini-simulations to prevent infinite recursion
         if _skip_sensitivity:
             sensitivity = {}
         else:
             sensitivity = self._calculate_sensitivity_with_simulations(
-                trial, blended_effect, event_projection, endpoint_model, params
+                trial, blended_effect, event_projection, endpoint_model, params,
+                draws=draws_n, memo=memo,
             )
 
         # ---- RISK FACTOR DETECTION ----
@@ -1223,9 +1269,13 @@ class MonteCarloSimulator:
             anchor_weights=blended_effect.weights,
             thesis_summary=[],
             trial_summary=trial.to_dict(),
-            n_iterations=self.n_iterations,
+            n_iterations=n,
             computation_time_ms=computation_time_ms,
             parameters_used=params.to_dict(),
+            pos_standard_error=float(pos_se),
+            target_standard_error=self.target_se,
+            converged=self.target_se is None or pos_se <= self.target_se,
+            seed=draws.seed,
         )
 
         logger.info(
@@ -1234,89 +1284,211 @@ class MonteCarloSimulator:
         )
         return result
 
-    @staticmethod
-    def _apply_benefit_timing(
-        true_effects: np.ndarray,
-        benefit_timing: str,
-        trial_years: float,
-    ) -> np.ndarray:
+    def _iterations_needed(
+        self,
+        trial: TrialDesign,
+        blended_effect: BlendedEffect,
+        event_projection: EventProjection,
+        endpoint_model: EndpointModel,
+        params: SimulationParams,
+        draws: RandomDraws,
+        memo: Optional["OrderedDict"] = None,
+    ) -> Tuple[int, Optional[Dict[str, np.ndarray]]]:
         """
-        Apply benefit timing adjustment based on class-specific data.
-
-        Examples:
-        - CETP inhibitors: Year 1 HR ~0.98, Year 3+ HR ~0.85
-        - GLP-1 RA: Immediate effect
-        - Immunotherapy: Delayed, increasing over time
-
-        Args:
-            true_effects: Array of true hazard ratios
-            benefit_timing: "immediate", "base" (gradual), or "delayed"
-            trial_years: Duration of follow-up
+        How many iterations this run uses, and the base scenario's stage 1-5
+        arrays over them if they were already simulated.
 
-        Returns:
-            Adjusted effects
+        Fixed mode: n_iterations (nothing simulated yet). Adaptive mode:
+        evaluate the base scenario chunk by chunk until pos_standard_error
+        <= target_se or the n_iterations cap is reached, and return the
+        chunks joined (their stage 2-4 rows also go into `memo`).
         """
-        if benefit_timing == "immediate":
-            return true_effects
-
-        elif benefit_timing == "delayed":
-            # Delayed benefit: effect increases over time
-            # Model as: HR(t) = 1 - (1 - HR_true) * t / max_time
-            # Average over trial duration
-            time_factor = np.minimum(trial_years / 3.0, 1.0)  # Reach full effect by year 3
-            adjusted = 1 - (1 - true_effects) * time_factor
-            return adjusted
-
-        else:  # "base" (gradual)
-            # Gradual benefit with heterogeneity
-            # Add uncertainty in benefit realization
-            onset_factor = np.random.beta(3, 1.5, len(true_effects))
-            adjusted = 1 - (1 - true_effects) * onset_factor
-            return adjusted
+        if not self.target_se:
+            return self.n_iterations, None
+
+        n, successes, chunks = 0, 0.0, []
+        while n < self.n_iterations:
+            end = min(n + self.chunk_size, self.n_iterations)
+            chunk = self._simulate_scenarios(
+                trial, blended_effect, event_projection, endpoint_model,
+                [params], draws.view(end, start=n),
+            )
+            chunks.append(chunk)
+            successes += float(chunk["is_significant"].sum())
+            n = end
+            if pos_standard_error(successes, n) <= self.target_se:
+                break
+        logger.info(f"  Adaptive: {n} iterations, PoS SE {pos_standard_error(successes, n):.4f}")
+
+        sim = {name: np.concatenate([c[name] for c in chunks], axis=1) for name in chunks[0]}
+        if memo is not None:
+            key = (n,) + self._accrual_key(params)
+            memo[key] = {name: arr[0] for name, arr in sim.items() if name != "is_significant"}
+            while len(memo) > FORECAST_STAGE_MEMO_ROWS:
+                memo.popitem(last=False)
+        return n, sim
 
     @staticmethod
-    def _apply_realistic_dilution(
-        effects: np.ndarray,
-        annual_discontinuation_rate: float,
-        trial_years: float,
-    ) -> np.ndarray:
-        """
-        Apply more realistic treatment dilution accounting for time-on-treatment.
+    def _accrual_key(p: SimulationParams) -> tuple:
+        """The parameters stages 2-4 depend on (alpha only enters at stage 5)."""
+        return (p.effect_scale, p.anchors_pre_adjusted, p.benefit_timing,
+                p.discontinuation_rate, p.crossover_rate)
 
-        Instead of simple multiplication, models as:
-        HR_diluted = 1 - fraction_on_treatment * (1 - HR_true)
+    @staticmethod
+    def _simulate_accrual(
+        trial: TrialDesign,
+        event_projection: EventProjection,
+        endpoint_model: EndpointModel,
+        scenarios: List[SimulationParams],
+        draws: Dict[str, np.ndarray],
+    ) -> Dict[str, np.ndarray]:
+        """Stages 2-4 (effect scale → adjustments → event accrual) as (n_scenarios, n) arrays."""
+        def column(values):
+            return np.asarray(values, dtype=float)[:, None]
 
-        This reflects that discontinuation gradually erodes the treatment effect.
+        # Apply user's effect scale
+        true_effects = draws["base_effects"][None, :] * column([p.effect_scale for p in scenarios])
 
-        Args:
-            effects: Array of true effects
-            annual_discontinuation_rate: Annual discontinuation rate
-            trial_years: Duration of trial
+        # ---- STAGE 3: ADJUSTMENTS ----
+        # Pre-adjusted (Warpspeed-style) anchors already include timing delays
+        # and dilution, so those scenarios skip this stage.
+        pre_adjusted = np.array([p.anchors_pre_adjusted for p in scenarios])[:, None]
+        if pre_adjusted.all():
+            final_effects = true_effects
+        else:
+            trial_years = event_projection.followup_months / 12.0
+
+            # 3a. Benefit timing (class-specific: CETP inhibitors HR ~0.98 in
+            # year 1 → ~0.85 by year 3; GLP-1 RA immediate; IO delayed).
+            #   immediate: full effect from day one
+            #   delayed:   HR(t) = 1 - (1 - HR_true) * t / 3y, averaged over follow-up
+            #   base:      gradual onset with heterogeneity, Beta(3, 1.5) per iteration
+            timing = np.array([p.benefit_timing for p in scenarios])[:, None]
+            onset = np.where(
+                timing == "immediate", 1.0,
+                np.where(timing == "delayed", min(trial_years / 3.0, 1.0), draws["onset"][None, :]),
+            )
+            adjusted = 1 - (1 - true_effects) * onset
 
-        Returns:
-            Diluted effects
-        """
-        if annual_discontinuation_rate == 0:
-            return effects.copy()
-
-        # Fraction of patient-time on treatment (exponential decay)
-        # fraction_on_treatment = (1 - exp(-rate * T)) / (rate * T)
-        fraction_on_treatment = (
-            (1 - np.exp(-annual_discontinuation_rate * trial_years))
-            / (annual_discontinuation_rate * trial_years)
+            # 3b. Treatment dilution: HR_diluted = 1 - f * (1 - HR), where f is
+            # the fraction of patient-time on treatment under exponential
+            # discontinuation, (1 - exp(-r*T)) / (r*T), with ±0.03 uncertainty.
+            rate = column([p.discontinuation_rate for p in scenarios])
+            safe_rate = np.where(rate > 0, rate, 1.0)
+            on_treatment = (1 - np.exp(-safe_rate * trial_years)) / (safe_rate * trial_years)
+            fraction = np.clip(on_treatment + 0.03 * draws["fraction_z"][None, :], 0.5, 1.0)
+            diluted = np.where(rate > 0, 1 - fraction * (1 - adjusted), adjusted)
+
+            # 3c. Crossover contamination
+            crossover = column([p.crossover_rate for p in scenarios])
+            diluted = np.where(
+                crossover > 0, np.minimum(diluted * (1 + crossover * 0.5), 1.05), diluted,
+            )
+
+            # 3d. Composite endpoint adjustment (if applicable)
+            if endpoint_model.composite_components:
+                diluted = MonteCarloSimulator._apply_composite_adjustment(
+                    diluted, endpoint_model.component_weights,
+                )
+            final_effects = np.where(pre_adjusted, true_effects, diluted)
+
+        # ---- STAGE 4: EVENT ACCRUAL ----
+        control_rate = (
+            event_projection.annual_control_event_rate
+            + event_projection.annual_control_event_rate_se * draws["control_z"]
         )
+        control_rate = np.clip(control_rate, 0.01, 0.30)[None, :]
 
-        # Add uncertainty around expected fraction
-        fraction_draws = np.random.normal(
-            fraction_on_treatment,
-            0.03,
-            len(effects),
+        trial_years = event_projection.followup_months / 12.0
+        n_per_arm = trial.target_enrollment // 2
+
+        # Expected events using exponential model
+        control_events = np.broadcast_to(
+            n_per_arm * (1 - np.exp(-control_rate * trial_years)), final_effects.shape,
         )
-        fraction_draws = np.clip(fraction_draws, 0.5, 1.0)
+        treatment_events = n_per_arm * (1 - np.exp(-control_rate * final_effects * trial_years))
+        total_events = control_events + treatment_events
 
-        # Diluted effect
-        diluted = 1 - fraction_draws * (1 - effects)
-        return diluted
+        # Gate: respect protocol-specified event target (±10%)
+        if event_projection.total_events_expected > 0:
+            total_events = np.clip(
+                total_events,
+                event_projection.total_events_expected * 0.9,
+                event_projection.total_events_expected * 1.1,
+            )
+
+        return {
+            "true_effects": true_effects,
+            "final_effects": final_effects,
+            "control_events": control_events,
+            "treatment_events": treatment_events,
+            "total_events": total_events,
+        }
+
+    @staticmethod
+    def _simulate_scenarios(
+        trial: TrialDesign,
+        blended_effect: BlendedEffect,
+        event_projection: EventProjection,
+        endpoint_model: EndpointModel,
+        scenarios: List[SimulationParams],
+        draws: Dict[str, np.ndarray],
+        memo: Optional["OrderedDict"] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Stages 1-5 for several parameter sets at once.
+
+        Every array is shaped (n_scenarios, n_iterations); scenario-level
+        parameters are broadcast down the first axis over the shared draws.
+
+        With a `memo` (a forecast session's stage cache), stage 2-4 rows are
+        reused for any scenario whose upstream parameters were already
+        simulated — an alpha change only reruns stage 5.
+        """
+        n = len(draws["effect_z"])
+        keys = [(n,) + MonteCarloSimulator._accrual_key(p) for p in scenarios]
+        rows: Dict[tuple, Dict[str, np.ndarray]] = {}
+        if memo is not None:
+            for key in keys:
+                if key in memo:
+                    memo.move_to_end(key)
+                    rows[key] = memo[key]
+
+        missing = [p for p, key in zip(scenarios, keys) if key not in rows]
+        if missing:
+            accrual = MonteCarloSimulator._simulate_accrual(
+                trial, event_projection, endpoint_model, missing, draws,
+            )
+            for i, p in enumerate(missing):
+                key = (n,) + MonteCarloSimulator._accrual_key(p)
+                rows[key] = {name: arr[i] for name, arr in accrual.items()}
+                if memo is not None:
+                    memo[key] = rows[key]
+                    while len(memo) > FORECAST_STAGE_MEMO_ROWS:
+                        memo.popitem(last=False)
+
+        sim = {
+            name: np.stack([rows[key][name] for key in keys])
+            for name in ("true_effects", "final_effects", "control_events",
+                         "treatment_events", "total_events")
+        }
+
+        def column(values):
+            return np.asarray(values, dtype=float)[:, None]
+
+        # ---- STAGE 5: STATISTICAL TESTING ----
+        sim["is_significant"] = MonteCarloSimulator._statistical_test(
+            sim["control_events"],
+            sim["treatment_events"],
+            sim["final_effects"],
+            sim["total_events"],
+            endpoint_model.endpoint_type,
+            column([p.alpha for p in scenarios]),
+            column([p.expected_mean_control for p in scenarios]),
+            endpoint_model.measurement_noise_sd,
+            noise=draws["test_z"],
+        )
+        return sim
 
     @staticmethod
     def _apply_composite_adjustment(
@@ -1365,6 +1537,7 @@ class MonteCarloSimulator:
         alpha: float,
         expected_mean_control: float,
         measurement_noise_sd: float,
+        noise: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """
         Perform statistical test based on endpoint type.
@@ -1382,11 +1555,16 @@ class MonteCarloSimulator:
             alpha: Significance level
             expected_mean_control: Expected mean in control (for continuous)
             measurement_noise_sd: Measurement noise SD (for continuous)
+            noise: Standard-normal sampling noise (drawn fresh if omitted).
+                   alpha / expected_mean_control may be (n_scenarios, 1)
+                   arrays broadcast against the per-iteration inputs.
 
         Returns:
             Boolean array of significance
         """
         z_critical = stats.norm.ppf(1 - alpha)
+        if noise is None:
+            noise = np.random.standard_normal(np.shape(hazard_ratios))
 
         if endpoint_type == EndpointType.TIME_TO_EVENT:
             # Log-rank test
@@ -1395,7 +1573,7 @@ class MonteCarloSimulator:
             noncentrality = np.sqrt(total_events / 4) * np.abs(log_hr)
 
             # Z-score with sampling noise
-            z_scores = noncentrality + np.random.standard_normal(len(noncentrality))
+            z_scores = noncentrality + noise
             is_significant = z_scores > z_critical
 
         elif endpoint_type == EndpointType.BINARY:
@@ -1410,7 +1588,7 @@ class MonteCarloSimulator:
                          treatment_prop * (1 - treatment_prop) / n_total)
             se = np.maximum(se, 0.001)
 
-            z_scores = diff / se + np.random.standard_normal(len(diff)) * 0.1
+            z_scores = diff / se + noise * 0.1
             is_significant = z_scores > z_critical
 
         else:  # CONTINUOUS
@@ -1497,10 +1675,17 @@ class MonteCarloSimulator:
         event_projection: EventProjection,
         endpoint_model: EndpointModel,
         params: SimulationParams,
+        draws: Optional[Dict[str, np.ndarray]] = None,
+        memo: Optional["OrderedDict"] = None,
     ) -> Dict[str, Dict[str, float]]:
         """
-        Perform sensitivity analysis by running mini-simulations (5000 iterations each).
-        This gives ACTUAL PoSS at parameter extremes, not linear approximations.
+        Sensitivity / tornado analysis: ACTUAL PoSS at parameter extremes,
+        not linear approximations.
+
+        All SENSITIVITY_SCENARIOS run as one batched simulation over the same
+        random draws as the base forecast (common random numbers), so each
+        delta isolates the parameter change and the whole analysis costs
+        about as much as one extra simulation per scenario row.
 
         Args:
             trial: Trial design
@@ -1508,69 +1693,26 @@ class MonteCarloSimulator:
             event_projection: Event projection
             endpoint_model: Endpoint model
             params: Base parameters
+            draws: Shared draws from the base run (fresh draws if omitted)
+            memo: Session stage cache, so unchanged scenario rows are reused
 
         Returns:
             Dict of sensitivity results
         """
-        sensitivity = {}
-        mini_n = 5000  # Fewer iterations for speed
-        logger.info("Running sensitivity analysis with mini-simulations...")
-
-        # Effect scale: 0.8x and 1.2x
-        effect_sensitivity = {}
-        for scale_label, scale_val in [("0.8x", 0.8), ("1.2x", 1.2)]:
-            test_params = copy.deepcopy(params)
-            test_params.effect_scale = scale_val
-            mini_sim = MonteCarloSimulator(n_iterations=mini_n)
-            mini_result = mini_sim.run_simulation(
-                trial, blended_effect, event_projection, endpoint_model, test_params, _skip_sensitivity=True
-            )
-            effect_sensitivity[scale_label] = mini_result.probability_of_success
-            logger.info(f"  Effect scale {scale_label}: PoSS={mini_result.probability_of_success:.2%}")
-
-        sensitivity["effect_scale"] = effect_sensitivity
-
-        # Alpha: strict vs lenient
-        alpha_sensitivity = {}
-        for alpha_label, alpha_val in [("0.01", 0.01), ("0.05", 0.05)]:
-            test_params = copy.deepcopy(params)
-            test_params.alpha = alpha_val
-            mini_sim = MonteCarloSimulator(n_iterations=mini_n)
-            mini_result = mini_sim.run_simulation(
-                trial, blended_effect, event_projection, endpoint_model, test_params, _skip_sensitivity=True
-            )
-            alpha_sensitivity[alpha_label] = mini_result.probability_of_success
-            logger.info(f"  Alpha {alpha_label}: PoSS={mini_result.probability_of_success:.2%}")
-
-        sensitivity["alpha"] = alpha_sensitivity
-
-        # Discontinuation rate: 5% vs 20%
-        disc_sensitivity = {}
-        for disc_label, disc_val in [("5%", 0.05), ("20%", 0.20)]:
-            test_params = copy.deepcopy(params)
-            test_params.discontinuation_rate = disc_val
-            mini_sim = MonteCarloSimulator(n_iterations=mini_n)
-            mini_result = mini_sim.run_simulation(
-                trial, blended_effect, event_projection, endpoint_model, test_params, _skip_sensitivity=True
-            )
-            disc_sensitivity[disc_label] = mini_result.probability_of_success
-            logger.info(f"  Discontinuation {disc_label}: PoSS={mini_result.probability_of_success:.2%}")
-
-        sensitivity["discontinuation_rate"] = disc_sensitivity
-
-        # Benefit timing
-        timing_sensitivity = {}
-        for timing_label, timing_val in [("immediate", "immediate"), ("delayed", "delayed")]:
-            test_params = copy.deepcopy(params)
-            test_params.benefit_timing = timing_val
-            mini_sim = MonteCarloSimulator(n_iterations=mini_n)
-            mini_result = mini_sim.run_simulation(
-                trial, blended_effect, event_projection, endpoint_model, test_params, _skip_sensitivity=True
-            )
-            timing_sensitivity[timing_label] = mini_result.probability_of_success
-            logger.info(f"  Benefit timing {timing_label}: PoSS={mini_result.probability_of_success:.2%}")
+        logger.info("Running sensitivity analysis (batched, common random numbers)...")
+        if draws is None:
+            draws = self.new_draws(blended_effect).view(self.n_iterations)
 
-        sensitivity["benefit_timing"] = timing_sensitivity
+        scenarios = [replace(params, **overrides) for _, _, overrides in SENSITIVITY_SCENARIOS]
+        sim = self._simulate_scenarios(
+            trial, blended_effect, event_projection, endpoint_model, scenarios, draws, memo,
+        )
+        poss = sim["is_significant"].mean(axis=1)
+
+        sensitivity: Dict[str, Dict[str, float]] = {}
+        for (param_name, label, _), value in zip(SENSITIVITY_SCENARIOS, poss):
+            sensitivity.setdefault(param_name, {})[label] = float(value)
+            logger.info(f"  {param_name} {label}: PoSS={value:.2%}")
 
         return sensitivity
 
@@ -1711,32 +1853,186 @@ def get_adjustable_parameters() -> List[ParameterDef]:
 # MAIN ENTRY POINT
 # ============================================================================
 
-async def forecast_trial(
-    query: str,
-    params: Optional[SimulationParams] = None,
-    n_iterations: int = 50000,
-) -> ForecastResult:
+# ============================================================================
+# FORECAST SESSIONS
+# Everything upstream of the simulation (CT.gov fetch, comparator search,
+# anchor estimation) and the random draws are kept per trial, so moving a
+# slider only re-runs the stages that depend on the changed parameter.
+# ============================================================================
+
+FORECAST_SESSION_TTL = int(os.environ.get("FORECAST_SESSION_TTL", 3600))
+FORECAST_SESSION_MAX = int(os.environ.get("FORECAST_SESSION_MAX", 8))
+
+
+@dataclass
+class ForecastSession:
     """
-    Main entry point for trial forecasting.
+    Cached inputs for one trial's forecasts.
 
-    Takes a trial identifier and produces a complete Warpspeed-quality forecast
-    with probability of success, effect estimates, risk factors, and parameter
-    sensitivity analysis.
+    Only the (picklable) inputs and a draw seed live here; the draws and the
+    stage memo are rebuilt from the seed by whichever process simulates the
+    session (see simulate_session), so reruns use the same random numbers
+    whether they run in-process or in a forecast_jobs worker.
+    """
+    session_id: str  # NCT ID
+    trial: TrialDesign
+    blended_effect: BlendedEffect
+    event_projection: EventProjection
+    endpoint_model: EndpointModel
+    n_iterations: int  # Fixed count, or the cap when target_se is set
+    target_se: Optional[float] = None
+    seed: int = field(default_factory=lambda: int(np.random.SeedSequence().entropy % 2**63))
+    last_used: float = field(default_factory=time.time)
 
-    Args:
-        query: NCT ID (e.g., "NCT03211416") or drug name
-        params: Optional SimulationParams (uses defaults if None)
-        n_iterations: Number of Monte Carlo iterations (default 50000)
+    def run(self, params: SimulationParams) -> ForecastResult:
+        """Simulate `params` in this process (see forecast_jobs for the pooled path)."""
+        self.last_used = time.time()
+        return simulate_session(self, params)
 
-    Returns:
-        ForecastResult with all outputs
 
-    Example:
-        >>> result = await forecast_trial("NCT03211416")
-        >>> print(f"PoSS: {result.probability_of_success:.2%}")
+# (session_id, seed) → [RandomDraws, stage memo, lock], per process. Draws are
+# chunk-stable, so sessions with different iteration counts share them.
+_stage_cache: "OrderedDict[tuple, list]" = OrderedDict()
+_stage_cache_lock = threading.Lock()
+
+
+def simulate_session(session: ForecastSession, params: SimulationParams) -> ForecastResult:
     """
-    if params is None:
-        params = SimulationParams()
+    Run one forecast for a session, reusing this process's draws and stage memo.
+
+    Module-level so it can be submitted to a process pool.
+    """
+    key = (session.session_id, session.seed)
+    simulator = MonteCarloSimulator(
+        n_iterations=session.n_iterations, target_se=session.target_se, seed=session.seed,
+    )
+    with _stage_cache_lock:
+        entry = _stage_cache.get(key)
+        if entry is None:
+            draws = simulator.new_draws(session.blended_effect)
+            entry = [draws, OrderedDict(), threading.Lock()]
+            _stage_cache[key] = entry
+            while len(_stage_cache) > FORECAST_SESSION_MAX:
+                _stage_cache.popitem(last=False)
+        _stage_cache.move_to_end(key)
+
+    draws, memo, lock = entry
+    with lock:
+        result = simulator.run_simulation(
+            session.trial, session.blended_effect, session.event_projection,
+            session.endpoint_model, params, draws=draws, memo=memo,
+        )
+    result.session_id = session.session_id
+    return result
+
+
+_sessions: "OrderedDict[str, ForecastSession]" = OrderedDict()
+_session_aliases: Dict[str, str] = {}  # normalized query → NCT ID
+_sessions_lock = threading.Lock()
+
+
+def _session_query_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def get_forecast_session(key: str) -> Optional[ForecastSession]:
+    """Look up a live session by NCT ID / session_id or by the query that created it."""
+    now = time.time()
+    with _sessions_lock:
+        for sid in [s for s, sess in _sessions.items() if now - sess.last_used > FORECAST_SESSION_TTL]:
+            del _sessions[sid]
+        sid = key.strip().upper()
+        if sid not in _sessions:
+            sid = _session_aliases.get(_session_query_key(key), "")
+        session = _sessions.get(sid)
+        if session is not None:
+            _sessions.move_to_end(sid)
+        return session
+
+
+def _store_forecast_session(session: ForecastSession, query: str):
+    with _sessions_lock:
+        _sessions[session.session_id] = session
+        _sessions.move_to_end(session.session_id)
+        _session_aliases[_session_query_key(query)] = session.session_id
+        while len(_sessions) > FORECAST_SESSION_MAX:
+            _sessions.popitem(last=False)
+        live = set(_sessions)
+        for alias in [a for a, sid in _session_aliases.items() if sid not in live]:
+            del _session_aliases[alias]
+
+
+def clear_forecast_sessions():
+    """Drop every cached session (tests, or after anchor logic changes)."""
+    with _sessions_lock:
+        _sessions.clear()
+        _session_aliases.clear()
+    with _stage_cache_lock:
+        _stage_cache.clear()
+
+
+def params_from_dict(values: Optional[Dict]) -> SimulationParams:
+    """
+    Build SimulationParams from UI values.
+
+    The parameter panel sends dropdown labels as-is ("0.01 (Very Strict)",
+    "Gradual (Base)"), so those are coerced to the engine's values here.
+    """
+    params = SimulationParams()
+    for key, val in (values or {}).items():
+        if not hasattr(params, key) or val is None:
+            continue
+        if key == "benefit_timing":
+            label = str(val).lower()
+            val = next((t for t in ("immediate", "delayed") if t in label), "base")
+        elif key == "anchors_pre_adjusted":
+            val = bool(val)
+        elif isinstance(getattr(params, key), (int, float)) or key in (
+            "control_event_rate", "enrollment_duration_months", "followup_months",
+        ):
+            try:
+                val = float(str(val).split()[0])
+            except (ValueError, IndexError):
+                continue
+        setattr(params, key, val)
+    return params
+
+
+async def recompute_forecast(session_id: str, params: Optional[SimulationParams] = None) -> ForecastResult:
+    """
+    Re-run a cached trial with new parameters (no CT.gov round-trips).
+
+    Raises:
+        KeyError if the session has expired or was never created
+    """
+    from forecast_jobs import run_session
+
+    session = get_forecast_session(session_id)
+    if session is None:
+        raise KeyError(session_id)
+    session.last_used = time.time()
+    return await run_session(session, params or SimulationParams())
+
+
+async def prepare_forecast_session(
+    query: str,
+    n_iterations: int = 50000,
+    target_se: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> ForecastSession:
+    """
+    Fetch the trial, find comparators and blend anchors — the I/O half of a
+    forecast. Returns the cached session for `query` when one is still live.
+    """
+    session = get_forecast_session(query)
+    if session is not None and (session.n_iterations, session.target_se) == (n_iterations, target_se):
+        if seed is None or session.seed == seed:
+            logger.info(f"Reusing forecast session {session.session_id}")
+            return session
+        # Same inputs, caller-chosen draws: no need to refetch anything
+        session = replace(session, seed=seed)
+        _store_forecast_session(session, query)
+        return session
 
     fetcher = TrialDataFetcher()
 
@@ -1792,18 +2088,63 @@ async def forecast_trial(
             is_surrogate=False,
         )
 
-        # Run Warpspeed simulation
-        simulator = MonteCarloSimulator(n_iterations=n_iterations)
-        result = simulator.run_simulation(
-            trial, blended_effect, event_projection, endpoint_model, params
+        session = ForecastSession(
+            session_id=trial.nct_id.upper(),
+            trial=trial,
+            blended_effect=blended_effect,
+            event_projection=event_projection,
+            endpoint_model=endpoint_model,
+            n_iterations=n_iterations,
+            target_se=target_se,
         )
-
-        return result
+        if seed is not None:
+            session.seed = seed
+        _store_forecast_session(session, query)
+        return session
 
     finally:
         await fetcher.close()
 
 
+async def forecast_trial(
+    query: str,
+    params: Optional[SimulationParams] = None,
+    n_iterations: int = 50000,
+    target_se: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> ForecastResult:
+    """
+    Main entry point for trial forecasting.
+
+    Takes a trial identifier and produces a complete Warpspeed-quality forecast
+    with probability of success, effect estimates, risk factors, and parameter
+    sensitivity analysis. The simulation itself runs in the forecast_jobs
+    process pool, so the event loop stays free while it computes.
+
+    Args:
+        query: NCT ID (e.g., "NCT03211416") or drug name
+        params: Optional SimulationParams (uses defaults if None)
+        n_iterations: Number of Monte Carlo iterations (default 50000); the
+                      cap when target_se is given
+        target_se: Stop once the PoS standard error is below this (e.g. 0.005)
+        seed: Draw seed, for reproducing an earlier result (result.seed)
+
+    Returns:
+        ForecastResult with all outputs
+
+    Example:
+        >>> result = await forecast_trial("NCT03211416")
+        >>> print(f"PoSS: {result.probability_of_success:.2%}")
+    """
+    from forecast_jobs import run_session
+
+    if params is None:
+        params = SimulationParams()
+
+    session = await prepare_forecast_session(query, n_iterations, target_se, seed)
+    return await run_session(session, params)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -1815,6 +2156,8 @@ def simulate_trial(
     endpoint_model: EndpointModel,
     params: SimulationParams = None,
     n_iterations: int = 50000,
+    target_se: Optional[float] = None,
+    seed: Optional[int] = None,
 ) -> ForecastResult:
     """
     Run simulation for a pre-loaded trial (synchronous wrapper).
@@ -1825,7 +2168,9 @@ def simulate_trial(
         event_projection: EventProjection object
         endpoint_model: EndpointModel object
         params: SimulationParams (uses defaults if None)
-        n_iterations: Number of iterations
+        n_iterations: Number of iterations (the cap when target_se is given)
+        target_se: Optional PoS standard-error target for adaptive stopping
+        seed: Optional draw seed; the same seed reproduces the same result
 
     Returns:
         ForecastResult
@@ -1833,7 +2178,7 @@ def simulate_trial(
     if params is None:
         params = SimulationParams()
 
-    simulator = MonteCarloSimulator(n_iterations=n_iterations)
+    simulator = MonteCarloSimulator(n_iterations=n_iterations, target_se=target_se, seed=seed)
     return simulator.run_simulation(
         trial, blended_effect, event_projection, endpoint_model, params
     )
@@ -1874,7 +2219,7 @@ def get_trial_forecaster_status() -> Dict:
         "forecaster_ready": numpy_ok and scipy_ok,
         "numpy_available": numpy_ok,
         "scipy_available": scipy_ok,
-        "ctgov_accessible": httpx is not None,
+        "ctgov_accessible": ctgov_client is not None,
         "research_agent_available": research_agent_available,
         "deep_research_mode": research_agent_available,
     }
@@ -1884,6 +2229,8 @@ async def run_forecast(
     query: str,
     params: Optional[Dict] = None,
     n_iterations: int = 50000,
+    target_se: Optional[float] = None,
+    seed: Optional[int] = None,
 ):
     """
     Async generator that yields (event_type, event_data) tuples for SSE streaming.
@@ -1901,11 +2248,7 @@ async def run_forecast(
     4. Return ForecastResult as dict
     """
     # Parse simulation params
-    sim_params = SimulationParams()
-    if params:
-        for key, val in params.items():
-            if hasattr(sim_params, key) and val is not None:
-                setattr(sim_params, key, val)
+    sim_params = params_from_dict(params)
 
     # Try deep research mode first
     research_report = None
@@ -1929,10 +2272,16 @@ async def run_forecast(
     yield ("step", "Fetching trial design from ClinicalTrials.gov...")
 
     try:
-        yield ("step", "Running Monte Carlo simulation (50,000 iterations)...")
-        result = await forecast_trial(query, sim_params, n_iterations)
+        if target_se:
+            yield ("step", f"Running Monte Carlo simulation (until SE < {target_se:.3f}, max {n_iterations:,} iterations)...")
+        else:
+            yield ("step", f"Running Monte Carlo simulation ({n_iterations:,} iterations)...")
+        result = await forecast_trial(query, sim_params, n_iterations, target_se, seed)
 
-        yield ("step", f"Simulation complete: PoSS = {result.probability_of_success:.1%}")
+        yield ("step", (
+            f"Simulation complete: PoSS = {result.probability_of_success:.1%} "
+            f"± {result.pos_standard_error:.1%} SE ({result.n_iterations:,} iterations)"
+        ))
 
         # Build the final output dict
         result_dict = result.to_dict()
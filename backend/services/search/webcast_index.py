@@ -0,0 +1,216 @@
+"""
+SatyaBio — Webcast Moment Index
+
+Segment-level, time-anchored index over webcast transcripts. Chunks are what
+gets embedded and retrieved; this index remembers which Whisper segments
+(with their exact start / end offsets) each chunk was built from, so a hit
+can be turned into "the moment where X was said" and deep-linked into the
+recording without re-reading the transcript.
+
+What it does:
+  - store_segments(): writes a chunk's segments to webcast_segments (chunk_id,
+    start/end seconds, section label from _infer_section, tsvector)
+  - attach_moments(): for the webcast chunks in a result list, one indexed
+    lookup returns the best-matching segments of every chunk, ranked by
+    keyword relevance to the query; each result gains start_time / end_time /
+    section_title / jump_url and a short list of "moments"
+  - moment_query(): the OR-ed tsquery used for ranking — a 10-second segment
+    rarely contains every query term
+
+Both search_webcasts() and rag_search.search() call attach_moments(), so
+webcast answers in the main hybrid search carry timestamps too. Webcasts
+ingested before the index existed have no segment rows and come back as
+plain chunks.
+
+Usage:
+    from webcast_index import attach_moments
+    results = attach_moments(conn, query, results)
+
+Environment:
+    WEBCAST_MOMENTS_PER_CHUNK   moments returned per webcast chunk (default 3)
+"""
+
+import os
+import re
+import bisect
+from typing import Optional
+
+MOMENTS_PER_CHUNK = int(os.environ.get("WEBCAST_MOMENTS_PER_CHUNK", 3))
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS webcast_segments (
+        id SERIAL PRIMARY KEY,
+        document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
+        chunk_id INTEGER REFERENCES chunks(id) ON DELETE CASCADE,
+        segment_index INTEGER,
+        start_time FLOAT NOT NULL,
+        end_time FLOAT NOT NULL,
+        section_title VARCHAR(100),
+        content TEXT NOT NULL,
+        content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+    );
+    CREATE INDEX IF NOT EXISTS idx_webcast_segments_chunk ON webcast_segments (chunk_id);
+    CREATE INDEX IF NOT EXISTS idx_webcast_segments_doc_time ON webcast_segments (document_id, start_time);
+    CREATE INDEX IF NOT EXISTS idx_webcast_segments_tsv ON webcast_segments USING GIN (content_tsv);
+"""
+
+_TERM = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_table_ready = False
+
+
+# =============================================================================
+# WRITE — called from webcast_pipeline while chunks are inserted
+# =============================================================================
+
+def ensure_schema(cur) -> bool:
+    global _table_ready
+    if not _table_ready:
+        cur.execute(SCHEMA)
+        _table_ready = True
+    return _table_ready
+
+
+def assign_segments(chunks: list[dict], segments: list) -> list[list]:
+    """
+    Segments grouped per chunk: each segment goes to the last chunk starting
+    at or before it (chunk_transcript's time windows don't overlap, only its
+    text does).
+    """
+    groups = [[] for _ in chunks]
+    if not chunks or not segments:
+        return groups
+    starts = [c.get("start_time", 0) or 0 for c in chunks]
+    for n, seg in enumerate(segments):
+        text = (seg.get("text") or "").strip()
+        if not text:
+            continue
+        i = max(0, bisect.bisect_right(starts, seg["start"]) - 1)
+        groups[i].append((n, seg["start"], seg["end"], text))
+    return groups
+
+
+def store_segments(cur, document_id: int, chunk_rows: list[tuple], segments: list):
+    """
+    Index the segments behind freshly inserted chunks, inside the caller's
+    transaction. chunk_rows: (chunk_id, chunk dict, section_title) in chunk
+    order. A failure here is rolled back to a savepoint so the chunks are
+    still stored.
+    """
+    global _table_ready
+    if not segments or not chunk_rows:
+        return 0
+    groups = assign_segments([c for _, c, _ in chunk_rows], segments)
+    rows = [
+        (document_id, chunk_id, n, round(start, 2), round(end, 2), section, text)
+        for (chunk_id, _, section), group in zip(chunk_rows, groups)
+        for n, start, end, text in group
+    ]
+    cur.execute("SAVEPOINT webcast_segments")
+    try:
+        ensure_schema(cur)
+        cur.executemany("""
+            INSERT INTO webcast_segments (document_id, chunk_id, segment_index, start_time,
+                                          end_time, section_title, content)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+    except Exception as e:
+        print(f"  [Webcast index] Segment indexing failed (non-fatal): {e}")
+        cur.execute("ROLLBACK TO SAVEPOINT webcast_segments")
+        _table_ready = False
+        return 0
+    cur.execute("RELEASE SAVEPOINT webcast_segments")
+    return len(rows)
+
+
+# =============================================================================
+# READ — moments for retrieved chunks
+# =============================================================================
+
+def moment_query(query: str) -> str:
+    """to_tsquery text matching any query term ("" when there is none)."""
+    terms = dict.fromkeys(_TERM.findall((query or "").lower()))
+    return " | ".join(t.replace("-", " <-> ") for t in terms)
+
+
+def format_timestamp(seconds: float) -> str:
+    seconds = int(seconds or 0)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+
+
+def jump_url(source_url: str, start_time: float) -> Optional[str]:
+    """Recording URL with a media-fragment offset, when the source is a link."""
+    if not source_url or not source_url.startswith(("http://", "https://")):
+        return None
+    base = source_url.split("#", 1)[0]
+    return f"{base}#t={int(start_time)}"
+
+
+def _chunk_id(result: dict):
+    return result.get("chunk_id", result.get("id"))
+
+
+def attach_moments(conn, query: str, results: list[dict],
+                   per_chunk: int = MOMENTS_PER_CHUNK) -> list[dict]:
+    """
+    Add time anchors to the webcast results in place (and return them).
+
+    The best moment of each chunk sets start_time / end_time / section_title /
+    timestamp / jump_url on the result; `moments` lists up to per_chunk
+    matching segments. Non-webcast results are untouched; any database error
+    leaves the results as they were.
+    """
+    ids = [_chunk_id(r) for r in results if r.get("doc_type", "webcast") == "webcast"]
+    ids = [i for i in ids if i is not None]
+    if not ids or conn is None:
+        return results
+
+    tsquery = moment_query(query)
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT chunk_id, start_time, end_time, section_title, content,
+                   CASE WHEN %s = '' THEN 0
+                        ELSE ts_rank_cd(content_tsv, to_tsquery('english', %s)) END AS rank
+            FROM webcast_segments
+            WHERE chunk_id = ANY(%s)
+            ORDER BY chunk_id, rank DESC, start_time
+        """, (tsquery, tsquery, ids))
+        rows = cur.fetchall()
+    except Exception as e:
+        print(f"  [Webcast index] Moment lookup unavailable: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return results
+    finally:
+        cur.close()
+
+    by_chunk: dict = {}
+    for chunk_id, start, end, section, content, rank in rows:
+        by_chunk.setdefault(chunk_id, []).append({
+            "start_time": float(start), "end_time": float(end), "section_title": section,
+            "text": content, "score": round(float(rank or 0), 4),
+        })
+
+    for r in results:
+        moments = by_chunk.get(_chunk_id(r))
+        if not moments:
+            continue
+        if moments[0]["score"] == 0:
+            # Semantic-only match: anchor at the start of the chunk
+            moments = sorted(moments, key=lambda m: m["start_time"])
+        best = moments[0]
+        source = r.get("source_url") or r.get("file_path") or ""
+        r.update({
+            "start_time": best["start_time"],
+            "end_time": best["end_time"],
+            "section_title": r.get("section_title") or best["section_title"],
+            "timestamp": format_timestamp(best["start_time"]),
+            "jump_url": jump_url(source, best["start_time"]),
+            "moments": [{**m, "timestamp": format_timestamp(m["start_time"]),
+                         "jump_url": jump_url(source, m["start_time"])}
+                        for m in moments[:per_chunk] if m["score"] > 0 or m is best],
+        })
+    return results
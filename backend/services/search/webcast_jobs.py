@@ -0,0 +1,386 @@
+"""
+SatyaBio — Webcast Job Queue
+
+Runs webcast processing (yt-dlp capture, Whisper transcription, chunk /
+embed / store) as background jobs instead of inside the HTTP request. A
+one-hour earnings call used to hold a request open for many minutes and was
+lost if the client disconnected; now POST /api/webcasts/process returns a
+job ID at once and the work continues regardless of the client.
+
+What it does:
+  1. Persistent queue: every job lives in its own directory under
+     WEBCAST_JOB_DIR (job.json + uploaded / downloaded audio + transcript.json),
+     rewritten atomically on every state change; progress events are
+     batched into at most one write per WEBCAST_EVENT_SAVE_SECONDS. Jobs
+     interrupted by a restart are picked up again the first time the queue
+     is touched.
+  2. Stages: webcast_pipeline.run_stage() for capture → transcribe → ingest,
+     in a worker thread, at most WEBCAST_MAX_CONCURRENT jobs at once.
+     Artifacts are saved after each stage, so resume_job() (and restart
+     recovery) continues from the last completed stage.
+  3. Progress: stage / progress / result / error events, read by the job
+     status endpoint (polling) and the /jobs/{id}/events SSE stream.
+  4. cancel_job(): a queued job stops at once (its waiting task is
+     cancelled); a running one at the next stage or progress boundary.
+     Cancelled and failed jobs can be resumed; every start gets a new run
+     number, so a stale task can never run a job a second time.
+
+Usage:
+    from webcast_jobs import submit_webcast, get_job
+
+    job = submit_webcast({"url": "https://...", "ticker": "ARGX", "title": "Q2 call"})
+    ...
+    get_job(job.job_id).to_dict()
+
+Environment:
+    WEBCAST_JOB_DIR             default: <repo>/data/webcast_jobs
+    WEBCAST_MAX_CONCURRENT      jobs running at once (default 1 — Whisper is heavy)
+    WEBCAST_QUEUE_MAX           queued + running jobs before submit is refused (default 8)
+    WEBCAST_JOB_RETENTION_DAYS  finished job directories are removed after this (default 7)
+    WEBCAST_EVENT_SAVE_SECONDS  minimum interval between job.json writes for progress events (default 2)
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+JOB_DIR = Path(os.environ.get("WEBCAST_JOB_DIR", _REPO_ROOT / "data" / "webcast_jobs"))
+MAX_CONCURRENT = int(os.environ.get("WEBCAST_MAX_CONCURRENT", 1))
+QUEUE_MAX = int(os.environ.get("WEBCAST_QUEUE_MAX", 8))
+RETENTION_DAYS = float(os.environ.get("WEBCAST_JOB_RETENTION_DAYS", 7))
+EVENT_SAVE_SECONDS = float(os.environ.get("WEBCAST_EVENT_SAVE_SECONDS", 2))
+
+FINISHED = ("done", "error", "cancelled")
+
+
+class WebcastQueueFull(RuntimeError):
+    """Raised by submit_webcast when WEBCAST_QUEUE_MAX jobs are already pending."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when cancellation was requested."""
+
+
+def _pipeline():
+    # Imported lazily: webcast_pipeline needs psycopg2 / Whisper at import time
+    import webcast_pipeline
+    return webcast_pipeline
+
+
+# =============================================================================
+# Jobs
+# =============================================================================
+
+@dataclass
+class WebcastJob:
+    """One queued / running / finished webcast job and the events it has produced."""
+    job_id: str
+    request: Dict
+    status: str = "queued"  # queued | running | done | error | cancelled
+    stage: Optional[str] = None
+    completed: List[str] = field(default_factory=list)
+    artifacts: Dict = field(default_factory=dict)
+    events: List[Dict] = field(default_factory=list)
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    error_details: Dict = field(default_factory=dict)
+    cancel_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _run: int = field(default=0, repr=False)          # bumped by every _start()
+    _saved_at: float = field(default=0.0, repr=False)
+
+    _PERSISTED = ("job_id", "request", "status", "stage", "completed", "artifacts", "events",
+                  "result", "error", "error_details", "cancel_requested",
+                  "created_at", "started_at", "finished_at")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def dir(self) -> Path:
+        return JOB_DIR / self.job_id
+
+    def add_event(self, kind: str, message: str = "", **data):
+        now = time.time()
+        self.events.append({"type": kind, "stage": self.stage, "message": message, "at": now, **data})
+        # Progress lines arrive many times a minute; persist them in batches
+        if kind != "progress" or now - self._saved_at >= EVENT_SAVE_SECONDS:
+            self.save()
+        self._changed.set()
+
+    async def stream(self) -> AsyncIterator[Dict]:
+        """Yield every event (past and future) until the job finishes."""
+        sent = 0
+        while True:
+            self._changed.clear()
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.finished:
+                return
+            await self._changed.wait()
+
+    def save(self):
+        path = self.dir / "job.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({k: getattr(self, k) for k in self._PERSISTED}, f, default=str)
+            os.replace(tmp, path)
+            self._saved_at = time.time()
+        except Exception as e:
+            logger.error(f"Webcast job {self.job_id} could not be saved: {e}")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["WebcastJob"]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(**{k: data[k] for k in cls._PERSISTED if k in data})
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, KeyError) as e:
+            logger.error(f"Unreadable webcast job file {path}: {e}")
+            return None
+
+    def to_dict(self) -> Dict:
+        """Serialize for GET /api/webcasts/jobs/{job_id}."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "completed_stages": list(self.completed),
+            "title": self.request.get("title", ""),
+            "ticker": self.request.get("ticker", ""),
+            "source": self.request.get("url") or os.path.basename(self.request.get("audio_path") or ""),
+            "events": list(self.events),
+            "result": self.result,
+            "error": self.error,
+            **({"error_details": self.error_details} if self.error_details else {}),
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_jobs: Dict[str, WebcastJob] = {}
+_tasks: Dict[str, asyncio.Task] = {}  # job_id -> its current task (also keeps it referenced)
+_semaphore: Optional[asyncio.Semaphore] = None
+_recovered = False
+
+
+def _pending_count() -> int:
+    return sum(1 for job in _jobs.values() if not job.finished)
+
+
+async def _run_job(job: WebcastJob, run: int):
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async with _semaphore:
+        if job.finished or run != job._run:  # cancelled while queued, or superseded by a resume
+            return
+        pipeline = _pipeline()
+        loop = asyncio.get_running_loop()
+        job.status = "running"
+        job.started_at = job.started_at or time.time()
+        job.save()
+
+        def progress(message: str):
+            # Called from the stage's worker thread
+            if job.cancel_requested:
+                raise JobCancelled()
+            loop.call_soon_threadsafe(job.add_event, "progress", message)
+
+        try:
+            for stage in pipeline.WEBCAST_STAGES:
+                if stage in job.completed:
+                    continue
+                if job.cancel_requested:
+                    raise JobCancelled()
+                job.stage = stage
+                job.add_event("stage", f"Starting {stage}")
+                produced = await asyncio.to_thread(
+                    pipeline.run_stage, stage, job.request, dict(job.artifacts), str(job.dir), progress)
+                job.artifacts.update(produced)
+                job.completed.append(stage)
+                job.add_event("stage_done", f"Finished {stage}")
+            job.result = pipeline.webcast_result(job.artifacts)
+            job.status = "done"
+            _remove_job_audio(job)
+            job.add_event("result", "Webcast processed", result=job.result)
+        except JobCancelled:
+            job.status = "cancelled"
+            job.add_event("cancelled", f"Cancelled during {job.stage}" if job.stage else "Cancelled")
+        except Exception as e:
+            logger.error(f"Webcast job {job.job_id} failed in {job.stage}: {e}")
+            job.status = "error"
+            job.error = str(e)
+            job.error_details = getattr(e, "details", {}) or {}
+            job.add_event("error", str(e))
+        finally:
+            job.finished_at = time.time()
+            job.save()
+            job._changed.set()
+
+
+def _remove_job_audio(job: WebcastJob):
+    """Delete audio the job itself stored (uploads, downloads) once the transcript is ingested."""
+    for path in job.dir.iterdir():
+        if path.is_file() and path.name not in ("job.json", "transcript.json"):
+            path.unlink(missing_ok=True)
+
+
+def _start(job: WebcastJob):
+    job._run += 1
+    task = asyncio.get_running_loop().create_task(_run_job(job, job._run))
+    _tasks[job.job_id] = task
+    task.add_done_callback(lambda t: _forget_task(job.job_id, t))
+
+
+def _forget_task(job_id: str, task: asyncio.Task):
+    if _tasks.get(job_id) is task:
+        del _tasks[job_id]
+
+
+def _prune_finished():
+    cutoff = time.time() - RETENTION_DAYS * 86400
+    for job_id in [j for j, job in _jobs.items() if job.finished and (job.finished_at or 0) < cutoff]:
+        shutil.rmtree(_jobs.pop(job_id).dir, ignore_errors=True)
+
+
+def recover_jobs():
+    """
+    Load stored jobs and restart the ones a previous process left queued or
+    running (they continue from their last completed stage). Runs once per
+    process, from the first queue call made on a running event loop.
+    """
+    global _recovered
+    if _recovered:
+        return
+    _recovered = True
+    if not JOB_DIR.exists():
+        return
+    restarted = 0
+    for path in sorted(JOB_DIR.glob("*/job.json")):
+        job = WebcastJob.load(path)
+        if job is None or job.job_id in _jobs:
+            continue
+        _jobs[job.job_id] = job
+        if not job.finished:
+            job.status = "queued"
+            job.add_event("resumed", "Restarted after server restart")
+            _start(job)
+            restarted += 1
+    _prune_finished()
+    if restarted:
+        print(f"  [webcast jobs] Resumed {restarted} interrupted jobs")
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def submit_webcast(request: Dict, upload_name: Optional[str] = None,
+                   upload_bytes: Optional[bytes] = None) -> WebcastJob:
+    """
+    Queue a webcast job; must be called from a running event loop.
+
+    Args:
+        request: audio_path / url / title / ticker / company_name / event_date / event_type / source_url
+        upload_name, upload_bytes: An uploaded recording, kept in the job directory
+                                   (request["audio_path"] is set to it)
+
+    Raises:
+        WebcastQueueFull when WEBCAST_QUEUE_MAX jobs are queued or running
+    """
+    recover_jobs()
+    if _pending_count() >= QUEUE_MAX:
+        raise WebcastQueueFull(f"{QUEUE_MAX} webcasts already queued — try again shortly")
+
+    job = WebcastJob(job_id=new_job_id(), request=dict(request))
+    job.dir.mkdir(parents=True, exist_ok=True)
+    if upload_bytes is not None:
+        ext = os.path.splitext(upload_name or "")[1].lower() or ".bin"
+        audio_path = job.dir / f"upload{ext}"
+        with open(audio_path, "wb") as f:
+            f.write(upload_bytes)
+        job.request["audio_path"] = str(audio_path)
+    _jobs[job.job_id] = job
+    job.add_event("queued", "Queued")
+    _start(job)
+    return job
+
+
+def get_job(job_id: str) -> Optional[WebcastJob]:
+    recover_jobs()
+    return _jobs.get(job_id)
+
+
+def list_jobs(limit: int = 50) -> List[Dict]:
+    """Most recent jobs first, without their event logs."""
+    recover_jobs()
+    jobs = sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)[:limit]
+    return [{k: v for k, v in j.to_dict().items() if k != "events"} for j in jobs]
+
+
+def cancel_job(job_id: str) -> Optional[WebcastJob]:
+    """Request cancellation. None if the job does not exist."""
+    job = get_job(job_id)
+    if job is None or job.finished:
+        return job
+    job.cancel_requested = True
+    if job.status == "queued":
+        task = _tasks.pop(job.job_id, None)
+        if task is not None:
+            task.cancel()  # still waiting for the semaphore
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        job.add_event("cancelled", "Cancelled before it started")
+    else:
+        job.add_event("cancel_requested", f"Cancelling after the current step of {job.stage}")
+    return job
+
+
+def resume_job(job_id: str) -> Optional[WebcastJob]:
+    """
+    Restart a failed or cancelled job from its last completed stage.
+    Jobs still queued / running or already done are returned unchanged.
+    """
+    job = get_job(job_id)
+    if job is None or job.status not in ("error", "cancelled"):
+        return job
+    if QUEUE_MAX and _pending_count() >= QUEUE_MAX:
+        raise WebcastQueueFull(f"{QUEUE_MAX} webcasts already queued — try again shortly")
+    job.status = "queued"
+    job.cancel_requested = False
+    job.error, job.error_details = None, {}
+    job.finished_at = None
+    job.add_event("resumed", f"Resuming after {job.completed[-1]}" if job.completed else "Resuming")
+    _start(job)
+    return job
+
+
+def get_queue_status() -> Dict:
+    """Queue occupancy for the status endpoint."""
+    return {
+        "max_concurrent": MAX_CONCURRENT,
+        "queue_max": QUEUE_MAX,
+        "queued": sum(1 for job in _jobs.values() if job.status == "queued"),
+        "running": sum(1 for job in _jobs.values() if job.status == "running"),
+    }
@@ -15,18 +15,31 @@ Audio capture methods:
 Transcription (priority order):
   1. OpenAI Whisper API — fast, reliable, no local deps ($0.006/min)
   2. Local openai-whisper — free, requires ffmpeg + ~1.5GB RAM
+  Recordings over WEBCAST_SEGMENT_MIN_AUDIO seconds are split on silence
+  into overlapping ranges transcribed in parallel (WEBCAST_TRANSCRIBE_WORKERS
+  API calls, or WEBCAST_LOCAL_WHISPER_WORKERS processes for local Whisper);
+  each range is chunked and embedded as soon as it completes.
 
 Storage:
   - Reuses existing documents + chunks tables (doc_type="webcast")
   - Voyage-3 embeddings (1024-dim), HNSW index, tsvector for keyword search
+
+Execution:
+  The pipeline is split into stages (capture → transcribe → ingest, see
+  run_stage). The API runs them as background jobs through webcast_jobs;
+  process_webcast() runs them inline.
 """
 
 import os
 import re
 import json
+import asyncio
+import shutil
 import subprocess
 import tempfile
 import hashlib
+import multiprocessing
+import concurrent.futures
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -34,6 +47,8 @@ from typing import Optional
 import psycopg2
 import psycopg2.extras
 
+from webcast_index import attach_moments, store_segments
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -295,8 +310,8 @@ MEDIA_RECORDER_JS = """
                     body: formData,
                 });
                 const data = await resp.json();
-                badge.innerHTML = data.status === 'ok'
-                    ? `✅ Uploaded! ${data.word_count?.toLocaleString() || '?'} words transcribed.`
+                badge.innerHTML = data.status === 'queued'
+                    ? `✅ Uploaded! Transcribing in the background (job ${data.job_id}).`
                     : `⚠️ ${data.error || 'Upload failed'}. Backup saved locally.`;
             } catch (err) {
                 badge.innerHTML = `⚠️ Upload failed: ${err.message}. Backup saved locally.`;
@@ -327,11 +342,16 @@ def get_media_recorder_js(backend_url: str = "") -> str:
 # 2. TRANSCRIPTION — OpenAI Whisper API (primary) or local Whisper (fallback)
 # ===========================================================================
 
-def transcribe_audio(audio_path: str) -> Optional[dict]:
+def transcribe_audio(audio_path: str, workdir: str = None, on_range=None,
+                     progress=None) -> Optional[dict]:
     """
     Transcribe an audio file. Tries OpenAI Whisper API first (fast, reliable),
     falls back to local Whisper if API unavailable.
 
+    Recordings of WEBCAST_SEGMENT_MIN_AUDIO seconds or more are split on
+    silence and transcribed range by range in parallel (transcribe_segmented);
+    on_range(index, segments) receives each range in order as it completes.
+
     Returns: {
         "text": str,           # full transcript
         "segments": [...],     # timestamped segments
@@ -340,6 +360,15 @@ def transcribe_audio(audio_path: str) -> Optional[dict]:
         "method": str,         # "openai_api" or "local_whisper"
     }
     """
+    if _openai_whisper_available or _whisper_available:
+        duration = probe_duration(audio_path)
+        if duration and duration >= SEGMENT_MIN_AUDIO:
+            try:
+                return transcribe_segmented(audio_path, duration, workdir, on_range, progress)
+            except (RuntimeError, OSError) as e:
+                print(f"  [webcast] Segmented transcription failed: {e}")
+                return {"error": str(e)}
+
     # Try OpenAI Whisper API first (fast, no local deps)
     if _openai_whisper_available:
         result = _transcribe_openai_api(audio_path)
@@ -492,6 +521,217 @@ def _transcribe_local_whisper(audio_path: str) -> Optional[dict]:
         return {"error": str(e)}
 
 
+# ===========================================================================
+# 2b. SEGMENTED TRANSCRIPTION — long recordings, split on silence
+# ===========================================================================
+# Recordings of WEBCAST_SEGMENT_MIN_AUDIO seconds or more are cut at silences
+# near every WEBCAST_SEGMENT_SECONDS into overlapping ranges, transcribed
+# concurrently (threads for the API, a process pool for local Whisper) and
+# stitched back onto one timeline. Ranges are handed to on_range() in order
+# as soon as every earlier range is done, so ingestion can start long before
+# the last range is transcribed.
+
+SEGMENT_SECONDS = float(os.getenv("WEBCAST_SEGMENT_SECONDS", 300))
+SEGMENT_OVERLAP = float(os.getenv("WEBCAST_SEGMENT_OVERLAP", 2.0))
+SEGMENT_MIN_AUDIO = float(os.getenv("WEBCAST_SEGMENT_MIN_AUDIO", 600))
+SILENCE_SEARCH = 30.0          # look this far either side of a target cut for a silence
+TRANSCRIBE_WORKERS = int(os.getenv("WEBCAST_TRANSCRIBE_WORKERS", 4))
+LOCAL_WHISPER_WORKERS = int(os.getenv("WEBCAST_LOCAL_WHISPER_WORKERS", 1))
+
+
+def probe_duration(audio_path: str) -> Optional[float]:
+    """Duration in seconds via ffprobe, or None."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", audio_path],
+            capture_output=True, text=True, timeout=30,
+        )
+        return float(json.loads(result.stdout)["format"]["duration"])
+    except Exception:
+        return None
+
+
+def detect_silences(audio_path: str, noise_db: int = -35, min_silence: float = 0.5) -> list[tuple]:
+    """(start, end) of silences found by ffmpeg's silencedetect filter."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-i", audio_path,
+             "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}", "-f", "null", "-"],
+            capture_output=True, text=True, timeout=600,
+        )
+    except Exception as e:
+        print(f"  [webcast] Silence detection failed: {e}")
+        return []
+    starts = [float(x) for x in re.findall(r"silence_start: ([\d.]+)", result.stderr)]
+    ends = [float(x) for x in re.findall(r"silence_end: ([\d.]+)", result.stderr)]
+    return list(zip(starts, ends))
+
+
+def plan_segments(duration: float, silences: list, target: float = SEGMENT_SECONDS,
+                  overlap: float = SEGMENT_OVERLAP, search: float = SILENCE_SEARCH) -> list[dict]:
+    """
+    Cut points near every `target` seconds, moved to the middle of the
+    closest silence within `search` seconds. Each range owns [cut, next_cut)
+    of the timeline; its audio extends `overlap` seconds past both ends.
+    """
+    cuts = [0.0]
+    while duration - cuts[-1] > target * 1.5:
+        goal = cuts[-1] + target
+        mids = [(s + e) / 2 for s, e in silences
+                if abs((s + e) / 2 - goal) <= search and (s + e) / 2 > cuts[-1] + target / 2]
+        cuts.append(min(mids, key=lambda m: abs(m - goal)) if mids else goal)
+    cuts.append(duration)
+    return [
+        {"index": i, "cut_start": cuts[i], "cut_end": cuts[i + 1],
+         "start": max(0.0, cuts[i] - overlap), "end": min(duration, cuts[i + 1] + overlap)}
+        for i in range(len(cuts) - 1)
+    ]
+
+
+def stitch_segments(plan_range: dict, segments: list) -> list:
+    """Shift a range's segments onto the recording timeline and keep the ones it owns."""
+    offset = plan_range["start"]
+    stitched = []
+    for seg in segments:
+        start, end = seg["start"] + offset, seg["end"] + offset
+        if plan_range["cut_start"] <= (start + end) / 2 < plan_range["cut_end"]:
+            stitched.append({"start": round(start, 2), "end": round(end, 2), "text": seg["text"].strip()})
+    return stitched
+
+
+def _extract_range(audio_path: str, plan_range: dict, workdir: str, wav: bool) -> Optional[str]:
+    """Cut one range out as 16 kHz mono (WAV for local Whisper, small MP3 for the API)."""
+    ext = "wav" if wav else "mp3"
+    output = os.path.join(workdir, f"range_{plan_range['index']:03d}.{ext}")
+    cmd = ["ffmpeg", "-y", "-ss", f"{plan_range['start']:.2f}", "-t",
+           f"{plan_range['end'] - plan_range['start']:.2f}", "-i", audio_path, "-ar", "16000", "-ac", "1"]
+    cmd += ["-f", "wav"] if wav else ["-b:a", "48k"]
+    try:
+        result = subprocess.run(cmd + [output], capture_output=True, text=True, timeout=300)
+        return output if result.returncode == 0 and os.path.exists(output) else None
+    except Exception as e:
+        print(f"  [webcast] Range extraction failed: {e}")
+        return None
+
+
+def _transcribe_range_file(path: str) -> dict:
+    """Transcribe one extracted range in this process (API first, then local Whisper)."""
+    if _openai_whisper_available:
+        result = _transcribe_openai_api(path)
+        if result and "error" not in result:
+            return result
+    if _whisper_available:
+        return _transcribe_local_whisper(path)
+    return {"error": "No transcription engine available"}
+
+
+def _init_local_worker():
+    # Process-pool initializer: load the model once per worker
+    _get_whisper()
+
+
+def _local_worker_transcribe(path: str) -> dict:
+    return _transcribe_local_whisper(path)
+
+
+def _range_executor():
+    """
+    (executor, transcribe function, extract as WAV): threads for API calls,
+    a spawn process pool when several local Whisper workers are configured.
+    """
+    if _openai_whisper_available:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, TRANSCRIBE_WORKERS))
+        return executor, _transcribe_range_file, False
+    if LOCAL_WHISPER_WORKERS > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=LOCAL_WHISPER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_local_worker,
+        )
+        return executor, _local_worker_transcribe, True
+    # One in-process model — it is not safe to share across threads
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1), _transcribe_range_file, True
+
+
+def transcribe_segmented(audio_path: str, duration: float, workdir: str = None,
+                         on_range=None, progress=None) -> dict:
+    """
+    Transcribe a long recording range by range, concurrently.
+
+    Finished ranges are cached in workdir (range_NNN.json) so a resumed job
+    only transcribes what is missing. on_range(index, segments) is called in
+    timeline order with each range's stitched segments.
+
+    Returns the same dict as transcribe_audio(), with method "<engine>_segmented".
+    """
+    progress = progress or (lambda message: None)
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="segments_", dir=AUDIO_TEMP_DIR)
+    os.makedirs(workdir, exist_ok=True)
+
+    plan = plan_segments(duration, detect_silences(audio_path))
+    progress(f"Transcribing {len(plan)} ranges of ~{SEGMENT_SECONDS / 60:.0f} min")
+    results: dict[int, list] = {}
+    methods = set()
+    for r in plan:
+        cached = os.path.join(workdir, f"range_{r['index']:03d}.json")
+        if os.path.exists(cached):
+            with open(cached) as f:
+                results[r["index"]] = json.load(f)
+
+    executor, worker, wav = _range_executor()
+    next_range = 0
+    try:
+        futures = {}
+        for r in plan:
+            if r["index"] in results:
+                continue
+            path = _extract_range(audio_path, r, workdir, wav=wav)
+            if path is None:
+                raise RuntimeError(f"Could not extract audio range {r['index']}")
+            futures[executor.submit(worker, path)] = (r, path)
+
+        pending = set(futures)
+        while True:
+            # Hand over every range whose predecessors are all done
+            while next_range < len(plan) and next_range in results:
+                if on_range:
+                    on_range(next_range, results[next_range])
+                next_range += 1
+            if not pending:
+                break
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                r, path = futures[future]
+                transcript = future.result()
+                if not transcript or "error" in transcript:
+                    raise RuntimeError(f"Range {r['index']} failed: {(transcript or {}).get('error')}")
+                methods.add(transcript.get("method", ""))
+                segments = stitch_segments(r, transcript.get("segments", []))
+                cached = os.path.join(workdir, f"range_{r['index']:03d}.json")
+                with open(cached + ".tmp", "w") as f:
+                    json.dump(segments, f)
+                os.replace(cached + ".tmp", cached)
+                os.remove(path)
+                results[r["index"]] = segments
+                progress(f"Transcribed range {len(results)}/{len(plan)}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    segments = [seg for i in range(len(plan)) for seg in results[i]]
+    method = (methods.pop() if len(methods) == 1 else "mixed") if methods else "cached"
+    return {
+        "text": " ".join(seg["text"] for seg in segments).strip(),
+        "segments": segments,
+        "language": WHISPER_LANGUAGE,
+        "duration": duration,
+        "method": f"{method}_segmented",
+        "ranges": len(plan),
+    }
+
+
 # ===========================================================================
 # 3. CHUNKING — for spoken content
 # ===========================================================================
@@ -570,6 +810,91 @@ def chunk_transcript(transcript_text: str, segments: list = None) -> list[dict]:
 # 4. RAG INGESTION — store in existing documents + chunks tables
 # ===========================================================================
 
+def _webcast_filename(title: str, ticker: str, event_date: str) -> str:
+    """Filename used to dedup webcast documents."""
+    slug = re.sub(r'[^a-z0-9]+', '_', title.lower())[:80] if title else "untitled"
+    return f"webcast_{ticker}_{slug}_{event_date}.txt"
+
+
+def _existing_webcast(cur, ticker: str, filename: str) -> Optional[int]:
+    cur.execute(
+        "SELECT id FROM documents WHERE ticker = %s AND filename = %s",
+        (ticker.upper(), filename)
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _insert_webcast_document(cur, ticker, company_name, filename, source_url, title,
+                             event_date, word_count, size_bytes) -> int:
+    cur.execute("""
+        INSERT INTO documents (ticker, company_name, filename, file_path,
+                               doc_type, title, date, word_count, page_count,
+                               file_size_bytes, embedded_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+        RETURNING id
+    """, (
+        ticker.upper(),
+        company_name,
+        filename,
+        source_url or "",
+        "webcast",
+        title,
+        event_date,
+        word_count,
+        0,  # page_count not applicable
+        size_bytes,
+    ))
+    return cur.fetchone()[0]
+
+
+def _embed_chunks(vo, chunks: list[dict]) -> list:
+    """Voyage embeddings for chunks, in batches; None for a batch that failed."""
+    all_embeddings = []
+    for i in range(0, len(chunks), EMBED_BATCH_SIZE):
+        batch = chunks[i:i + EMBED_BATCH_SIZE]
+        texts = [c["content"] for c in batch]
+        try:
+            resp = vo.embed(texts, model=EMBED_MODEL, input_type="document")
+            all_embeddings.extend(resp.embeddings)
+        except Exception as e:
+            print(f"  [webcast] Embedding batch {i} failed: {e}")
+            # Fill with None so we can still store text
+            all_embeddings.extend([None] * len(batch))
+    return all_embeddings
+
+
+def _insert_chunks(cur, doc_id: int, chunks: list[dict], embeddings: list, start_index: int = 0,
+                   segments: list = None) -> int:
+    """Insert chunks and index the timestamped segments behind them (webcast_index)."""
+    chunk_rows = []
+    for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings), start=start_index):
+        section_title = _infer_section(chunk["content"], chunk.get("start_time", 0))
+
+        emb_str = str(embedding) if embedding else None
+
+        cur.execute("""
+            INSERT INTO chunks (document_id, chunk_index, page_number,
+                                section_title, content, token_count,
+                                embedding, content_tsv, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s,
+                    %s::vector, to_tsvector('english', %s), NOW())
+            RETURNING id
+        """, (
+            doc_id,
+            idx,
+            0,  # page_number — not applicable for webcasts
+            section_title,
+            chunk["content"],
+            chunk["word_count"],
+            emb_str,
+            chunk["content"],
+        ))
+        chunk_rows.append((cur.fetchone()[0], chunk, section_title))
+    store_segments(cur, doc_id, chunk_rows, segments)
+    return len(chunk_rows)
+
+
 def ingest_webcast(
     transcript_text: str,
     segments: list = None,
@@ -595,49 +920,26 @@ def ingest_webcast(
     if vo is None:
         return {"error": "Voyage AI client not available", "status": "error"}
 
-    # Build a filename for dedup
-    slug = re.sub(r'[^a-z0-9]+', '_', title.lower())[:80] if title else "untitled"
-    filename = f"webcast_{ticker}_{slug}_{event_date}.txt"
+    filename = _webcast_filename(title, ticker, event_date)
 
     try:
         cur = conn.cursor()
 
         # Check if already ingested
-        cur.execute(
-            "SELECT id FROM documents WHERE ticker = %s AND filename = %s",
-            (ticker.upper(), filename)
-        )
-        existing = cur.fetchone()
+        existing = _existing_webcast(cur, ticker, filename)
         if existing:
             return {
-                "document_id": existing[0],
+                "document_id": existing,
                 "chunks_stored": 0,
                 "status": "already_exists",
-                "message": f"Webcast already ingested as document {existing[0]}"
+                "message": f"Webcast already ingested as document {existing}"
             }
 
         word_count = len(transcript_text.split())
-
-        # Insert document record
-        cur.execute("""
-            INSERT INTO documents (ticker, company_name, filename, file_path,
-                                   doc_type, title, date, word_count, page_count,
-                                   file_size_bytes, embedded_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-            RETURNING id
-        """, (
-            ticker.upper(),
-            company_name,
-            filename,
-            source_url or "",
-            "webcast",
-            title,
-            event_date,
-            word_count,
-            0,  # page_count not applicable
-            len(transcript_text.encode("utf-8")),
-        ))
-        doc_id = cur.fetchone()[0]
+        doc_id = _insert_webcast_document(
+            cur, ticker, company_name, filename, source_url, title, event_date,
+            word_count, len(transcript_text.encode("utf-8")),
+        )
 
         # Chunk the transcript
         chunks = chunk_transcript(transcript_text, segments)
@@ -645,44 +947,8 @@ def ingest_webcast(
             conn.commit()
             return {"document_id": doc_id, "chunks_stored": 0, "status": "ok_no_chunks"}
 
-        # Embed chunks in batches
-        all_embeddings = []
-        for i in range(0, len(chunks), EMBED_BATCH_SIZE):
-            batch = chunks[i:i + EMBED_BATCH_SIZE]
-            texts = [c["content"] for c in batch]
-            try:
-                resp = vo.embed(texts, model=EMBED_MODEL, input_type="document")
-                all_embeddings.extend(resp.embeddings)
-            except Exception as e:
-                print(f"  [webcast] Embedding batch {i} failed: {e}")
-                # Fill with None so we can still store text
-                all_embeddings.extend([None] * len(batch))
-
-        # Insert chunks
-        chunks_stored = 0
-        for idx, (chunk, embedding) in enumerate(zip(chunks, all_embeddings)):
-            section_title = _infer_section(chunk["content"], chunk.get("start_time", 0))
-
-            emb_str = str(embedding) if embedding else None
-
-            cur.execute("""
-                INSERT INTO chunks (document_id, chunk_index, page_number,
-                                    section_title, content, token_count,
-                                    embedding, content_tsv, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s,
-                        %s::vector, to_tsvector('english', %s), NOW())
-            """, (
-                doc_id,
-                idx,
-                0,  # page_number — not applicable for webcasts
-                section_title,
-                chunk["content"],
-                chunk["word_count"],
-                emb_str,
-                chunk["content"],
-            ))
-            chunks_stored += 1
-
+        chunks_stored = _insert_chunks(cur, doc_id, chunks, _embed_chunks(vo, chunks),
+                                       segments=segments)
         conn.commit()
 
         # Also store metadata as JSON in a webcast_metadata record if table exists
@@ -709,6 +975,134 @@ def ingest_webcast(
         return {"error": str(e), "status": "error"}
 
 
+class IncrementalIngest:
+    """
+    Stores a webcast while it is still being transcribed.
+
+    start() creates the document row up front; add_range() chunks a finished
+    transcript range with chunk_transcript, embeds it and commits it at once,
+    so the start of a long call is searchable within minutes of the upload.
+    finish() fills in the word count and webcast_metadata. `state` is plain
+    JSON, written to state_path after every range so a resumed job skips
+    ranges that were already stored.
+    """
+
+    def __init__(self, request: dict, state: dict = None, state_path: str = None):
+        self.request = request
+        self.state_path = state_path
+        self._unavailable = False
+        self.state = state or self._load_state() or {
+            "document_id": None, "ranges_done": [], "next_chunk_index": 0, "chunks_stored": 0,
+        }
+
+    def _load_state(self) -> Optional[dict]:
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return None
+
+    def _save_state(self):
+        if self.state_path:
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.state_path)
+
+    @property
+    def filename(self) -> str:
+        return _webcast_filename(self.request.get("title", ""), self.request.get("ticker", ""),
+                                 self.event_date)
+
+    @property
+    def event_date(self) -> str:
+        return self.request.get("event_date") or datetime.now().strftime("%Y-%m-%d")
+
+    def start(self) -> bool:
+        """Create the document (once). False when the webcast already exists or storage is unavailable."""
+        if self.state["document_id"]:
+            return True
+        if self._unavailable:
+            return False
+        self._unavailable = True
+        conn, vo = _get_db(), _get_voyage()
+        if conn is None or vo is None:
+            return False
+        try:
+            cur = conn.cursor()
+            existing = _existing_webcast(cur, self.request.get("ticker", ""), self.filename)
+            if existing:
+                return False
+            self.state["document_id"] = _insert_webcast_document(
+                cur, self.request.get("ticker", ""), self.request.get("company_name", ""),
+                self.filename, self.request.get("source_url") or self.request.get("url") or "",
+                self.request.get("title", ""), self.event_date, 0, 0,
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"  [webcast] Could not start incremental ingest: {e}")
+            return False
+        self._unavailable = False
+        self._save_state()
+        return True
+
+    def add_range(self, index: int, segments: list):
+        """Chunk, embed and store one transcript range (no-op if already stored)."""
+        if index in self.state["ranges_done"]:
+            return
+        text = " ".join(seg["text"] for seg in segments)
+        chunks = chunk_transcript(text, segments)
+        if chunks:
+            conn = _get_db()
+            cur = conn.cursor()
+            try:
+                stored = _insert_chunks(cur, self.state["document_id"], chunks,
+                                        _embed_chunks(_get_voyage(), chunks),
+                                        start_index=self.state["next_chunk_index"],
+                                        segments=segments)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            self.state["next_chunk_index"] += stored
+            self.state["chunks_stored"] += stored
+        self.state["ranges_done"].append(index)
+        self._save_state()
+
+    def finish(self, transcript: dict) -> dict:
+        """Final word count and metadata; returns the same dict as ingest_webcast()."""
+        doc_id = self.state["document_id"]
+        text = transcript["text"]
+        word_count = len(text.split())
+        conn = _get_db()
+        if conn is None:
+            return {"error": "Database not available", "status": "error"}
+        try:
+            cur = conn.cursor()
+            cur.execute("UPDATE documents SET word_count = %s, file_size_bytes = %s WHERE id = %s",
+                        (word_count, len(text.encode("utf-8")), doc_id))
+            conn.commit()
+            _store_webcast_metadata(cur, conn, doc_id, {
+                "source_url": self.request.get("source_url") or self.request.get("url") or "",
+                "event_type": self.request.get("event_type", "webcast"),
+                "duration_seconds": transcript.get("duration", 0),
+                "segment_count": len(transcript.get("segments") or []),
+                "chunk_count": self.state["chunks_stored"],
+                "incremental_ranges": len(self.state["ranges_done"]),
+            })
+        except Exception as e:
+            conn.rollback()
+            return {"error": str(e), "status": "error"}
+        print(f"  [webcast] Ingested incrementally: doc_id={doc_id}, "
+              f"{self.state['chunks_stored']} chunks, {word_count} words")
+        return {
+            "document_id": doc_id,
+            "chunks_stored": self.state["chunks_stored"],
+            "word_count": word_count,
+            "status": "ok",
+        }
+
+
 def _infer_section(text: str, start_time: float = 0) -> str:
     """Infer a section label from spoken content."""
     text_lower = text[:500].lower()
@@ -794,7 +1188,9 @@ def search_webcasts(
 ) -> list[dict]:
     """
     Hybrid search (vector + keyword) over webcast transcripts.
-    Returns ranked chunks with document metadata.
+    Returns ranked chunks with document metadata, each anchored to its
+    best-matching moment (start_time, end_time, jump_url, moments — see
+    webcast_index.attach_moments).
     """
     if not query or not query.strip():
         return []
@@ -825,7 +1221,7 @@ def search_webcasts(
         cur.execute(f"""
             SELECT c.id, c.content, c.chunk_index, c.section_title, c.token_count,
                    d.id AS document_id, d.ticker, d.company_name, d.title,
-                   d.date, d.doc_type,
+                   d.date, d.doc_type, d.file_path,
                    1 - (c.embedding <=> %s::vector) AS similarity
             FROM chunks c
             JOIN documents d ON c.document_id = d.id
@@ -846,7 +1242,7 @@ def search_webcasts(
         cur.execute(f"""
             SELECT c.id, c.content, c.chunk_index, c.section_title, c.token_count,
                    d.id AS document_id, d.ticker, d.company_name, d.title,
-                   d.date, d.doc_type,
+                   d.date, d.doc_type, d.file_path,
                    ts_rank_cd(c.content_tsv, websearch_to_tsquery('english', %s)) AS rank
             FROM chunks c
             JOIN documents d ON c.document_id = d.id
@@ -904,11 +1300,11 @@ def search_webcasts(
                     item = scored[rr.index]
                     item["rerank_score"] = rr.relevance_score
                     reranked.append(item)
-                return reranked
+                return attach_moments(conn, query, reranked)
             except Exception as e:
                 print(f"  [webcast] Rerank failed, using hybrid scores: {e}")
 
-        return scored[:top_k]
+        return attach_moments(conn, query, scored[:top_k])
 
     except Exception as e:
         print(f"  [webcast] Search error: {e}")
@@ -1024,6 +1420,137 @@ def get_webcast_transcript(document_id: int) -> dict:
 # 7. END-TO-END PIPELINE
 # ===========================================================================
 
+# The pipeline runs as three resumable stages. Each returns the artifacts it
+# produced; webcast_jobs persists them after every stage so a job restarted
+# after a crash, a deploy or a cancel picks up from the last completed stage.
+WEBCAST_STAGES = ("capture", "transcribe", "ingest")
+
+
+class WebcastStageError(RuntimeError):
+    """A pipeline stage failed. `details` is merged into the error response."""
+
+    def __init__(self, message: str, **details):
+        super().__init__(message)
+        self.details = details
+
+
+def load_transcript(artifacts: dict) -> dict:
+    """The transcribe stage's output, inline or from its transcript.json."""
+    if "transcript" in artifacts:
+        return artifacts["transcript"]
+    with open(artifacts["transcript_path"]) as f:
+        return json.load(f)
+
+
+def run_stage(stage: str, request: dict, artifacts: dict, workdir: str = None,
+              progress=None) -> dict:
+    """
+    Run one pipeline stage (blocking) and return the artifacts it produced.
+
+    Args:
+        stage: One of WEBCAST_STAGES
+        request: audio_path / url / title / ticker / company_name / event_date / event_type
+        artifacts: Everything earlier stages returned
+        workdir: Directory for downloaded audio and the transcript (job directory);
+                 without one the transcript is returned inline
+        progress: Optional callable(message) for progress within the stage
+
+    Raises:
+        WebcastStageError when the stage cannot complete
+    """
+    progress = progress or (lambda message: None)
+
+    if stage == "capture":
+        audio_path = request.get("audio_path")
+        if audio_path and os.path.exists(audio_path):
+            progress("Using uploaded audio")
+            return {"audio_path": audio_path, "audio_method": "file_upload"}
+        url = request.get("url")
+        if not url:
+            raise WebcastStageError("Provide audio_path or url")
+        progress(f"Downloading audio with yt-dlp: {url}")
+        output_path = os.path.join(workdir, "audio.mp3") if workdir else None
+        audio_path = capture_audio_yt_dlp(url, output_path)
+        if audio_path is None:
+            raise WebcastStageError(
+                "Could not capture audio. Try uploading the file directly.",
+                capture_js=get_media_recorder_js(),
+                message="yt-dlp failed. Use the MediaRecorder JS snippet to capture "
+                        "audio from the browser, then upload the recording.",
+            )
+        return {"audio_path": audio_path, "audio_method": "yt-dlp"}
+
+    if stage == "transcribe":
+        progress("Transcribing audio")
+        # Long recordings are stored range by range while later ranges are
+        # still being transcribed; the ingest stage then only finalizes
+        incremental = IncrementalIngest(
+            request, state_path=os.path.join(workdir, "ingest_state.json") if workdir else None)
+
+        def on_range(index, segments):
+            if incremental.start():
+                incremental.add_range(index, segments)
+                progress(f"Range {index + 1} searchable ({incremental.state['chunks_stored']} chunks stored)")
+
+        transcript = transcribe_audio(artifacts["audio_path"], workdir=workdir,
+                                      on_range=on_range, progress=progress)
+        if not transcript or "error" in transcript:
+            raise WebcastStageError((transcript or {}).get("error", "Transcription failed"))
+        summary = {"chars": len(transcript["text"]), "duration": transcript.get("duration", 0),
+                   "method": transcript.get("method", "")}
+        if incremental.state["document_id"]:
+            summary["ingest_state"] = incremental.state
+        if not workdir:
+            return {"transcript": transcript, **summary}
+        transcript_path = os.path.join(workdir, "transcript.json")
+        tmp = transcript_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(transcript, f)
+        os.replace(tmp, transcript_path)
+        return {"transcript_path": transcript_path, **summary}
+
+    if stage == "ingest":
+        transcript = load_transcript(artifacts)
+        if artifacts.get("ingest_state"):
+            progress("Finalizing incrementally stored transcript")
+            result = IncrementalIngest(request, state=artifacts["ingest_state"]).finish(transcript)
+            if result.get("status") == "error":
+                raise WebcastStageError(result.get("error", "Ingestion failed"))
+            return {"ingest": result}
+        progress("Chunking, embedding and storing transcript")
+        result = ingest_webcast(
+            transcript_text=transcript["text"],
+            segments=transcript.get("segments"),
+            title=request.get("title", ""),
+            ticker=request.get("ticker", ""),
+            company_name=request.get("company_name", ""),
+            event_date=request.get("event_date") or datetime.now().strftime("%Y-%m-%d"),
+            event_type=request.get("event_type", "webcast"),
+            source_url=request.get("source_url") or request.get("url") or "",
+            duration_seconds=transcript.get("duration", 0),
+        )
+        if result.get("status") == "error":
+            raise WebcastStageError(result.get("error", "Ingestion failed"))
+        return {"ingest": result}
+
+    raise ValueError(f"Unknown webcast stage: {stage}")
+
+
+def webcast_result(artifacts: dict) -> dict:
+    """Final response for a completed pipeline (same shape process_webcast has always returned)."""
+    result = artifacts.get("ingest", {})
+    transcript = load_transcript(artifacts)
+    return {
+        "status": result.get("status", "error"),
+        "document_id": result.get("document_id"),
+        "chunks_stored": result.get("chunks_stored", 0),
+        "word_count": result.get("word_count", 0),
+        "duration": transcript.get("duration", 0),
+        "method": transcript.get("method", ""),
+        "transcript_preview": transcript["text"][:500],
+    }
+
+
 async def process_webcast(
     audio_path: str = None,
     url: str = None,
@@ -1034,7 +1561,10 @@ async def process_webcast(
     event_type: str = "webcast",
 ) -> dict:
     """
-    Full pipeline: capture audio → transcribe → chunk → embed → store.
+    Full pipeline: capture audio → transcribe → chunk → embed → store, inline.
+
+    The API runs this as a background job instead (webcast_jobs); this is
+    for scripts and callers that want to wait. Stages run in a worker thread.
 
     Provide either:
       - audio_path: path to a local audio/video file
@@ -1042,70 +1572,21 @@ async def process_webcast(
 
     Returns status dict with document_id and chunk count.
     """
-    steps = []
-
-    # Step 1: Get audio file
-    if audio_path and os.path.exists(audio_path):
-        steps.append({"step": "audio_source", "method": "file_upload", "path": audio_path})
-    elif url:
-        steps.append({"step": "audio_capture", "method": "yt-dlp", "url": url})
-        audio_path = capture_audio_yt_dlp(url)
-        if audio_path is None:
-            return {
-                "status": "error",
-                "error": "Could not capture audio. Try uploading the file directly.",
-                "steps": steps,
-                "capture_js": get_media_recorder_js(),
-                "message": "yt-dlp failed. Use the MediaRecorder JS snippet to capture "
-                           "audio from the browser, then upload the recording.",
-            }
-        steps.append({"step": "audio_captured", "path": audio_path})
-    else:
-        return {"status": "error", "error": "Provide audio_path or url"}
-
-    # Step 2: Transcribe
-    steps.append({"step": "transcribing", "model": WHISPER_MODEL})
-    transcript = transcribe_audio(audio_path)
-    if not transcript or "error" in transcript:
-        return {
-            "status": "error",
-            "error": transcript.get("error", "Transcription failed"),
-            "steps": steps,
-        }
-    steps.append({
-        "step": "transcribed",
-        "chars": len(transcript["text"]),
-        "duration": transcript.get("duration", 0),
-    })
-
-    # Step 3: Ingest into RAG
-    steps.append({"step": "ingesting"})
-    if not event_date:
-        event_date = datetime.now().strftime("%Y-%m-%d")
-
-    result = ingest_webcast(
-        transcript_text=transcript["text"],
-        segments=transcript.get("segments"),
-        title=title,
-        ticker=ticker,
-        company_name=company_name,
-        event_date=event_date,
-        event_type=event_type,
-        source_url=url or "",
-        duration_seconds=transcript.get("duration", 0),
-    )
-
-    steps.append({"step": "ingested", **result})
-
-    return {
-        "status": result.get("status", "error"),
-        "document_id": result.get("document_id"),
-        "chunks_stored": result.get("chunks_stored", 0),
-        "word_count": result.get("word_count", 0),
-        "duration": transcript.get("duration", 0),
-        "transcript_preview": transcript["text"][:500],
-        "steps": steps,
+    request = {
+        "audio_path": audio_path, "url": url, "title": title, "ticker": ticker,
+        "company_name": company_name, "event_date": event_date, "event_type": event_type,
     }
+    artifacts, steps = {}, []
+    for stage in WEBCAST_STAGES:
+        steps.append({"step": stage})
+        try:
+            produced = await asyncio.to_thread(run_stage, stage, request, artifacts)
+        except WebcastStageError as e:
+            return {"status": "error", "error": str(e), "steps": steps, **e.details}
+        artifacts.update(produced)
+        steps.append({"step": f"{stage}_done", **{k: v for k, v in produced.items() if k != "transcript"}})
+
+    return {**webcast_result(artifacts), "steps": steps}
 
 
 # ===========================================================================
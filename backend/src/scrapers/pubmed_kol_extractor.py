@@ -6,8 +6,17 @@ Extracts their contact information for expert network calls.
 
 This is what funds pay $5-15K per call to GLG/Guidepoint for.
 You're building the lead generation for free.
+
+PubMed access goes through the shared pubmed_client (backend/services/search):
+one rate limiter for every module, history-server paging and a PMID cache,
+so re-running a KOL build only fetches publications it has not seen.
+
+Parsed publications and authors are kept in the KOL store (kol_store.py), which
+disambiguates authors across queries and scores KOLs from stored authorships;
+find_kols() only parses PMIDs the store has not seen before.
 """
 
+import sys
 import requests
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
@@ -15,15 +24,29 @@ from datetime import datetime
 from typing import Optional
 import time
 import re
-from collections import defaultdict
 import json
 from pathlib import Path
 
+# Shared PubMed client lives with the search services
+_ROOT = Path(__file__).resolve().parents[2]
+for _search_dir in (_ROOT / "backend" / "services" / "search", _ROOT / "services" / "search"):
+    if _search_dir.is_dir():
+        if str(_search_dir) not in sys.path:
+            sys.path.append(str(_search_dir))
+        break
+try:
+    import pubmed_client
+except ImportError:
+    pubmed_client = None
+
+from src.scrapers.kol_store import KOLStore
+
 
 # NCBI E-utilities base URL
 PUBMED_BASE = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
 # Rate limit: NCBI allows 3 requests/second without API key, 10/sec with key
+# (only used when pubmed_client is unavailable)
 RATE_LIMIT_DELAY = 0.35
 
 
@@ -72,6 +95,7 @@ class KOL:
     department: str
     city: str
     country: str
+    orcid: str = ""
     
     # Metrics
     publication_count: int = 0
@@ -95,16 +119,20 @@ class PubMedKOLExtractor:
         kols = extractor.find_kols("obefazimod ulcerative colitis")
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, store: Optional[KOLStore] = None):
         """
         Initialize extractor.
         
         Args:
             api_key: NCBI API key (optional but recommended for higher rate limits)
                     Get one free at: https://www.ncbi.nlm.nih.gov/account/settings/
+            store: KOL store to read and update (default: KOL_STORE_PATH)
         """
         self.api_key = api_key
         self.session = requests.Session()
+        self.store = store or KOLStore()
+        if pubmed_client is not None and api_key:
+            pubmed_client.set_api_key(api_key)
     
     def _make_request(self, url: str, params: dict) -> requests.Response:
         """Make a rate-limited request to NCBI"""
@@ -127,6 +155,9 @@ class PubMedKOLExtractor:
         Returns:
             List of PubMed IDs
         """
+        if pubmed_client is not None:
+            return pubmed_client.search(query, max_results=max_results, sort="relevance").pmids
+
         url = f"{PUBMED_BASE}/esearch.fcgi"
         params = {
             "db": "pubmed",
@@ -154,6 +185,15 @@ class PubMedKOLExtractor:
         if not pmids:
             return []
         
+        if pubmed_client is not None:
+            # Cached PMIDs are read from disk; the rest are fetched 200 at a time
+            publications = []
+            for article in pubmed_client.fetch_article_elements(pmids):
+                pub = self._parse_article(article)
+                if pub:
+                    publications.append(pub)
+            return publications
+        
         publications = []
         
         # Fetch in batches of 100
@@ -289,6 +329,13 @@ class PubMedKOLExtractor:
         
         full_name = f"{first_name} {last_name}".strip()
         
+        # ORCID, when the record carries one (as a bare id or an orcid.org URL)
+        orcid = ""
+        for ident in author_elem.findall("Identifier"):
+            if ident.get("Source") == "ORCID" and ident.text:
+                orcid = ident.text.strip().rsplit("/", 1)[-1]
+                break
+        
         # Get affiliation
         affiliation = ""
         affil_elem = author_elem.find(".//Affiliation")
@@ -308,6 +355,7 @@ class PubMedKOLExtractor:
             initials=initials,
             affiliation=affiliation,
             email=email,
+            orcid=orcid,
             institution=institution,
             department=department,
             city=city,
@@ -398,11 +446,34 @@ class PubMedKOLExtractor:
         month_lower = month_str.lower()[:3]
         return month_map.get(month_lower, 1)
     
+    def sync(self, query: str, max_publications: int = 100) -> list[str]:
+        """
+        Bring the store up to date for a query: search PubMed, fetch and parse
+        only the PMIDs the store has not seen, and record the query's PMIDs.
+        
+        Returns:
+            The query's PMIDs (most relevant first)
+        """
+        print(f"Searching PubMed for: {query}")
+        pmids = self.search(query, max_publications)
+        print(f"Found {len(pmids)} publications")
+        
+        missing = self.store.missing_pmids(pmids)
+        if missing:
+            print(f"Fetching {len(missing)} new articles ({len(pmids) - len(missing)} already stored)...")
+            publications = self.fetch_articles(missing)
+            added = self.store.ingest(publications)
+            print(f"Stored {added} publications")
+        
+        self.store.record_query(query, pmids)
+        return pmids
+    
     def find_kols(
         self,
         query: str,
         max_publications: int = 100,
-        min_publications: int = 2
+        min_publications: int = 2,
+        max_results: Optional[int] = None,
     ) -> list[KOL]:
         """
         Find Key Opinion Leaders for a given search query.
@@ -411,129 +482,18 @@ class PubMedKOLExtractor:
             query: Search query (drug name, indication, etc.)
             max_publications: Maximum publications to analyze
             min_publications: Minimum publications required to be considered a KOL
+            max_results: Return only the top N KOLs (default: all)
             
         Returns:
             List of KOL objects sorted by relevance
         """
-        print(f"Searching PubMed for: {query}")
-        
-        # Search PubMed
-        pmids = self.search(query, max_publications)
-        print(f"Found {len(pmids)} publications")
-        
+        pmids = self.sync(query, max_publications)
         if not pmids:
             return []
         
-        # Fetch article details
-        print("Fetching article details...")
-        publications = self.fetch_articles(pmids)
-        print(f"Parsed {len(publications)} publications")
-        
-        # Aggregate authors
-        author_stats = defaultdict(lambda: {
-            "name": "",
-            "last_name": "",
-            "first_name": "",
-            "email": "",
-            "institution": "",
-            "department": "",
-            "city": "",
-            "country": "",
-            "affiliations": [],
-            "emails": [],
-            "pmids": [],
-            "first_author_count": 0,
-            "last_author_count": 0,
-            "recent_count": 0,
-        })
-        
-        cutoff_year = datetime.now().year - 3
-        
-        for pub in publications:
-            if not pub.authors:
-                continue
-            
-            for i, author in enumerate(pub.authors):
-                # Create a unique key for this author
-                key = f"{author.last_name.lower()}_{author.first_name.lower()[:1]}"
-                
-                stats = author_stats[key]
-                
-                # Update basic info
-                stats["name"] = author.full_name
-                stats["last_name"] = author.last_name
-                stats["first_name"] = author.first_name
-                
-                # Collect affiliations and emails
-                if author.affiliation:
-                    stats["affiliations"].append(author.affiliation)
-                if author.email:
-                    stats["emails"].append(author.email)
-                if author.institution:
-                    stats["institution"] = author.institution
-                if author.department:
-                    stats["department"] = author.department
-                if author.country:
-                    stats["country"] = author.country
-                
-                # Track PMIDs
-                stats["pmids"].append(pub.pmid)
-                
-                # Count author positions
-                if i == 0:  # First author
-                    stats["first_author_count"] += 1
-                if i == len(pub.authors) - 1:  # Last author
-                    stats["last_author_count"] += 1
-                
-                # Count recent publications
-                if pub.publication_date and pub.publication_date.year >= cutoff_year:
-                    stats["recent_count"] += 1
-        
-        # Convert to KOL objects
-        kols = []
-        for key, stats in author_stats.items():
-            pub_count = len(stats["pmids"])
-            
-            if pub_count < min_publications:
-                continue
-            
-            # Pick best email (most common or most recent)
-            email = ""
-            if stats["emails"]:
-                email = max(set(stats["emails"]), key=stats["emails"].count)
-            
-            # Calculate relevance score
-            # Weight: publications + first author bonus + last author bonus + recency
-            relevance = (
-                pub_count * 1.0 +
-                stats["first_author_count"] * 0.5 +
-                stats["last_author_count"] * 0.5 +
-                stats["recent_count"] * 0.3
-            )
-            
-            kol = KOL(
-                name=stats["name"],
-                last_name=stats["last_name"],
-                first_name=stats["first_name"],
-                email=email,
-                institution=stats["institution"],
-                department=stats["department"],
-                city=stats["city"],
-                country=stats["country"],
-                publication_count=pub_count,
-                first_author_count=stats["first_author_count"],
-                last_author_count=stats["last_author_count"],
-                recent_publication_count=stats["recent_count"],
-                pmids=list(set(stats["pmids"])),
-                relevance_score=relevance,
-            )
-            
-            kols.append(kol)
-        
-        # Sort by relevance
-        kols.sort(key=lambda x: x.relevance_score, reverse=True)
-        
-        return kols
+        # Relevance: publications + 0.5 first author + 0.5 last author + 0.3 recent (3 years)
+        rows = self.store.top_kols(pmids, limit=max_results, min_publications=min_publications)
+        return [kol_from_row(row) for row in rows]
     
     def export_kols_to_csv(
         self,
@@ -604,6 +564,11 @@ class PubMedKOLExtractor:
         print(f"Exported {len(kols)} KOLs to {output_path}")
 
 
+def kol_from_row(row: dict) -> KOL:
+    """KOL from a KOLStore.top_kols() row."""
+    return KOL(**{name: row[name] for name in KOL.__dataclass_fields__ if name in row})
+
+
 def find_kols_for_drug(drug_name: str, indication: str = "") -> list[KOL]:
     """
     Convenience function to find KOLs for a specific drug.
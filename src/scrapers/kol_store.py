@@ -0,0 +1,433 @@
+"""
+Persistent KOL (Key Opinion Leader) store
+
+Authors and publications from PubMed kept in a local SQLite database, so KOL
+maps for a whole therapeutic area are built once and then grow
+incrementally instead of being re-fetched and re-aggregated per query.
+
+What it does:
+  - ingest(): adds new publications and assigns every authorship to an
+    author through the disambiguation index (ORCID, then name key plus
+    affiliation terms plus co-author signature); only unseen PMIDs are
+    processed, so re-running a query costs nothing for papers already stored
+  - record_query(): remembers which PMIDs a PubMed query returned, and when
+  - top_kols(): KOL scores for a set of publications as one vectorized
+    aggregation (numpy bincount over the authorship rows) — same weights as
+    PubMedKOLExtractor.find_kols: pubs + 0.5 first + 0.5 last + 0.3 recent
+  - search_kols(): answers a query from the store (its recorded PMIDs, or a
+    full-text match over stored titles / abstracts / MeSH) without PubMed,
+    flagging recorded queries older than KOL_QUERY_TTL as stale so callers
+    re-sync them (a re-sync only fetches PMIDs the store hasn't seen)
+
+Disambiguation: authorships share a name key (normalized last name + first
+initial). Among the authors with that key, an ORCID match wins; otherwise a
+candidate is scored on affiliation-term overlap and shared co-authors, and
+candidates with a conflicting forename are never merged. Below
+KOL_MATCH_THRESHOLD a new author is created — splitting a common name is
+safer than merging two people.
+
+Usage:
+    from src.scrapers.kol_store import KOLStore
+
+    store = KOLStore()
+    store.ingest(publications)                 # list[Publication]
+    kols = store.search_kols("obefazimod ulcerative colitis", limit=20)
+
+Environment:
+    KOL_STORE_PATH          default: <repo>/data/kols/kol_store.db
+    KOL_MATCH_THRESHOLD     minimum evidence score to merge authors (default 0.25)
+    KOL_QUERY_TTL           seconds before a recorded query is stale (default 604800, 7 days)
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+STORE_PATH = Path(os.environ.get("KOL_STORE_PATH", _REPO_ROOT / "data" / "kols" / "kol_store.db"))
+MATCH_THRESHOLD = float(os.environ.get("KOL_MATCH_THRESHOLD", 0.25))
+QUERY_TTL = float(os.environ.get("KOL_QUERY_TTL", 7 * 24 * 3600))
+
+# Same weights as PubMedKOLExtractor.find_kols
+FIRST_AUTHOR_WEIGHT = 0.5
+LAST_AUTHOR_WEIGHT = 0.5
+RECENT_WEIGHT = 0.3
+RECENT_YEARS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    pmid TEXT PRIMARY KEY,
+    title TEXT,
+    abstract TEXT,
+    journal TEXT,
+    pub_year INTEGER,
+    mesh_terms TEXT,
+    keywords TEXT,
+    n_authors INTEGER,
+    added_at TEXT
+);
+CREATE TABLE IF NOT EXISTS authors (
+    author_id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL,
+    last_name TEXT,
+    first_name TEXT,
+    full_name TEXT,
+    orcid TEXT,
+    email TEXT,
+    institution TEXT,
+    department TEXT,
+    city TEXT,
+    country TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_authors_name_key ON authors (name_key);
+CREATE INDEX IF NOT EXISTS idx_authors_orcid ON authors (orcid);
+CREATE TABLE IF NOT EXISTS authorships (
+    pmid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    is_first INTEGER,
+    is_last INTEGER,
+    affiliation TEXT,
+    PRIMARY KEY (pmid, position)
+);
+CREATE INDEX IF NOT EXISTS idx_authorships_author ON authorships (author_id);
+CREATE TABLE IF NOT EXISTS author_terms (
+    author_id INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    n INTEGER DEFAULT 1,
+    PRIMARY KEY (author_id, term)
+);
+CREATE TABLE IF NOT EXISTS author_coauthors (
+    author_id INTEGER NOT NULL,
+    coauthor_key TEXT NOT NULL,
+    n INTEGER DEFAULT 1,
+    PRIMARY KEY (author_id, coauthor_key)
+);
+CREATE TABLE IF NOT EXISTS queries (
+    query_key TEXT PRIMARY KEY,
+    query TEXT,
+    pmids TEXT,
+    synced_at TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+    pmid UNINDEXED, title, abstract, mesh_terms, keywords
+);
+"""
+
+# Words too common in affiliations to tell two people apart
+_AFFIL_STOPWORDS = {
+    "and", "the", "for", "with", "university", "universita", "universitat", "hospital",
+    "department", "dept", "division", "section", "unit", "school", "college", "faculty",
+    "institute", "institut", "center", "centre", "medical", "medicine", "clinical",
+    "research", "sciences", "science", "health", "national", "general", "usa", "china",
+    "germany", "france", "japan", "italy", "spain", "canada", "kingdom", "united",
+    "states", "email", "electronic", "address",
+}
+_TOKEN = re.compile(r"[a-z][a-z\-]{2,}")
+_EMAIL = re.compile(r"\S+@\S+")
+
+
+def _fold(text: str) -> str:
+    """Lowercase ASCII form (accents stripped)."""
+    return unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower().strip()
+
+
+def name_key(last_name: str, first_name: str) -> str:
+    last = re.sub(r"[^a-z]", "", _fold(last_name))
+    first = re.sub(r"[^a-z]", "", _fold(first_name))
+    return f"{last}_{first[:1]}"
+
+
+def affiliation_terms(affiliation: str) -> set[str]:
+    text = _EMAIL.sub(" ", _fold(affiliation))
+    return {t for t in _TOKEN.findall(text) if t not in _AFFIL_STOPWORDS}
+
+
+def forenames_compatible(a: str, b: str) -> bool:
+    """"Bruce E" ~ "Bruce" ~ "B"; "Bruce" vs "Brian" is a conflict."""
+    a_parts, b_parts = _fold(a).replace(".", " ").split(), _fold(b).replace(".", " ").split()
+    if not a_parts or not b_parts:
+        return True
+    x, y = a_parts[0], b_parts[0]
+    if len(x) == 1 or len(y) == 1:
+        return x[0] == y[0]
+    return x == y
+
+
+# One write lock per database file, shared by every KOLStore instance in the
+# process (routers and extractors open a new store per call)
+_write_locks: dict[str, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def _write_lock(path: Path) -> threading.Lock:
+    key = str(path.resolve())
+    with _write_locks_guard:
+        return _write_locks.setdefault(key, threading.Lock())
+
+
+def _query_key(query: str) -> str:
+    return " ".join(_fold(query).split())
+
+
+def _fts_query(query: str) -> str:
+    terms = re.findall(r"[a-z0-9]+", _fold(query))
+    return " ".join(f'"{t}"' for t in terms)
+
+
+class KOLStore:
+    """SQLite-backed author / publication store (one per database file)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or STORE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = _write_lock(self.path)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # -------------------------------------------------------------------------
+    # Ingest
+    # -------------------------------------------------------------------------
+
+    def missing_pmids(self, pmids: list[str]) -> list[str]:
+        """PMIDs not stored yet, in the order given."""
+        with self._connect() as conn:
+            known = {row[0] for row in conn.execute(
+                "SELECT pmid FROM publications WHERE pmid IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(pmids)),))}
+        return [p for p in pmids if p not in known]
+
+    def ingest(self, publications: list) -> int:
+        """Store new publications (Publication objects) and disambiguate their authors."""
+        added = 0
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._connect() as conn:
+            for pub in publications:
+                year = pub.publication_date.year if pub.publication_date else None
+                # OR IGNORE: another process may have stored this PMID since
+                # the caller's missing_pmids() check
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO publications VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (pub.pmid, pub.title, pub.abstract, pub.journal, year,
+                     json.dumps(pub.mesh_terms), json.dumps(pub.keywords), len(pub.authors), now))
+                if inserted.rowcount == 0:
+                    continue
+                conn.execute(
+                    "INSERT INTO publications_fts VALUES (?, ?, ?, ?, ?)",
+                    (pub.pmid, pub.title or "", pub.abstract or "",
+                     " ".join(pub.mesh_terms), " ".join(pub.keywords)))
+                self._ingest_authors(conn, pub)
+                added += 1
+        return added
+
+    def _ingest_authors(self, conn, pub):
+        keys = [name_key(a.last_name, a.first_name) for a in pub.authors]
+        last = len(pub.authors) - 1
+        for position, (author, key) in enumerate(zip(pub.authors, keys)):
+            coauthors = set(keys) - {key}
+            terms = affiliation_terms(author.affiliation)
+            author_id = self._resolve(conn, author, key, terms, coauthors)
+            conn.execute(
+                "INSERT OR REPLACE INTO authorships VALUES (?, ?, ?, ?, ?, ?)",
+                (pub.pmid, position, author_id, int(position == 0), int(position == last and last > 0),
+                 author.affiliation))
+            conn.executemany("""
+                INSERT INTO author_terms (author_id, term) VALUES (?, ?)
+                ON CONFLICT (author_id, term) DO UPDATE SET n = n + 1
+            """, [(author_id, t) for t in terms])
+            conn.executemany("""
+                INSERT INTO author_coauthors (author_id, coauthor_key) VALUES (?, ?)
+                ON CONFLICT (author_id, coauthor_key) DO UPDATE SET n = n + 1
+            """, [(author_id, c) for c in coauthors])
+
+    def _resolve(self, conn, author, key: str, terms: set, coauthors: set) -> int:
+        """Existing author_id for this authorship, or a new author."""
+        orcid = getattr(author, "orcid", "") or ""
+        if orcid:
+            row = conn.execute("SELECT author_id FROM authors WHERE orcid = ?", (orcid,)).fetchone()
+            if row:
+                self._update_profile(conn, row[0], author, orcid)
+                return row[0]
+
+        best_id, best_score = None, 0.0
+        for author_id, first_name, cand_orcid in conn.execute(
+                "SELECT author_id, first_name, orcid FROM authors WHERE name_key = ?", (key,)).fetchall():
+            if orcid and cand_orcid and cand_orcid != orcid:
+                continue
+            if not forenames_compatible(first_name, author.first_name):
+                continue
+            score = self._evidence(conn, author_id, terms, coauthors)
+            if score > best_score:
+                best_id, best_score = author_id, score
+
+        if best_id is not None and best_score >= MATCH_THRESHOLD:
+            self._update_profile(conn, best_id, author, orcid)
+            return best_id
+
+        cur = conn.execute("""
+            INSERT INTO authors (name_key, last_name, first_name, full_name, orcid, email,
+                                 institution, department, city, country)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (key, author.last_name, author.first_name, author.full_name, orcid or None, author.email,
+              author.institution, author.department, author.city, author.country))
+        return cur.lastrowid
+
+    @staticmethod
+    def _evidence(conn, author_id: int, terms: set, coauthors: set) -> float:
+        """Affiliation-term Jaccard plus a bonus per shared co-author (capped at 1)."""
+        known_terms = {r[0] for r in conn.execute(
+            "SELECT term FROM author_terms WHERE author_id = ?", (author_id,))}
+        term_score = len(terms & known_terms) / len(terms | known_terms) if terms and known_terms else 0.0
+        shared = 0
+        if coauthors:
+            shared = conn.execute(
+                "SELECT COUNT(*) FROM author_coauthors WHERE author_id = ? "
+                "AND coauthor_key IN (SELECT value FROM json_each(?))",
+                (author_id, json.dumps(sorted(coauthors)))).fetchone()[0]
+        return min(1.0, term_score + 0.25 * shared)
+
+    @staticmethod
+    def _update_profile(conn, author_id: int, author, orcid: str):
+        """Latest non-empty contact / affiliation details win; a longer forename replaces initials."""
+        conn.execute("""
+            UPDATE authors SET
+                orcid = COALESCE(orcid, NULLIF(?, '')),
+                email = COALESCE(NULLIF(?, ''), email),
+                institution = COALESCE(NULLIF(?, ''), institution),
+                department = COALESCE(NULLIF(?, ''), department),
+                city = COALESCE(NULLIF(?, ''), city),
+                country = COALESCE(NULLIF(?, ''), country),
+                first_name = CASE WHEN length(?) > length(first_name) THEN ? ELSE first_name END,
+                full_name = CASE WHEN length(?) > length(full_name) THEN ? ELSE full_name END
+            WHERE author_id = ?
+        """, (orcid, author.email, author.institution, author.department, author.city, author.country,
+              author.first_name, author.first_name, author.full_name, author.full_name, author_id))
+
+    def record_query(self, query: str, pmids: list[str]):
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?)",
+                         (_query_key(query), query, json.dumps(list(pmids)),
+                          datetime.now().isoformat(timespec="seconds")))
+
+    # -------------------------------------------------------------------------
+    # Read
+    # -------------------------------------------------------------------------
+
+    def query_pmids(self, query: str) -> Optional[list[str]]:
+        """PMIDs recorded for this query, or None if it was never synced."""
+        record = self.query_record(query)
+        return record[0] if record else None
+
+    def query_record(self, query: str) -> Optional[tuple[list[str], datetime]]:
+        """(PMIDs, synced_at) recorded for this query, or None if it was never synced."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT pmids, synced_at FROM queries WHERE query_key = ?",
+                               (_query_key(query),)).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), datetime.fromisoformat(row[1]) if row[1] else datetime.min
+
+    def match_pmids(self, query: str, limit: int = 5000) -> list[str]:
+        """Stored publications matching every query term (title / abstract / MeSH / keywords)."""
+        fts = _fts_query(query)
+        if not fts:
+            return []
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute(
+                "SELECT pmid FROM publications_fts WHERE publications_fts MATCH ? ORDER BY rank LIMIT ?",
+                (fts, limit))]
+
+    def top_kols(self, pmids: list[str], limit: Optional[int] = 20, min_publications: int = 2) -> list[dict]:
+        """KOL profiles ranked by relevance over the given publications."""
+        if not pmids:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT a.author_id, a.pmid, a.is_first, a.is_last, COALESCE(p.pub_year, 0)
+                FROM authorships a JOIN publications p ON p.pmid = a.pmid
+                WHERE a.pmid IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(pmids)),)).fetchall()
+            if not rows:
+                return []
+
+            author_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+            is_first = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+            is_last = np.fromiter((r[3] for r in rows), dtype=np.float64, count=len(rows))
+            years = np.fromiter((r[4] for r in rows), dtype=np.int64, count=len(rows))
+            row_pmids = np.array([r[1] for r in rows], dtype=object)
+
+            ids, inverse = np.unique(author_ids, return_inverse=True)
+            pubs = np.bincount(inverse)
+            first = np.bincount(inverse, weights=is_first)
+            last = np.bincount(inverse, weights=is_last)
+            recent = np.bincount(inverse, weights=(years >= datetime.now().year - RECENT_YEARS).astype(np.float64))
+            score = pubs + FIRST_AUTHOR_WEIGHT * first + LAST_AUTHOR_WEIGHT * last + RECENT_WEIGHT * recent
+
+            eligible = np.flatnonzero(pubs >= min_publications)
+            if eligible.size == 0:
+                return []
+            top = eligible[np.argsort(-score[eligible], kind="stable")[:limit]]
+
+            profiles = {r[0]: r for r in conn.execute("""
+                SELECT author_id, full_name, last_name, first_name, email, institution,
+                       department, city, country, orcid
+                FROM authors WHERE author_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps([int(ids[k]) for k in top]),))}
+
+        kols = []
+        for k in top:
+            p = profiles[int(ids[k])]
+            kols.append({
+                "author_id": int(ids[k]),
+                "name": p[1], "last_name": p[2], "first_name": p[3], "email": p[4] or "",
+                "institution": p[5] or "", "department": p[6] or "", "city": p[7] or "",
+                "country": p[8] or "", "orcid": p[9] or "",
+                "publication_count": int(pubs[k]),
+                "first_author_count": int(first[k]),
+                "last_author_count": int(last[k]),
+                "recent_publication_count": int(recent[k]),
+                "relevance_score": round(float(score[k]), 2),
+                "pmids": sorted(set(row_pmids[inverse == k])),
+            })
+        return kols
+
+    def search_kols(self, query: str, limit: int = 20, min_publications: int = 2) -> dict:
+        """
+        Answer a KOL query from the store alone. Uses the PMIDs recorded for
+        the query when it has been synced, else a full-text match. `stale`
+        is set when the recorded sync is older than QUERY_TTL.
+        """
+        record = self.query_record(query)
+        if record is None:
+            pmids, source, stale = self.match_pmids(query), "match", False
+        else:
+            pmids, synced_at = record
+            source = "query"
+            stale = (datetime.now() - synced_at).total_seconds() > QUERY_TTL
+        return {
+            "kols": self.top_kols(pmids, limit=limit, min_publications=min_publications),
+            "publications": len(pmids),
+            "source": source,
+            "stale": stale,
+        }
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            return {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("publications", "authors", "authorships", "queries")
+            }
@@ -0,0 +1,89 @@
+"""
+Tests for api_connectors' partitioned ClinicalTrials.gov pager.
+
+All tests run offline — ctgov_client.get_json is replaced by a fake that
+pages through canned studies per overall-status slice.
+
+Usage:
+    python -m pytest tests/test_api_connectors.py -v
+"""
+
+import sys
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import pytest
+
+import api_connectors
+
+PAGE_SIZE = 100
+
+
+def _study(nct_id):
+    return {"protocolSection": {"identificationModule": {"nctId": nct_id}}}
+
+
+class FakeCtgov:
+    """Canned studies per status; the unsliced query sees all of them in status order."""
+
+    def __init__(self, by_status):
+        self.by_status = by_status
+        self.calls = []
+
+    def get_json(self, params, timeout=None):
+        self.calls.append(dict(params))
+        statuses = params.get("filter.overallStatus")
+        if statuses:
+            studies = [s for status in statuses.split(",") for s in self.by_status.get(status, [])]
+        else:
+            studies = [s for group in self.by_status.values() for s in group]
+        start = int(params.get("pageToken", 0))
+        end = start + params["pageSize"]
+        page = {"studies": studies[start:end], "totalCount": len(studies)}
+        if end < len(studies):
+            page["nextPageToken"] = str(end)
+        return page
+
+
+@pytest.fixture
+def ctgov(monkeypatch):
+    shared = _study("NCT00000001")  # listed under two statuses
+    fake = FakeCtgov({
+        "RECRUITING": [shared] + [_study(f"NCT1{i:07d}") for i in range(249)],
+        "COMPLETED": [shared] + [_study(f"NCT2{i:07d}") for i in range(119)],
+    })
+    monkeypatch.setattr(api_connectors.ctgov_client, "get_json", fake.get_json)
+    return fake
+
+
+def test_query_within_budget_is_paged_in_order_with_full_coverage(ctgov):
+    trials = api_connectors.search_clinical_trials_paginated(sponsor="Acme", max_pages=10, page_size=PAGE_SIZE)
+    assert len(ctgov.calls) == 4  # 370 rows, probe page included
+    assert not any("filter.overallStatus" in c for c in ctgov.calls)
+    ids = [t["nct_id"] for t in trials]
+    assert len(ids) == len(set(ids)) == 250 + 119  # every trial, the shared one once
+
+
+def test_small_budget_pages_sequentially(ctgov):
+    trials = api_connectors.search_clinical_trials_paginated(sponsor="Acme", max_pages=3, page_size=PAGE_SIZE)
+    assert len(ctgov.calls) == 3
+    assert not any("filter.overallStatus" in c for c in ctgov.calls)
+    assert len(trials) == 299  # 300 rows, the shared study only once
+
+
+def test_oversized_query_is_partitioned_within_budget(ctgov):
+    page_size = 20  # 370 rows > 10 pages of 20
+    trials = api_connectors.search_clinical_trials_paginated(sponsor="Acme", max_pages=10, page_size=page_size)
+    # 1 unsliced probe + 7 slice first pages + the 2 pages left for RECRUITING
+    assert len(ctgov.calls) == 10
+    follow_ups = [c for c in ctgov.calls if "pageToken" in c]
+    assert {c["filter.overallStatus"] for c in follow_ups} == {"RECRUITING"}
+
+    ids = [t["nct_id"] for t in trials]
+    assert len(ids) == len(set(ids))
+    assert ids.count("NCT00000001") == 1
+    # RECRUITING rows 0-59 (probe overlaps the slice) + COMPLETED's first page
+    assert len(ids) == 60 + 19
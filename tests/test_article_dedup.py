@@ -0,0 +1,74 @@
+"""
+Tests for article_dedup (near-duplicate news clustering before extraction).
+
+Usage:
+    python -m pytest tests/test_article_dedup.py -v
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+from article_dedup import article_text, cluster_articles, signature, similarity
+
+NOW = datetime(2026, 6, 1, 9, tzinfo=timezone.utc)
+
+BODY = (
+    "Hengrui Pharma said on Monday it has licensed global rights outside Greater China "
+    "for its oral GLP-1 receptor agonist HRS-7535 to a newly formed US company, receiving "
+    "an upfront payment of 110 million dollars and up to 5.9 billion dollars in milestones. "
+    "The deal also covers two injectable incretin candidates in phase 2 trials for obesity "
+    "and type 2 diabetes, and Hengrui will take an equity stake in the new company."
+)
+
+
+def _article(source, url, title, body, published=NOW, language="en"):
+    return {"source_name": source, "url": url, "title": title, "full_text": body,
+            "published": published, "language": language, "region": "china"}
+
+
+def test_signature_similarity_tracks_overlap():
+    rewrite = BODY.replace("said on Monday", "announced Monday").replace("newly formed", "new")
+    unrelated = "Daiichi Sankyo reported phase 3 results for its HER3 antibody drug conjugate in breast cancer."
+    assert similarity(signature(BODY), signature(BODY)) == 1.0
+    assert similarity(signature(BODY), signature(rewrite)) >= 0.5
+    assert similarity(signature(BODY), signature(unrelated)) < 0.2
+    assert signature("") == []
+
+
+def test_copies_cluster_with_one_representative_and_citations():
+    wire = _article("BioSpectrum Asia", "https://a.example/1", "Hengrui licenses GLP-1 portfolio", BODY[:300])
+    full = _article("Fierce Biotech", "https://b.example/2", "Hengrui licenses GLP-1 portfolio", BODY)
+    other = _article("Korea Biomedical Review", "https://c.example/3", "Celltrion files biosimilar",
+                     "Celltrion filed a biosimilar application for denosumab with the Korean ministry.")
+
+    clusters = cluster_articles([wire, other, full])
+    assert len(clusters) == 2
+    story = clusters[0]
+    assert story.representative is full
+    assert [c["source_name"] for c in full["citations"]] == ["BioSpectrum Asia"]
+    assert wire["cluster_key"] == full["cluster_key"] != other["cluster_key"]
+    assert clusters[1].representative is other and other["citations"] == []
+
+
+def test_time_window_and_prior_stories():
+    first = _article("Endpoints", "https://a.example/1", "Hengrui deal", BODY)
+    later = _article("BioWorld", "https://b.example/2", "Hengrui deal", BODY, published=NOW + timedelta(days=10))
+    assert len(cluster_articles([first, later], window_hours=72)) == 2
+
+    prior = [("stored-key", signature(article_text(first)), NOW - timedelta(hours=5))]
+    copy = _article("BioWorld", "https://b.example/2", "Hengrui deal", BODY)
+    clusters = cluster_articles([copy], prior=prior)
+    assert len(clusters) == 1 and clusters[0].prior
+    assert clusters[0].representative is None
+    assert copy["cluster_key"] == "stored-key"
+
+
+def test_cjk_text_is_shingled_per_character():
+    zh = "恒瑞医药宣布将其口服GLP-1受体激动剂HRS-7535的海外权益授权给一家新成立的美国公司，首付款1.1亿美元。"
+    near = zh.replace("宣布", "表示")
+    assert similarity(signature(zh), signature(near)) >= 0.5
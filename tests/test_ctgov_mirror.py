@@ -0,0 +1,133 @@
+"""
+Tests for ctgov_mirror (local SQLite/FTS5 copy of ClinicalTrials.gov).
+
+All tests run offline against a temporary database.
+
+Usage:
+    python -m pytest tests/test_ctgov_mirror.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import ctgov_mirror
+
+
+def _study(nct_id, title, conditions, interventions, sponsor, phases, status, countries, updated):
+    return {
+        "protocolSection": {
+            "identificationModule": {"nctId": nct_id, "briefTitle": title},
+            "statusModule": {
+                "overallStatus": status,
+                "lastUpdatePostDateStruct": {"date": updated},
+            },
+            "designModule": {"phases": phases, "studyType": "INTERVENTIONAL"},
+            "sponsorCollaboratorsModule": {"leadSponsor": {"name": sponsor}},
+            "conditionsModule": {"conditions": conditions},
+            "armsInterventionsModule": {
+                "interventions": [{"name": n, "type": "DRUG"} for n in interventions],
+            },
+            "contactsLocationsModule": {
+                "locations": [{"facility": "Site", "country": c} for c in countries],
+            },
+        }
+    }
+
+
+STUDIES = [
+    _study("NCT00000001", "Obefazimod in Ulcerative Colitis", ["Ulcerative Colitis"], ["Obefazimod"],
+           "Abivax", ["PHASE3"], "RECRUITING", ["United States", "Japan"], "2025-03-01"),
+    _study("NCT00000002", "Tulisokibart in Crohn's Disease", ["Crohn Disease"], ["Tulisokibart"],
+           "Merck Sharp & Dohme LLC", ["PHASE2"], "COMPLETED", ["Germany"], "2024-11-15"),
+    _study("NCT00000003", "GLP-1 agonist in obesity", ["Obesity"], ["Semaglutide"],
+           "Novo Nordisk A/S", ["PHASE2", "PHASE3"], "ACTIVE_NOT_RECRUITING", ["China"], "2025-06-30"),
+]
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    db = tmp_path / "mirror.db"
+    monkeypatch.setattr(ctgov_mirror, "MIRROR_PATH", db)
+    monkeypatch.setattr(ctgov_mirror, "MIRROR_MODE", "auto")
+    count, latest = ctgov_mirror.upsert_studies(STUDIES)
+    ctgov_mirror._record_sync(ctgov_mirror._connect(), latest)
+    ctgov_mirror._invalidate_status()
+    yield db
+    ctgov_mirror._invalidate_status()
+
+
+def _ids(studies):
+    return [s["protocolSection"]["identificationModule"]["nctId"] for s in studies]
+
+
+def test_search_filters(mirror):
+    assert _ids(ctgov_mirror.search_studies(condition="ulcerative colitis")) == ["NCT00000001"]
+    assert _ids(ctgov_mirror.search_studies(sponsor="merck")) == ["NCT00000002"]
+    assert _ids(ctgov_mirror.search_studies(phase="PHASE3", country="china")) == ["NCT00000003"]
+    assert _ids(ctgov_mirror.search_studies(term="GLP-1")) == ["NCT00000003"]
+    assert ctgov_mirror.search_studies(intervention="obefazimod", status="COMPLETED") == []
+
+
+def test_answer_matches_api_shape_and_pages(mirror):
+    body = ctgov_mirror.answer({"pageSize": 2, "countTotal": "true",
+                                "sort": "LastUpdatePostDate:desc"})
+    assert body["totalCount"] == 3
+    assert _ids(body["studies"]) == ["NCT00000003", "NCT00000001"]
+    page2 = ctgov_mirror.answer({"pageSize": 2, "pageToken": body["nextPageToken"],
+                                 "sort": "LastUpdatePostDate:desc"})
+    assert _ids(page2["studies"]) == ["NCT00000002"]
+    assert "nextPageToken" not in page2
+
+
+def test_answer_handles_country_and_update_window(mirror):
+    # The delta fetch build_landscape runs when refreshing a stored landscape
+    advanced = ('(AREA[LocationCountry] "Japan" OR AREA[LocationCountry] "China") '
+                'AND (AREA[LastUpdatePostDate]RANGE[2025-04-01,MAX])')
+    assert _ids(ctgov_mirror.answer({"filter.advanced": advanced})["studies"]) == ["NCT00000003"]
+
+
+def test_advanced_and_within_one_field_goes_live(mirror):
+    # The API intersects "Japan AND China"; the mirror can only OR one field
+    both = 'AREA[LocationCountry] "Japan" AND AREA[LocationCountry] "United States"'
+    assert ctgov_mirror.answer({"filter.advanced": both}) is None
+    assert ctgov_mirror.answer({"filter.advanced": 'AREA[Phase] "PHASE2"', "filter.phase": "PHASE3"}) is None
+    two_ranges = ("AREA[LastUpdatePostDate]RANGE[2025-01-01,MAX] AND "
+                  "AREA[LastUpdatePostDate]RANGE[MIN,2025-04-01]")
+    assert ctgov_mirror.answer({"filter.advanced": two_ranges}) is None
+    mixed = 'AREA[LocationCountry] "Japan" OR AREA[Phase] "PHASE2"'
+    assert ctgov_mirror.answer({"filter.advanced": mixed}) is None
+
+    # Distinct fields ANDed together are intersected locally
+    spec = ctgov_mirror._translate({"filter.advanced": 'AREA[LocationCountry] "Japan" AND AREA[Phase] "PHASE3"'})
+    assert spec["countries"] == ["Japan"] and spec["phases"] == ["PHASE3"]
+
+
+def test_answer_defers_to_live_api(mirror):
+    # Unsupported advanced syntax, foreign page tokens and empty first pages go upstream
+    assert ctgov_mirror.answer({"filter.advanced": "AREA[MinimumAge]RANGE[18,MAX]"}) is None
+    assert ctgov_mirror.answer({"query.cond": "obesity", "pageToken": "NF0g5JSK"}) is None
+    assert ctgov_mirror.answer({"query.cond": "psoriasis"}) is None
+    assert ctgov_mirror.answer(nct_id="nct00000002")["protocolSection"]
+
+
+def test_upsert_replaces_existing_record(mirror):
+    updated = _study("NCT00000002", "Tulisokibart in Crohn's Disease", ["Crohn Disease"],
+                     ["Tulisokibart"], "Merck Sharp & Dohme LLC", ["PHASE3"], "RECRUITING",
+                     ["Germany"], "2025-07-01")
+    ctgov_mirror.upsert_studies([updated])
+    assert _ids(ctgov_mirror.search_studies(intervention="tulisokibart", phase="PHASE3")) == ["NCT00000002"]
+    assert ctgov_mirror.get_status()["studies"] == 3
+
+
+def test_stale_mirror_is_skipped_in_auto_mode(mirror, monkeypatch):
+    monkeypatch.setattr(ctgov_mirror, "MAX_AGE_HOURS", -1)
+    ctgov_mirror._invalidate_status()
+    assert not ctgov_mirror.is_available()
+    monkeypatch.setattr(ctgov_mirror, "MIRROR_MODE", "only")
+    assert ctgov_mirror.is_available()
@@ -0,0 +1,177 @@
+"""
+Tests for drug_entities' pooled lookups and in-process caches.
+
+All tests run offline — the connection pool is a stub, no database needed.
+
+Usage:
+    python -m pytest tests/test_drug_entities.py -v
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import pytest
+
+drug_entities = pytest.importorskip("drug_entities", exc_type=ImportError)  # needs psycopg2 + a DB URL
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+class _Conn:
+    closed = 0
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, cursor_factory=None):
+        return _Cursor(self.rows)
+
+    def rollback(self):
+        pass
+
+
+class _Pool:
+    """Mimics ThreadedConnectionPool: raises once maxconn connections are out."""
+
+    def __init__(self, maxconn, rows=()):
+        self.maxconn, self.rows = maxconn, list(rows)
+        self.out = self.peak = 0
+        self.lock = threading.Lock()
+
+    def getconn(self):
+        with self.lock:
+            if self.out >= self.maxconn:
+                raise drug_entities.PoolError("connection pool exhausted")
+            self.out += 1
+            self.peak = max(self.peak, self.out)
+        return _Conn(self.rows)
+
+    def putconn(self, conn, close=False):
+        with self.lock:
+            self.out -= 1
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = _Pool(maxconn=2, rows=[{"drug_id": 1, "alias": "Keytruda", "canonical_name": "pembrolizumab"}])
+    monkeypatch.setattr(drug_entities, "_get_pool", lambda: pool)
+    monkeypatch.setattr(drug_entities, "_pool_slots", threading.BoundedSemaphore(2))
+    return pool
+
+
+def _in_threads(fn, n=8):
+    errors = []
+
+    def run():
+        try:
+            fn()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def test_callers_beyond_pool_size_wait_instead_of_failing(pool):
+    errors = _in_threads(lambda: drug_entities._with_pooled_cursor(lambda cur: time.sleep(0.02)))
+    assert errors == []
+    assert pool.peak == 2 and pool.out == 0
+
+
+def test_pool_wait_times_out_with_pool_error(pool, monkeypatch):
+    monkeypatch.setattr(drug_entities, "_pool_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(drug_entities, "DRUG_DB_POOL_WAIT", 0.01)
+    drug_entities._pool_slots.acquire()
+    with pytest.raises(drug_entities.PoolError):
+        drug_entities._with_pooled_cursor(lambda cur: None)
+
+
+def test_expired_alias_index_is_reloaded_once(pool, monkeypatch):
+    loads = []
+    real_load = drug_entities._load_alias_index
+
+    def slow_load():
+        loads.append(1)
+        time.sleep(0.05)
+        return real_load()
+
+    monkeypatch.setattr(drug_entities, "_load_alias_index", slow_load)
+    drug_entities.invalidate_drug_cache()
+    assert _in_threads(drug_entities.get_alias_entries) == []
+    assert len(loads) == 1
+
+    # Once an index exists, an expired one is refreshed by one thread while
+    # the rest keep serving the stale copy
+    monkeypatch.setattr(drug_entities, "_alias_index_loaded_at", 1.0)
+    results = []
+    assert _in_threads(lambda: results.append(drug_entities.get_alias_entries())) == []
+    assert len(loads) == 2
+    assert all(r == [("Keytruda", 1, "pembrolizumab")] for r in results)
+
+
+class _ClosureCursor:
+    def __init__(self, stored):
+        self.stored = stored
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchone(self):
+        return {"present": self.stored is not None}
+
+    def fetchall(self):
+        return [{"ancestor_id": a, "descendant_id": d, "depth": depth} for a, d, depth in self.stored]
+
+
+def test_closure_check_compares_rows_not_a_checksum():
+    tree = drug_entities.TargetTree([(1, "KRAS", None), (32, "KRAS G12C", 1)], [])
+    assert drug_entities._closure_matches(_ClosureCursor([(1, 1, 0), (1, 32, 1), (32, 32, 0)]), tree)
+    # Same row count and same additive sum (31*1 + 32 == 31*2 + 1), different rows
+    assert not drug_entities._closure_matches(_ClosureCursor([(1, 1, 0), (2, 1, 1), (32, 32, 0)]), tree)
+    assert not drug_entities._closure_matches(_ClosureCursor(None), tree)
+
+
+def test_stale_target_tree_is_reloaded_once_and_closure_written_once(monkeypatch):
+    tree = drug_entities.TargetTree([(1, "KRAS", None)], [])
+    loads, writes = [], []
+
+    def load(fn):
+        loads.append(1)
+        time.sleep(0.05)
+        return tree, False
+
+    monkeypatch.setattr(drug_entities, "_with_pooled_cursor", load)
+    monkeypatch.setattr(drug_entities, "sync_target_closure", lambda t: writes.append(t) or True)
+    monkeypatch.setattr(drug_entities, "_target_tree", None)
+    assert _in_threads(drug_entities.get_target_tree) == []
+    assert len(loads) == 1 and writes == [tree]
+
+    monkeypatch.setattr(drug_entities, "_target_tree_loaded_at", 1.0)
+    results = []
+    assert _in_threads(lambda: results.append(drug_entities.get_target_tree())) == []
+    assert len(loads) == 2 and all(r is tree for r in results)
@@ -0,0 +1,132 @@
+"""
+Tests for drug_matcher (compiled alias / DRUG_PATTERNS matcher).
+
+All tests run offline — pure Python.
+
+Usage:
+    python -m pytest tests/test_drug_matcher.py -v
+"""
+
+import re
+import sys
+import random
+from difflib import SequenceMatcher
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import drug_matcher
+from drug_matcher import AhoCorasick, AliasMatcher, FuzzyIndex, PatternMatcher, expand_literal_pattern
+
+
+PATTERNS = {
+    r'\b(semaglutide)\b': ("semaglutide", "GLP-1"),
+    r'\b(tirzepatide|LY3298176)\b': ("tirzepatide", "GLP-1/GIP"),
+    r'\b(CagriSema|cagrilintide)\b': ("CagriSema", "GLP-1+amylin"),
+    r'\b(sitagliptin|[Jj]anuvia)\b': ("sitagliptin", "DPP-4"),
+    r'\b(CMK-?389)\b': ("CMK-389", "IL-18"),
+    r'\b(difamilast|MOH[- ]?22)\b': ("difamilast", "PDE4 (topical)"),
+    r'\b(ABBV-\d+)\b': ("ABBV code", "unknown"),      # not a literal set → regex fallback
+}
+
+
+def test_aho_corasick_finds_overlapping_keys():
+    ac = AhoCorasick()
+    for key in ("he", "she", "his", "hers"):
+        ac.add(key, key)
+    found = sorted((s, e, v) for s, e, v in ac.iter("ushers"))
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_expand_literal_pattern():
+    assert sorted(expand_literal_pattern(r'\b(CMK-?389)\b')) == [
+        ("CMK-389", True, True), ("CMK389", True, True),
+    ]
+    assert expand_literal_pattern(r'\b(ABBV-\d+)\b') is None
+
+
+def test_pattern_matcher_agrees_with_per_pattern_regex():
+    matcher = PatternMatcher(PATTERNS)
+    texts = [
+        "Semaglutide vs tirzepatide in obesity",
+        "CagriSema (cagrilintide/semaglutide) phase 3",
+        "JANUVIA add-on study",
+        "CMK389 and CMK-389 dose escalation",
+        "MOH 22 cream; MOH-22 gel; moh22",
+        "semaglutides are not a word-boundary match",
+        "ABBV-400 in colorectal cancer",
+        "no drugs here",
+    ]
+    for text in texts:
+        expected = [i for i, p in enumerate(PATTERNS) if re.search(p, text, re.IGNORECASE)]
+        assert matcher.matches(text) == expected, text
+
+
+def test_alias_matcher_prefers_exact_then_longest_substring():
+    alias_map = {
+        "vivitrol": "VIVITROL",
+        "naltrexone": "VIVITROL",
+        "naltrexone xr": "VIVITROL XR",
+        "semaglutide": "Ozempic",
+    }
+    matcher = AliasMatcher(alias_map)
+    assert matcher.normalize("Vivitrol") == "VIVITROL"
+    assert matcher.normalize("Naltrexone XR (extended release)") == "VIVITROL XR"
+    assert matcher.normalize("oral semaglutide 14 mg") == "Ozempic"
+    assert matcher.normalize("Placebo") == "Placebo"
+
+
+def test_shared_matcher_rebuilds_when_table_changes():
+    table = dict(PATTERNS)
+    first = drug_matcher.get_pattern_matcher(table, name="test")
+    assert drug_matcher.get_pattern_matcher(table, name="test") is first
+    table[r'\b(orforglipron)\b'] = ("orforglipron", "GLP-1 (oral)")
+    rebuilt = drug_matcher.get_pattern_matcher(table, name="test")
+    assert rebuilt is not first
+    assert rebuilt.payloads("orforglipron QD") == [("orforglipron", "GLP-1 (oral)")]
+
+
+def test_inn_mentions():
+    text = "Nemolizumab vs dupilumab, then KT-621 or abrocitinib"
+    assert drug_matcher.find_inn_mentions(text) == ["Nemolizumab", "dupilumab", "abrocitinib"]
+    assert drug_matcher.CODE_NAME_PATTERN.match("KT-621")
+
+
+def _scan_best(keys, query, threshold):
+    best, best_score = None, 0.0
+    for key in keys:
+        score = SequenceMatcher(None, query, key).ratio()
+        if score > best_score:
+            best, best_score = key, score
+    return (best, best_score) if best and best_score >= threshold else None
+
+
+def test_fuzzy_index_agrees_with_full_scan():
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz-0123456789"
+    keys = list(dict.fromkeys(
+        "".join(rng.choice(letters[:26]) for _ in range(rng.randint(1, 12))) + rng.choice(["mab", "tinib", ""])
+        for _ in range(1500)
+    ))
+    keys += ["gilteritinib", "asp2215", "xospata"]
+    index = FuzzyIndex(keys)
+
+    queries = ["giltertinib", "ASP-2215".lower(), "xospatta", "", "a", "zzzzzzzzzzzz"]
+    for _ in range(60):
+        chars = list(rng.choice(keys))
+        i = rng.randrange(len(chars))
+        chars[i:i + 1] = rng.choice(([], [rng.choice(letters)], [chars[i], rng.choice(letters)]))
+        queries.append("".join(chars))
+
+    for threshold in (0.85, 0.7):
+        for query in queries:
+            assert index.best(query, threshold) == _scan_best(keys, query, threshold), (query, threshold)
+
+
+def test_fuzzy_index_keeps_first_insertion_on_ties():
+    index = FuzzyIndex(["abcx", "abcy"])
+    index.add("abcx")  # re-adding doesn't move it
+    assert index.best("abcz", 0.7) == ("abcx", 0.75)
+    assert len(index) == 2
@@ -0,0 +1,40 @@
+"""
+Tests for enrichment_agent (CT.gov + Claude enrichment of mined candidates).
+
+The search router imports this module at startup and only tolerates
+ImportError, so a module-level NameError takes the whole app down — these
+tests import it for real. All tests run offline.
+
+Usage:
+    python -m pytest tests/test_enrichment_agent.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+pytest.importorskip("dotenv")
+
+import ctgov_client
+import enrichment_agent
+
+
+def test_module_imports_and_uses_the_shared_ctgov_client():
+    assert enrichment_agent.CTGOV_BASE == ctgov_client.CTGOV_BASE
+
+
+def test_lookup_goes_through_ctgov_client(monkeypatch):
+    calls = []
+
+    def fake_get_json(params, timeout=None):
+        calls.append(params)
+        return {"studies": []}
+
+    monkeypatch.setattr(ctgov_client, "get_json", fake_get_json)
+    assert enrichment_agent.lookup_drug_on_ctgov("BG-68501", max_results=5) is None
+    assert [c.get("query.intr") or c.get("query.term") for c in calls] == ["BG-68501", "BG-68501", "BG68501", "BG68501"]
@@ -0,0 +1,102 @@
+"""
+Tests for EntityResolver.resolve_many (batch drug-name resolution).
+
+All tests run offline — the database step uses a fake connection.
+
+Usage:
+    python -m pytest tests/test_entity_resolver.py -v
+"""
+
+import sys
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+from entity_resolver import EntityResolver
+
+
+ALIASES = {
+    "pembrolizumab": "pembrolizumab",
+    "Keytruda": "pembrolizumab",
+    "MK-3475": "pembrolizumab",
+    "gilteritinib": "gilteritinib",
+    "ASP2215": "gilteritinib",
+    "AZD5363": "capivasertib",
+}
+
+
+class FakeConnection:
+    """Answers the resolver's set-based alias query from a dict."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def cursor(self, cursor_factory=None):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.queries.append(params)
+
+    def fetchall(self):
+        names = set(self.queries[-1][0])
+        return [
+            {"name": name, "drug_id": drug_id, "canonical_name": canonical}
+            for name, (drug_id, canonical) in self.rows.items() if name in names
+        ]
+
+
+def test_resolve_many_dedupes_and_reports_strategies():
+    batch = EntityResolver.from_aliases(ALIASES).resolve_many(
+        ["Keytruda", " keytruda ", "KEYTRUDA", "gilteritinb", "unknownib", "", None]
+    )
+    assert batch.get("keytruda").canonical_name == "pembrolizumab"
+    assert batch.get("Gilteritinb").match_method == "fuzzy"
+    assert batch.get("unknownib") is None
+    assert batch.stats == {
+        "inputs": 7, "unique": 3, "exact_alias": 1, "database": 0,
+        "fuzzy": 1, "unresolved": 1, "queries": 0,
+    }
+    assert [u.input_text for u in batch.unresolved] == ["unknownib"]
+
+
+def test_fuzzy_match_agrees_with_resolve_drug():
+    resolver = EntityResolver.from_aliases(ALIASES)
+    names = ["pembrolizumb", "Keytrudah", "gilteritnib", "MK3475"]
+    batch = resolver.resolve_many(names)
+    for name in names:
+        single = resolver.resolve_drug(name)
+        assert batch.get(name).entity_id == single.entity_id
+        assert batch.get(name).confidence == single.confidence
+
+
+def test_fuzzy_never_merges_codes_with_different_digits():
+    batch = EntityResolver.from_aliases(ALIASES).resolve_many(["AZD5365", "ASP2216"], context="ASCO abstract")
+    assert batch.resolved == {}
+    review = {u.input_text: u for u in batch.unresolved}
+    assert review["AZD5365"].candidates[0]["alias"] == "azd5363"
+    assert review["AZD5365"].context == "ASCO abstract"
+
+
+def test_database_misses_resolved_in_one_query_and_cached():
+    conn = FakeConnection({"sotorasib": (7, "sotorasib"), "amg 510": (7, "sotorasib")})
+    resolver = EntityResolver()
+    resolver.connect(conn, load_caches=False)
+
+    batch = resolver.resolve_many(["Sotorasib", "AMG 510", "adagrasib", "sotorasib"], fuzzy=False)
+    assert len(conn.queries) == 1
+    assert sorted(conn.queries[0][0]) == ["adagrasib", "amg 510", "sotorasib"]
+    assert batch.get("AMG 510").entity_id == "7"
+    assert batch.stats["database"] == 2 and batch.stats["unresolved"] == 1
+
+    again = resolver.resolve_many(["amg 510"])
+    assert again.stats["exact_alias"] == 1 and again.stats["queries"] == 0
+    assert len(conn.queries) == 1
@@ -0,0 +1,118 @@
+"""
+Tests for feed_harvester (concurrent, per-host-polite, conditional-GET fetching).
+
+All tests run offline — the HTTP session is replaced with a fake.
+
+Usage:
+    python -m pytest tests/test_feed_harvester.py -v
+"""
+
+import sys
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import feed_harvester
+from feed_harvester import HostLimiter, fetch_many, run_sync
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Serves canned responses and records request headers and start times."""
+
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, allow_redirects=True):
+        with self._lock:
+            self.calls.append((url, dict(headers or {}), time.monotonic()))
+        time.sleep(self.delay)
+        route = self.routes[url]
+        if isinstance(route, Exception):
+            raise route
+        return route(headers or {}) if callable(route) else route
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(feed_harvester, "CACHE_DIR", tmp_path / "feeds")
+    fake = FakeSession({})
+    monkeypatch.setattr(feed_harvester, "get_session", lambda: fake)
+    return fake
+
+
+def test_conditional_get_reuses_stored_body_on_304(session):
+    url = "https://www.fiercebiotech.com/rss/xml"
+
+    def feed(headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, "<rss>v1</rss>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jun 2026 00:00:00 GMT"})
+
+    session.routes[url] = feed
+    first = run_sync(fetch_many([url], conditional=True))[url]
+    second = run_sync(fetch_many([url], conditional=True))[url]
+
+    assert (first.status, first.not_modified) == (200, False)
+    assert (second.status, second.not_modified, second.body) == (304, True, "<rss>v1</rss>")
+    assert session.calls[1][1]["If-Modified-Since"] == "Mon, 01 Jun 2026 00:00:00 GMT"
+
+
+def test_errors_are_reported_per_url_and_duplicates_fetched_once(session):
+    ok, missing = "https://a.example/feed", "https://b.example/feed"
+    session.routes.update({ok: FakeResponse(200, "body"), missing: FakeResponse(404)})
+    pages = run_sync(fetch_many([ok, missing, ok]))
+    assert list(pages) == [ok, missing]
+    assert pages[ok].ok and not pages[missing].ok
+    assert pages[missing].error == "HTTP 404"
+    assert len(session.calls) == 2
+
+
+def test_certificate_errors_fail_the_fetch(session):
+    url = "https://bad-cert.example/feed"
+    session.routes[url] = feed_harvester.requests.exceptions.SSLError("certificate verify failed")
+    page = run_sync(fetch_many([url]))[url]
+    assert not page.ok and "certificate verify failed" in page.error
+    assert len(session.calls) == 1
+
+
+def test_politeness_is_per_host(session):
+    session.delay = 0.05
+    same_host = [f"https://endpts.com/article-{i}" for i in range(3)]
+    other_hosts = [f"https://site{i}.example/article" for i in range(3)]
+    for url in same_host + other_hosts:
+        session.routes[url] = FakeResponse(200, "ok")
+
+    run_sync(fetch_many(same_host + other_hosts, limiter=HostLimiter(per_host=1, interval=0.1)))
+    starts = {url: started for url, _, started in session.calls}
+
+    same = sorted(starts[u] for u in same_host)
+    assert all(later - earlier >= 0.09 for earlier, later in zip(same, same[1:]))
+    others = sorted(starts[u] for u in other_hosts)
+    assert others[-1] - others[0] < 0.05
+
+
+def test_run_sync_works_inside_a_running_loop(session):
+    url = "https://a.example/feed"
+    session.routes[url] = FakeResponse(200, "body")
+
+    async def caller():
+        return run_sync(fetch_many([url]))[url].body
+
+    assert asyncio.run(caller()) == "body"
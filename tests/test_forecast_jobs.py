@@ -0,0 +1,99 @@
+"""
+Tests for forecast_jobs (process-pool simulation lanes with timeouts).
+
+Runs real spawn-context worker processes with stand-in simulation
+functions; no network or database.
+
+Usage:
+    python -m pytest tests/test_forecast_jobs.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import forecast_jobs
+
+
+def _worker_pid(session, params):
+    if params == "slow":
+        time.sleep(30)
+    return os.getpid()
+
+
+@pytest.fixture
+def lanes(monkeypatch):
+    monkeypatch.setattr(forecast_jobs, "FORECAST_WORKERS", 2)
+    monkeypatch.setattr(forecast_jobs, "simulate_session", _worker_pid)
+    yield
+    forecast_jobs.shutdown_pool()
+
+
+def test_session_recomputes_stay_on_one_worker(lanes):
+    session = SimpleNamespace(session_id="NCT05202860")
+
+    async def scenario():
+        return [await forecast_jobs.run_session(session, None, timeout=60) for _ in range(3)]
+
+    pids = asyncio.run(scenario())
+    assert len(set(pids)) == 1 and pids[0] != os.getpid()
+    assert forecast_jobs._lane_for("NCT05202860") == forecast_jobs._lane_for("NCT05202860")
+
+
+def test_timed_out_simulation_has_its_worker_replaced(lanes):
+    session = SimpleNamespace(session_id="NCT00000001")
+
+    async def scenario():
+        first = await forecast_jobs.run_session(session, None, timeout=60)
+        with pytest.raises(asyncio.TimeoutError):
+            await forecast_jobs.run_session(session, "slow", timeout=0.5)
+        return first, await forecast_jobs.run_session(session, None, timeout=60)
+
+    before, after = asyncio.run(scenario())
+    assert before != after
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            os.kill(before, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("timed-out worker is still running")
+
+
+def test_job_timeout_terminates_the_running_worker(lanes, monkeypatch):
+    session = SimpleNamespace(session_id="NCT00000002")
+    monkeypatch.setattr(forecast_jobs, "_semaphore", None)
+
+    async def source():
+        await forecast_jobs.run_session(session, "slow", timeout=60)  # outlives the job
+        yield ("result", {})
+
+    async def scenario():
+        pid = await forecast_jobs.run_session(session, None, timeout=60)  # warm the lane
+        job = forecast_jobs.ForecastJob(job_id="j1", query="q", timeout=1.0, _source=source)
+        await forecast_jobs._run_job(job)
+        return pid, job
+
+    pid, job = asyncio.run(scenario())
+    assert job.status == "error" and "timed out" in job.error
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("worker of the timed-out job is still running")
+    assert forecast_jobs._lane_for(session.session_id) not in forecast_jobs._lanes
@@ -0,0 +1,134 @@
+"""
+Benchmark / regression tests for the trial forecaster hot path.
+
+Runs forecast_benchmark over its fixture trials (TTE, binary, continuous)
+and compares against tests/data/forecaster_benchmark_baseline.json: stage
+wall time (scaled by a machine-speed calibration), peak memory, and seeded
+PoS within Monte Carlo noise. All offline.
+
+Wall time and memory depend on the machine and its load, so those budget
+checks only run when FORECASTER_BENCHMARK=1; the default suite keeps the
+seeded, deterministic checks.
+
+Re-record the baseline after an intentional change:
+    cd backend/services/search && python3 forecast_benchmark.py --update-baseline
+
+Usage:
+    python -m pytest tests/test_forecaster_benchmark.py -v
+    FORECASTER_BENCHMARK=1 python -m pytest tests/test_forecaster_benchmark.py -v
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import forecast_benchmark
+from forecast_benchmark import FIXTURES, build_fixture, compare, load_baseline, run_benchmarks
+from trial_forecaster import MonteCarloSimulator, SimulationParams, simulate_trial
+
+benchmark_only = pytest.mark.skipif(
+    os.environ.get("FORECASTER_BENCHMARK") != "1",
+    reason="timing/memory budgets are machine-dependent; set FORECASTER_BENCHMARK=1",
+)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    data = load_baseline()
+    if data is None:
+        pytest.skip("no forecaster benchmark baseline recorded")
+    return data
+
+
+@pytest.fixture(scope="module")
+def report():
+    return run_benchmarks()
+
+
+def _failures(report, baseline, kind):
+    return [f for f in compare(report, baseline) if kind in f]
+
+
+def test_fixtures_cover_every_endpoint_type():
+    types = {build_fixture(name)["trial"].primary_endpoint.endpoint_type for name in FIXTURES}
+    assert len(types) == 3
+
+
+def test_pos_within_monte_carlo_noise(report, baseline):
+    assert _failures(report, baseline, "PoS") == []
+
+
+def test_pos_stable_across_iteration_counts(report):
+    by_fixture = {}
+    for case in report["cases"]:
+        by_fixture.setdefault(case["fixture"], []).append(case)
+    for cases in by_fixture.values():
+        small, large = min(cases, key=lambda c: c["n_iterations"]), max(cases, key=lambda c: c["n_iterations"])
+        assert abs(small["probability_of_success"] - large["probability_of_success"]) <= (
+            forecast_benchmark.POS_SIGMAS * small["pos_standard_error"] + 1e-9
+        )
+
+
+@benchmark_only
+def test_stage_times_within_budget(report, baseline):
+    assert _failures(report, baseline, " ms > budget") == []
+
+
+@benchmark_only
+def test_peak_memory_within_budget(report, baseline):
+    assert _failures(report, baseline, " MB > budget") == []
+
+
+def test_same_seed_reproduces_forecast():
+    inputs = build_fixture("tte_cv_outcomes")
+    args = (inputs["trial"], inputs["blended_effect"], inputs["event_projection"], inputs["endpoint_model"])
+    first = simulate_trial(*args, n_iterations=20000, seed=11)
+    second = simulate_trial(*args, n_iterations=20000, seed=11)
+    assert first.probability_of_success == second.probability_of_success
+    assert first.sensitivity == second.sensitivity
+    assert first.seed == 11
+
+
+def test_adaptive_run_meets_target_and_matches_fixed_prefix():
+    inputs = build_fixture("continuous_change")
+    args = (inputs["trial"], inputs["blended_effect"], inputs["event_projection"], inputs["endpoint_model"])
+    adaptive = simulate_trial(*args, n_iterations=100000, target_se=0.006, seed=5)
+    assert adaptive.converged and adaptive.pos_standard_error <= 0.006
+    assert adaptive.n_iterations < 100000
+
+    fixed = simulate_trial(*args, n_iterations=adaptive.n_iterations, seed=5)
+    assert fixed.probability_of_success == adaptive.probability_of_success
+
+
+def test_adaptive_run_does_not_stop_on_a_certain_first_chunk():
+    inputs = build_fixture("tte_cv_outcomes")
+    args = (inputs["trial"], inputs["blended_effect"], inputs["event_projection"], inputs["endpoint_model"])
+    simulator = MonteCarloSimulator(n_iterations=100000, target_se=0.006, chunk_size=50, seed=3)
+    result = simulator.run_simulation(*args, SimulationParams(effect_scale=0.2), _skip_sensitivity=True)
+    assert result.probability_of_success == 1.0
+    assert result.n_iterations > 50 and 0 < result.pos_standard_error <= 0.006
+
+
+def test_adaptive_run_reuses_its_chunks(monkeypatch):
+    inputs = build_fixture("continuous_change")
+    args = (inputs["trial"], inputs["blended_effect"], inputs["event_projection"], inputs["endpoint_model"])
+    simulated = []
+    real_accrual = MonteCarloSimulator._simulate_accrual
+
+    def counting_accrual(trial, event_projection, endpoint_model, scenarios, draws):
+        simulated.append(len(draws["effect_z"]))
+        return real_accrual(trial, event_projection, endpoint_model, scenarios, draws)
+
+    monkeypatch.setattr(MonteCarloSimulator, "_simulate_accrual", staticmethod(counting_accrual))
+    simulator = MonteCarloSimulator(n_iterations=100000, target_se=0.006, chunk_size=2000, seed=5)
+    result = simulator.run_simulation(*args, SimulationParams(), _skip_sensitivity=True)
+    assert sum(simulated) == result.n_iterations
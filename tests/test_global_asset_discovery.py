@@ -0,0 +1,46 @@
+"""
+Tests for global_asset_discovery's entity resolution step.
+
+All tests run offline — the resolver's database is a stub.
+
+Usage:
+    python -m pytest tests/test_global_asset_discovery.py -v
+"""
+
+import sys
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import pytest
+
+gad = pytest.importorskip("global_asset_discovery")  # needs python-dotenv, psycopg2, anthropic
+
+
+def test_resolver_caches_load_once_across_runs(monkeypatch):
+    loads, lookups = [], []
+
+    class StubResolver(gad.EntityResolver):
+        def _load_caches(self):
+            loads.append(self._conn)
+            self._cache_alias("keytruda", "1", "pembrolizumab")
+
+        def _lookup_aliases(self, normalized_names):
+            lookups.append((self._conn, list(normalized_names)))
+            return {}
+
+    monkeypatch.setattr(gad, "EntityResolver", StubResolver)
+    monkeypatch.setattr(gad, "_resolver", None)
+    entities = [{"type": "drug", "local_name": "キイトルーダ", "english_name": "Keytruda"},
+                {"type": "drug", "local_name": "", "english_name": "XZ-101"}]
+
+    first_conn, second_conn = object(), object()
+    resolved, novel = gad.resolve_entities([dict(e) for e in entities], first_conn)
+    assert [e["resolved_name"] for e in resolved] == ["pembrolizumab"]
+    assert [e["english_name"] for e in novel] == ["XZ-101"]
+
+    gad.resolve_entities([dict(e) for e in entities], second_conn)
+    assert loads == [first_conn]
+    assert [conn for conn, _ in lookups] == [first_conn, second_conn]
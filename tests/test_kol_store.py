@@ -0,0 +1,166 @@
+"""
+Tests for kol_store (persistent author / publication store with incremental
+author disambiguation and vectorized KOL scoring).
+
+All tests run offline — publications are built in memory, the store lives in
+a temp dir and PubMed is a stub.
+
+Usage:
+    python -m pytest tests/test_kol_store.py -v
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.scrapers import kol_store
+from src.scrapers.kol_store import KOLStore, forenames_compatible, name_key
+from src.scrapers.pubmed_kol_extractor import Author, Publication, PubMedKOLExtractor
+
+THIS_YEAR = datetime.now().year
+MOUNT_SINAI = "Division of Gastroenterology, Icahn School of Medicine at Mount Sinai, New York, NY, USA."
+LEUVEN = "Department of Gastroenterology, University Hospitals Leuven, KU Leuven, Leuven, Belgium."
+
+
+def _author(first, last, affiliation="", orcid=""):
+    return Author(full_name=f"{first} {last}", last_name=last, first_name=first,
+                  initials=first[:1], affiliation=affiliation, orcid=orcid)
+
+
+def _pub(pmid, authors, year=THIS_YEAR, title="Obefazimod in ulcerative colitis", mesh="Colitis, Ulcerative"):
+    return Publication(pmid=pmid, title=title, abstract="", journal="Gut",
+                       publication_date=datetime(year, 1, 1), authors=authors, mesh_terms=[mesh])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return KOLStore(tmp_path / "kol_store.db")
+
+
+def test_name_helpers():
+    assert name_key("Müller", "Jürgen") == name_key("Muller", "J") == "muller_j"
+    assert forenames_compatible("Bruce E", "B") and forenames_compatible("Bruce", "")
+    assert not forenames_compatible("Bruce", "Brian")
+
+
+def test_same_name_is_split_by_affiliation_and_merged_by_coauthors(store):
+    store.ingest([
+        _pub("1", [_author("Bruce E", "Sands", MOUNT_SINAI), _author("Severine", "Vermeire", LEUVEN)]),
+        _pub("2", [_author("Bruce", "Sands", "Icahn School of Medicine at Mount Sinai, New York.")]),
+        _pub("3", [_author("B", "Sands", "Stanford University School of Medicine, Palo Alto, CA.")]),
+        # No affiliation, but a known co-author
+        _pub("4", [_author("B", "Sands"), _author("S", "Vermeire")]),
+        # Conflicting forename is never merged
+        _pub("5", [_author("Brian", "Sands", MOUNT_SINAI)]),
+    ])
+    with store._connect() as conn:
+        owners = dict(conn.execute(
+            "SELECT pmid, author_id FROM authorships WHERE author_id IN "
+            "(SELECT author_id FROM authors WHERE name_key = 'sands_b')"))
+    assert owners["1"] == owners["2"] == owners["4"]
+    assert len({owners["1"], owners["3"], owners["5"]}) == 3
+
+
+def test_orcid_links_authorships_across_affiliations(store):
+    store.ingest([_pub("1", [_author("Marla", "Dubinsky", MOUNT_SINAI, orcid="0000-0001-1111-2222")]),
+                  _pub("2", [_author("M", "Dubinsky", LEUVEN, orcid="0000-0001-1111-2222")])])
+    assert store.stats()["authors"] == 1
+
+
+def test_ingest_is_incremental(store):
+    pubs = [_pub("1", [_author("Bruce", "Sands", MOUNT_SINAI)])]
+    assert store.ingest(pubs) == 1
+    assert store.ingest(pubs) == 0
+    assert store.missing_pmids(["2", "1", "3"]) == ["2", "3"]
+    assert store.stats()["authorships"] == 1
+
+
+def test_top_kols_matches_the_relevance_formula(store):
+    sands, vermeire = _author("Bruce", "Sands", MOUNT_SINAI), _author("Severine", "Vermeire", LEUVEN)
+    store.ingest([
+        _pub("1", [sands, vermeire]),
+        _pub("2", [vermeire, sands], year=2010),
+        _pub("3", [sands, _author("Marla", "Dubinsky", MOUNT_SINAI), vermeire]),
+    ])
+    kols = store.top_kols(["1", "2", "3"], limit=10, min_publications=2)
+    assert [k["name"] for k in kols] == ["Bruce Sands", "Severine Vermeire"]
+    top = kols[0]
+    assert (top["publication_count"], top["first_author_count"], top["last_author_count"],
+            top["recent_publication_count"]) == (3, 2, 1, 2)
+    assert top["relevance_score"] == 3 + 0.5 * 2 + 0.5 * 1 + 0.3 * 2
+    assert top["pmids"] == ["1", "2", "3"]
+    assert store.top_kols(["1"], min_publications=2) == []
+
+
+def test_search_kols_prefers_recorded_query_then_full_text(store):
+    author = _author("Bruce", "Sands", MOUNT_SINAI)
+    store.ingest([_pub("1", [author]), _pub("2", [author]),
+                  _pub("3", [author], title="Risankizumab in Crohn's disease", mesh="Crohn Disease")])
+    matched = store.search_kols("ulcerative colitis", min_publications=1)
+    assert matched["source"] == "match" and matched["kols"][0]["pmids"] == ["1", "2"]
+
+    store.record_query("Ulcerative  Colitis", ["1", "3"])
+    recorded = store.search_kols("ulcerative colitis", min_publications=1)
+    assert recorded["source"] == "query" and recorded["kols"][0]["pmids"] == ["1", "3"]
+
+
+def test_find_kols_only_fetches_unseen_pmids(store, monkeypatch):
+    fetched = []
+    corpus = {p: _pub(p, [_author("Bruce", "Sands", MOUNT_SINAI)]) for p in ("1", "2", "3")}
+
+    extractor = PubMedKOLExtractor(store=store)
+    monkeypatch.setattr(extractor, "search", lambda query, max_results: list(corpus))
+    monkeypatch.setattr(extractor, "fetch_articles",
+                        lambda pmids: fetched.append(list(pmids)) or [corpus[p] for p in pmids])
+
+    store.ingest([corpus["1"]])
+    kols = extractor.find_kols("obefazimod", max_results=5)
+    assert fetched == [["2", "3"]]
+    assert kols[0].name == "Bruce Sands" and kols[0].publication_count == 3
+
+    extractor.find_kols("obefazimod")
+    assert fetched == [["2", "3"]]
+
+
+def test_recorded_query_goes_stale_after_ttl(store, monkeypatch):
+    store.ingest([_pub("1", [_author("Bruce", "Sands", MOUNT_SINAI)])])
+    assert store.search_kols("obefazimod", min_publications=1)["stale"] is False
+
+    store.record_query("obefazimod", ["1"])
+    assert store.search_kols("obefazimod", min_publications=1)["stale"] is False
+    monkeypatch.setattr(kol_store, "QUERY_TTL", -1)
+    result = store.search_kols("obefazimod", min_publications=1)
+    assert result["source"] == "query" and result["stale"] is True
+
+
+def test_concurrent_ingests_of_overlapping_batches(tmp_path):
+    import threading
+
+    path = tmp_path / "kol_store.db"
+    pubs = [_pub(str(i), [_author("Bruce", "Sands", MOUNT_SINAI), _author("Severine", "Vermeire", LEUVEN)])
+            for i in range(300)]
+    added, errors = [], []
+    start = threading.Barrier(4)
+
+    def sync():
+        try:
+            store = KOLStore(path)
+            start.wait()
+            added.append(store.ingest(pubs))  # a new store per call, like the router
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=sync) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [] and sum(added) == 300
+    stats = KOLStore(path).stats()
+    assert stats["publications"] == 300 and stats["authorships"] == 600 and stats["authors"] == 2
@@ -0,0 +1,118 @@
+"""
+Tests for landscape_store (stored, incrementally refreshed landscapes).
+
+All tests run offline — snapshots live in process memory.
+
+Usage:
+    python -m pytest tests/test_landscape_store.py -v
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import landscape_store
+
+PHASE_RANK = {"PHASE3": 4, "PHASE2": 3, "PHASE1": 2, "": 0}
+BUILT = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def _trial(trial_id, phase, status="RECRUITING", sponsor="Amgen", countries="United States", conditions="NSCLC"):
+    return {"trial_id": trial_id, "phase": phase, "status": status, "sponsor": sponsor,
+            "countries": countries, "conditions": conditions}
+
+
+def _snapshot():
+    trials = [
+        _trial("NCT1", "PHASE2"),
+        _trial("NCT2", "PHASE1", status="COMPLETED", sponsor="Mirati", countries="China, Japan"),
+        _trial("NCT3", "PHASE1"),
+    ]
+    assignments = {
+        "NCT1": [["pattern", "sotorasib", "KRAS G12C", ""]],
+        "NCT2": [["pattern", "adagrasib", "KRAS G12C", ""], ["pattern", "sotorasib", "KRAS G12C", ""]],
+        "NCT3": [],
+    }
+    return landscape_store.new_snapshot("KRAS", "all", {"max_trials": 200}, trials, assignments, now=BUILT)
+
+
+def test_aggregate_assets_counts_each_trial_once_per_drug():
+    assets, stats = landscape_store.aggregate_assets(_snapshot(), PHASE_RANK)
+    assert [a["drug_name"] for a in assets] == ["sotorasib", "adagrasib"]
+    sotorasib = assets[0]
+    assert sotorasib["trials"] == ["NCT1", "NCT2"]
+    assert (sotorasib["highest_phase"], sotorasib["active_trials"], sotorasib["sponsor"]) == ("PHASE2", 1, "Amgen")
+    assert sotorasib["countries"] == ["China", "Japan", "United States"]
+    assert stats == {"pattern": 2, "direct": 0, "llm": 0, "patent_only": 0, "unmatched": 1}
+
+
+def test_merge_replaces_updated_trials_without_touching_the_original():
+    snapshot = _snapshot()
+    refreshed = BUILT + timedelta(days=2)
+    merged, counts = landscape_store.merge_trials(
+        snapshot,
+        [_trial("NCT2", "PHASE3", status="RECRUITING", sponsor="Mirati"), _trial("NCT4", "PHASE1")],
+        {"NCT2": [["pattern", "adagrasib", "KRAS G12C", ""]],
+         "NCT4": [["direct", "BBO-8520", "Unknown (auto-discovered)", "intervention_extraction"]]},
+        now=refreshed,
+    )
+    assert counts == {"added": 1, "updated": 1}
+    assert list(merged["trials"]) == ["NCT1", "NCT2", "NCT3", "NCT4"]
+    assert snapshot["trials"]["NCT2"]["phase"] == "PHASE1"
+
+    assets, stats = landscape_store.aggregate_assets(merged, PHASE_RANK)
+    by_name = {a["drug_name"]: a for a in assets}
+    assert assets[0]["drug_name"] == "adagrasib" and by_name["adagrasib"]["highest_phase"] == "PHASE3"
+    assert by_name["sotorasib"]["trials"] == ["NCT1"]
+    assert by_name["BBO-8520"]["source"] == "intervention_extraction"
+    assert stats["direct"] == 1
+    assert merged["refreshes"] == 1
+    assert landscape_store.delta_since(merged) == "2026-03-02"
+
+
+def test_freshness_policy(monkeypatch):
+    monkeypatch.setattr(landscape_store, "FRESH_HOURS", 24)
+    monkeypatch.setattr(landscape_store, "MAX_AGE_DAYS", 30)
+    snapshot = _snapshot()
+    assert landscape_store.freshness(snapshot, now=BUILT + timedelta(hours=3))["status"] == "fresh"
+    stale = landscape_store.freshness(snapshot, now=BUILT + timedelta(hours=30))
+    assert (stale["status"], stale["age_hours"]) == ("stale", 30.0)
+    merged, _ = landscape_store.merge_trials(snapshot, [], {}, now=BUILT + timedelta(days=31))
+    assert landscape_store.freshness(merged, now=BUILT + timedelta(days=31, hours=1))["status"] == "expired"
+
+
+def test_snapshots_round_trip_through_memory_without_a_database(monkeypatch):
+    monkeypatch.setattr(landscape_store, "DATABASE_URL", "")
+    landscape_store.clear_memory()
+    snapshot = _snapshot()
+    assert landscape_store.load(snapshot["key"]) is None
+    landscape_store.save(snapshot)
+    assert landscape_store.load(landscape_store.snapshot_key(" kras ", "ALL", {"max_trials": 200})) is snapshot
+    assert landscape_store.snapshot_key("KRAS", "all", {"max_trials": 100}) != snapshot["key"]
+
+    assert landscape_store.begin_refresh(snapshot["key"])
+    assert not landscape_store.begin_refresh(snapshot["key"])
+    landscape_store.end_refresh(snapshot["key"])
+    landscape_store.clear_memory()
+
+
+def test_failed_delta_fetch_keeps_the_watermark(monkeypatch):
+    gad = pytest.importorskip("global_asset_discovery")  # needs python-dotenv, psycopg2
+    import ctgov_client
+
+    def unavailable(params, **kwargs):
+        raise RuntimeError("503 Service Unavailable")
+
+    saved = []
+    monkeypatch.setattr(ctgov_client, "get_json", unavailable)
+    monkeypatch.setattr(landscape_store, "save", saved.append)
+    snapshot = _snapshot()
+    refreshed, counts = gad._refresh_landscape(snapshot)
+    assert counts["failed"] and refreshed is snapshot and saved == []
+    assert landscape_store.delta_since(refreshed) == landscape_store.delta_since(_snapshot())
@@ -0,0 +1,126 @@
+"""
+Tests for mention_tagger (one-pass drug / target / indication tagging).
+
+All tests run offline — pure Python.
+
+Usage:
+    python -m pytest tests/test_mention_tagger.py -v
+"""
+
+import sys
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import pytest
+
+import mention_tagger
+from mention_tagger import MentionTagger
+from therapeutic_areas import get_ta_config_for_indication, register_indication_mapping
+
+
+def _tagger():
+    tagger = MentionTagger()
+    tagger.set_source("drugs", "drug", [
+        ("pembrolizumab", 1, "pembrolizumab"),
+        ("Keytruda", 1, "pembrolizumab"),
+        ("sotorasib", 2, "sotorasib"),
+        ("AMG 510", 2, "sotorasib"),
+    ])
+    tagger.set_source("targets", "target", [
+        ("KRAS", 10, "KRAS"),
+        ("KRAS G12C", 11, "KRAS G12C"),
+        ("MET", 12, "MET"),
+    ])
+    tagger.set_source("indications", "indication", [
+        ("NSCLC", "oncology_solid", "NSCLC"),
+        ("ALL", "heme", "ALL"),
+        ("melanoma", "oncology_solid", "melanoma"),
+    ], prefix=True)
+    return tagger
+
+
+def test_tags_spans_with_ids_leftmost_longest():
+    text = "Keytruda vs AMG 510 in KRAS G12C NSCLC"
+    found = [(m.text, m.entity_type, m.entity_id) for m in _tagger().tag(text)]
+    assert found == [
+        ("Keytruda", "drug", 1),
+        ("AMG 510", "drug", 2),
+        ("KRAS G12C", "target", 11),
+        ("NSCLC", "indication", "oncology_solid"),
+    ]
+    overlapping = _tagger().tag(text, types=("target",), overlapping=True)
+    assert {m.canonical for m in overlapping} == {"KRAS", "KRAS G12C"}
+
+
+def test_word_boundaries_prefixes_and_ambiguous_acronyms():
+    tagger = _tagger()
+    assert tagger.tag("small cell, metastatic, all patients") == []
+    assert [m.canonical for m in tagger.tag("MET exon 14 in ALL")] == ["MET", "ALL"]
+    assert [m.text for m in tagger.tag("uveal melanomas")] == ["melanoma"]
+    assert tagger.tag("pembrolizumabs") == []
+
+
+def test_incremental_source_updates():
+    tagger = _tagger()
+    version = tagger.version
+    assert tagger.set_source("targets", "target", [
+        ("KRAS", 10, "KRAS"), ("KRAS G12C", 11, "KRAS G12C"), ("MET", 12, "MET"),
+    ]) is False
+    assert tagger.version == version
+
+    tagger.set_source("targets", "target", [
+        ("KRAS", 10, "KRAS"), ("KRAS G12C", 11, "KRAS G12C"), ("MET", 12, "MET"), ("HER2", 13, "HER2"),
+    ])
+    assert [m.entity_id for m in tagger.tag("HER2 and KRAS")] == [13, 10]
+
+    tagger.set_source("targets", "target", [("HER2", 13, "HER2")])
+    assert [m.entity_id for m in tagger.tag("HER2 and KRAS")] == [13]
+    # Re-adding after a build must not duplicate outputs
+    assert len(tagger.tag("HER2 HER2")) == 2
+
+
+def test_confidence_requires_every_drug_shaped_token_known():
+    tagger = _tagger()
+    assert tagger.is_confident("Keytruda with sotorasib in KRAS G12C NSCLC (ASCO 2025)")
+    assert not tagger.is_confident("Keytruda with BG-68501 in NSCLC")
+    assert not tagger.is_confident("Keytruda with novelizumab")
+    assert not tagger.is_confident("恒瑞 pembrolizumab")
+    # No drug named at all: an unnamed asset needs the LLM
+    assert not tagger.is_confident("Hengrui licenses a novel bispecific to Merck for USD 1bn")
+
+
+def test_db_targets_keep_case_so_acronyms_stay_guarded(monkeypatch):
+    drug_entities = pytest.importorskip("drug_entities", exc_type=ImportError)  # needs psycopg2 + a DB URL
+
+    tree = drug_entities.TargetTree([(1, "MET", None), (2, "KRAS", None)], [(1, "c-MET"), (2, "KRAS")])
+    monkeypatch.setattr(drug_entities, "get_alias_entries", lambda: [])
+    monkeypatch.setattr(drug_entities, "get_target_tree", lambda: tree)
+    _, targets = mention_tagger._db_entries()
+    assert ("MET", 1, "MET") in targets and ("c-MET", 1, "MET") in targets
+
+    tagger = MentionTagger()
+    tagger.set_source("targets", "target", targets)
+    assert tagger.tag("Trial met its primary endpoint") == []
+    assert [m.entity_id for m in tagger.tag("MET amplification")] == [1]
+
+
+def test_registered_sources_reach_the_shared_tagger(monkeypatch):
+    monkeypatch.setattr(mention_tagger, "_shared", None)
+    monkeypatch.setattr(mention_tagger, "_registered", {})
+    monkeypatch.setattr(mention_tagger, "_db_entries", lambda: None)
+    mention_tagger.register_source("extra_targets", "target", [("TREM2", "TREM2", "TREM2")])
+    tagger = mention_tagger.get_mention_tagger()
+    assert tagger.sources()["extra_targets"] == 1
+    mention_tagger.register_source("more_targets", "target", [("LRRK2", "LRRK2", "LRRK2")])
+    assert [m.canonical for m in tagger.tag("LRRK2 and TREM2")] == ["LRRK2", "TREM2"]
+
+
+def test_indication_lookup_uses_word_starts_and_map_order():
+    assert get_ta_config_for_indication("metastatic NSCLC").ta_id == "oncology_solid"
+    assert get_ta_config_for_indication("relapsed ALL").ta_id == "heme"
+    assert get_ta_config_for_indication("smallpox vaccine") is None
+    register_indication_mapping("IgA nephropathy", "rare_disease")
+    assert get_ta_config_for_indication("IgA nephropathy").ta_id == "rare_disease"
@@ -0,0 +1,88 @@
+"""
+Tests for portfolio_forecaster (trial selection, risk ranking, run storage).
+
+All tests run offline — CT.gov is a fake and runs are stored as local JSON
+in a temp dir.
+
+Usage:
+    python -m pytest tests/test_portfolio_forecaster.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import portfolio_forecaster
+from portfolio_forecaster import load_run, portfolio_timeout, rank_rows, save_run, select_trials
+
+
+def _study(nct_id):
+    return {"protocolSection": {"identificationModule": {"nctId": nct_id}}}
+
+
+def test_select_trials_dedupes_and_caps_an_nct_list():
+    assert select_trials(nct_ids=[" nct001 ", "NCT002", "nct001", ""], limit=5) == ["NCT001", "NCT002"]
+    assert select_trials(nct_ids=["NCT001", "NCT002", "NCT003"], limit=2) == ["NCT001", "NCT002"]
+    with pytest.raises(ValueError):
+        select_trials()
+
+
+def test_select_trials_pages_one_ctgov_search(monkeypatch):
+    pages = [
+        {"studies": [_study("NCT001"), _study("NCT002")], "nextPageToken": "p2"},
+        {"studies": [_study("NCT002"), _study("NCT003")]},
+    ]
+    calls = []
+    monkeypatch.setattr(portfolio_forecaster.ctgov_client, "get_json",
+                        lambda params, timeout=None: calls.append(dict(params)) or pages[len(calls) - 1])
+    monkeypatch.setattr(portfolio_forecaster, "sponsor_for_ticker", lambda ticker: "Acme Bio")
+
+    found = select_trials(ticker="ACME", window="2026-10-01:", phases=("PHASE2", "PHASE3"), limit=10)
+    assert found == ["NCT001", "NCT002", "NCT003"]
+    first, second = calls
+    assert first["query.spons"] == "Acme Bio" and "pageToken" not in first
+    assert first["filter.advanced"] == ("(AREA[Phase]PHASE2 OR AREA[Phase]PHASE3) AND "
+                                        "AREA[PrimaryCompletionDate]RANGE[2026-10-01,MAX]")
+    assert first["filter.overallStatus"].endswith(",COMPLETED")
+    assert second["pageToken"] == "p2"
+
+
+def test_rank_rows_puts_riskiest_first_and_failures_last():
+    rows = rank_rows([
+        {"nct_id": "A", "probability_of_success": 0.8, "error": None},
+        {"nct_id": "B", "probability_of_success": None, "error": "no anchors"},
+        {"nct_id": "C", "probability_of_success": 0.3, "error": None},
+    ])
+    assert [(r["nct_id"], r["risk_rank"]) for r in rows] == [("C", 1), ("A", 2), ("B", 3)]
+
+
+def test_saved_run_loads_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio_forecaster, "DATABASE_URL", "")
+    monkeypatch.setattr(portfolio_forecaster, "LOCAL_DIR", tmp_path)
+    run = {
+        "run_id": "abc123", "created_at": "2026-10-18T00:00:00Z",
+        "selector": {"ticker": "ACME", "window": None, "nct_ids": None, "phases": ["PHASE3"]},
+        "params": {}, "n_iterations": 20000, "target_se": None,
+        "rows": rank_rows([{"nct_id": "NCT001", "probability_of_success": 0.42, "error": None,
+                            "true_effect_ci": [0.6, 0.9], "event_distribution": [100.0, 120.0]}]),
+    }
+    assert save_run(run) == str(tmp_path / "portfolio_abc123.json")
+    assert load_run("abc123") == run
+    assert load_run("missing") is None
+
+
+def test_job_timeout_follows_the_selection(monkeypatch):
+    monkeypatch.setattr(portfolio_forecaster, "TRIAL_SECONDS", 10.0)
+    monkeypatch.setattr(portfolio_forecaster, "MIN_TIMEOUT", 60.0)
+    monkeypatch.setattr(portfolio_forecaster, "MAX_TRIALS", 40)
+    assert portfolio_timeout([f"NCT{i:03d}" for i in range(12)]) == 120.0
+    assert portfolio_timeout(["NCT001", "nct001"]) == 60.0
+    assert portfolio_timeout(None) == 400.0
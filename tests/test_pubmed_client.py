@@ -0,0 +1,173 @@
+"""
+Tests for pubmed_client (shared E-utilities client with history-server
+paging, batched efetch and a PMID cache).
+
+All tests run offline — the HTTP session is a fake that answers esearch,
+epost, efetch and elink from canned data, and the cache lives in a temp dir.
+
+Usage:
+    python -m pytest tests/test_pubmed_client.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import pubmed_client
+from rate_limiter import TokenBucket
+
+ALL_PMIDS = [str(40000000 + i) for i in range(12)]
+
+
+def _article_xml(pmid: str, pmc: str = "") -> str:
+    pmc_id = f'<ArticleId IdType="pmc">{pmc}</ArticleId>' if pmc else ""
+    return f"""
+    <PubmedArticle>
+      <MedlineCitation><PMID>{pmid}</PMID>
+        <Article>
+          <Journal><JournalIssue><PubDate><Year>2025</Year><Month>Mar</Month></PubDate></JournalIssue>
+            <Title>Gut</Title></Journal>
+          <ArticleTitle>Obefazimod in <i>ulcerative</i> colitis {pmid}</ArticleTitle>
+          <AuthorList><Author><LastName>Sands</LastName><ForeName>Bruce E</ForeName><Initials>BE</Initials></Author>
+            <Author><CollectiveName>ABTECT Investigators</CollectiveName></Author></AuthorList>
+        </Article>
+      </MedlineCitation>
+      <PubmedData><ArticleIdList><ArticleId IdType="doi">10.1/{pmid}</ArticleId>{pmc_id}</ArticleIdList></PubmedData>
+    </PubmedArticle>"""
+
+
+class FakeResponse:
+    def __init__(self, body=None, text="", status_code=200, headers=None):
+        self._body = body
+        self.content = text.encode()
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.posted = {}
+
+    def _answer(self, url, params):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls.append((endpoint, dict(params)))
+        if endpoint == "esearch.fcgi":
+            start = int(params.get("retstart", 0))
+            ids = ALL_PMIDS[start:start + int(params["retmax"])]
+            return FakeResponse({"esearchresult": {"count": "12", "idlist": ids,
+                                                   "webenv": "WE1", "querykey": "1"}})
+        if endpoint == "epost.fcgi":
+            self.posted = params["id"].split(",")
+            return FakeResponse(text="<ePostResult><QueryKey>2</QueryKey><WebEnv>WE2</WebEnv></ePostResult>")
+        if endpoint == "efetch.fcgi":
+            if "id" in params:
+                ids = params["id"].split(",")
+            else:
+                start = int(params["retstart"])
+                ids = self.posted[start:start + int(params["retmax"])]
+            pmc = {ALL_PMIDS[0]: "PMC111"}
+            body = "".join(_article_xml(p, pmc.get(p, "")) for p in ids)
+            return FakeResponse(text=f"<PubmedArticleSet>{body}</PubmedArticleSet>")
+        if endpoint == "elink.fcgi":
+            return FakeResponse({"linksets": [
+                {"ids": [pmid], "linksetdbs": [{"linkname": "pubmed_pmc", "links": ["222"]}]}
+                for pmid in params["id"] if pmid == ALL_PMIDS[1]]})
+        raise AssertionError(endpoint)
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        return self._answer(url, params)
+
+    def post(self, url, data=None, timeout=None, **kwargs):
+        return self._answer(url, data)
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(pubmed_client, "_session", fake)
+    monkeypatch.setattr(pubmed_client, "_bucket", TokenBucket(rate=1000, capacity=1000))
+    monkeypatch.setattr(pubmed_client, "CACHE_DIR", tmp_path / "pubmed")
+    monkeypatch.setattr(pubmed_client, "NCBI_API_KEY", "")
+    return fake
+
+
+def test_search_pages_through_the_history_server(session, monkeypatch):
+    monkeypatch.setattr(pubmed_client, "ESEARCH_PAGE", 5)
+    result = pubmed_client.search("obefazimod", max_results=11)
+    assert result.pmids == ALL_PMIDS[:11] and result.count == 12
+    first, *pages = session.calls
+    assert first[1]["usehistory"] == "y" and first[1]["term"] == "obefazimod"
+    assert [(p[1]["WebEnv"], p[1]["retstart"], p[1]["retmax"]) for p in pages] == [("WE1", 5, 5), ("WE1", 10, 1)]
+
+
+def test_fetch_uses_cache_and_epost_batches(session, monkeypatch):
+    monkeypatch.setattr(pubmed_client, "EFETCH_BATCH", 4)
+    first = pubmed_client.fetch_articles(ALL_PMIDS[:3])
+    assert list(first) == ALL_PMIDS[:3]
+    assert [c[0] for c in session.calls] == ["efetch.fcgi"]
+
+    session.calls.clear()
+    articles = pubmed_client.fetch_articles(ALL_PMIDS)
+    assert list(articles) == ALL_PMIDS
+    assert session.posted == ALL_PMIDS[3:]   # only the 9 uncached PMIDs
+    fetches = [c[1] for c in session.calls if c[0] == "efetch.fcgi"]
+    assert [(f["WebEnv"], f["retstart"]) for f in fetches] == [("WE2", 0), ("WE2", 4), ("WE2", 8)]
+
+    session.calls.clear()
+    pubmed_client.fetch_articles(ALL_PMIDS)
+    assert session.calls == []
+
+
+def test_pmc_ids_prefer_cached_records_then_elink(session):
+    pubmed_client.fetch_articles(ALL_PMIDS[:3])
+    session.calls.clear()
+    assert pubmed_client.pmc_ids(ALL_PMIDS[:3]) == {ALL_PMIDS[0]: "PMC111", ALL_PMIDS[1]: "PMC222"}
+    (endpoint, params), = session.calls
+    assert endpoint == "elink.fcgi" and params["id"] == ALL_PMIDS[1:3]
+
+
+def test_article_summary_fields(session):
+    article = pubmed_client.fetch_articles([ALL_PMIDS[0]])[ALL_PMIDS[0]]
+    summary = pubmed_client.article_summary(article)
+    assert summary["title"] == f"Obefazimod in ulcerative colitis {ALL_PMIDS[0]}"
+    assert summary["authors"] == ["Sands BE", "ABTECT Investigators"]
+    assert (summary["journal"], summary["pub_date"], summary["doi"]) == ("Gut", "2025 Mar", f"10.1/{ALL_PMIDS[0]}")
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(rate=1000, capacity=1000)
+        self.taken = 0
+
+    def acquire(self, tokens=1.0, timeout=None):
+        self.taken += 1
+        return super().acquire(tokens, timeout)
+
+
+def test_retries_take_a_token_each(session, monkeypatch):
+    answers = [FakeResponse(status_code=429, headers={"Retry-After": "0"}),
+               FakeResponse(status_code=503)]
+    real_get = session.get
+    monkeypatch.setattr(session, "get", lambda url, params=None, **kw: answers.pop(0) if answers
+                        else real_get(url, params))
+    monkeypatch.setattr(pubmed_client, "RETRY_BACKOFF", 0)
+    bucket = CountingBucket()
+    monkeypatch.setattr(pubmed_client, "_bucket", bucket)
+
+    assert pubmed_client.search("obefazimod", max_results=3).pmids == ALL_PMIDS[:3]
+    assert bucket.taken == 3
+
+
+def test_default_bucket_does_not_start_with_a_burst(monkeypatch):
+    monkeypatch.setattr(pubmed_client, "NCBI_API_KEY", "")
+    bucket = pubmed_client._new_bucket()
+    assert bucket.rate == 3 and bucket.try_acquire() and not bucket.try_acquire()
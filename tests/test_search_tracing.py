@@ -0,0 +1,85 @@
+"""
+Tests for search_tracing (search pipeline spans + latency histograms).
+
+All tests run offline — pure Python, no DB or API keys.
+
+Usage:
+    python -m pytest tests/test_search_tracing.py -v
+"""
+
+import sys
+import concurrent.futures
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import search_tracing
+from search_tracing import start_trace, span, submit_traced, render_prometheus
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    search_tracing.reset_metrics()
+    yield
+    search_tracing.reset_metrics()
+
+
+def test_span_without_trace_feeds_histogram():
+    with span("vector_sql"):
+        pass
+    summary = search_tracing.get_latency_summary()
+    assert summary["vector_sql"]["count"] == 1
+    assert summary["vector_sql"]["errors"] == 0
+
+
+def test_nested_span_attaches_to_active_trace():
+    trace = start_trace("search", query="KRAS landscape")
+    with trace.span("execute"):
+        with span("embed"):
+            pass
+    stages = [s["stage"] for s in trace.spans]
+    assert stages == ["embed", "execute"]
+
+
+def test_submit_traced_carries_trace_into_worker_threads():
+    trace = start_trace("search")
+    with trace.span("execute"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+            fut = submit_traced(ex, "api.PUBMED", lambda x: x * 2, 21)
+            assert fut.result() == 42
+    assert "api.PUBMED" in trace.timing()
+
+
+def test_errors_are_counted_and_reraised():
+    with pytest.raises(ValueError):
+        with span("rerank"):
+            raise ValueError("boom")
+    assert search_tracing.get_latency_summary()["rerank"]["errors"] == 1
+
+
+def test_prometheus_output_is_cumulative():
+    search_tracing.observe("classify", 0.003)
+    search_tracing.observe("classify", 0.2)
+    search_tracing.observe("classify", 120.0)
+    text = render_prometheus()
+    assert '# TYPE satyabio_search_stage_seconds histogram' in text
+    assert 'satyabio_search_stage_seconds_bucket{stage="classify",le="0.005"} 1' in text
+    assert 'satyabio_search_stage_seconds_bucket{stage="classify",le="0.25"} 2' in text
+    assert 'satyabio_search_stage_seconds_bucket{stage="classify",le="60.0"} 2' in text
+    assert 'satyabio_search_stage_seconds_bucket{stage="classify",le="+Inf"} 3' in text
+    assert 'satyabio_search_stage_seconds_count{stage="classify"} 3' in text
+
+
+def test_slow_query_log(tmp_path, monkeypatch):
+    log_path = tmp_path / "slow.jsonl"
+    monkeypatch.setattr(search_tracing, "SLOW_QUERY_SECONDS", 0.0)
+    monkeypatch.setattr(search_tracing, "SLOW_QUERY_LOG", str(log_path))
+    trace = start_trace("search", query="slow one")
+    trace.record("claude_ttft", 1.5)
+    trace.finish()
+    assert log_path.exists()
+    assert '"claude_ttft"' in log_path.read_text()
@@ -0,0 +1,88 @@
+"""
+Tests for translation_memory (segment-level reuse of Claude translations).
+
+All tests run offline — the batch translator is a fake and entries live in
+process memory.
+
+Usage:
+    python -m pytest tests/test_translation_memory.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import translation_memory
+
+GLOSSARY = {
+    "恒瑞医药宣布授权。": "Hengrui Medicine (恒瑞医药) announced a license.",
+    "首付款1.1亿美元。": "Upfront payment of USD 110 million.",
+    "卡瑞利珠单抗获批。": "Camrelizumab (卡瑞利珠单抗) was approved.",
+}
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, segments, source_lang, target_lang, context):
+        self.calls.append(list(segments))
+        return [{"translation": GLOSSARY[s], "entities": [{"type": "company", "local_name": s[:4]}]}
+                if s in GLOSSARY else None for s in segments]
+
+
+@pytest.fixture(autouse=True)
+def memory_only(monkeypatch):
+    monkeypatch.setattr(translation_memory, "DATABASE_URL", "")
+    translation_memory.clear_memory()
+    yield
+    translation_memory.clear_memory()
+
+
+def test_split_segments_round_trips_layout():
+    text = "Title: 恒瑞医药宣布授权。首付款1.1亿美元。\nHRS-7535 mg 2.5"
+    pairs = translation_memory.split_segments(text)
+    assert [s for s, _ in pairs] == ["Title: 恒瑞医药宣布授权。", "首付款1.1亿美元。", "HRS-7535 mg 2.5"]
+    assert "".join(s + sep for s, sep in pairs) == text
+
+
+def test_segments_are_translated_once_and_batched():
+    translator = FakeTranslator()
+    texts = ["恒瑞医药宣布授权。首付款1.1亿美元。\nHRS-7535", "首付款1.1亿美元。"]
+    first = translation_memory.translate_many(texts, "zh", "en", "ir page", translator)
+
+    assert translator.calls == [["恒瑞医药宣布授权。", "首付款1.1亿美元。"]]
+    assert first[0]["translated_text"] == (
+        "Hengrui Medicine (恒瑞医药) announced a license. Upfront payment of USD 110 million.\nHRS-7535")
+    assert first[1]["translated_text"] == "Upfront payment of USD 110 million."
+    assert len(first[0]["entities"]) == 2
+
+    again = translation_memory.translate_many(
+        ["首付款1.1亿美元。卡瑞利珠单抗获批。"], "zh", "en", "ir page", translator)
+    assert translator.calls[1] == ["卡瑞利珠单抗获批。"]
+    assert (again[0]["segments_reused"], again[0]["segments_translated"]) == (1, 1)
+
+
+def test_context_and_language_pair_are_part_of_the_key():
+    translator = FakeTranslator()
+    translation_memory.translate_many(["卡瑞利珠单抗获批。"], "zh", "en", "ir page", translator)
+    translation_memory.translate_many(["卡瑞利珠单抗获批。"], "zh", "en", "clinical trial", translator)
+    translation_memory.translate_many(["卡瑞利珠单抗获批。"], "ja", "en", "ir page", translator)
+    assert len(translator.calls) == 3
+
+
+def test_batches_respect_limits_and_failures_are_not_stored(monkeypatch):
+    monkeypatch.setattr(translation_memory, "BATCH_SEGMENTS", 2)
+    translator = FakeTranslator()
+    texts = ["恒瑞医药宣布授权。首付款1.1亿美元。卡瑞利珠单抗获批。未知句子。"]
+    result = translation_memory.translate_many(texts, "zh", "en", "ir page", translator)
+    assert [len(c) for c in translator.calls] == [2, 2]
+    assert result[0]["translated_text"].endswith("未知句子。")
+
+    translation_memory.translate_many(["未知句子。"], "zh", "en", "ir page", translator)
+    assert translator.calls[-1] == ["未知句子。"]
@@ -0,0 +1,105 @@
+"""
+Tests for webcast_index (time-anchored segment index for webcast search).
+
+All tests run offline — the database connection is a fake that records SQL
+and returns canned segment rows.
+
+Usage:
+    python -m pytest tests/test_webcast_index.py -v
+"""
+
+import sys
+from pathlib import Path
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import webcast_index
+
+
+class FakeCursor:
+    def __init__(self, rows=None, fail=False):
+        self.rows = rows or []
+        self.fail = fail
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if self.fail and "webcast_segments" in sql:
+            raise RuntimeError('relation "webcast_segments" does not exist')
+
+    def executemany(self, sql, rows):
+        self.executed.append((sql, list(rows)))
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.rolled_back = False
+
+    def cursor(self):
+        return self._cursor
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def test_segments_are_assigned_to_the_chunk_covering_their_start():
+    chunks = [{"start_time": 0.0}, {"start_time": 120.0}, {"start_time": 300.0}]
+    segments = [{"start": 5, "end": 9, "text": "welcome"}, {"start": 119, "end": 125, "text": "enrollment"},
+                {"start": 130, "end": 140, "text": " "}, {"start": 310, "end": 320, "text": "questions"}]
+    groups = webcast_index.assign_segments(chunks, segments)
+    assert [[text for *_, text in g] for g in groups] == [["welcome", "enrollment"], [], ["questions"]]
+
+
+def test_store_segments_writes_rows_with_section_labels(monkeypatch):
+    monkeypatch.setattr(webcast_index, "_table_ready", True)
+    cur = FakeCursor()
+    chunk_rows = [(11, {"start_time": 0.0}, "Introduction"), (12, {"start_time": 60.0}, "Efficacy Data")]
+    segments = [{"start": 1.234, "end": 4.0, "text": "hello"}, {"start": 61, "end": 70, "text": "ORR was 42%"}]
+    assert webcast_index.store_segments(cur, 7, chunk_rows, segments) == 2
+    rows = next(params for sql, params in cur.executed if "INSERT INTO webcast_segments" in sql)
+    assert rows == [(7, 11, 0, 1.23, 4.0, "Introduction", "hello"),
+                    (7, 12, 1, 61, 70, "Efficacy Data", "ORR was 42%")]
+    assert cur.executed[-1][0] == "RELEASE SAVEPOINT webcast_segments"
+
+
+def test_moment_query_ors_terms():
+    assert webcast_index.moment_query("GLP-1 weight loss, weight!") == "glp <-> 1 | weight | loss"
+    assert webcast_index.moment_query("  ") == ""
+
+
+def test_attach_moments_anchors_webcast_results():
+    rows = [(5, 610.0, 618.5, "Efficacy Data", "weight loss of 14 percent", 0.4),
+            (5, 600.0, 609.0, "Efficacy Data", "turning to the data", 0.0),
+            (9, 30.0, 40.0, "Introduction", "good morning", 0.0)]
+    conn = FakeConn(FakeCursor(rows))
+    results = [
+        {"chunk_id": 5, "doc_type": "webcast", "file_path": "https://ir.example/call#player"},
+        {"chunk_id": 9, "doc_type": "webcast", "file_path": "upload.mp3"},
+        {"chunk_id": 3, "doc_type": "10-K"},
+    ]
+    webcast_index.attach_moments(conn, "weight loss", results)
+
+    hit, semantic, filing = results
+    assert hit["start_time"] == 610.0 and hit["timestamp"] == "10:10"
+    assert hit["jump_url"] == "https://ir.example/call#t=610"
+    assert [m["start_time"] for m in hit["moments"]] == [610.0]
+    assert semantic["timestamp"] == "0:30" and semantic["jump_url"] is None
+    assert "start_time" not in filing
+    _, params = conn.cursor().executed[0]
+    assert params[2] == [5, 9]
+
+
+def test_attach_moments_leaves_results_alone_without_the_table():
+    conn = FakeConn(FakeCursor(fail=True))
+    results = [{"id": 5, "doc_type": "webcast"}]
+    assert webcast_index.attach_moments(conn, "dose", results) == [{"id": 5, "doc_type": "webcast"}]
+    assert conn.rolled_back
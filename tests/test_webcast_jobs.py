@@ -0,0 +1,174 @@
+"""
+Tests for webcast_jobs (background webcast processing with resumable stages).
+
+All tests run offline — the pipeline stages are fakes and jobs persist under
+a temporary directory.
+
+Usage:
+    python -m pytest tests/test_webcast_jobs.py -v
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+SEARCH_DIR = Path(__file__).resolve().parent.parent / "backend" / "services" / "search"
+if str(SEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(SEARCH_DIR))
+
+import webcast_jobs
+
+
+class StageFailed(RuntimeError):
+    def __init__(self, message, **details):
+        super().__init__(message)
+        self.details = details
+
+
+class FakePipeline:
+    """Records stage calls; transcribe fails while `fail_transcribe` is set."""
+
+    WEBCAST_STAGES = ("capture", "transcribe", "ingest")
+
+    def __init__(self):
+        self.calls = []
+        self.fail_transcribe = False
+        self.gate = None  # threading.Event the capture stage waits on
+
+    def run_stage(self, stage, request, artifacts, workdir, progress):
+        self.calls.append(stage)
+        progress(f"working on {stage}")
+        if stage == "capture":
+            if self.gate is not None:
+                self.gate.wait(5)
+            return {"audio_path": request.get("audio_path") or "audio.mp3"}
+        if stage == "transcribe":
+            if self.fail_transcribe:
+                raise StageFailed("Whisper unavailable", hint="set OPENAI_API_KEY")
+            return {"transcript": {"text": "hello world", "duration": 60.0}}
+        return {"ingest": {"status": "ok", "document_id": 7, "chunks_stored": 1}}
+
+    def webcast_result(self, artifacts):
+        return {"status": artifacts["ingest"]["status"], "document_id": artifacts["ingest"]["document_id"]}
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    fake = FakePipeline()
+    monkeypatch.setattr(webcast_jobs, "JOB_DIR", tmp_path / "jobs")
+    monkeypatch.setattr(webcast_jobs, "_pipeline", lambda: fake)
+    monkeypatch.setattr(webcast_jobs, "_jobs", {})
+    monkeypatch.setattr(webcast_jobs, "_tasks", {})
+    monkeypatch.setattr(webcast_jobs, "_semaphore", None)
+    monkeypatch.setattr(webcast_jobs, "_recovered", False)
+    return fake
+
+
+async def _finish(job):
+    return [event async for event in job.stream()]
+
+
+def test_job_runs_all_stages_and_streams_events(pipeline):
+    async def scenario():
+        job = webcast_jobs.submit_webcast({"url": "https://x.example/call"})
+        events = await _finish(job)
+        return job, events
+
+    job, events = asyncio.run(scenario())
+    assert job.status == "done" and job.result == {"status": "ok", "document_id": 7}
+    assert job.completed == ["capture", "transcribe", "ingest"]
+    kinds = [e["type"] for e in events]
+    assert kinds[0] == "queued" and kinds[-1] == "result"
+    assert any(e["type"] == "progress" and e["stage"] == "transcribe" for e in events)
+    assert (job.dir / "job.json").exists()
+
+
+def test_failed_job_resumes_from_last_completed_stage(pipeline):
+    pipeline.fail_transcribe = True
+
+    async def scenario():
+        job = webcast_jobs.submit_webcast({"url": "https://x.example/call"})
+        await _finish(job)
+        failed = (job.status, job.error, dict(job.error_details))
+        pipeline.fail_transcribe = False
+        webcast_jobs.resume_job(job.job_id)
+        await _finish(job)
+        return job, failed
+
+    job, failed = asyncio.run(scenario())
+    assert failed == ("error", "Whisper unavailable", {"hint": "set OPENAI_API_KEY"})
+    assert job.status == "done" and job.error is None
+    assert pipeline.calls == ["capture", "transcribe", "transcribe", "ingest"]
+
+
+def test_interrupted_jobs_are_recovered_from_disk(pipeline, monkeypatch):
+    job = webcast_jobs.WebcastJob(job_id="abc123", request={"url": "https://x.example/call"},
+                                  status="running", stage="transcribe", completed=["capture"],
+                                  artifacts={"audio_path": "audio.mp3"})
+    job.save()
+
+    async def scenario():
+        recovered = webcast_jobs.get_job("abc123")
+        await _finish(recovered)
+        return recovered
+
+    recovered = asyncio.run(scenario())
+    assert recovered.status == "done"
+    assert pipeline.calls == ["transcribe", "ingest"]
+
+
+def test_cancel_stops_queued_and_running_jobs(pipeline, monkeypatch):
+    monkeypatch.setattr(webcast_jobs, "MAX_CONCURRENT", 1)
+    pipeline.gate = threading.Event()
+
+    async def scenario():
+        running = webcast_jobs.submit_webcast({"url": "https://x.example/a"})
+        queued = webcast_jobs.submit_webcast({"url": "https://x.example/b"})
+        await asyncio.sleep(0.05)
+        webcast_jobs.cancel_job(queued.job_id)
+        webcast_jobs.cancel_job(running.job_id)
+        pipeline.gate.set()
+        await _finish(running)
+        await _finish(queued)
+        return running, queued
+
+    running, queued = asyncio.run(scenario())
+    assert queued.status == "cancelled" and queued.completed == []
+    assert running.status == "cancelled" and running.completed == ["capture"]
+    assert pipeline.calls == ["capture"]
+
+
+def test_resumed_queued_job_runs_once(pipeline, monkeypatch):
+    monkeypatch.setattr(webcast_jobs, "MAX_CONCURRENT", 1)
+    pipeline.gate = threading.Event()
+
+    async def scenario():
+        first = webcast_jobs.submit_webcast({"url": "https://x.example/a"})
+        queued = webcast_jobs.submit_webcast({"url": "https://x.example/b"})
+        await asyncio.sleep(0.05)
+        webcast_jobs.cancel_job(queued.job_id)
+        webcast_jobs.resume_job(queued.job_id)
+        pipeline.gate.set()
+        await _finish(first)
+        await _finish(queued)
+        await asyncio.sleep(0.05)  # a stale second task would run the stages again here
+        return queued
+
+    queued = asyncio.run(scenario())
+    assert queued.status == "done"
+    assert pipeline.calls == ["capture", "transcribe", "ingest"] * 2
+
+
+def test_progress_events_are_saved_in_batches(pipeline, monkeypatch):
+    monkeypatch.setattr(webcast_jobs, "EVENT_SAVE_SECONDS", 60)
+    job = webcast_jobs.WebcastJob(job_id="batch1", request={})
+    saves = []
+    monkeypatch.setattr(job, "save", lambda: saves.append(len(job.events)) or setattr(job, "_saved_at", 1e12))
+    job.add_event("stage", "Starting transcribe")
+    for n in range(50):
+        job.add_event("progress", f"chunk {n}")
+    job.add_event("stage_done", "Finished transcribe")
+    assert saves == [1, 52]